@@ -447,7 +447,7 @@ JSON 형식으로 응답해주세요:
         for wiki in wikis[:20]:  # 상위 20개만
             snapshot = wiki.snapshots.order_by("-valid_from_chapter").first()
             if snapshot:
-                wiki_info.append(f"- {wiki.name}: {snapshot.content[:200]}")
+                wiki_info.append(f"- {wiki.name}: {snapshot.text[:200]}")
 
         prompt = f"""다음 회차 내용의 설정 일관성을 검사해주세요.
 
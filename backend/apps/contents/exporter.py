@@ -0,0 +1,346 @@
+"""
+BranchExportService - Offline/backup export of a branch as EPUB or zip.
+
+Published chapters are streamed with ``.iterator()`` and written one entry at a
+time into a zip container on local disk (an EPUB is a zip with a fixed layout),
+followed by the wiki snapshots valid at the last exported chapter. The finished
+artifact is copied to default storage under a path keyed by ``Branch.version``
+(plus the ancestors' versions for forks, whose wiki is inherited) and the
+reader's access scope, so repeated exports of an unchanged branch are
+served from storage without rebuilding. Every job leases the artifact it points
+at for as long as the job is kept; storing a new artifact deletes older versions
+next to it only once no job leases them any more. Which chapters a reader gets follows
+``AccessService`` (FREE chapters, plus everything for the author/subscribers or
+purchased chapters otherwise).
+
+The zip format stores chapter markdown as ``chapters/NNNN.md`` with a ``# Title``
+first line, which ``ChapterImportService`` can import back; the wiki and the
+manifest are JSON so the importer skips them.
+"""
+
+import hashlib
+import json
+import re
+import tempfile
+import uuid
+import zipfile
+from html import escape
+from pathlib import PurePosixPath
+from typing import Any
+
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.contents.lineage import BranchLineage
+from apps.contents.models import AccessType, Chapter, ChapterStatus, WikiEntry, WikiSnapshot
+from apps.contents.services import WikiService
+from apps.contents.wiki_history import WikiSnapshotHistory
+from apps.novels.models import Branch
+from apps.users.models import User
+
+ARTIFACT_VERSION = re.compile(r"^v([\d.a-f]+)-")
+
+
+class ExportFormat:
+    EPUB = "epub"
+    ZIP = "zip"
+
+    CHOICES = (EPUB, ZIP)
+    CONTENT_TYPES = {EPUB: "application/epub+zip", ZIP: "application/zip"}
+
+
+class ExportJobStatus:
+    PENDING = "PENDING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class BranchExportService:
+    """Service for exporting a branch's published chapters."""
+
+    JOB_KEY = "branch_export:{job_id}"
+    JOB_TIMEOUT = 24 * 60 * 60  # 24 hours
+    LEASE_KEY = "branch_export_lease:{path}"
+    ARTIFACT_DIR = "exports/{branch_id}"
+    ARTIFACT_NAME = "v{version}-{scope}.{fmt}"
+
+    def request_export(self, branch: Branch, user: User, fmt: str) -> tuple[str, dict[str, Any]]:
+        """
+        사용자가 접근할 수 있는 회차로 구성된 내보내기 파일을 요청합니다.
+
+        같은 브랜치 버전과 접근 범위의 파일이 이미 있으면 바로 완료 상태의 작업을 반환하고,
+        없으면 백그라운드 작업을 등록합니다.
+
+        Parameters:
+            branch (Branch): 내보낼 브랜치
+            user (User): 요청 사용자 (AccessService 규칙으로 포함 회차 결정)
+            fmt (str): "epub" 또는 "zip"
+
+        Returns:
+            tuple[str, dict]: (작업 ID, 작업 상태)
+        """
+        from apps.contents.tasks import export_branch
+        from apps.interactions.services import AccessService
+
+        accessible_ids = AccessService().get_accessible_chapter_ids(user, branch)
+        path = self.get_artifact_path(branch, fmt, accessible_ids)
+
+        job_id = uuid.uuid4().hex
+        ready = default_storage.exists(path)
+        self._set_job(
+            job_id,
+            branch_id=branch.id,
+            user_id=user.id,
+            format=fmt,
+            path=path,
+            status=ExportJobStatus.DONE if ready else ExportJobStatus.PENDING,
+        )
+        # The job may be downloaded until it expires, so keep its artifact as long
+        cache.set(self.LEASE_KEY.format(path=path), job_id, self.JOB_TIMEOUT)
+
+        if not ready:
+            transaction.on_commit(
+                lambda: export_branch.delay(job_id, branch.id, fmt, accessible_ids, path)
+            )
+        return job_id, self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """내보내기 작업 상태(`status`, `path`, `format`, `branch_id`, `user_id`)를 반환합니다."""
+        return cache.get(self.JOB_KEY.format(job_id=job_id))
+
+    def _set_job(self, job_id: str, **fields: Any) -> None:
+        job = self.get_job(job_id) or {}
+        job.update(fields)
+        cache.set(self.JOB_KEY.format(job_id=job_id), job, self.JOB_TIMEOUT)
+
+    def get_artifact_path(self, branch: Branch, fmt: str, accessible_ids: list[int] | None) -> str:
+        """브랜치 버전과 접근 범위(전체/무료/소장 회차 집합)로 결정되는 저장 경로를 반환합니다."""
+        if accessible_ids is None:
+            scope = "full"
+        elif not accessible_ids:
+            scope = "free"
+        else:
+            scope = hashlib.sha1(",".join(map(str, accessible_ids)).encode()).hexdigest()[:16]
+        version = str(branch.version)
+        if branch.parent_branch_id is not None:
+            stamp = BranchLineage.resolve(branch.id).stamp
+            version += "." + hashlib.sha1(stamp.encode()).hexdigest()[:8]
+        name = self.ARTIFACT_NAME.format(version=version, scope=scope, fmt=fmt)
+        return f"{self.ARTIFACT_DIR.format(branch_id=branch.id)}/{name}"
+
+    def run(
+        self, job_id: str, branch_id: int, fmt: str, accessible_ids: list[int] | None, path: str
+    ) -> str:
+        """백그라운드 작업 본체: 파일을 만들고 작업 상태를 갱신합니다."""
+        try:
+            if not default_storage.exists(path):
+                self.build(branch_id, fmt, accessible_ids, path)
+        except Exception as e:
+            self._set_job(job_id, status=ExportJobStatus.FAILED, error=str(e))
+            raise
+        self._set_job(job_id, status=ExportJobStatus.DONE)
+        return path
+
+    def build(self, branch_id: int, fmt: str, accessible_ids: list[int] | None, path: str) -> str:
+        """
+        회차를 스트리밍하여 내보내기 파일을 만들고 저장소에 저장합니다.
+
+        같은 브랜치의 이전 버전 파일은 저장 후 삭제합니다.
+
+        Returns:
+            str: 저장된 파일 경로
+        """
+        branch = Branch.objects.select_related("novel").get(id=branch_id)
+        chapters = Chapter.objects.filter(branch_id=branch_id, status=ChapterStatus.PUBLISHED)
+        if accessible_ids is not None:
+            chapters = chapters.filter(Q(access_type=AccessType.FREE) | Q(id__in=accessible_ids))
+        chapters = chapters.only("chapter_number", "title", "content", "content_html").order_by(
+            "chapter_number"
+        )
+
+        writer_class = _EpubWriter if fmt == ExportFormat.EPUB else _ZipWriter
+        with tempfile.TemporaryFile() as tmp:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as bundle:
+                writer = writer_class(bundle, branch)
+                last_number = 0
+                for chapter in chapters.iterator(chunk_size=100):
+                    writer.add_chapter(chapter)
+                    last_number = chapter.chapter_number
+                writer.add_wiki(self._wiki_at(branch_id, last_number))
+                writer.close()
+
+            tmp.seek(0)
+            if not default_storage.exists(path):
+                default_storage.save(path, File(tmp))
+
+        self._delete_stale(path)
+        return path
+
+    @staticmethod
+    def _wiki_at(branch_id: int, chapter_number: int) -> list[tuple[str, str]]:
+        """
+        (이름, 내용) of each wiki entry's snapshot valid at ``chapter_number``,
+        including entries a fork inherits (up to its fork point).
+        """
+        lineage = BranchLineage.resolve(branch_id)
+        entries = WikiEntry.objects.filter(WikiService._visible_entries(lineage)).values("id")
+        snapshots = (
+            WikiSnapshot.objects.filter(
+                lineage.filter("wiki_entry__branch_id", "valid_from_chapter"),
+                wiki_entry_id__in=entries,
+                valid_from_chapter__lte=chapter_number,
+            )
+            .order_by("wiki_entry__name", "wiki_entry_id", "-valid_from_chapter")
+            .values_list("id", "wiki_entry_id", "wiki_entry__name")
+        )
+        chosen = []
+        seen = set()
+        for snapshot_id, wiki_id, name in snapshots.iterator(chunk_size=500):
+            if wiki_id not in seen:
+                seen.add(wiki_id)
+                chosen.append((name, snapshot_id))
+
+        # Load (and decode delta-encoded) contents only for the chosen versions
+        entries = []
+        for offset in range(0, len(chosen), 500):
+            batch = chosen[offset : offset + 500]
+            loaded = WikiSnapshot.objects.defer(*WikiSnapshot.HEAVY_FIELDS).in_bulk(
+                [snapshot_id for _, snapshot_id in batch]
+            )
+            WikiSnapshotHistory.materialize(list(loaded.values()))
+            entries += [(name, loaded[snapshot_id].text) for name, snapshot_id in batch]
+        return entries
+
+    @classmethod
+    def _delete_stale(cls, path: str) -> None:
+        """Delete artifacts of older branch versions next to ``path`` that no live job leases."""
+        artifact = PurePosixPath(path)
+        current = ARTIFACT_VERSION.match(artifact.name)
+        if current is None:
+            return
+        _, files = default_storage.listdir(str(artifact.parent))
+        stale = []
+        for name in files:
+            match = ARTIFACT_VERSION.match(name)
+            if match and match.group(1) != current.group(1):
+                stale.append(str(artifact.parent / name))
+        leased = cache.get_many([cls.LEASE_KEY.format(path=stale_path) for stale_path in stale])
+        for stale_path in stale:
+            if cls.LEASE_KEY.format(path=stale_path) not in leased:
+                default_storage.delete(stale_path)
+
+
+class _ZipWriter:
+    """Plain zip backup: markdown chapters, wiki markdown and a manifest."""
+
+    def __init__(self, bundle: zipfile.ZipFile, branch: Branch) -> None:
+        self.bundle = bundle
+        self.branch = branch
+        self.chapters: list[dict[str, Any]] = []
+
+    def add_chapter(self, chapter: Chapter) -> None:
+        name = f"chapters/{chapter.chapter_number:04d}.md"
+        self.bundle.writestr(name, f"# {chapter.title}\n\n{chapter.content}\n")
+        self.chapters.append(
+            {"number": chapter.chapter_number, "title": chapter.title, "file": name}
+        )
+
+    def add_wiki(self, entries: list[tuple[str, str]]) -> None:
+        if entries:
+            wiki = [{"name": name, "content": content} for name, content in entries]
+            self.bundle.writestr("wiki.json", json.dumps(wiki, ensure_ascii=False, indent=2))
+
+    def close(self) -> None:
+        manifest = {
+            "novel": self.branch.novel.title,
+            "branch": self.branch.name,
+            "version": self.branch.version,
+            "exported_at": timezone.now().isoformat(),
+            "chapters": self.chapters,
+        }
+        self.bundle.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+class _EpubWriter:
+    """EPUB 3 container written entry by entry."""
+
+    XHTML = (
+        '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+        'lang="ko" xml:lang="ko">\n<head><meta charset="utf-8"/><title>{title}</title></head>\n'
+        "<body>\n{body}\n</body>\n</html>\n"
+    )
+    CONTAINER = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+        '<rootfiles><rootfile full-path="OEBPS/content.opf" '
+        'media-type="application/oebps-package+xml"/></rootfiles>\n</container>\n'
+    )
+
+    def __init__(self, bundle: zipfile.ZipFile, branch: Branch) -> None:
+        self.bundle = bundle
+        self.branch = branch
+        self.items: list[tuple[str, str, str]] = []  # (id, href, title)
+        # The mimetype entry must come first and be stored uncompressed.
+        bundle.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        bundle.writestr("META-INF/container.xml", self.CONTAINER)
+
+    def _write_page(self, item_id: str, title: str, body: str) -> None:
+        href = f"{item_id}.xhtml"
+        page = self.XHTML.format(title=escape(title), body=body)
+        self.bundle.writestr(f"OEBPS/{href}", page)
+        self.items.append((item_id, href, title))
+
+    def add_chapter(self, chapter: Chapter) -> None:
+        title = f"{chapter.chapter_number}화. {chapter.title}"
+        self._write_page(
+            f"chapter-{chapter.chapter_number:04d}",
+            title,
+            f"<h1>{escape(title)}</h1>\n{chapter.content_html}",
+        )
+
+    def add_wiki(self, entries: list[tuple[str, str]]) -> None:
+        if not entries:
+            return
+        sections = "\n".join(
+            f"<section><h2>{escape(name)}</h2>\n"
+            + "\n".join(f"<p>{escape(line)}</p>" for line in content.splitlines() if line.strip())
+            + "</section>"
+            for name, content in entries
+        )
+        self._write_page("wiki", "위키", f"<h1>위키</h1>\n{sections}")
+
+    def close(self) -> None:
+        title = f"{self.branch.novel.title} - {self.branch.name}"
+        nav_items = "\n".join(
+            f'<li><a href="{href}">{escape(item_title)}</a></li>'
+            for _, href, item_title in self.items
+        )
+        nav = self.XHTML.format(
+            title=escape(title),
+            body=f'<nav epub:type="toc" id="toc"><h1>목차</h1><ol>\n{nav_items}\n</ol></nav>',
+        )
+        self.bundle.writestr("OEBPS/nav.xhtml", nav)
+
+        manifest = "\n".join(
+            f'<item id="{item_id}" href="{href}" media-type="application/xhtml+xml"/>'
+            for item_id, href, _ in self.items
+        )
+        spine = "\n".join(f'<itemref idref="{item_id}"/>' for item_id, _, _ in self.items)
+        modified = timezone.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        opf = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid">\n'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'<dc:identifier id="uid">forklore-branch-{self.branch.id}-v{self.branch.version}'
+            "</dc:identifier>\n"
+            f"<dc:title>{escape(title)}</dc:title>\n<dc:language>ko</dc:language>\n"
+            f'<meta property="dcterms:modified">{modified}</meta>\n</metadata>\n'
+            '<manifest>\n<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" '
+            f'properties="nav"/>\n{manifest}\n</manifest>\n<spine>\n{spine}\n</spine>\n</package>\n'
+        )
+        self.bundle.writestr("OEBPS/content.opf", opf)
@@ -0,0 +1,182 @@
+"""
+WikiHighlighter - Server-side wiki keyword highlighting for the reader.
+
+Each branch gets an Aho-Corasick automaton over its wiki entry names (and
+aliases listed under ``ai_metadata["aliases"]``), including entries a fork
+inherits from its ancestors. Automata are kept in a small per-process LRU keyed
+by ``Branch.version`` (every version in the lineage for forks); every wiki
+mutation bumps the version, so a changed wiki is picked up on the next request
+in every worker without cross-process invalidation. Matching a chapter is a single pass over
+its text, independent of how many entries the branch has.
+
+Spans are reported per paragraph (the ``paragraph_offsets`` numbering used by
+paragraph comments and the paragraph window endpoint), as offsets into the
+paragraph's text content, so the client can wrap them without re-scanning.
+"""
+
+import builtins
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+from apps.contents.lineage import BranchLineage
+from apps.contents.models import Chapter, WikiEntry
+from apps.contents.services import ChapterService, WikiService
+from common.aho_corasick import AhoCorasick
+
+# (wiki_id, name, first_appearance)
+WikiPayload = tuple[int, str, int | None]
+
+
+class _TextParser(HTMLParser):
+    """Concatenate the text nodes of an HTML fragment (DOM ``textContent``)."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.chunks: builtins.list[str] = []
+
+    def handle_data(self, data: str) -> None:
+        self.chunks.append(data)
+
+    @classmethod
+    def text_of(cls, html: str) -> str:
+        parser = cls()
+        parser.feed(html)
+        parser.close()
+        return "".join(parser.chunks)
+
+
+class WikiHighlighter:
+    """Per-branch cached automaton of wiki names."""
+
+    MAX_BRANCHES = 256
+
+    _automata: OrderedDict[int, tuple[int | str, AhoCorasick]] = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_automaton(cls, branch_id: int, version: int | str) -> AhoCorasick:
+        """
+        브랜치 위키 이름으로 만든 오토마톤을 반환합니다. 브랜치 버전이 바뀌었으면 다시 만듭니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID
+            version (int | str): 현재 Branch.version (포크는 BranchLineage.stamp)
+
+        Returns:
+            AhoCorasick: 같은 이름을 쓰는 (위키 ID, 이름, 첫 등장 회차)의 튜플을 payload로 갖는 오토마톤
+        """
+        with cls._lock:
+            cached = cls._automata.get(branch_id)
+            if cached is not None and cached[0] == version:
+                cls._automata.move_to_end(branch_id)
+                return cached[1]
+
+        automaton = cls._build(branch_id)
+        with cls._lock:
+            cls._automata[branch_id] = (version, automaton)
+            cls._automata.move_to_end(branch_id)
+            while len(cls._automata) > cls.MAX_BRANCHES:
+                cls._automata.popitem(last=False)
+        return automaton
+
+    @classmethod
+    def invalidate(cls, branch_id: int | None = None) -> None:
+        """Drop the cached automaton of a branch (all branches if None)."""
+        with cls._lock:
+            if branch_id is None:
+                cls._automata.clear()
+            else:
+                cls._automata.pop(branch_id, None)
+
+    @staticmethod
+    def _build(branch_id: int) -> AhoCorasick:
+        lineage = BranchLineage.resolve(branch_id)
+        rows = WikiEntry.objects.filter(WikiService._visible_entries(lineage)).values_list(
+            "id", "name", "first_appearance", "ai_metadata__aliases"
+        )
+        # Every entry sharing a name or alias is kept; highlight() picks the one the
+        # chapter can see. Names go first so an entry's own name beats another's alias.
+        entries: dict[str, builtins.list[WikiPayload]] = {}
+        aliases: builtins.list[tuple[str, WikiPayload]] = []
+        for wiki_id, name, first_appearance, entry_aliases in rows:
+            payload = (wiki_id, name, first_appearance)
+            entries.setdefault(name.strip(), []).append(payload)
+            if isinstance(entry_aliases, builtins.list):
+                aliases += [(a.strip(), payload) for a in entry_aliases if isinstance(a, str)]
+        for alias, payload in aliases:
+            entries.setdefault(alias, []).append(payload)
+        return AhoCorasick((pattern, tuple(payloads)) for pattern, payloads in entries.items())
+
+    @classmethod
+    def highlight(cls, chapter: Chapter) -> dict:
+        """
+        회차 본문에서 해당 회차까지 등장한 위키 항목(first_appearance <= 회차 번호)의 이름을 찾습니다.
+
+        Parameters:
+            chapter (Chapter): 대상 회차 (branch가 함께 로드되어 있어야 함, 본문은 지연 로딩 가능)
+
+        Returns:
+            dict: ``spans``(``paragraph``, ``start``, ``end``, ``wiki_id``) 목록과
+            등장한 위키 항목(``id``, ``name``) 목록 ``wikis``
+        """
+        branch = chapter.branch
+        version = (
+            branch.version
+            if branch.parent_branch_id is None
+            else BranchLineage.resolve(branch.id).stamp
+        )
+        automaton = cls.get_automaton(branch.id, version)
+        if not len(automaton):
+            return {"spans": [], "wikis": []}
+
+        html = Chapter.objects.values_list("content_html", flat=True).get(pk=chapter.pk)
+        offsets = chapter.paragraph_offsets or ChapterService.compute_paragraph_offsets(html)
+        bounds = [*offsets, len(html)]
+
+        chapter_number = chapter.chapter_number
+        spans = []
+        wikis: dict[int, str] = {}
+        for index in range(len(offsets)):
+            text = _TextParser.text_of(html[bounds[index] : bounds[index + 1]])
+
+            def visible(
+                start: int, end: int, payloads: tuple[WikiPayload, ...], text: str = text
+            ) -> bool:
+                if cls._appeared(payloads, chapter_number) is None:
+                    return False
+                return cls._on_word_boundary(text, start, end)
+
+            for start, end, payloads in automaton.find_longest(text, accept=visible):
+                wiki_id, name, _ = cls._appeared(payloads, chapter_number)
+                spans.append({"paragraph": index, "start": start, "end": end, "wiki_id": wiki_id})
+                wikis[wiki_id] = name
+        return {
+            "spans": spans,
+            "wikis": [{"id": wiki_id, "name": name} for wiki_id, name in wikis.items()],
+        }
+
+    @staticmethod
+    def _appeared(payloads: tuple[WikiPayload, ...], chapter_number: int) -> WikiPayload | None:
+        """The first entry under a name that has appeared by ``chapter_number``."""
+        for payload in payloads:
+            if payload[2] is None or payload[2] <= chapter_number:
+                return payload
+        return None
+
+    @staticmethod
+    def _on_word_boundary(text: str, start: int, end: int) -> bool:
+        """
+        Latin names must not be part of a longer word ("Ann" in "Annual").
+
+        Hangul names are not checked: particles attach directly to the name.
+        """
+
+        def is_latin_word(char: str) -> bool:
+            return char.isascii() and char.isalnum()
+
+        if is_latin_word(text[start]) and start > 0 and is_latin_word(text[start - 1]):
+            return False
+        if is_latin_word(text[end - 1]) and end < len(text) and is_latin_word(text[end]):
+            return False
+        return True
@@ -0,0 +1,310 @@
+"""
+ChapterImportService - Streaming bulk import of a novel's chapters into a branch.
+
+An archive is either a zip of markdown/text files (one chapter per file, in
+natural file name order, so ``2.md`` comes before ``10.md``) or a single markdown file where every ``# Title`` line starts a new
+chapter. Chapters are parsed as a stream and processed in batches: each batch is
+rendered in a process pool (markdown, paragraph offsets, word count) and written
+with one ``bulk_create`` in its own short transaction. Branch counters are updated
+once at the end, so memory and query count stay bounded by the batch size rather
+than the archive size, and the branch row is only locked while a batch is written.
+Zip archives are capped in member count and member size.
+
+Progress is kept in the cache under a job id and polled by the client.
+"""
+
+import io
+import multiprocessing
+import re
+import uuid
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import PurePosixPath
+from typing import IO, Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from apps.contents.models import Chapter, ChapterStatus
+from apps.contents.services import ChapterNavigationService, ChapterService
+from apps.novels.models import Branch
+
+TITLE_LINE = re.compile(r"^#\s+(.+?)\s*#*\s*$")
+DIGITS = re.compile(r"(\d+)")
+CHAPTER_FILE_SUFFIXES = (".md", ".markdown", ".txt")
+
+
+class ImportJobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+def _render(content: str) -> tuple[str, list[int], int]:
+    """Render one chapter body (runs in a worker process)."""
+    service = ChapterService()
+    content_html = service.convert_markdown(content)
+    return (
+        content_html,
+        service.compute_paragraph_offsets(content_html),
+        service.calculate_word_count(content),
+    )
+
+
+class ChapterImportService:
+    """Service for importing many chapters into a branch at once."""
+
+    BATCH_SIZE = 100
+    MAX_ZIP_MEMBERS = 10_000
+    MAX_CHAPTER_BYTES = 2 * 1024 * 1024  # uncompressed size of one zip member
+    JOB_KEY = "chapter_import:{job_id}"
+    JOB_TIMEOUT = 24 * 60 * 60  # 24 hours
+    UPLOAD_PATH = "imports/{job_id}{suffix}"
+
+    # ------------------------------------------------------------------
+    # Job bookkeeping
+    # ------------------------------------------------------------------
+
+    def start(self, branch: Branch, upload: IO[bytes], filename: str, publish: bool = False) -> str:
+        """
+        업로드된 아카이브를 저장하고 가져오기 작업을 큐에 등록합니다.
+
+        Parameters:
+            branch (Branch): 회차를 추가할 브랜치
+            upload (IO[bytes]): 업로드 파일 (zip 또는 단일 마크다운 파일)
+            filename (str): 원본 파일명 (형식 판별용)
+            publish (bool): True이면 가져온 회차를 즉시 발행 상태로 저장
+
+        Returns:
+            str: 진행 상황 조회에 사용할 작업 ID
+        """
+        from apps.contents.tasks import import_chapters
+
+        job_id = uuid.uuid4().hex
+        suffix = PurePosixPath(filename).suffix.lower()
+        path = default_storage.save(self.UPLOAD_PATH.format(job_id=job_id, suffix=suffix), upload)
+        self._set_job(job_id, branch_id=branch.id, status=ImportJobStatus.PENDING, imported=0)
+
+        transaction.on_commit(lambda: import_chapters.delay(job_id, branch.id, path, publish))
+        return job_id
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """가져오기 작업의 상태(`status`, `imported`, `error`, `branch_id`)를 반환합니다."""
+        return cache.get(self.JOB_KEY.format(job_id=job_id))
+
+    def _set_job(self, job_id: str, **fields: Any) -> None:
+        job = self.get_job(job_id) or {}
+        job.update(fields)
+        cache.set(self.JOB_KEY.format(job_id=job_id), job, self.JOB_TIMEOUT)
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    def run(self, job_id: str, branch_id: int, path: str, publish: bool = False) -> int:
+        """
+        저장된 아카이브를 스트리밍으로 읽어 회차를 일괄 생성합니다.
+
+        Returns:
+            int: 생성된 회차 수
+
+        Raises:
+            ValueError: 아카이브 형식이 올바르지 않을 때
+        """
+        self._set_job(job_id, status=ImportJobStatus.RUNNING)
+        try:
+            with default_storage.open(path, "rb") as archive:
+                imported = self.import_archive(
+                    branch_id,
+                    archive,
+                    path,
+                    publish=publish,
+                    on_progress=lambda n: self._set_job(job_id, imported=n),
+                )
+        except Exception as e:
+            self._set_job(job_id, status=ImportJobStatus.FAILED, error=str(e))
+            raise
+        finally:
+            default_storage.delete(path)
+
+        self._set_job(job_id, status=ImportJobStatus.DONE, imported=imported)
+        return imported
+
+    def import_archive(
+        self,
+        branch_id: int,
+        archive: IO[bytes],
+        filename: str,
+        publish: bool = False,
+        on_progress: Any = None,
+    ) -> int:
+        """
+        아카이브의 회차들을 브랜치의 마지막 회차 뒤에 순서대로 추가합니다.
+
+        Parameters:
+            branch_id (int): 대상 브랜치 ID
+            archive (IO[bytes]): 아카이브 바이너리 스트림
+            filename (str): 파일명 (확장자로 zip/단일 파일 판별)
+            publish (bool): True이면 발행 상태로 저장하고 브랜치 회차 수에 반영
+            on_progress (Callable[[int], None] | None): 배치마다 누적 생성 수로 호출
+
+        배치마다 별도 트랜잭션으로 저장하므로, 중간에 실패하면 앞서 저장된 배치는 남습니다.
+
+        Returns:
+            int: 생성된 회차 수
+        """
+        chapters = self.parse(archive, filename)
+        status = ChapterStatus.PUBLISHED if publish else ChapterStatus.DRAFT
+        published_at = timezone.now() if publish else None
+
+        imported = 0
+        try:
+            with self._executor() as executor:
+                while batch := list(islice(chapters, self.BATCH_SIZE)):
+                    rendered = list(executor.map(_render, [content for _, content in batch]))
+                    with transaction.atomic():
+                        next_number = self._reserve_numbers(branch_id)
+                        Chapter.objects.bulk_create(
+                            [
+                                Chapter(
+                                    branch_id=branch_id,
+                                    chapter_number=next_number + i,
+                                    title=title[:200],
+                                    content=content,
+                                    content_html=content_html,
+                                    paragraph_offsets=offsets,
+                                    word_count=word_count,
+                                    status=status,
+                                    published_at=published_at,
+                                )
+                                for i, (
+                                    (title, content),
+                                    (content_html, offsets, word_count),
+                                ) in enumerate(zip(batch, rendered, strict=True))
+                            ]
+                        )
+                    imported += len(batch)
+                    if on_progress is not None:
+                        on_progress(imported)
+        finally:
+            # Batches already written stay, so a failed import still counts them
+            if imported:
+                Branch.objects.filter(id=branch_id).update(
+                    chapter_count=F("chapter_count") + (imported if publish else 0),
+                    version=F("version") + 1,
+                    updated_at=timezone.now(),
+                )
+                ChapterNavigationService.invalidate(branch_id)
+
+        return imported
+
+    @staticmethod
+    def _reserve_numbers(branch_id: int) -> int:
+        """
+        First free chapter number of the branch; call inside the batch's transaction.
+
+        The branch row stays locked until the batch commits, so concurrent imports
+        cannot take the same numbers. Chapters created between batches simply land
+        between them.
+        """
+        Branch.objects.select_for_update().filter(id=branch_id).exists()
+        last = Chapter.objects.filter(branch_id=branch_id).aggregate(last=Max("chapter_number"))
+        return (last["last"] or 0) + 1
+
+    @staticmethod
+    @contextmanager
+    def _executor() -> Iterator[Executor]:
+        """Process pool for rendering; inline inside daemonic (e.g. Celery prefork) workers."""
+        workers = settings.CHAPTER_IMPORT_WORKERS
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            yield _InlineExecutor()
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield executor
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def parse(self, archive: IO[bytes], filename: str) -> Iterator[tuple[str, str]]:
+        """
+        아카이브에서 (제목, 본문) 쌍을 순서대로 하나씩 생성합니다.
+
+        Raises:
+            ValueError: zip 파일이 손상되었거나 너무 크거나 지원하지 않는 형식일 때
+        """
+        if filename.lower().endswith(".zip"):
+            return self._parse_zip(archive)
+        if filename.lower().endswith(CHAPTER_FILE_SUFFIXES):
+            return self._parse_delimited(io.TextIOWrapper(archive, encoding="utf-8"))
+        raise ValueError("zip 또는 마크다운(.md, .txt) 파일만 가져올 수 있습니다.")
+
+    @classmethod
+    def _parse_zip(cls, archive: IO[bytes]) -> Iterator[tuple[str, str]]:
+        try:
+            bundle = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile as e:
+            raise ValueError("올바른 zip 파일이 아닙니다.") from e
+
+        members = bundle.infolist()
+        if len(members) > cls.MAX_ZIP_MEMBERS:
+            raise ValueError(
+                f"zip 파일에는 최대 {cls.MAX_ZIP_MEMBERS}개의 파일만 넣을 수 있습니다."
+            )
+        members = sorted(
+            (
+                info
+                for info in members
+                if not info.is_dir()
+                and info.filename.lower().endswith(CHAPTER_FILE_SUFFIXES)
+                and not PurePosixPath(info.filename).name.startswith(".")
+            ),
+            key=lambda info: _natural_key(info.filename),
+        )
+        # Checked before anything is written; zipfile never inflates past the declared size
+        for info in members:
+            if info.file_size > cls.MAX_CHAPTER_BYTES:
+                raise ValueError(f"{info.filename}: 회차 파일이 너무 큽니다.")
+        for info in members:
+            name = info.filename
+            text = bundle.read(info).decode("utf-8")
+            lines = text.splitlines()
+            if lines and (match := TITLE_LINE.match(lines[0])):
+                yield match.group(1), "\n".join(lines[1:]).strip()
+            else:
+                yield PurePosixPath(name).stem, text.strip()
+
+    @staticmethod
+    def _parse_delimited(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+        title = None
+        body: list[str] = []
+        for line in lines:
+            if match := TITLE_LINE.match(line):
+                if title is not None:
+                    yield title, "".join(body).strip()
+                title, body = match.group(1), []
+            elif title is not None:
+                body.append(line)
+        if title is not None:
+            yield title, "".join(body).strip()
+
+
+def _natural_key(name: str) -> tuple[Any, ...]:
+    """Sort key comparing digit runs as numbers ("ch2.md" before "ch10.md")."""
+    # re.split with a group alternates text and digits, so positions never mix types
+    return tuple(int(part) if index % 2 else part for index, part in enumerate(DIGITS.split(name)))
+
+
+class _InlineExecutor:
+    """Executor stand-in that renders in the current process."""
+
+    def map(self, fn: Any, items: Iterable[Any]) -> Iterator[Any]:
+        return map(fn, items)
@@ -0,0 +1,55 @@
+"""
+Django management command for delta-encoding existing wiki snapshot histories.
+
+Snapshots created before delta encoding (or copied in bulk) are stored as full
+keyframes. This re-encodes each wiki entry's history into keyframes and deltas
+(see WikiSnapshotHistory); the decoded text of every snapshot is unchanged.
+
+Usage:
+    poetry run python manage.py compact_wiki_history [--branch=ID] [--min-snapshots=N]
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from apps.contents.models import WikiEntry
+from apps.contents.wiki_history import WikiSnapshotHistory
+
+
+class Command(BaseCommand):
+    help = "Delta-encode wiki snapshot histories."
+
+    def add_arguments(self, parser: Any) -> None:
+        """Add command-line arguments."""
+        parser.add_argument(
+            "--branch",
+            type=int,
+            default=None,
+            help="Only compact wiki entries of this branch",
+        )
+        parser.add_argument(
+            "--min-snapshots",
+            type=int,
+            default=2,
+            help="Skip entries with fewer snapshots (default: 2)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Handle command execution."""
+        entries = WikiEntry.objects.annotate(snapshot_count=Count("snapshots")).filter(
+            snapshot_count__gte=options["min_snapshots"]
+        )
+        if options["branch"] is not None:
+            entries = entries.filter(branch_id=options["branch"])
+
+        compacted = 0
+        deltas = 0
+        for wiki_id in entries.values_list("id", flat=True).iterator():
+            deltas += WikiSnapshotHistory.compact(wiki_id)
+            compacted += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Compacted {compacted} wiki entries ({deltas} delta snapshots).")
+        )
@@ -0,0 +1,336 @@
+"""
+Geometry helpers for map objects.
+
+``MapObject.coordinates`` is free-form JSON. The shapes in use are points as
+``{"x": .., "y": ..}``, ``{"lat": .., "lng": ..}`` or ``[lat, lng]`` (the
+client uses Leaflet's simple CRS, so ``lat`` is y and ``lng`` is x), lines and
+polygons as lists of points (polygons may nest rings), and circles as
+``{"center": point, "radius": r}`` or a point object with a ``radius``.
+Anything else has no known extent. GeoJSON geometries are converted to these
+shapes by ``from_geojson``.
+
+The tile helpers work on NumPy arrays of ``(x, y)`` rows: Douglas–Peucker
+simplification, clipping to a tile (with buffer), and a compact text encoding
+of quantized coordinates (zigzag delta varints in base64).
+"""
+
+import base64
+import math
+from collections.abc import Iterator
+from itertools import accumulate
+from typing import Any
+
+import numpy as np
+
+# (min_x, min_y, max_x, max_y)
+BBox = tuple[float, float, float, float]
+
+BBOX_FIELDS = ("min_x", "min_y", "max_x", "max_y")
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    return float(value) if math.isfinite(value) else None
+
+
+def as_point(value: Any) -> tuple[float, float] | None:
+    """``(x, y)`` of a single point, or None if ``value`` is not a point."""
+    if isinstance(value, dict):
+        x, y = _number(value.get("x")), _number(value.get("y"))
+        if x is None or y is None:
+            x, y = _number(value.get("lng")), _number(value.get("lat"))
+    elif isinstance(value, list | tuple) and len(value) == 2:
+        y, x = _number(value[0]), _number(value[1])
+    else:
+        return None
+    return None if x is None or y is None else (x, y)
+
+
+def points(coordinates: Any) -> Iterator[tuple[float, float]]:
+    """Every point of a point, (nested) point list or circle center."""
+    point = as_point(coordinates)
+    if point is not None:
+        yield point
+    elif isinstance(coordinates, list):
+        for item in coordinates:
+            yield from points(item)
+    elif isinstance(coordinates, dict) and "center" in coordinates:
+        yield from points(coordinates["center"])
+
+
+def radius(coordinates: Any) -> float | None:
+    """Radius of a circle, or None if the coordinates have none."""
+    value = _number(coordinates.get("radius")) if isinstance(coordinates, dict) else None
+    return abs(value) if value is not None else None
+
+
+def bounding_box(coordinates: Any) -> BBox | None:
+    """Axis-aligned bounding box of the coordinates, or None if they have no points."""
+    xs: list[float] = []
+    ys: list[float] = []
+    for x, y in points(coordinates):
+        xs.append(x)
+        ys.append(y)
+    if not xs:
+        return None
+
+    pad = radius(coordinates) or 0.0
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+def bbox_fields(coordinates: Any) -> dict[str, float | None]:
+    """``MapObject`` bounding-box column values for the coordinates (all None if unknown)."""
+    bbox = bounding_box(coordinates)
+    return dict(zip(BBOX_FIELDS, bbox or (None,) * 4, strict=True))
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    ``"x1,y1,x2,y2"`` query parameter as a normalized bounding box.
+
+    Raises:
+        ValueError: If it is not four finite numbers.
+    """
+    message = "bbox는 x1,y1,x2,y2 형식의 숫자여야 합니다."
+    try:
+        x1, y1, x2, y2 = (float(part) for part in value.split(","))
+    except ValueError as e:
+        raise ValueError(message) from e
+    if not all(math.isfinite(n) for n in (x1, y1, x2, y2)):
+        raise ValueError(message)
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+
+def _position(value: Any) -> list[float]:
+    """GeoJSON position ``[x, y, ...]`` as a ``[lat, lng]`` pair (altitude dropped)."""
+    if not isinstance(value, list) or len(value) < 2:
+        raise ValueError("좌표는 [x, y] 숫자 배열이어야 합니다.")
+    x, y = _number(value[0]), _number(value[1])
+    if x is None or y is None:
+        raise ValueError("좌표는 [x, y] 숫자 배열이어야 합니다.")
+    return [y, x]
+
+
+def _line(value: Any, min_points: int = 2) -> list[list[float]]:
+    if not isinstance(value, list) or len(value) < min_points:
+        raise ValueError(f"선과 고리는 점이 {min_points}개 이상이어야 합니다.")
+    return [_position(item) for item in value]
+
+
+def _rings(value: Any) -> list[list[list[float]]]:
+    """Rings of a GeoJSON polygon, without the repeated closing point."""
+    if not isinstance(value, list) or not value:
+        raise ValueError("다각형에는 고리가 하나 이상 있어야 합니다.")
+    rings = []
+    for item in value:
+        ring = _line(item, 4)
+        if ring[0] != ring[-1]:
+            raise ValueError("다각형 고리는 첫 점과 끝 점이 같아야 합니다.")
+        rings.append(ring[:-1])
+    return rings
+
+
+def _runs(value: Any) -> list:
+    if not isinstance(value, list) or not value:
+        raise ValueError("좌표 배열이 비어 있습니다.")
+    return value
+
+
+def from_geojson(geometry: Any) -> Any:
+    """
+    ``MapObject.coordinates`` of a GeoJSON geometry.
+
+    Points become ``{"x": .., "y": ..}`` and lines/rings lists of ``[lat, lng]``
+    points; multi-part lines and polygons (and polygons with holes) become
+    nested lists, one run per line or ring. MultiPoint and
+    GeometryCollection have no counterpart and are rejected.
+
+    Raises:
+        ValueError: If the geometry is missing, malformed or of another type.
+    """
+    if not isinstance(geometry, dict):
+        raise ValueError("geometry 객체가 필요합니다.")
+    kind, value = geometry.get("type"), geometry.get("coordinates")
+    if kind == "Point":
+        y, x = _position(value)
+        return {"x": x, "y": y}
+    if kind == "LineString":
+        return _line(value)
+    if kind == "MultiLineString":
+        runs = [_line(item) for item in _runs(value)]
+    elif kind == "Polygon":
+        runs = _rings(value)
+    elif kind == "MultiPolygon":
+        runs = [ring for polygon in _runs(value) for ring in _rings(polygon)]
+    else:
+        raise ValueError(f"지원하지 않는 geometry 타입입니다: {kind}")
+    return runs[0] if len(runs) == 1 else runs
+
+
+def parts(coordinates: Any) -> list[np.ndarray]:
+    """
+    Point runs of the coordinates as ``(n, 2)`` float arrays.
+
+    A point or circle is one single-point run, a line one run, and a polygon
+    one run per ring.
+    """
+    point = as_point(coordinates)
+    if point is not None:
+        return [np.array([point], dtype=float)]
+    if isinstance(coordinates, dict) and "center" in coordinates:
+        return parts(coordinates["center"])
+    if not isinstance(coordinates, list):
+        return []
+
+    runs: list[np.ndarray] = []
+    run: list[tuple[float, float]] = []
+    for item in coordinates:
+        point = as_point(item)
+        if point is not None:
+            run.append(point)
+            continue
+        if run:
+            runs.append(np.array(run, dtype=float))
+            run = []
+        runs.extend(parts(item))
+    if run:
+        runs.append(np.array(run, dtype=float))
+    return runs
+
+
+def simplify(line: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas–Peucker simplification of a point run.
+
+    Distances of all points between the ends of a span are computed at once;
+    the span is split at the farthest point while that is beyond ``tolerance``.
+    The first and last points are always kept.
+    """
+    n = len(line)
+    if n < 3 or tolerance <= 0:
+        return line
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    spans = [(0, n - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        start = line[first]
+        dx, dy = line[last] - start
+        offsets = line[first + 1 : last] - start
+        length = math.hypot(dx, dy)
+        if length:
+            distances = np.abs(dx * offsets[:, 1] - dy * offsets[:, 0]) / length
+        else:
+            # Closed ring: distance from the shared end point
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = first + 1 + i
+            keep[split] = True
+            spans += [(first, split), (split, last)]
+    return line[keep]
+
+
+def clip_polygon(ring: np.ndarray, bbox: BBox) -> np.ndarray:
+    """
+    Sutherland–Hodgman clip of a ring to ``bbox`` (one edge of the box at a time).
+
+    Returns the clipped ring (empty if it lies outside the box).
+    """
+    for axis, bound, is_min in (
+        (0, bbox[0], True),
+        (1, bbox[1], True),
+        (0, bbox[2], False),
+        (1, bbox[3], False),
+    ):
+        if not len(ring):
+            break
+        following = np.roll(ring, -1, axis=0)
+        inside = ring[:, axis] >= bound if is_min else ring[:, axis] <= bound
+        next_inside = np.roll(inside, -1)
+
+        # Each edge (p, q) emits [crossing if it crosses the bound] + [q if q is inside]
+        delta = following[:, axis] - ring[:, axis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(delta != 0, (bound - ring[:, axis]) / delta, 0.0)
+        crossing = ring + t[:, None] * (following - ring)
+        emitted = np.stack([crossing, following], axis=1).reshape(-1, 2)
+        mask = np.stack([inside != next_inside, next_inside], axis=1).reshape(-1)
+        ring = emitted[mask]
+    return ring
+
+
+def clip_line(line: np.ndarray, bbox: BBox) -> list[np.ndarray]:
+    """
+    Pieces of a line whose segments meet ``bbox``.
+
+    Segments are kept whole rather than cut at the box edge; the tile buffer
+    hides the overshoot.
+    """
+    if len(line) < 2:
+        inside = (
+            (line[:, 0] >= bbox[0])
+            & (line[:, 1] >= bbox[1])
+            & (line[:, 0] <= bbox[2])
+            & (line[:, 1] <= bbox[3])
+        )
+        return [line] if inside.all() else []
+
+    start, end = line[:-1], line[1:]
+    meets = (
+        (np.maximum(start[:, 0], end[:, 0]) >= bbox[0])
+        & (np.maximum(start[:, 1], end[:, 1]) >= bbox[1])
+        & (np.minimum(start[:, 0], end[:, 0]) <= bbox[2])
+        & (np.minimum(start[:, 1], end[:, 1]) <= bbox[3])
+    )
+    # Runs of consecutive kept segments, as [first point, last point + 1) ranges
+    edges = np.diff(np.concatenate([[0], meets.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1) + 1
+    return [line[a:b] for a, b in zip(starts, stops, strict=True)]
+
+
+def encode_points(runs: list[np.ndarray]) -> str:
+    """
+    Integer point runs as base64 of zigzag varints of ``x, y`` deltas.
+
+    Deltas continue from one run to the next; the run lengths are sent
+    separately. See ``decode_points``.
+    """
+    if not runs:
+        return ""
+    flat = np.concatenate(runs).astype(np.int64)
+    deltas = np.diff(flat, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).reshape(-1)
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+
+    data = bytearray()
+    for value in zigzag.tolist():
+        while value >= 0x80:
+            data.append((value & 0x7F) | 0x80)
+            value >>= 7
+        data.append(value)
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def decode_points(encoded: str, lengths: list[int]) -> list[list[list[int]]]:
+    """Inverse of ``encode_points``: point runs of ``[x, y]`` integer pairs."""
+    values: list[int] = []
+    value = shift = 0
+    for byte in base64.b64decode(encoded):
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append((value >> 1) ^ -(value & 1))
+            value = shift = 0
+
+    x = y = 0
+    flat = []
+    for dx, dy in zip(values[::2], values[1::2], strict=True):
+        x, y = x + dx, y + dy
+        flat.append([x, y])
+    ends = list(accumulate(lengths))
+    return [flat[end - length : end] for end, length in zip(ends, lengths, strict=True)]
@@ -0,0 +1,409 @@
+"""
+MapSnapshotHistory - Keyframe/delta storage of map snapshots and timeline scrubbing.
+
+From one chapter to the next a map usually changes a handful of objects (an
+army marker moves, a city falls). A snapshot that continues the previous one
+(``MapService.create_snapshot(copy_previous=True)``) is stored as a delta
+against the nearest keyframe: its own layer rows (few, so always complete)
+and only the objects that differ from the keyframe - added rows, modified
+copies and removal markers (``is_removed``), matched to keyframe objects by
+``key``. As with wiki history, every delta depends on a single keyframe, so
+reading never walks a chain; a new snapshot is written as a keyframe (a full
+copy) once its keyframe already has KEYFRAME_INTERVAL deltas or the changes
+carried since it reach MAX_DELTA_RATIO of its objects.
+
+A keyframe with deltas is frozen for them: before one of its objects is
+changed or removed, ``preserve`` writes the current row into every delta
+that still inherits it, and an object added to it is masked in those deltas
+with a removal marker. Editing an earlier chapter therefore never changes
+later ones, however they happen to be stored.
+
+``materialize`` resolves the effective layers and objects of snapshots into
+their prefetch caches, so services and serializers read full snapshots
+however they are stored. ``scrub`` returns the state at the start of a
+chapter range and, for each later snapshot in it, what changed from the one
+before.
+"""
+
+import builtins
+from collections import defaultdict
+from typing import Any
+
+from django.db.models import BigIntegerField, F, Q, QuerySet
+from django.db.models.functions import Coalesce
+
+from apps.contents.map_geometry import BBOX_FIELDS
+from apps.contents.models import MapLayer, MapObject, MapSnapshot
+
+# Compared to find changed layers and objects between snapshots
+LAYER_FIELDS = ("name", "layer_type", "z_index", "is_visible", "style_json")
+OBJECT_FIELDS = (
+    "object_type",
+    "coordinates",
+    "label",
+    "description",
+    "wiki_entry_id",
+    "style_json",
+)
+
+
+class MapSnapshotHistory:
+    """Keyframe/delta encoding of map snapshots."""
+
+    KEYFRAME_INTERVAL = 8
+    # Start a new keyframe once the carried changes reach this fraction of the keyframe's objects
+    MAX_DELTA_RATIO = 0.5
+
+    @classmethod
+    def continue_from(cls, previous: MapSnapshot, snapshot: MapSnapshot) -> None:
+        """
+        새 스냅샷(레이어 없음)을 앞선 스냅샷의 상태로 채웁니다.
+
+        앞선 스냅샷의 키프레임에 델타를 더 붙일 수 있으면 레이어와 그 키프레임에서 바뀐 오브젝트만
+        복사하고(델타), 아니면 현재 상태 전체를 복사합니다(새 키프레임). 어느 쪽이든 레이어와
+        오브젝트의 ``key``는 그대로 이어집니다.
+        """
+        keyframe_id = previous.base_id or previous.id
+        carried = (
+            MapObject.objects.filter(layer__snapshot_id=previous.id).count()
+            if previous.base_id
+            else 0
+        )
+        as_delta = (
+            MapSnapshot.objects.filter(base_id=keyframe_id).count() < cls.KEYFRAME_INTERVAL
+            and carried
+            <= MapObject.objects.filter(layer__snapshot_id=keyframe_id).count()
+            * cls.MAX_DELTA_RATIO
+        )
+
+        layers = builtins.list(MapLayer.objects.filter(snapshot_id=previous.id).order_by("id"))
+        if as_delta:
+            snapshot.base_id = keyframe_id
+            snapshot.save(update_fields=["base"])
+            # The previous snapshot's own changes (none if it is the keyframe)
+            objects = (
+                builtins.list(
+                    MapObject.objects.filter(layer__snapshot_id=previous.id).order_by("id")
+                )
+                if previous.base_id
+                else []
+            )
+        else:
+            cls.materialize([previous])
+            objects = [obj for layer in previous.layers.all() for obj in layer.map_objects.all()]
+
+        new_layers = MapLayer.objects.bulk_create(
+            [
+                MapLayer(
+                    snapshot=snapshot,
+                    key=layer.identity,
+                    **{name: getattr(layer, name) for name in LAYER_FIELDS},
+                )
+                for layer in layers
+            ]
+        )
+        layer_mapping = {
+            old.identity: new.id for old, new in zip(layers, new_layers, strict=True)
+        }  # layer key -> new layer id
+        layer_keys = {layer.id: layer.identity for layer in layers}
+        if not as_delta:
+            # Objects inherited from the keyframe hang off the keyframe's layers
+            layer_keys.update(
+                MapLayer.objects.filter(snapshot_id=keyframe_id).values_list(
+                    "id", Coalesce("key", "id", output_field=BigIntegerField())
+                )
+            )
+        MapObject.objects.bulk_create(
+            [
+                cls.copy_object(obj, layer_mapping[layer_keys[obj.layer_id]])
+                for obj in objects
+                if layer_keys.get(obj.layer_id) in layer_mapping
+            ]
+        )
+
+    @staticmethod
+    def copy_object(obj: MapObject, layer_id: int) -> MapObject:
+        """Unsaved copy of an object in another layer, keeping its key and removal mark."""
+        return MapObject(
+            layer_id=layer_id,
+            key=obj.identity,
+            is_removed=obj.is_removed,
+            **{name: getattr(obj, name) for name in (*OBJECT_FIELDS, *BBOX_FIELDS)},
+        )
+
+    @classmethod
+    def override(cls, obj: MapObject, snapshot_id: int) -> MapObject:
+        """
+        델타 스냅샷이 키프레임에서 물려받은 오브젝트를 그 스냅샷에서만 바꿀 행을 반환합니다.
+
+        이미 바꾼 행이 있으면 그 행을, 없으면 저장되지 않은 복사본을 돌려줍니다. 키프레임과 다른
+        스냅샷은 그대로입니다.
+
+        Raises:
+            ValueError: 스냅샷이 이 오브젝트를 물려받는 델타가 아닐 때
+        """
+        layer = (
+            MapLayer.objects.select_related("snapshot__map")
+            .filter(snapshot_id=snapshot_id, snapshot__base_id=obj.layer.snapshot_id)
+            .filter(Q(key=obj.layer.identity) | Q(key__isnull=True, id=obj.layer.identity))
+            .first()
+        )
+        if layer is None:
+            raise ValueError("이 스냅샷에서 볼 수 없는 오브젝트입니다.")
+
+        existing = MapObject.objects.filter(
+            layer__snapshot_id=snapshot_id, key=obj.identity
+        ).first()
+        if existing is not None:
+            existing.is_removed = False
+            return existing
+        copy = cls.copy_object(obj, layer.id)
+        copy.layer = layer
+        return copy
+
+    @classmethod
+    def preserve(
+        cls, layer: MapLayer, objects: builtins.list[MapObject], added: bool = False
+    ) -> None:
+        """
+        키프레임 레이어의 오브젝트가 바뀌기 전에, 그 오브젝트를 물려받는 델타마다 현재 행을 복사해 둡니다.
+
+        ``added``이면 방금 추가한 오브젝트이므로 델타에는 삭제 표시로 넣어 보이지 않게 합니다.
+        이미 그 오브젝트를 바꾼(또는 지운) 델타는 그대로 둡니다. 델타가 아닌 스냅샷에서만
+        의미가 있고, 델타가 없으면 쿼리 한 번으로 끝납니다.
+
+        Parameters:
+            layer (MapLayer): 오브젝트들의 레이어 (``snapshot`` 로드됨)
+            objects (list[MapObject]): 바뀌기 직전 상태의 오브젝트 (모두 ``layer``의 행)
+            added (bool): 새로 추가된 오브젝트인지 여부
+        """
+        if layer.snapshot.base_id is not None or not objects:
+            return
+        delta_layers = builtins.list(
+            MapLayer.objects.filter(snapshot__base_id=layer.snapshot_id)
+            .filter(Q(key=layer.identity) | Q(key__isnull=True, id=layer.identity))
+            .values_list("id", flat=True)
+        )
+        if not delta_layers:
+            return
+
+        overridden = set(
+            MapObject.objects.filter(
+                layer_id__in=delta_layers,
+                key__in=[obj.identity for obj in objects],
+            ).values_list("layer_id", "key")
+        )
+        copies = []
+        for layer_id in delta_layers:
+            for obj in objects:
+                if (layer_id, obj.identity) not in overridden:
+                    copy = cls.copy_object(obj, layer_id)
+                    copy.is_removed = added or obj.is_removed
+                    copies.append(copy)
+        MapObject.objects.bulk_create(copies)
+
+    @classmethod
+    def materialize(
+        cls,
+        snapshots: builtins.list[MapSnapshot],
+        objects: Q | None = None,
+        visible_only: bool = False,
+    ) -> None:
+        """
+        스냅샷들의 실제 레이어와 오브젝트를 ``layers``/``map_objects`` 프리페치 캐시에 채웁니다.
+
+        쿼리 수는 스냅샷 수와 무관합니다 (레이어 1번, 오브젝트 1번, ``objects``가 있으면
+        델타의 변경 목록 1번).
+
+        Parameters:
+            snapshots (list[MapSnapshot]): 대상 스냅샷
+            objects (Q | None): 오브젝트 조건 (예: 뷰포트 경계 상자). 델타가 바꾼 키프레임
+                오브젝트는 조건과 관계없이 가려집니다.
+            visible_only (bool): 표시 중인 레이어만
+        """
+        if not snapshots:
+            return
+
+        ids = {snapshot.id for snapshot in snapshots}
+        delta_ids = {snapshot.id for snapshot in snapshots if snapshot.base_id}
+        base_ids = {snapshot.base_id for snapshot in snapshots if snapshot.base_id}
+
+        layers = MapLayer.objects.filter(snapshot_id__in=ids)
+        if visible_only:
+            layers = layers.filter(is_visible=True)
+        layers_by_snapshot: dict[int, builtins.list[MapLayer]] = defaultdict(builtins.list)
+        for layer in layers:
+            layers_by_snapshot[layer.snapshot_id].append(layer)
+
+        rows = MapObject.objects.filter(layer__snapshot_id__in=ids | base_ids).annotate(
+            snapshot_ref=F("layer__snapshot_id"),
+            layer_key=Coalesce("layer__key", "layer_id", output_field=BigIntegerField()),
+        )
+        if objects is not None:
+            rows = rows.filter(objects)
+        by_snapshot: dict[int, builtins.list[MapObject]] = defaultdict(builtins.list)
+        for obj in rows:
+            by_snapshot[obj.snapshot_ref].append(obj)
+
+        # Keyframe objects a delta has changed or removed
+        overridden: dict[int, set[int]] = defaultdict(set)
+        if objects is None:
+            for snapshot_id in delta_ids:
+                overridden[snapshot_id] = {obj.identity for obj in by_snapshot[snapshot_id]}
+        elif delta_ids:
+            changed = MapObject.objects.filter(layer__snapshot_id__in=delta_ids).values_list(
+                "layer__snapshot_id", Coalesce("key", "id", output_field=BigIntegerField())
+            )
+            for snapshot_id, identity in changed:
+                overridden[snapshot_id].add(identity)
+
+        for snapshot in snapshots:
+            own_layers = layers_by_snapshot[snapshot.id]
+            by_layer: dict[int, builtins.list[MapObject]] = {layer.id: [] for layer in own_layers}
+            for obj in by_snapshot[snapshot.id]:
+                if not obj.is_removed and obj.layer_id in by_layer:
+                    by_layer[obj.layer_id].append(obj)
+            if snapshot.base_id:
+                layer_ids = {layer.identity: layer.id for layer in own_layers}
+                hidden = overridden[snapshot.id]
+                for obj in by_snapshot[snapshot.base_id]:
+                    layer_id = layer_ids.get(obj.layer_key)
+                    if layer_id is not None and obj.identity not in hidden:
+                        by_layer[layer_id].append(obj)
+
+            for layer in own_layers:
+                rows = sorted(by_layer[layer.id], key=lambda obj: obj.identity)
+                layer._prefetched_objects_cache = {
+                    "map_objects": cls._prefetched(
+                        MapObject.objects.filter(id__in=[obj.id for obj in rows]), rows
+                    )
+                }
+            if not hasattr(snapshot, "_prefetched_objects_cache"):
+                snapshot._prefetched_objects_cache = {}
+            snapshot._prefetched_objects_cache["layers"] = cls._prefetched(
+                MapLayer.objects.filter(id__in=[layer.id for layer in own_layers]), own_layers
+            )
+
+    @staticmethod
+    def _prefetched(queryset: QuerySet, rows: builtins.list) -> QuerySet:
+        # Same shape as a prefetch_related() cache: iterating reads ``rows``, and a further
+        # filter() re-queries the same rows. Note: _result_cache/_prefetch_done are Django
+        # internals (see MapService.add_layer for the same trade-off).
+        queryset._result_cache = rows
+        queryset._prefetch_done = True
+        return queryset
+
+    @classmethod
+    def scrub(
+        cls, map_id: int, from_chapter: int, to_chapter: int, cap: int | None = None
+    ) -> dict[str, Any]:
+        """
+        회차 구간의 지도 변화를 키프레임 하나와 변경분 목록으로 반환합니다.
+
+        ``keyframe``은 ``from_chapter`` 시점의 전체 상태(그 시점 스냅샷이 없으면 None)이고,
+        ``deltas``는 구간 안에서 시작하는 스냅샷마다 바로 앞 상태에서 바뀐 레이어/오브젝트와
+        사라진 레이어/오브젝트의 ``key`` 목록입니다. 스냅샷 수와 관계없이 쿼리 3번으로 만듭니다.
+
+        Parameters:
+            map_id (int): 지도 ID
+            from_chapter (int): 구간 시작 회차
+            to_chapter (int): 구간 끝 회차
+            cap (int | None): 볼 수 있는 마지막 회차 (포크가 물려받은 지도는 분기 회차).
+                그 뒤에 시작하는 스냅샷은 넣지 않습니다.
+
+        Returns:
+            dict: ``map_id``, ``from_chapter``, ``to_chapter``, ``keyframe``, ``deltas``
+        """
+        last = to_chapter if cap is None else min(to_chapter, cap)
+        snapshots = builtins.list(
+            MapSnapshot.objects.filter(map_id=map_id, valid_from_chapter__lte=last).order_by(
+                "valid_from_chapter"
+            )
+        )
+        before = [s for s in snapshots if s.valid_from_chapter <= from_chapter]
+        in_range = [s for s in snapshots if s.valid_from_chapter > from_chapter]
+        start = before[-1] if before else None
+        cls.materialize([start, *in_range] if start else in_range)
+
+        state: tuple[dict, dict] = ({}, {})
+        keyframe = None
+        if start is not None:
+            state = cls._state(start)
+            keyframe = {
+                **cls._snapshot_fields(start),
+                "layers": [
+                    {
+                        **cls._layer_fields(layer),
+                        "objects": [
+                            cls._object_fields(obj, layer.identity)
+                            for obj in layer.map_objects.all()
+                        ],
+                    }
+                    for layer in start.layers.all()
+                ],
+            }
+
+        deltas = []
+        for snapshot in in_range:
+            new_state = cls._state(snapshot)
+            deltas.append({**cls._snapshot_fields(snapshot), **cls._diff(state, new_state)})
+            state = new_state
+
+        return {
+            "map_id": map_id,
+            "from_chapter": from_chapter,
+            "to_chapter": to_chapter,
+            "keyframe": keyframe,
+            "deltas": deltas,
+        }
+
+    @classmethod
+    def _state(cls, snapshot: MapSnapshot) -> tuple[dict[int, dict], dict[int, dict]]:
+        """(layer key -> fields, object key -> fields) of a materialized snapshot."""
+        layers = {}
+        objects = {}
+        for layer in snapshot.layers.all():
+            layers[layer.identity] = cls._layer_fields(layer)
+            for obj in layer.map_objects.all():
+                objects[obj.identity] = cls._object_fields(obj, layer.identity)
+        return layers, objects
+
+    @staticmethod
+    def _diff(old: tuple[dict, dict], new: tuple[dict, dict]) -> dict[str, Any]:
+        changes: dict[str, Any] = {}
+        for name, old_rows, new_rows in (
+            ("layers", old[0], new[0]),
+            ("objects", old[1], new[1]),
+        ):
+            changes[name] = [
+                row
+                for key, row in new_rows.items()
+                if {**old_rows.get(key, {}), "id": None} != {**row, "id": None}
+            ]
+            changes[f"removed_{name}"] = [key for key in old_rows if key not in new_rows]
+        return changes
+
+    @staticmethod
+    def _snapshot_fields(snapshot: MapSnapshot) -> dict[str, Any]:
+        return {
+            "snapshot_id": snapshot.id,
+            "valid_from_chapter": snapshot.valid_from_chapter,
+            "base_image_url": snapshot.base_image_url,
+        }
+
+    @staticmethod
+    def _layer_fields(layer: MapLayer) -> dict[str, Any]:
+        return {
+            "id": layer.id,
+            "key": layer.identity,
+            **{name: getattr(layer, name) for name in LAYER_FIELDS},
+        }
+
+    @staticmethod
+    def _object_fields(obj: MapObject, layer_key: int) -> dict[str, Any]:
+        return {
+            "id": obj.id,
+            "key": obj.identity,
+            "layer_key": layer_key,
+            **{name: getattr(obj, name) for name in OBJECT_FIELDS},
+        }
@@ -0,0 +1,357 @@
+"""
+MapImportService - Bulk upsert of a map layer's objects from GeoJSON.
+
+An author uploads a FeatureCollection for one layer instead of creating its
+objects one request at a time. The file is read as a stream: ``iter_features``
+decodes one feature at a time, so memory is bounded by the largest feature
+plus what is kept per valid feature, not by the size of the file. Each feature
+is validated and converted as it arrives (``map_geometry.from_geojson``);
+wiki links of all features are then checked with one ``IN`` query and
+existing objects matched with one lookup. Features with an integer ``id``
+update the layer's object with that ``key`` (in a delta snapshot, an
+inherited object gets an override row), the others are created. Everything is
+written with ``bulk_create``/``bulk_update`` in one transaction.
+
+Any invalid feature rejects the whole upload: ``FeatureImportError`` reports
+the problems of every feature by its index, and nothing is written.
+"""
+
+import codecs
+import json
+import math
+from collections.abc import Iterator
+from typing import IO, Any
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.contents.map_geometry import BBOX_FIELDS, bbox_fields, from_geojson
+from apps.contents.map_history import MapSnapshotHistory
+from apps.contents.map_services import MapService
+from apps.contents.models import MapLayer, MapObject, ObjectType, WikiEntry
+from apps.users.models import User
+
+# Object types each GeoJSON geometry may be stored as (the first is the default)
+GEOMETRY_OBJECT_TYPES = {
+    "Point": (ObjectType.POINT, ObjectType.ICON, ObjectType.CIRCLE),
+    "LineString": (ObjectType.LINE,),
+    "MultiLineString": (ObjectType.LINE,),
+    "Polygon": (ObjectType.POLYGON,),
+    "MultiPolygon": (ObjectType.POLYGON,),
+}
+OBJECT_FIELDS = (
+    "object_type",
+    "coordinates",
+    "label",
+    "description",
+    "wiki_entry_id",
+    "style_json",
+)
+
+
+class FeatureImportError(ValueError):
+    """Invalid features of an upload: ``errors`` maps feature index to field errors."""
+
+    def __init__(self, errors: dict[str, dict[str, list[str]]]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)}개 피처에 오류가 있습니다.")
+
+
+class _JSONStream:
+    """Reads JSON tokens and values from a UTF-8 byte stream, a chunk at a time."""
+
+    def __init__(self, stream: IO[bytes], chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False at the end of the stream."""
+        if self._eof:
+            return False
+        # Read at least as much as is pending, so a long value is re-decoded O(log n) times
+        chunk = self._stream.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk, final=self._eof)
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\n\r":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def accept(self, char: str) -> bool:
+        """Consume ``char`` if it comes next."""
+        if self.peek() != char:
+            return False
+        self._pos += 1
+        return True
+
+    def expect(self, char: str) -> None:
+        if not self.accept(char):
+            raise ValueError("올바른 GeoJSON 파일이 아닙니다.")
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValueError("올바른 GeoJSON 파일이 아닙니다.") from e
+            # A number at the end of the buffer may go on in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_features(stream: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Features of a GeoJSON FeatureCollection, decoded one at a time from the stream.
+
+    Members other than ``features`` are decoded whole (they are small); each
+    feature is yielded as soon as it has been read.
+
+    Raises:
+        ValueError: If the stream is not a FeatureCollection object.
+    """
+    reader = _JSONStream(stream, chunk_size)
+    collection_type = None
+    has_features = False
+    try:
+        reader.expect("{")
+        first = True
+        while not reader.accept("}"):
+            if not first:
+                reader.expect(",")
+            first = False
+            key = reader.value()
+            reader.expect(":")
+            if key == "features":
+                has_features = True
+                reader.expect("[")
+                while not reader.accept("]"):
+                    yield reader.value()
+                    if reader.peek() != "]":
+                        reader.expect(",")
+            elif key == "type":
+                collection_type = reader.value()
+            else:
+                reader.value()
+        if reader.peek():
+            raise ValueError("올바른 GeoJSON 파일이 아닙니다.")
+    except UnicodeDecodeError as e:
+        raise ValueError("GeoJSON 파일은 UTF-8이어야 합니다.") from e
+    if collection_type != "FeatureCollection" or not has_features:
+        raise ValueError("GeoJSON FeatureCollection이 아닙니다.")
+
+
+class MapImportService:
+    """Service for upserting many map objects of a layer at once."""
+
+    MAX_FEATURES = 10000
+    BATCH_SIZE = 1000
+    UPDATE_FIELDS = (
+        "object_type",
+        "coordinates",
+        "label",
+        "description",
+        "wiki_entry",
+        "style_json",
+        *BBOX_FIELDS,
+        "updated_at",
+    )
+
+    @classmethod
+    def import_features(cls, layer_id: int, user: User, upload: IO[bytes]) -> dict[str, Any]:
+        """
+        GeoJSON FeatureCollection의 피처들을 레이어의 오브젝트로 일괄 생성/수정합니다.
+
+        피처의 ``properties``에서 ``label``, ``description``, ``wikiEntryId``, ``styleJson``,
+        ``objectType``(점은 POINT/ICON/CIRCLE, CIRCLE이면 ``radius`` 필요)을 읽습니다.
+        정수 ``id``가 있으면 그 ``key``의 기존 오브젝트를 수정하며, 이때 없는 속성은
+        그대로 둡니다.
+
+        Parameters:
+            layer_id (int): 레이어 ID
+            user (User): 요청 사용자 (브랜치 작가여야 함)
+            upload (IO[bytes]): GeoJSON 파일 스트림
+
+        Returns:
+            dict: ``created``, ``updated`` (개수), ``objects`` (피처 순서의 MapObject 목록)
+
+        Raises:
+            ValueError: 레이어가 없거나 파일이 FeatureCollection이 아니거나 피처가 너무 많을 때
+            FeatureImportError: 잘못된 피처가 있을 때 (아무것도 저장하지 않음)
+            PermissionDenied: 브랜치 작가가 아닐 때
+        """
+        try:
+            layer = MapLayer.objects.select_related("snapshot__map__branch").get(id=layer_id)
+        except MapLayer.DoesNotExist as e:
+            raise ValueError("존재하지 않는 레이어입니다.") from e
+
+        MapService._check_branch_author(layer.snapshot.map.branch, user)
+
+        features: list[tuple[str, dict[str, Any]]] = []
+        errors: dict[str, dict[str, list[str]]] = {}
+        for index, raw in enumerate(iter_features(upload)):
+            if index >= cls.MAX_FEATURES:
+                raise ValueError(f"한 번에 {cls.MAX_FEATURES}개까지 가져올 수 있습니다.")
+            fields, feature_errors = cls._parse_feature(raw)
+            if feature_errors:
+                errors[str(index)] = feature_errors
+            else:
+                features.append((str(index), fields))
+
+        wiki_ids = {
+            fields["wiki_entry_id"] for _, fields in features if fields.get("wiki_entry_id")
+        }
+        if wiki_ids:
+            wiki_ids = set(WikiEntry.objects.filter(id__in=wiki_ids).values_list("id", flat=True))
+        existing = cls._existing(layer, {fields["key"] for _, fields in features if fields["key"]})
+
+        seen: set[int] = set()
+        for index, fields in features:
+            wiki_entry_id = fields.get("wiki_entry_id")
+            if wiki_entry_id and wiki_entry_id not in wiki_ids:
+                errors.setdefault(index, {})["wiki_entry_id"] = ["존재하지 않는 위키입니다."]
+            key = fields["key"]
+            if key is not None:
+                if key in seen:
+                    errors.setdefault(index, {})["id"] = ["같은 id의 피처가 이미 있습니다."]
+                elif key not in existing:
+                    errors.setdefault(index, {})["id"] = ["이 레이어에 없는 오브젝트입니다."]
+                seen.add(key)
+        if errors:
+            raise FeatureImportError(dict(sorted(errors.items(), key=lambda item: int(item[0]))))
+
+        now = timezone.now()
+        objects, to_create, to_update = [], [], []
+        with transaction.atomic():
+            # Deltas of a keyframe layer keep its objects as they were before the import
+            MapSnapshotHistory.preserve(
+                layer, [obj for obj in existing.values() if obj.layer_id == layer.id]
+            )
+            for _, fields in features:
+                obj = existing.get(fields["key"])
+                if obj is None:
+                    obj = MapObject(layer_id=layer.id)
+                    to_create.append(obj)
+                elif obj.layer_id != layer.id:
+                    # Inherited from the keyframe: the delta snapshot gets its own copy
+                    obj = MapSnapshotHistory.copy_object(obj, layer.id)
+                    to_create.append(obj)
+                else:
+                    obj.updated_at = now
+                    to_update.append(obj)
+                cls._apply(obj, fields)
+                objects.append(obj)
+
+            MapObject.objects.bulk_create(to_create, batch_size=cls.BATCH_SIZE)
+            MapObject.objects.bulk_update(to_update, cls.UPDATE_FIELDS, batch_size=cls.BATCH_SIZE)
+            MapSnapshotHistory.preserve(
+                layer, [obj for obj in to_create if obj.key is None], added=True
+            )
+        if objects:
+            MapService._snapshot_changed(layer.snapshot_id, layer.snapshot.map.branch_id)
+
+        created = sum(1 for obj in to_create if obj.key is None)
+        return {"created": created, "updated": len(objects) - created, "objects": objects}
+
+    @staticmethod
+    def _parse_feature(raw: Any) -> tuple[dict[str, Any], dict[str, list[str]]]:
+        """Model fields of a feature (plus ``key``) and its errors by field."""
+        if not isinstance(raw, dict) or raw.get("type") != "Feature":
+            return {}, {"type": ["Feature 객체여야 합니다."]}
+        properties = raw.get("properties") or {}
+        if not isinstance(properties, dict):
+            return {}, {"properties": ["객체여야 합니다."]}
+
+        fields: dict[str, Any] = {"key": raw.get("id")}
+        errors: dict[str, list[str]] = {}
+        if fields["key"] is not None and (
+            isinstance(fields["key"], bool) or not isinstance(fields["key"], int)
+        ):
+            errors["id"] = ["id는 기존 오브젝트의 key(정수)여야 합니다."]
+
+        try:
+            coordinates = from_geojson(raw.get("geometry"))
+        except ValueError as e:
+            errors["geometry"] = [str(e)]
+        else:
+            allowed = GEOMETRY_OBJECT_TYPES[raw["geometry"]["type"]]
+            object_type = properties.get("objectType", allowed[0])
+            radius = properties.get("radius")
+            if object_type not in allowed:
+                errors["object_type"] = [f"이 geometry에 쓸 수 있는 타입: {', '.join(allowed)}"]
+            elif object_type == ObjectType.CIRCLE:
+                if (
+                    isinstance(radius, bool)
+                    or not isinstance(radius, int | float)
+                    or not math.isfinite(radius)
+                    or radius <= 0
+                ):
+                    errors["radius"] = ["원에는 양수 radius가 필요합니다."]
+                coordinates = {"center": coordinates, "radius": radius}
+            fields["object_type"] = object_type
+            fields["coordinates"] = coordinates
+
+        label = properties.get("label", "")
+        if not isinstance(label, str) or len(label) > 100:
+            errors["label"] = ["100자 이하의 문자열이어야 합니다."]
+        description = properties.get("description", "")
+        if not isinstance(description, str):
+            errors["description"] = ["문자열이어야 합니다."]
+        wiki_entry_id = properties.get("wikiEntryId")
+        if wiki_entry_id is not None and (
+            isinstance(wiki_entry_id, bool) or not isinstance(wiki_entry_id, int)
+        ):
+            errors["wiki_entry_id"] = ["정수여야 합니다."]
+        style_json = properties.get("styleJson")
+        if style_json is not None and not isinstance(style_json, dict):
+            errors["style_json"] = ["객체여야 합니다."]
+
+        # On update, properties left out keep their values
+        for name, prop in (
+            ("label", "label"),
+            ("description", "description"),
+            ("wiki_entry_id", "wikiEntryId"),
+            ("style_json", "styleJson"),
+        ):
+            if prop in properties:
+                fields[name] = properties[prop]
+        return fields, errors
+
+    @staticmethod
+    def _existing(layer: MapLayer, keys: set[int]) -> dict[int, MapObject]:
+        """The layer's objects (inherited ones included) with the given keys, by key."""
+        if not keys:
+            return {}
+        snapshot = layer.snapshot
+        MapSnapshotHistory.materialize(
+            [snapshot], objects=Q(key__in=keys) | Q(key__isnull=True, id__in=keys)
+        )
+        effective = next(item for item in snapshot.layers.all() if item.id == layer.id)
+        return {obj.identity: obj for obj in effective.map_objects.all()}
+
+    @staticmethod
+    def _apply(obj: MapObject, fields: dict[str, Any]) -> None:
+        for name in OBJECT_FIELDS:
+            if name in fields:
+                setattr(obj, name, fields[name])
+        for name, value in bbox_fields(obj.coordinates).items():
+            setattr(obj, name, value)
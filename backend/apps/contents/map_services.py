@@ -3,22 +3,41 @@ MapService - Business logic for Map management.
 """
 
 import builtins
+import uuid
+from collections.abc import Callable
+from itertools import islice
+from typing import Any
 
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.db.models import Prefetch, QuerySet
+from django.db import transaction
+from django.db.models import F, Prefetch, Q, QuerySet, prefetch_related_objects
+from django.utils import timezone
 
+from apps.contents.lineage import BranchLineage
+from apps.contents.map_geometry import BBOX_FIELDS, BBox, bbox_fields
+from apps.contents.map_history import MapSnapshotHistory
 from apps.contents.models import (
     LayerType,
     Map,
     MapLayer,
     MapObject,
     MapSnapshot,
+    ObjectType,
     WikiEntry,
 )
+from apps.contents.snapshot_index import SnapshotIntervalIndex
 from apps.novels.models import Branch
 from apps.users.models import User
 
 
+class ForkJobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 class MapService:
     """Service for managing maps, snapshots, layers, and objects."""
 
@@ -62,17 +81,20 @@ class MapService:
 
         MapService._check_branch_author(branch, user)
 
-        # Check for duplicate name
-        if Map.objects.filter(branch=branch, name=name).exists():
+        # Check for duplicate name, including maps inherited by a fork
+        lineage = BranchLineage.resolve(branch.id)
+        if Map.objects.filter(MapService._visible_maps(lineage), name=name).exists():
             raise ValueError(f"이미 존재하는 지도 이름입니다: {name}")
 
-        return Map.objects.create(
+        map_obj = Map.objects.create(
             branch=branch,
             name=name,
             description=description,
             width=width,
             height=height,
         )
+        Branch.bump_version(branch.id)
+        return map_obj
 
     @staticmethod
     def update(
@@ -118,43 +140,188 @@ class MapService:
             map_obj.height = height
 
         map_obj.save()
+        Branch.bump_version(map_obj.branch_id)
         return map_obj
 
     @staticmethod
-    def retrieve(map_id: int) -> Map:
+    def retrieve(map_id: int, lineage: BranchLineage | None = None) -> Map:
         """
         ID로 Map을 조회하여 관련 Branch와 snapshots, layers, map_objects를 미리 로드해 반환합니다.
         
         Parameters:
             map_id (int): 조회할 Map의 ID
+            lineage (BranchLineage | None): 지도를 보는 브랜치의 계보. 주어지면 그 브랜치에서
+                보이는 지도만 조회하고, 물려받은 지도의 스냅샷은 분기 회차까지만 로드합니다.
         
         Returns:
             Map: 조회된 Map 인스턴스 (관련 Branch와 snapshots->layers->map_objects가 프리페치됨)
         
         Raises:
-            ValueError: 지정한 ID의 Map이 존재하지 않을 때
+            ValueError: 지정한 ID의 Map이 존재하지 않거나 브랜치에서 볼 수 없을 때
+        """
+        map_obj = MapService.get_visible(map_id, lineage)
+        snapshots = MapSnapshot.objects.all()
+        cap = MapService.cap_for(map_obj, lineage)
+        if cap is not None:
+            snapshots = snapshots.filter(valid_from_chapter__lte=cap)
+        prefetch_related_objects([map_obj], Prefetch("snapshots", queryset=snapshots))
+        MapSnapshotHistory.materialize(builtins.list(map_obj.snapshots.all()))
+        return map_obj
+
+    @staticmethod
+    def get_visible(map_id: int, lineage: BranchLineage | None = None) -> Map:
+        """
+        Map by ID (with its branch), only if visible from the lineage when one is given.
+
+        Raises:
+            ValueError: If the map does not exist or is not visible from the branch
         """
+        maps = Map.objects.select_related("branch")
+        if lineage is not None:
+            maps = maps.filter(MapService._visible_maps(lineage))
         try:
-            return (
-                Map.objects.select_related("branch")
-                .prefetch_related("snapshots__layers__map_objects")
-                .get(id=map_id)
-            )
+            return maps.get(id=map_id)
         except Map.DoesNotExist as e:
             raise ValueError("존재하지 않는 지도입니다.") from e
 
     @staticmethod
-    def list(branch_id: int) -> QuerySet[Map]:
+    def cap_for(map_obj: Map, lineage: BranchLineage | None) -> int | None:
+        """Last chapter of the map's snapshots visible from the lineage (None: no cap)."""
+        if lineage is None:
+            return None
+        return lineage.cap_for(map_obj.branch_id)
+
+    @staticmethod
+    def list(branch_id: int, lineage: BranchLineage | None = None) -> QuerySet[Map]:
         """
-        List maps for a branch.
+        List maps for a branch, including maps a fork inherits from its ancestors.
 
         Args:
             branch_id: Branch ID
+            lineage: Already resolved lineage of the branch (optional)
 
         Returns:
             QuerySet of Map
         """
-        return Map.objects.filter(branch_id=branch_id).order_by("name")
+        if lineage is None:
+            try:
+                lineage = BranchLineage.resolve(branch_id)
+            except ValueError:
+                return Map.objects.none()
+        return Map.objects.filter(MapService._visible_maps(lineage)).order_by("name")
+
+    @staticmethod
+    def _visible_maps(lineage: BranchLineage) -> Q:
+        """Maps of the branch plus inherited maps not yet materialized by a nearer branch."""
+        if not lineage.is_fork:
+            return Q(branch_id=lineage.branch_id)
+        materialized = Map.objects.filter(
+            branch_id__in=lineage.branch_ids, source_map__isnull=False
+        ).values("source_map_id")
+        return Q(branch_id__in=lineage.branch_ids) & ~Q(id__in=materialized)
+
+    @staticmethod
+    def materialize(branch_id: int, map_id: int, user: User) -> Map:
+        """
+        Copy an inherited map into a fork so the fork author can edit it.
+
+        Snapshots valid from after the fork point are not copied; layers and
+        objects of the copied snapshots are, with bulk inserts per level, as
+        stored (delta snapshots stay deltas of the copied keyframe). The
+        copy keeps a ``source_map`` reference and shadows the inherited map.
+        Calling it for a map the branch already owns (or already materialized)
+        returns that map.
+
+        Args:
+            branch_id: Fork branch ID
+            map_id: Map ID as seen from the fork
+            user: User performing the edit
+
+        Returns:
+            Map owned by the branch
+
+        Raises:
+            PermissionDenied: If user is not branch author
+            ValueError: If branch or map not found, or the map is not visible from the branch
+        """
+        try:
+            branch = Branch.objects.get(id=branch_id)
+            source = Map.objects.get(id=map_id)
+        except (Branch.DoesNotExist, Map.DoesNotExist) as e:
+            raise ValueError("존재하지 않는 지도입니다.") from e
+
+        MapService._check_branch_author(branch, user)
+
+        if source.branch_id == branch_id:
+            return source
+        existing = Map.objects.filter(branch_id=branch_id, source_map_id=map_id).first()
+        if existing is not None:
+            return existing
+
+        lineage = BranchLineage.resolve(branch_id)
+        if not Map.objects.filter(MapService._visible_maps(lineage), id=map_id).exists():
+            raise ValueError("이 브랜치에서 볼 수 없는 지도입니다.")
+        cap = lineage.cap_for(source.branch_id)
+
+        snapshots = source.snapshots.prefetch_related(
+            Prefetch("layers", queryset=MapLayer.objects.prefetch_related("map_objects"))
+        ).order_by("valid_from_chapter")
+        if cap is not None:
+            snapshots = snapshots.filter(valid_from_chapter__lte=cap)
+        snapshots = builtins.list(snapshots)
+
+        with transaction.atomic():
+            copy = Map.objects.create(
+                branch_id=branch_id,
+                source_map=source,
+                name=source.name,
+                description=source.description,
+                width=source.width,
+                height=source.height,
+            )
+            new_snapshots = MapSnapshot.objects.bulk_create(
+                [
+                    MapSnapshot(
+                        map=copy,
+                        valid_from_chapter=snap.valid_from_chapter,
+                        base_image_url=snap.base_image_url,
+                    )
+                    for snap in snapshots
+                ]
+            )
+            MapService._copy_delta_bases(
+                {snap.id: new.id for snap, new in zip(snapshots, new_snapshots, strict=True)},
+                {snap.id: snap.base_id for snap in snapshots if snap.base_id},
+            )
+            layers = [
+                (new_snapshot, layer)
+                for snap, new_snapshot in zip(snapshots, new_snapshots, strict=True)
+                for layer in snap.layers.all()
+            ]
+            new_layers = MapLayer.objects.bulk_create(
+                [
+                    MapLayer(
+                        snapshot=new_snapshot,
+                        key=layer.identity,
+                        name=layer.name,
+                        layer_type=layer.layer_type,
+                        z_index=layer.z_index,
+                        is_visible=layer.is_visible,
+                        style_json=layer.style_json,
+                    )
+                    for new_snapshot, layer in layers
+                ]
+            )
+            MapObject.objects.bulk_create(
+                [
+                    MapSnapshotHistory.copy_object(obj, new_layer.id)
+                    for (_, layer), new_layer in zip(layers, new_layers, strict=True)
+                    for obj in layer.map_objects.all()
+                ]
+            )
+
+        Branch.bump_version(branch_id)
+        return copy
 
     @staticmethod
     def delete(map_id: int, user: User) -> None:
@@ -176,15 +343,22 @@ class MapService:
 
         MapService._check_branch_author(map_obj.branch, user)
         map_obj.delete()
+        Branch.bump_version(map_obj.branch_id)
 
     # --- Snapshot Methods ---
 
+    # Viewport queries leave out shapes smaller than this on screen (pixels)
+    MIN_FEATURE_PIXELS = 2
+    MIN_ZOOM = -8
+    MAX_ZOOM = 24
+
     @staticmethod
     def create_snapshot(
         map_id: int,
         user: User,
         valid_from_chapter: int,
         base_image_url: str = "",
+        copy_previous: bool = False,
     ) -> MapSnapshot:
         """
         지도의 특정 회차부터 유효한 새 MapSnapshot을 생성한다.
@@ -194,6 +368,8 @@ class MapService:
             user (User): 요청자 사용자(지도의 브랜치 작성자여야 함).
             valid_from_chapter (int): 이 스냅샷이 유효하기 시작하는 회차 번호.
             base_image_url (str): 기본 베이스 이미지의 URL(선택).
+            copy_previous (bool): 바로 앞 스냅샷의 레이어와 오브젝트로 시작할지 여부. 가능하면
+                키프레임에 대한 델타로 저장된다 (MapSnapshotHistory 참고).
         
         Returns:
             MapSnapshot: 생성된 MapSnapshot 인스턴스.
@@ -213,66 +389,175 @@ class MapService:
         if MapSnapshot.objects.filter(map=map_obj, valid_from_chapter=valid_from_chapter).exists():
             raise ValueError(f"이미 회차 {valid_from_chapter}에 스냅샷이 존재합니다.")
 
-        snapshot = MapSnapshot.objects.create(
-            map=map_obj,
-            valid_from_chapter=valid_from_chapter,
-            base_image_url=base_image_url,
-        )
-        # Note: _prefetched_objects_cache is Django internal API.
-        # Used here to prevent N+1 queries when serializing newly created objects.
-        # If this breaks in future Django versions, replace with re-fetch + prefetch_related.
-        snapshot._prefetched_objects_cache = {"layers": MapLayer.objects.none()}
+        previous = None
+        if copy_previous:
+            previous = (
+                MapSnapshot.objects.filter(map=map_obj, valid_from_chapter__lt=valid_from_chapter)
+                .order_by("-valid_from_chapter")
+                .first()
+            )
+
+        with transaction.atomic():
+            snapshot = MapSnapshot.objects.create(
+                map=map_obj,
+                valid_from_chapter=valid_from_chapter,
+                base_image_url=base_image_url,
+            )
+            if previous is not None:
+                MapSnapshotHistory.continue_from(previous, snapshot)
+
+        if previous is not None:
+            MapSnapshotHistory.materialize([snapshot])
+        else:
+            # Note: _prefetched_objects_cache is Django internal API.
+            # Used here to prevent N+1 queries when serializing newly created objects.
+            # If this breaks in future Django versions, replace with re-fetch + prefetch_related.
+            snapshot._prefetched_objects_cache = {"layers": MapLayer.objects.none()}
+        SnapshotIntervalIndex.invalidate("map", map_obj.id)
+        Branch.bump_version(map_obj.branch_id)
         return snapshot
 
     @staticmethod
-    def get_snapshot_for_chapter(map_id: int, chapter_number: int) -> MapSnapshot | None:
+    def get_snapshot_for_chapter(
+        map_id: int, chapter_number: int, cap: int | None = None
+    ) -> MapSnapshot | None:
         """
         주어진 장(chapter)에 적용되는 MapSnapshot을 결정합니다.
         
         Args:
             map_id (int): 대상 Map의 ID.
             chapter_number (int): 조회하려는 장 번호.
+            cap (int | None): 볼 수 있는 마지막 회차. 포크가 물려받은 지도는 분기 회차
+                (``BranchLineage.cap_for``)이며, 그 뒤에 시작하는 스냅샷은 고르지 않습니다.
         
         Returns:
             MapSnapshot 또는 None: valid_from_chapter가 chapter_number 이하인 snapshot 중 가장 큰 valid_from_chapter를 가진 MapSnapshot, 없으면 None.
         """
-        return (
-            MapSnapshot.objects.filter(
-                map_id=map_id,
-                valid_from_chapter__lte=chapter_number,
-            )
-            .prefetch_related(
-                Prefetch("layers", queryset=MapLayer.objects.prefetch_related("map_objects"))
-            )
-            .order_by("-valid_from_chapter")
-            .first()
+        if cap is not None:
+            chapter_number = min(chapter_number, cap)
+        snapshot = SnapshotIntervalIndex.load_at(
+            "map", map_id, chapter_number, MapSnapshot.objects.all()
         )
+        if snapshot is not None:
+            MapSnapshotHistory.materialize([snapshot])
+        return snapshot
 
     @staticmethod
-    def get_for_chapter(map_id: int, chapter_number: int) -> dict:
+    def get_for_chapter(
+        map_id: int, chapter_number: int, lineage: BranchLineage | None = None
+    ) -> dict:
         """
         Get map with context-aware snapshot for a specific chapter.
 
         Args:
             map_id: Map ID
             chapter_number: Current chapter being read
+            lineage: Lineage of the reading branch; inherited maps stop at the fork point
 
         Returns:
             Dict with 'map' and 'snapshot' keys
 
         Raises:
-            ValueError: If map not found
+            ValueError: If map not found (or not visible from the branch)
         """
-        map_obj = MapService.retrieve(map_id)
-        snapshot = MapService.get_snapshot_for_chapter(map_id, chapter_number)
+        map_obj = MapService.retrieve(map_id, lineage=lineage)
+        snapshot = MapService.get_snapshot_for_chapter(
+            map_id, chapter_number, cap=MapService.cap_for(map_obj, lineage)
+        )
 
         return {
             "map": map_obj,
             "snapshot": snapshot,
         }
 
+    @staticmethod
+    def timeline(
+        branch_id: int, chapter: int | None = None, lineage: BranchLineage | None = None
+    ) -> builtins.list[dict]:
+        """
+        브랜치 지도마다 스냅샷 유효 구간 표를 한 번에 반환합니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID (포크는 물려받은 지도도 분기 회차까지 포함)
+            chapter (int | None): 주어지면 그 회차까지 시작한 구간만 반환
+            lineage (BranchLineage | None): 이미 조회한 브랜치 계보
+
+        Returns:
+            list[dict]: 이름 순의 ``id``, ``name``, ``snapshots``
+            (SnapshotIntervalIndex.timeline 참고)
+
+        Raises:
+            ValueError: 브랜치가 존재하지 않을 때
+        """
+        if lineage is None:
+            lineage = BranchLineage.resolve(branch_id)
+        maps = Map.objects.filter(MapService._visible_maps(lineage)).order_by("name")
+        return SnapshotIntervalIndex.timeline(
+            "map", lineage, maps.values("id", "name"), chapter=chapter
+        )
+
+    @staticmethod
+    def get_viewport(
+        map_id: int, snapshot_id: int, bbox: BBox, zoom: int | None = None
+    ) -> builtins.list[MapLayer]:
+        """
+        Visible layers of a snapshot with only the objects that intersect ``bbox``.
+
+        Objects are matched on their precomputed bounding boxes
+        (``map_objects_layer_bbox_idx``); objects whose coordinates have no known
+        extent are always included. With ``zoom`` (Leaflet simple CRS: one map
+        unit is ``2 ** zoom`` pixels), lines, polygons and circles spanning less
+        than MIN_FEATURE_PIXELS on screen are left out; points and icons are kept.
+
+        Args:
+            map_id: Map ID
+            snapshot_id: MapSnapshot ID
+            bbox: Viewport as (min_x, min_y, max_x, max_y) in map units
+            zoom: Map zoom level (optional)
+
+        Returns:
+            List of MapLayer with the matching objects prefetched as ``map_objects``
+
+        Raises:
+            ValueError: If snapshot not found
+        """
+        snapshot = MapSnapshot.objects.filter(id=snapshot_id, map_id=map_id).first()
+        if snapshot is None:
+            raise ValueError("존재하지 않는 스냅샷입니다.")
+
+        min_x, min_y, max_x, max_y = bbox
+        unknown = Q(min_x__isnull=True)
+        objects = unknown | Q(max_x__gte=min_x, min_x__lte=max_x, max_y__gte=min_y, min_y__lte=max_y)
+        if zoom is not None:
+            min_extent = MapService.MIN_FEATURE_PIXELS / 2**zoom
+            objects &= (
+                unknown
+                | Q(object_type__in=[ObjectType.POINT, ObjectType.ICON])
+                | Q(max_x__gte=F("min_x") + min_extent)
+                | Q(max_y__gte=F("min_y") + min_extent)
+            )
+
+        MapSnapshotHistory.materialize([snapshot], objects=objects, visible_only=True)
+        return builtins.list(snapshot.layers.all())
+
     # --- Layer Methods ---
 
+    @staticmethod
+    def _snapshot_changed(snapshot_id: int, branch_id: int) -> None:
+        """
+        Record a layer or object change of a snapshot.
+
+        Bumps the branch version, moves ``updated_at`` (the tile version, so
+        cached tiles of the old content are no longer used) of the snapshot,
+        and queues a background render of its tiles. Deltas of the snapshot do
+        not change (see MapSnapshotHistory.preserve).
+        """
+        from apps.contents.map_tiles import MapTileService
+
+        MapSnapshot.objects.filter(id=snapshot_id).update(updated_at=timezone.now())
+        Branch.bump_version(branch_id)
+        MapTileService.schedule_render(snapshot_id)
+
     @staticmethod
     def add_layer(
         snapshot_id: int,
@@ -321,6 +606,7 @@ class MapService:
         # Used here to prevent N+1 queries when serializing newly created objects.
         # If this breaks in future Django versions, replace with re-fetch + prefetch_related.
         layer._prefetched_objects_cache = {"map_objects": MapObject.objects.none()}
+        MapService._snapshot_changed(snapshot.id, snapshot.map.branch_id)
         return layer
 
     @staticmethod
@@ -371,9 +657,11 @@ class MapService:
             layer.style_json = style_json
 
         layer.save()
+        MapService._snapshot_changed(layer.snapshot_id, layer.snapshot.map.branch_id)
         return layer
 
     @staticmethod
+    @transaction.atomic
     def delete_layer(layer_id: int, user: User) -> None:
         """Delete a map layer."""
         try:
@@ -382,11 +670,14 @@ class MapService:
             raise ValueError("존재하지 않는 레이어입니다.") from e
 
         MapService._check_branch_author(layer.snapshot.map.branch, user)
+        MapSnapshotHistory.preserve(layer, builtins.list(layer.map_objects.all()))
         layer.delete()
+        MapService._snapshot_changed(layer.snapshot_id, layer.snapshot.map.branch_id)
 
     # --- Object Methods ---
 
     @staticmethod
+    @transaction.atomic
     def add_object(
         layer_id: int,
         user: User,
@@ -427,7 +718,7 @@ class MapService:
             except WikiEntry.DoesNotExist as e:
                 raise ValueError("존재하지 않는 위키입니다.") from e
 
-        return MapObject.objects.create(
+        obj = MapObject.objects.create(
             layer=layer,
             object_type=object_type,
             coordinates=coordinates,
@@ -435,9 +726,14 @@ class MapService:
             description=description,
             wiki_entry=wiki_entry,
             style_json=style_json,
+            **bbox_fields(coordinates),
         )
+        MapSnapshotHistory.preserve(layer, [obj], added=True)
+        MapService._snapshot_changed(layer.snapshot_id, layer.snapshot.map.branch_id)
+        return obj
 
     @staticmethod
+    @transaction.atomic
     def update_object(
         object_id: int,
         user: User,
@@ -447,19 +743,24 @@ class MapService:
         description: str | None = None,
         wiki_entry_id: int | None = None,
         style_json: dict | None = None,
+        snapshot_id: int | None = None,
     ) -> MapObject:
-        """Update a map object."""
-        try:
-            obj = MapObject.objects.select_related("layer__snapshot__map__branch").get(id=object_id)
-        except MapObject.DoesNotExist as e:
-            raise ValueError("존재하지 않는 오브젝트입니다.") from e
+        """
+        Update a map object.
 
-        MapService._check_branch_author(obj.layer.snapshot.map.branch, user)
+        Editing a keyframe object leaves the delta snapshots that inherit it
+        as they were. Pass ``snapshot_id`` of a delta snapshot to change an
+        inherited object in that snapshot only.
+        """
+        obj = MapService._get_object_for_edit(object_id, user, snapshot_id)
+        MapSnapshotHistory.preserve(obj.layer, [obj])
 
         if object_type is not None:
             obj.object_type = object_type
         if coordinates is not None:
             obj.coordinates = coordinates
+            for name, value in bbox_fields(coordinates).items():
+                setattr(obj, name, value)
         if label is not None:
             obj.label = label
         if description is not None:
@@ -473,26 +774,56 @@ class MapService:
             obj.style_json = style_json
 
         obj.save()
+        MapService._snapshot_changed(obj.layer.snapshot_id, obj.layer.snapshot.map.branch_id)
         return obj
 
     @staticmethod
-    def delete_object(object_id: int, user: User) -> None:
-        """Delete a map object."""
+    @transaction.atomic
+    def delete_object(object_id: int, user: User, snapshot_id: int | None = None) -> None:
+        """
+        Delete a map object.
+
+        Pass ``snapshot_id`` of a delta snapshot to remove an inherited object
+        from that snapshot only. In a delta snapshot, a copy of a keyframe
+        object is kept as a removal mark rather than deleted, so the keyframe
+        object does not show through again.
+        """
+        obj = MapService._get_object_for_edit(object_id, user, snapshot_id)
+        MapSnapshotHistory.preserve(obj.layer, [obj])
+        if obj.key is not None and obj.layer.snapshot.base_id is not None:
+            obj.is_removed = True
+            obj.save()
+        else:
+            obj.delete()
+        MapService._snapshot_changed(obj.layer.snapshot_id, obj.layer.snapshot.map.branch_id)
+
+    @staticmethod
+    def _get_object_for_edit(object_id: int, user: User, snapshot_id: int | None) -> MapObject:
+        """The object to edit: itself, or its row in delta snapshot ``snapshot_id``."""
         try:
             obj = MapObject.objects.select_related("layer__snapshot__map__branch").get(id=object_id)
         except MapObject.DoesNotExist as e:
             raise ValueError("존재하지 않는 오브젝트입니다.") from e
 
         MapService._check_branch_author(obj.layer.snapshot.map.branch, user)
-        obj.delete()
+        if snapshot_id is not None and snapshot_id != obj.layer.snapshot_id:
+            obj = MapSnapshotHistory.override(obj, snapshot_id)
+        return obj
 
     # --- Fork Methods ---
 
+    FORK_BATCH_SIZE = 1000
+    # Forks copying more map objects than this run as a background job
+    FORK_ASYNC_THRESHOLD = 5000
+    FORK_JOB_KEY = "map_fork:{job_id}"
+    FORK_JOB_TIMEOUT = 24 * 60 * 60  # 24 hours
+
     @staticmethod
     def fork_maps(
         source_branch_id: int,
         target_branch_id: int,
         user: User,
+        on_progress: Callable[[int], None] | None = None,
     ) -> builtins.list[Map]:
         """
         Fork all maps from source branch to target branch.
@@ -503,72 +834,271 @@ class MapService:
         - All MapLayers
         - All MapObjects
 
+        Snapshots, layers and objects are copied as stored: delta snapshots
+        point at the copies of their keyframes and keys are kept. When the
+        target forks the source, snapshots valid from after the fork point are
+        not copied. Maps the target already owns under the same name, or has
+        already materialized, are skipped, so forking twice copies nothing new.
+
+        Each level is copied with ``bulk_create`` in one transaction, so the
+        number of statements depends on the number of batches (FORK_BATCH_SIZE
+        rows each), not on the number of rows. Old to new IDs are mapped from
+        the primary keys ``bulk_create`` returns (RETURNING). Objects, the
+        largest level, are streamed so memory stays bounded by the batch size.
+
         Args:
             source_branch_id: Source branch ID
             target_branch_id: Target branch ID
             user: User performing the fork
+            on_progress: Called with the number of objects copied so far after each batch
 
         Returns:
             List of created Map instances
         """
-        try:
-            source_branch = Branch.objects.get(id=source_branch_id)
-            target_branch = Branch.objects.get(id=target_branch_id)
-        except Branch.DoesNotExist as e:
-            raise ValueError("존재하지 않는 브랜치입니다.") from e
+        branch_ids = {source_branch_id, target_branch_id}
+        branches = Branch.objects.in_bulk(branch_ids)
+        if len(branches) != len(branch_ids):
+            raise ValueError("존재하지 않는 브랜치입니다.")
+
+        batch_size = MapService.FORK_BATCH_SIZE
+        target = branches[target_branch_id]
+
+        with transaction.atomic():
+            # 1. Copy maps
+            source_maps = builtins.list(
+                MapService._fork_sources(source_branch_id, target).order_by("id")
+            )
+            # Listed before the copies exist: they would exclude their sources
+            source_snapshots = MapService._fork_snapshots(source_maps, source_branch_id, target)
+            forked_maps = Map.objects.bulk_create(
+                [
+                    Map(
+                        branch_id=target_branch_id,
+                        source_map_id=source_map.id,
+                        name=source_map.name,
+                        description=source_map.description,
+                        width=source_map.width,
+                        height=source_map.height,
+                    )
+                    for source_map in source_maps
+                ],
+                batch_size=batch_size,
+            )
+            map_mapping = {
+                old.id: new.id for old, new in zip(source_maps, forked_maps, strict=True)
+            }  # old_map_id -> new_map_id
+
+            # 2. Copy snapshots
+            snapshots = builtins.list(
+                source_snapshots.order_by("id").values(
+                    "id", "map_id", "valid_from_chapter", "base_image_url", "base_id"
+                )
+            )
+            new_snapshots = MapSnapshot.objects.bulk_create(
+                [
+                    MapSnapshot(
+                        **{
+                            **row,
+                            "id": None,
+                            "map_id": map_mapping[row["map_id"]],
+                            "base_id": None,
+                        }
+                    )
+                    for row in snapshots
+                ],
+                batch_size=batch_size,
+            )
+            snapshot_mapping = {
+                row["id"]: new.id for row, new in zip(snapshots, new_snapshots, strict=True)
+            }  # old_snapshot_id -> new_snapshot_id
+            MapService._copy_delta_bases(
+                snapshot_mapping, {row["id"]: row["base_id"] for row in snapshots if row["base_id"]}
+            )
 
-        forked_maps = []
-        source_maps = Map.objects.filter(branch=source_branch).prefetch_related(
-            Prefetch(
-                "snapshots",
-                queryset=MapSnapshot.objects.prefetch_related(
-                    Prefetch("layers", queryset=MapLayer.objects.prefetch_related("map_objects"))
-                ),
+            # 3. Copy layers
+            layers = builtins.list(
+                MapLayer.objects.filter(snapshot__in=source_snapshots)
+                .order_by("id")
+                .values(
+                    "id",
+                    "key",
+                    "snapshot_id",
+                    "name",
+                    "layer_type",
+                    "z_index",
+                    "is_visible",
+                    "style_json",
+                )
             )
+            new_layers = MapLayer.objects.bulk_create(
+                [
+                    MapLayer(
+                        **{
+                            **row,
+                            "id": None,
+                            "key": row["key"] or row["id"],
+                            "snapshot_id": snapshot_mapping[row["snapshot_id"]],
+                        }
+                    )
+                    for row in layers
+                ],
+                batch_size=batch_size,
+            )
+            layer_mapping = {
+                row["id"]: new.id for row, new in zip(layers, new_layers, strict=True)
+            }  # old_layer_id -> new_layer_id
+
+            # 4. Copy objects, streamed in batches
+            objects = (
+                MapObject.objects.filter(layer__snapshot__in=source_snapshots)
+                .order_by("id")
+                .values(
+                    "id",
+                    "key",
+                    "is_removed",
+                    "layer_id",
+                    "object_type",
+                    "coordinates",
+                    "label",
+                    "description",
+                    "wiki_entry_id",
+                    "style_json",
+                    *BBOX_FIELDS,
+                )
+                .iterator(chunk_size=batch_size)
+            )
+            copied = 0
+            while batch := builtins.list(islice(objects, batch_size)):
+                MapObject.objects.bulk_create(
+                    [
+                        MapObject(
+                            **{
+                                **row,
+                                "id": None,
+                                "key": row["key"] or row["id"],
+                                "layer_id": layer_mapping[row["layer_id"]],
+                            }
+                        )
+                        for row in batch
+                    ]
+                )
+                copied += len(batch)
+                if on_progress is not None:
+                    on_progress(copied)
+
+            if forked_maps:
+                Branch.bump_version(target_branch_id)
+        return forked_maps
+
+    @staticmethod
+    def _fork_sources(source_branch_id: int, target: Branch) -> QuerySet[Map]:
+        """Maps of the source branch that a fork into ``target`` copies."""
+        owned = Map.objects.filter(branch_id=target.id)
+        return Map.objects.filter(branch_id=source_branch_id).exclude(
+            Q(id__in=owned.filter(source_map__isnull=False).values("source_map_id"))
+            | Q(name__in=owned.values("name"))
         )
 
-        for source_map in source_maps:
-            # Create new map with source reference
-            new_map = Map.objects.create(
-                branch=target_branch,
-                source_map=source_map,
-                name=source_map.name,
-                description=source_map.description,
-                width=source_map.width,
-                height=source_map.height,
+    @staticmethod
+    def _fork_snapshots(
+        maps: QuerySet[Map] | builtins.list[Map], source_branch_id: int, target: Branch
+    ) -> QuerySet[MapSnapshot]:
+        """Snapshots of ``maps`` a fork copies (up to the fork point if ``target`` forks the source)."""
+        snapshots = MapSnapshot.objects.filter(map__in=maps)
+        if target.parent_branch_id == source_branch_id and target.fork_point_chapter is not None:
+            snapshots = snapshots.filter(valid_from_chapter__lte=target.fork_point_chapter)
+        return snapshots
+
+    @staticmethod
+    def _copy_delta_bases(snapshot_mapping: dict[int, int], bases: dict[int, int]) -> None:
+        """Point copied delta snapshots at the copies of their keyframes (old ids in ``bases``)."""
+        if bases:
+            MapSnapshot.objects.bulk_update(
+                [
+                    MapSnapshot(id=snapshot_mapping[old_id], base_id=snapshot_mapping[base_id])
+                    for old_id, base_id in bases.items()
+                ],
+                ["base"],
             )
 
-            # Copy snapshots
-            for source_snapshot in source_map.snapshots.all():
-                new_snapshot = MapSnapshot.objects.create(
-                    map=new_map,
-                    valid_from_chapter=source_snapshot.valid_from_chapter,
-                    base_image_url=source_snapshot.base_image_url,
-                )
+    @staticmethod
+    def start_fork(source_branch_id: int, target_branch_id: int, user: User) -> dict[str, Any]:
+        """
+        지도 포크를 시작합니다.
 
-                # Copy layers
-                for source_layer in source_snapshot.layers.all():
-                    new_layer = MapLayer.objects.create(
-                        snapshot=new_snapshot,
-                        name=source_layer.name,
-                        layer_type=source_layer.layer_type,
-                        z_index=source_layer.z_index,
-                        is_visible=source_layer.is_visible,
-                        style_json=source_layer.style_json,
-                    )
+        복사할 지도 오브젝트가 FORK_ASYNC_THRESHOLD개 이하이면 바로 복사하고, 그보다 많으면
+        백그라운드 작업으로 등록합니다. 어느 쪽이든 작업 ID로 진행 상황을 조회할 수 있습니다.
 
-                    # Copy objects
-                    for source_obj in source_layer.map_objects.all():
-                        MapObject.objects.create(
-                            layer=new_layer,
-                            object_type=source_obj.object_type,
-                            coordinates=source_obj.coordinates,
-                            label=source_obj.label,
-                            description=source_obj.description,
-                            wiki_entry=source_obj.wiki_entry,
-                            style_json=source_obj.style_json,
-                        )
+        Parameters:
+            source_branch_id (int): 원본 브랜치 ID
+            target_branch_id (int): 대상 브랜치 ID
+            user (User): 포크를 수행하는 사용자
+
+        Returns:
+            dict: 작업 상태 (``job_id``, ``status``, ``copied``, ``total``)
 
-            forked_maps.append(new_map)
+        Raises:
+            ValueError: 브랜치가 존재하지 않을 때
+            PermissionDenied: 대상 브랜치의 작가가 아닐 때
+        """
+        from apps.contents.tasks import fork_maps
 
-        return forked_maps
\ No newline at end of file
+        try:
+            target = Branch.objects.get(id=target_branch_id)
+        except Branch.DoesNotExist as e:
+            raise ValueError("존재하지 않는 브랜치입니다.") from e
+        MapService._check_branch_author(target, user)
+
+        job_id = uuid.uuid4().hex
+        snapshots = MapService._fork_snapshots(
+            MapService._fork_sources(source_branch_id, target), source_branch_id, target
+        )
+        total = MapObject.objects.filter(layer__snapshot__in=snapshots).count()
+        MapService._set_fork_job(
+            job_id,
+            source_branch_id=source_branch_id,
+            target_branch_id=target_branch_id,
+            status=ForkJobStatus.PENDING,
+            copied=0,
+            total=total,
+        )
+        if total <= MapService.FORK_ASYNC_THRESHOLD:
+            MapService.run_fork(job_id, source_branch_id, target_branch_id, user)
+        else:
+            transaction.on_commit(
+                lambda: fork_maps.delay(job_id, source_branch_id, target_branch_id, user.id)
+            )
+        return {"job_id": job_id, **MapService.get_fork_job(job_id)}
+
+    @staticmethod
+    def run_fork(job_id: str, source_branch_id: int, target_branch_id: int, user: User) -> int:
+        """
+        지도 포크 작업을 실행하고 진행 상황(복사한 오브젝트 수)을 기록합니다.
+
+        Returns:
+            int: 복사된 지도 수
+        """
+        MapService._set_fork_job(job_id, status=ForkJobStatus.RUNNING)
+        try:
+            forked = MapService.fork_maps(
+                source_branch_id,
+                target_branch_id,
+                user,
+                on_progress=lambda copied: MapService._set_fork_job(job_id, copied=copied),
+            )
+        except Exception as e:
+            MapService._set_fork_job(job_id, status=ForkJobStatus.FAILED, error=str(e))
+            raise
+        MapService._set_fork_job(job_id, status=ForkJobStatus.DONE, maps=len(forked))
+        return len(forked)
+
+    @staticmethod
+    def get_fork_job(job_id: str) -> dict[str, Any] | None:
+        """지도 포크 작업의 상태(``status``, ``copied``, ``total``, ``maps``, ``error``)를 반환합니다."""
+        return cache.get(MapService.FORK_JOB_KEY.format(job_id=job_id))
+
+    @staticmethod
+    def _set_fork_job(job_id: str, **fields: Any) -> None:
+        job = MapService.get_fork_job(job_id) or {}
+        job.update(fields)
+        cache.set(MapService.FORK_JOB_KEY.format(job_id=job_id), job, MapService.FORK_JOB_TIMEOUT)
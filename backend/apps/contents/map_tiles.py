@@ -0,0 +1,309 @@
+"""
+MapTileService - Simplified z/x/y tiles of map snapshots.
+
+Tiles follow Leaflet's simple CRS: at zoom ``z`` a map point ``(x, y)`` is
+the pixel ``(x * 2 ** z, -y * 2 ** z)``, so pixel rows grow as ``y`` shrinks and
+a map inside ``[0, height]`` sits on negative tile rows. Tile ``(col, row)``
+covers ``span = TILE_SIZE / 2 ** z`` map units, ``x`` from ``col * span`` and
+``y`` from ``-(row + 1) * span`` up to ``-row * span``. A tile holds the visible layers of the snapshot with
+the objects whose bounding boxes meet it (plus a small buffer). Lines and
+polygon rings are simplified for the zoom (Douglas–Peucker, half a pixel) and
+cut to the buffered tile; coordinates are quantized to an ``EXTENT`` grid
+relative to the tile's top-left corner (``y`` pointing down, like pixels) and sent as ``geometry`` (zigzag delta varints in
+base64, see ``map_geometry.encode_points``) with the point count of each run
+in ``parts``. Objects of unknown shape are not tiled.
+
+Tiles are cached under the snapshot's ``updated_at``, which every layer or
+object change moves forward, so stale tiles are never served and need no
+explicit invalidation. A change also queues a background render of the
+first zoom levels of the snapshot.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from apps.contents.map_geometry import (
+    BBox,
+    clip_line,
+    clip_polygon,
+    encode_points,
+    parts,
+    radius,
+    simplify,
+)
+from apps.contents.map_history import MapSnapshotHistory
+from apps.contents.map_services import MapService
+from apps.contents.models import MapSnapshot, ObjectType
+
+LAYER_FIELDS = ("id", "name", "layer_type", "z_index", "style_json")
+OBJECT_FIELDS = (
+    "id",
+    "layer_id",
+    "object_type",
+    "coordinates",
+    "label",
+    "wiki_entry_id",
+    "style_json",
+    "min_x",
+    "min_y",
+    "max_x",
+    "max_y",
+)
+
+
+class MapTileService:
+    """Render and cache vector tiles of map snapshots."""
+
+    TILE_SIZE = 256  # pixels
+    EXTENT = 4096  # grid units per tile side
+    BUFFER = 64  # grid units drawn past each tile edge
+    TOLERANCE_PIXELS = 0.5
+
+    # Zoom levels rendered in the background, from the one where the map fits one tile
+    PREWARM_LEVELS = 3
+    RENDER_DELAY = 5  # seconds, so a burst of edits renders once
+
+    CACHE_KEY = "map_tile:{snapshot_id}:{version}:{z}:{x}:{y}"
+    PENDING_KEY = "map_tiles_pending:{snapshot_id}"
+    TIMEOUT = 7 * 24 * 60 * 60  # 7 days
+    HTTP_MAX_AGE = 365 * 24 * 60 * 60  # versioned tile URLs never change
+
+    @staticmethod
+    def version(updated_at: Any) -> str:
+        """Tile version of a snapshot (``updated_at`` in milliseconds)."""
+        return str(int(updated_at.timestamp() * 1000))
+
+    @classmethod
+    def base_zoom(cls, width: int, height: int) -> int:
+        """Largest zoom at which the whole map fits in one tile."""
+        zoom = math.floor(math.log2(cls.TILE_SIZE / max(width, height, 1)))
+        return min(max(zoom, MapService.MIN_ZOOM), MapService.MAX_ZOOM)
+
+    @classmethod
+    def get_tile(cls, map_id: int, snapshot_id: int, z: int, x: int, y: int) -> dict[str, Any]:
+        """
+        스냅샷의 z/x/y 타일을 반환합니다. 캐시에 없으면 타일 영역의 오브젝트만 읽어 만듭니다.
+
+        Parameters:
+            map_id (int): 지도 ID
+            snapshot_id (int): 스냅샷 ID
+            z (int): 확대 수준 (MapService.MIN_ZOOM ~ MAX_ZOOM)
+            x (int): 타일 열
+            y (int): 타일 행
+
+        Returns:
+            dict: ``z``, ``x``, ``y``, ``extent``, ``version``, ``layers``
+            (레이어마다 ``objects``: ``geometry``, ``parts``, 원이면 ``radius``)
+
+        Raises:
+            ValueError: 스냅샷이 없거나 해당 지도의 스냅샷이 아닐 때
+        """
+        snapshot = (
+            MapSnapshot.objects.filter(id=snapshot_id, map_id=map_id)
+            .only("id", "base_id", "updated_at")
+            .first()
+        )
+        if snapshot is None:
+            raise ValueError("존재하지 않는 스냅샷입니다.")
+
+        version = cls.version(snapshot.updated_at)
+        key = cls.CACHE_KEY.format(snapshot_id=snapshot_id, version=version, z=z, x=x, y=y)
+        tile = cache.get(key)
+        if tile is None:
+            min_x, min_y, max_x, max_y = cls._tile_bbox(z, x, y)
+            layers, objects = cls._load(
+                snapshot, Q(max_x__gte=min_x, min_x__lte=max_x, max_y__gte=min_y, min_y__lte=max_y)
+            )
+            tiles = cls._render_zoom(layers, objects, z, version, only=(x, y))
+            tile = tiles.get((x, y)) or cls._tile(layers, {}, z, x, y, version)
+            cache.set(key, tile, cls.TIMEOUT)
+        return tile
+
+    @classmethod
+    def render(cls, snapshot_id: int) -> int:
+        """
+        스냅샷의 앞쪽 확대 수준(PREWARM_LEVELS개) 타일 중 오브젝트가 있는 것을 미리 만들어 캐시에 넣습니다.
+
+        오브젝트는 한 번만 읽고, 확대 수준마다 한 번씩 단순화합니다.
+
+        Returns:
+            int: 캐시에 넣은 타일 수
+        """
+        cache.delete(cls.PENDING_KEY.format(snapshot_id=snapshot_id))
+        snapshot = (
+            MapSnapshot.objects.filter(id=snapshot_id)
+            .select_related("map")
+            .only("id", "base_id", "updated_at", "map__width", "map__height")
+            .first()
+        )
+        if snapshot is None:
+            return 0
+
+        version = cls.version(snapshot.updated_at)
+        layers, objects = cls._load(snapshot)
+        base = cls.base_zoom(snapshot.map.width, snapshot.map.height)
+
+        rendered = {}
+        for z in range(base, min(base + cls.PREWARM_LEVELS, MapService.MAX_ZOOM + 1)):
+            for (x, y), tile in cls._render_zoom(layers, objects, z, version).items():
+                key = cls.CACHE_KEY.format(snapshot_id=snapshot_id, version=version, z=z, x=x, y=y)
+                rendered[key] = tile
+        cache.set_many(rendered, cls.TIMEOUT)
+        return len(rendered)
+
+    @classmethod
+    def schedule_render(cls, snapshot_id: int) -> None:
+        """Queue a background render of the snapshot's tiles unless one is already pending."""
+        from apps.contents.tasks import render_map_tiles
+
+        pending = cls.PENDING_KEY.format(snapshot_id=snapshot_id)
+        if cache.add(pending, True, cls.RENDER_DELAY * 12):
+            transaction.on_commit(
+                lambda: render_map_tiles.apply_async((snapshot_id,), countdown=cls.RENDER_DELAY)
+            )
+
+    @classmethod
+    def _tile_bbox(cls, z: int, x: int, y: int) -> BBox:
+        """Map-unit bounds of a tile, buffer included."""
+        span = cls.TILE_SIZE / 2**z
+        pad = span * cls.BUFFER / cls.EXTENT
+        return x * span - pad, -(y + 1) * span - pad, (x + 1) * span + pad, -y * span + pad
+
+    @staticmethod
+    def _load(
+        snapshot: MapSnapshot, objects: Q | None = None
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Visible layers and their objects of known extent (matching ``objects``), as dicts."""
+        condition = Q(min_x__isnull=False) & (objects or Q())
+        MapSnapshotHistory.materialize([snapshot], objects=condition, visible_only=True)
+        layers = list(snapshot.layers.all())
+        return (
+            [{name: getattr(layer, name) for name in LAYER_FIELDS} for layer in layers],
+            [
+                # Inherited keyframe objects are drawn in the snapshot's own layer
+                {**{name: getattr(obj, name) for name in OBJECT_FIELDS}, "layer_id": layer.id}
+                for layer in layers
+                for obj in layer.map_objects.all()
+            ],
+        )
+
+    @classmethod
+    def _render_zoom(
+        cls,
+        layers: list[dict[str, Any]],
+        objects: Any,
+        z: int,
+        version: str,
+        only: tuple[int, int] | None = None,
+    ) -> dict[tuple[int, int], dict[str, Any]]:
+        """Tiles of one zoom level that have objects (only tile ``only`` if given)."""
+        scale = 2**z
+        span = cls.TILE_SIZE / scale
+        pad = span * cls.BUFFER / cls.EXTENT
+        tolerance = cls.TOLERANCE_PIXELS / scale
+        min_extent = MapService.MIN_FEATURE_PIXELS / scale
+        point_types = (ObjectType.POINT, ObjectType.ICON, ObjectType.CIRCLE)
+
+        features: dict[tuple[int, int], dict[int, list]] = defaultdict(lambda: defaultdict(list))
+        for obj in objects:
+            is_point = obj["object_type"] in point_types
+            width, height = obj["max_x"] - obj["min_x"], obj["max_y"] - obj["min_y"]
+            if not is_point and max(width, height) < min_extent:
+                continue
+
+            columns = range(
+                math.floor((obj["min_x"] - pad) / span),
+                math.floor((obj["max_x"] + pad) / span) + 1,
+            )
+            # Pixel rows run against map y
+            rows = range(
+                math.floor((-obj["max_y"] - pad) / span),
+                math.floor((-obj["min_y"] + pad) / span) + 1,
+            )
+            if only is not None:
+                if only[0] not in columns or only[1] not in rows:
+                    continue
+                columns, rows = [only[0]], [only[1]]
+
+            runs = [run * (1, -1) for run in parts(obj["coordinates"])]
+            if not is_point:
+                runs = [simplify(run, tolerance) for run in runs]
+            for x in columns:
+                for y in rows:
+                    feature = cls._feature(obj, runs, x * span, y * span, span, pad)
+                    if feature is not None:
+                        features[(x, y)][obj["layer_id"]].append(feature)
+
+        return {
+            (x, y): cls._tile(layers, by_layer, z, x, y, version)
+            for (x, y), by_layer in features.items()
+        }
+
+    @classmethod
+    def _feature(
+        cls,
+        obj: dict[str, Any],
+        runs: list[np.ndarray],
+        origin_x: float,
+        origin_y: float,
+        span: float,
+        pad: float,
+    ) -> dict[str, Any] | None:
+        """
+        An object cut to one tile, or None if nothing of it is left there.
+
+        ``runs`` and ``origin_y`` are in pixel orientation (map ``y`` negated).
+        """
+        bbox = (origin_x - pad, origin_y - pad, origin_x + span + pad, origin_y + span + pad)
+        if obj["object_type"] == ObjectType.POLYGON:
+            runs = [clipped for run in runs if len(clipped := clip_polygon(run, bbox)) >= 3]
+        elif obj["object_type"] == ObjectType.LINE:
+            runs = [piece for run in runs for piece in clip_line(run, bbox)]
+        if not runs:
+            return None
+
+        grid = cls.EXTENT / span
+        origin = np.array([origin_x, origin_y])
+        quantized = [np.rint((run - origin) * grid).astype(np.int64) for run in runs]
+        feature = {
+            "id": obj["id"],
+            "object_type": obj["object_type"],
+            "label": obj["label"],
+            "wiki_entry_id": obj["wiki_entry_id"],
+            "style_json": obj["style_json"],
+            "geometry": encode_points(quantized),
+            "parts": [len(run) for run in quantized],
+        }
+        circle_radius = radius(obj["coordinates"])
+        if circle_radius is not None:
+            feature["radius"] = round(circle_radius * grid)
+        return feature
+
+    @classmethod
+    def _tile(
+        cls,
+        layers: list[dict[str, Any]],
+        by_layer: dict[int, list],
+        z: int,
+        x: int,
+        y: int,
+        version: str,
+    ) -> dict[str, Any]:
+        return {
+            "z": z,
+            "x": x,
+            "y": y,
+            "extent": cls.EXTENT,
+            "version": version,
+            "layers": [
+                {**layer, "objects": by_layer[layer["id"]]}
+                for layer in layers
+                if layer["id"] in by_layer
+            ],
+        }
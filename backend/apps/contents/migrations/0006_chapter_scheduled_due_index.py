@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0005_rename_objects_related_name'),
+        ('novels', '0006_branch_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chapter',
+            index=models.Index(condition=models.Q(('status', 'SCHEDULED')), fields=['scheduled_at'], name='chapters_scheduled_due_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0006_chapter_scheduled_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chapter',
+            name='paragraph_offsets',
+            field=models.JSONField(blank=True, default=list, verbose_name='문단 오프셋'),
+        ),
+    ]
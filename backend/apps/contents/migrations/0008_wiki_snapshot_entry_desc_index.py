@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0007_chapter_paragraph_offsets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wikisnapshot',
+            index=models.Index(fields=['wiki_entry', '-valid_from_chapter'], name='wiki_snapshots_entry_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 04:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0008_wiki_snapshot_entry_desc_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikisnapshot',
+            name='base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='deltas', to='contents.wikisnapshot', verbose_name='기준 키프레임'),
+        ),
+        migrations.AddField(
+            model_name='wikisnapshot',
+            name='delta',
+            field=models.JSONField(blank=True, null=True, verbose_name='변경분'),
+        ),
+        migrations.AlterField(
+            model_name='wikisnapshot',
+            name='content',
+            field=models.TextField(blank=True, verbose_name='내용'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.10 on 2026-10-19 04:13
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from common import line_delta
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def create_search_indexes(apps, schema_editor):
+    """PostgreSQL only: trigram index on entry names, GIN index and backfill of snapshot vectors."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS wiki_entries_name_trgm_idx "
+        "ON wiki_entries USING gin (name gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "UPDATE wiki_snapshots SET search_vector = to_tsvector('simple', content) "
+        "WHERE delta IS NULL"
+    )
+
+    # Delta rows have no stored text: decode them against their keyframe
+    WikiSnapshot = apps.get_model("contents", "WikiSnapshot")
+    rows = (
+        WikiSnapshot.objects.filter(delta__isnull=False)
+        .values_list("id", "base__content", "delta")
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    )
+    with schema_editor.connection.cursor() as cursor:
+        for snapshot_id, base, delta in rows:
+            cursor.execute(
+                "UPDATE wiki_snapshots SET search_vector = to_tsvector('simple', %s) WHERE id = %s",
+                [line_delta.apply(base, delta), snapshot_id],
+            )
+
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS wiki_snapshots_search_idx "
+        "ON wiki_snapshots USING gin (search_vector)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS wiki_snapshots_search_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS wiki_entries_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0009_wiki_snapshot_delta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikisnapshot',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='검색 벡터'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
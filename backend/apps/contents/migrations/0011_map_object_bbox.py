@@ -0,0 +1,58 @@
+# Generated by Django 5.2.10 on 2026-10-19 04:27
+
+from django.db import migrations, models
+
+from apps.contents.map_geometry import BBOX_FIELDS, bbox_fields
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_bboxes(apps, schema_editor):
+    """Bounding boxes of existing objects, computed from their coordinates."""
+    MapObject = apps.get_model("contents", "MapObject")
+    last_id = 0
+    while batch := list(
+        MapObject.objects.filter(id__gt=last_id)
+        .order_by("id")
+        .values_list("id", "coordinates")[:BACKFILL_BATCH_SIZE]
+    ):
+        MapObject.objects.bulk_update(
+            [MapObject(id=pk, **bbox_fields(coordinates)) for pk, coordinates in batch],
+            BBOX_FIELDS,
+        )
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0010_wiki_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mapobject',
+            name='max_x',
+            field=models.FloatField(editable=False, null=True, verbose_name='최대 X'),
+        ),
+        migrations.AddField(
+            model_name='mapobject',
+            name='max_y',
+            field=models.FloatField(editable=False, null=True, verbose_name='최대 Y'),
+        ),
+        migrations.AddField(
+            model_name='mapobject',
+            name='min_x',
+            field=models.FloatField(editable=False, null=True, verbose_name='최소 X'),
+        ),
+        migrations.AddField(
+            model_name='mapobject',
+            name='min_y',
+            field=models.FloatField(editable=False, null=True, verbose_name='최소 Y'),
+        ),
+        migrations.AddIndex(
+            model_name='mapobject',
+            index=models.Index(fields=['layer', 'min_x', 'max_x', 'min_y', 'max_y'], name='map_objects_layer_bbox_idx'),
+        ),
+        migrations.RunPython(backfill_bboxes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-19 04:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0011_map_object_bbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maplayer',
+            name='key',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name='식별 키'),
+        ),
+        migrations.AddField(
+            model_name='mapobject',
+            name='is_removed',
+            field=models.BooleanField(default=False, editable=False, verbose_name='삭제 표시'),
+        ),
+        migrations.AddField(
+            model_name='mapobject',
+            name='key',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name='식별 키'),
+        ),
+        migrations.AddField(
+            model_name='mapsnapshot',
+            name='base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='deltas', to='contents.mapsnapshot', verbose_name='기준 키프레임'),
+        ),
+    ]
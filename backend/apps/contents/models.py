@@ -1,6 +1,8 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from common import line_delta
 from common.models import BaseModel
 
 
@@ -39,12 +41,26 @@ class Chapter(BaseModel):
     like_count = models.BigIntegerField("좋아요 수", default=0)
     comment_count = models.IntegerField("댓글 수", default=0)
 
+    # content_html에서 각 최상위 블록(문단)이 시작하는 문자 오프셋
+    paragraph_offsets = models.JSONField("문단 오프셋", default=list, blank=True)
+
+    # 본문 컬럼: 목록/요약 조회(ChapterListSerializer 등)에서는 defer한다.
+    HEAVY_FIELDS = ("content", "content_html", "paragraph_offsets")
+
     class Meta:
         db_table = "chapters"
         verbose_name = "회차"
         verbose_name_plural = "회차들"
         unique_together = ["branch", "chapter_number"]
         ordering = ["chapter_number"]
+        indexes = [
+            # Due-chapter sweep of publish_scheduled_chapters
+            models.Index(
+                fields=["scheduled_at"],
+                condition=models.Q(status=ChapterStatus.SCHEDULED),
+                name="chapters_scheduled_due_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.branch.name} - {self.chapter_number}화: {self.title}"
@@ -101,6 +117,9 @@ class WikiEntry(BaseModel):
     hidden_note = models.TextField("작가 노트 (비공개)", blank=True)
     ai_metadata = models.JSONField("AI 메타데이터", null=True, blank=True)
 
+    # 상세 전용 컬럼: 목록 조회(WikiEntryListSerializer)에서는 defer한다.
+    HEAVY_FIELDS = ("hidden_note", "ai_metadata")
+
     # M2M 태그 관계
     tags = models.ManyToManyField(
         WikiTagDefinition,
@@ -121,11 +140,27 @@ class WikiEntry(BaseModel):
 
 
 class WikiSnapshot(BaseModel):
-    """위키 스냅샷 (회차별 버전)"""
+    """
+    위키 스냅샷 (회차별 버전)
+
+    키프레임은 ``content``에 전체 내용을 저장하고, 나머지는 같은 항목의 앞선 키프레임(``base``)에
+    대한 줄 단위 변경분(``delta``)만 저장합니다 (WikiSnapshotHistory 참고). 내용은 ``text``로 읽습니다.
+    """
 
     wiki_entry = models.ForeignKey(WikiEntry, on_delete=models.CASCADE, related_name="snapshots")
 
-    content = models.TextField("내용")
+    content = models.TextField("내용", blank=True)
+    base = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.RESTRICT,
+        related_name="deltas",
+        verbose_name="기준 키프레임",
+    )
+    delta = models.JSONField("변경분", null=True, blank=True)
+    # tsvector of the decoded text (PostgreSQL only), maintained by WikiSearchService
+    search_vector = SearchVectorField("검색 벡터", null=True, editable=False)
     valid_from_chapter = models.IntegerField("유효 시작 회차")
     contributor_type = models.CharField(
         "기여자 유형",
@@ -141,16 +176,44 @@ class WikiSnapshot(BaseModel):
         related_name="wiki_contributions",
     )
 
+    # 검색 전용 컬럼: 스냅샷 조회에서는 defer한다.
+    HEAVY_FIELDS = ("search_vector",)
+
     class Meta:
         db_table = "wiki_snapshots"
         verbose_name = "위키 스냅샷"
         verbose_name_plural = "위키 스냅샷들"
         unique_together = [["wiki_entry", "valid_from_chapter"]]
         ordering = ["valid_from_chapter"]
+        indexes = [
+            # DISTINCT ON (wiki_entry_id) lookup of the latest snapshot per entry
+            models.Index(
+                fields=["wiki_entry", "-valid_from_chapter"],
+                name="wiki_snapshots_entry_desc_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.wiki_entry.name} - 회차 {self.valid_from_chapter}~"
 
+    @property
+    def is_keyframe(self) -> bool:
+        return self.delta is None
+
+    @property
+    def text(self) -> str:
+        """
+        Full content of this version.
+
+        Delta rows are decoded against ``base`` (one query unless the text was
+        filled in by ``WikiSnapshotHistory.materialize``).
+        """
+        if self.delta is None:
+            return self.content
+        if "_text" not in self.__dict__:
+            self._text = line_delta.apply(self.base.content, self.delta)
+        return self._text
+
 
 class LayerType(models.TextChoices):
     """지도 레이어 타입"""
@@ -203,12 +266,25 @@ class Map(BaseModel):
 
 
 class MapSnapshot(BaseModel):
-    """지도 스냅샷 (회차별 버전)"""
+    """
+    지도 스냅샷 (회차별 버전)
+
+    키프레임(``base`` 없음)은 레이어와 오브젝트를 모두 저장하고, 델타 스냅샷은 자기 레이어와
+    키프레임(``base``)에서 바뀐 오브젝트(추가/수정/삭제 표시)만 저장합니다 (MapSnapshotHistory 참고).
+    """
 
     map = models.ForeignKey(Map, on_delete=models.CASCADE, related_name="snapshots")
 
     valid_from_chapter = models.IntegerField("유효 시작 회차")
     base_image_url = models.URLField("기본 이미지 URL", max_length=500, blank=True)
+    base = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.RESTRICT,
+        related_name="deltas",
+        verbose_name="기준 키프레임",
+    )
 
     class Meta:
         db_table = "map_snapshots"
@@ -234,6 +310,9 @@ class MapLayer(BaseModel):
     is_visible = models.BooleanField("표시 여부", default=True)
     style_json = models.JSONField("스타일 JSON", null=True, blank=True)
 
+    # 스냅샷을 넘어 같은 레이어를 가리키는 식별자 (처음 만든 행의 ID, NULL이면 자기 ID)
+    key = models.BigIntegerField("식별 키", null=True, blank=True, editable=False)
+
     class Meta:
         db_table = "map_layers"
         verbose_name = "지도 레이어"
@@ -243,6 +322,10 @@ class MapLayer(BaseModel):
     def __str__(self) -> str:
         return f"{self.snapshot.map.name} - {self.name}"
 
+    @property
+    def identity(self) -> int:
+        return self.key or self.id
+
 
 class MapObject(BaseModel):
     """지도 오브젝트"""
@@ -267,11 +350,33 @@ class MapObject(BaseModel):
 
     style_json = models.JSONField("스타일 JSON", null=True, blank=True)
 
+    # 스냅샷을 넘어 같은 오브젝트를 가리키는 식별자 (처음 만든 행의 ID, NULL이면 자기 ID)
+    key = models.BigIntegerField("식별 키", null=True, blank=True, editable=False)
+    # 델타 스냅샷에서 키프레임의 오브젝트(같은 key)를 지운 표시
+    is_removed = models.BooleanField("삭제 표시", default=False, editable=False)
+
+    # coordinates의 경계 상자 (뷰포트 조회용, map_geometry.bbox_fields로 계산; 알 수 없으면 NULL)
+    min_x = models.FloatField("최소 X", null=True, editable=False)
+    min_y = models.FloatField("최소 Y", null=True, editable=False)
+    max_x = models.FloatField("최대 X", null=True, editable=False)
+    max_y = models.FloatField("최대 Y", null=True, editable=False)
+
     class Meta:
         db_table = "map_objects"
         verbose_name = "지도 오브젝트"
         verbose_name_plural = "지도 오브젝트들"
         ordering = ["id"]
+        indexes = [
+            # Viewport queries: a layer's objects whose bounding box meets the screen
+            models.Index(
+                fields=["layer", "min_x", "max_x", "min_y", "max_y"],
+                name="map_objects_layer_bbox_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.layer.name} - {self.label or self.object_type}"
+
+    @property
+    def identity(self) -> int:
+        return self.key or self.id
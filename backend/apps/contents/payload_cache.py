@@ -0,0 +1,86 @@
+"""
+ChapterPayloadCache - Pre-rendered response bodies for published chapters.
+
+A published chapter's body is immutable (ChapterService.update forbids content
+edits after publish), so the expensive part of the detail response - serializing
+``content_html`` and camelCasing it - only has to happen once per
+``(chapter id, updated_at)``. The rendered JSON is stored zlib-compressed in the
+cache. Fields that change without touching ``updated_at`` (counters, prev/next)
+or that depend on the requesting user are rendered separately and spliced into
+the cached object on every request.
+"""
+
+import zlib
+from typing import Any
+
+from django.core.cache import cache
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from apps.contents.models import Chapter
+from apps.contents.serializers import ChapterPayloadSerializer
+
+
+class ChapterPayloadCache:
+    """Cache of compressed, pre-rendered chapter bodies."""
+
+    CACHE_KEY = "chapter_payload:{chapter_id}:{stamp}"
+    COMPRESS_LEVEL = 6
+
+    # Size-aware retention: small bodies stay long, large bodies expire quickly
+    # so a handful of huge chapters cannot crowd hot ones out of Redis.
+    TIMEOUT = 24 * 60 * 60  # 24 hours
+    LARGE_TIMEOUT = 60 * 60  # 1 hour
+    LARGE_PAYLOAD_BYTES = 64 * 1024
+    MAX_PAYLOAD_BYTES = 1024 * 1024  # compressed bodies above this are not cached
+
+    @classmethod
+    def _get_key(cls, chapter: Chapter) -> str:
+        stamp = int(chapter.updated_at.timestamp() * 1_000_000)
+        return cls.CACHE_KEY.format(chapter_id=chapter.id, stamp=stamp)
+
+    @staticmethod
+    def _render(data: Any) -> bytes:
+        return CamelCaseJSONRenderer().render(data)
+
+    @classmethod
+    def get_body(cls, chapter: Chapter) -> bytes:
+        """
+        발행된 회차의 정적 본문 JSON(camelCase)을 반환합니다. 캐시에 없으면 직렬화 후 압축하여 저장합니다.
+
+        Parameters:
+            chapter (Chapter): 발행된 Chapter 인스턴스. content_html은 지연 로딩되어도 된다.
+
+        Returns:
+            bytes: 렌더링된 JSON 객체 바이트
+        """
+        key = cls._get_key(chapter)
+        compressed = cache.get(key)
+        if compressed is not None:
+            return zlib.decompress(compressed)
+
+        body = cls._render(ChapterPayloadSerializer(chapter).data)
+        compressed = zlib.compress(body, cls.COMPRESS_LEVEL)
+        size = len(compressed)
+        if size <= cls.MAX_PAYLOAD_BYTES:
+            timeout = cls.TIMEOUT if size < cls.LARGE_PAYLOAD_BYTES else cls.LARGE_TIMEOUT
+            cache.set(key, compressed, timeout)
+        return body
+
+    @classmethod
+    def render(cls, chapter: Chapter, extra: dict[str, Any]) -> bytes:
+        """
+        캐시된 본문에 요청별 필드(`extra`)를 병합한 JSON 객체 바이트를 반환합니다.
+
+        본문은 다시 직렬화하지 않고, 닫는 중괄호 앞에 `extra`의 렌더링 결과를 이어 붙입니다.
+
+        Parameters:
+            chapter (Chapter): 발행된 Chapter 인스턴스
+            extra (dict): 조회수/이전·다음 회차/사용자별 상태 등 본문과 별도로 렌더링할 필드
+
+        Returns:
+            bytes: 병합된 JSON 객체 바이트
+        """
+        body = cls.get_body(chapter)
+        if not extra:
+            return body
+        return body[:-1] + b"," + cls._render(extra)[1:]
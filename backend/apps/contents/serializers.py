@@ -10,10 +10,10 @@ Contains serializers for:
 
 from rest_framework import serializers
 
+from .map_tiles import MapTileService
 from .models import (
     AccessType,
     Chapter,
-    ChapterStatus,
     Map,
     MapLayer,
     MapObject,
@@ -39,6 +39,37 @@ class ChapterCreateSerializer(serializers.Serializer):
     price = serializers.IntegerField(required=False, default=0)
 
 
+class ChapterImportSerializer(serializers.Serializer):
+    """Serializer for a bulk chapter import upload."""
+
+    file = serializers.FileField()
+    publish = serializers.BooleanField(required=False, default=False)
+
+
+class ChapterImportJobSerializer(serializers.Serializer):
+    """Progress of a bulk chapter import job."""
+
+    job_id = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    imported = serializers.IntegerField(read_only=True)
+    error = serializers.CharField(read_only=True, required=False)
+
+
+class ChapterExportSerializer(serializers.Serializer):
+    """Serializer for requesting a branch export."""
+
+    format = serializers.ChoiceField(choices=["epub", "zip"], default="epub")
+
+
+class ChapterExportJobSerializer(serializers.Serializer):
+    """Status of a branch export job."""
+
+    job_id = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    format = serializers.CharField(read_only=True)
+    error = serializers.CharField(read_only=True, required=False)
+
+
 class ChapterNavSerializer(serializers.Serializer):
     """Minimal serializer for prev/next navigation."""
 
@@ -46,11 +77,63 @@ class ChapterNavSerializer(serializers.Serializer):
     title = serializers.CharField(read_only=True)
 
 
-class ChapterDetailSerializer(serializers.ModelSerializer):
-    """Serializer for chapter detail view."""
+class ChapterTocSerializer(serializers.Serializer):
+    """Compact table-of-contents entry."""
 
-    prev_chapter = serializers.SerializerMethodField()
-    next_chapter = serializers.SerializerMethodField()
+    id = serializers.IntegerField(read_only=True)
+    chapter_number = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+
+
+class ChapterWikiSpanSerializer(serializers.Serializer):
+    """Occurrence of a wiki entry name in a paragraph's text content."""
+
+    paragraph = serializers.IntegerField(read_only=True)
+    start = serializers.IntegerField(read_only=True)
+    end = serializers.IntegerField(read_only=True)
+    wiki_id = serializers.IntegerField(read_only=True)
+
+
+class ChapterWikiRefSerializer(serializers.Serializer):
+    """Wiki entry mentioned in a chapter."""
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+
+
+class ChapterWikiHighlightSerializer(serializers.Serializer):
+    """Wiki keyword highlights of a chapter."""
+
+    spans = ChapterWikiSpanSerializer(many=True, read_only=True)
+    wikis = ChapterWikiRefSerializer(many=True, read_only=True)
+
+
+class ChapterParagraphSerializer(serializers.Serializer):
+    """One paragraph (top-level block) of a chapter's rendered HTML."""
+
+    index = serializers.IntegerField(read_only=True)
+    html = serializers.CharField(read_only=True)
+
+
+class ChapterParagraphWindowSerializer(serializers.Serializer):
+    """A window of paragraphs plus the chapter's total paragraph count."""
+
+    total = serializers.IntegerField(read_only=True)
+    paragraphs = ChapterParagraphSerializer(many=True, read_only=True)
+
+
+# Detail fields that change without touching updated_at (counters, navigation).
+CHAPTER_LIVE_FIELDS = [
+    "view_count",
+    "like_count",
+    "comment_count",
+    "prev_chapter",
+    "next_chapter",
+]
+
+
+class ChapterPayloadSerializer(serializers.ModelSerializer):
+    """Immutable part of the chapter detail view (cached pre-rendered for published chapters)."""
 
     class Meta:
         model = Chapter
@@ -65,47 +148,63 @@ class ChapterDetailSerializer(serializers.ModelSerializer):
             "price",
             "scheduled_at",
             "published_at",
-            "view_count",
-            "like_count",
-            "comment_count",
             "created_at",
             "updated_at",
-            "prev_chapter",
-            "next_chapter",
         ]
         read_only_fields = fields
 
+
+class ChapterDetailSerializer(serializers.ModelSerializer):
+    """Serializer for chapter detail view."""
+
+    prev_chapter = serializers.SerializerMethodField()
+    next_chapter = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Chapter
+        fields = ChapterPayloadSerializer.Meta.fields + CHAPTER_LIVE_FIELDS
+        read_only_fields = fields
+
+    def _get_neighbors(self, obj: Chapter) -> tuple[dict | None, dict | None]:
+        """Look up prev/next entries once per chapter from the branch navigation index."""
+        from .services import ChapterNavigationService
+
+        neighbors = self.__dict__.setdefault("_neighbors", {})
+        if obj.id not in neighbors:
+            neighbors[obj.id] = ChapterNavigationService.get_neighbors(
+                obj.branch_id, obj.chapter_number
+            )
+        return neighbors[obj.id]
+
     def get_prev_chapter(self, obj: Chapter) -> dict | None:
         """Get previous chapter navigation info."""
-        prev_chapter = (
-            Chapter.objects.filter(
-                branch_id=obj.branch_id,
-                chapter_number__lt=obj.chapter_number,
-                status=ChapterStatus.PUBLISHED,
-            )
-            .order_by("-chapter_number")
-            .first()
-        )
+        prev_chapter, _ = self._get_neighbors(obj)
         if prev_chapter:
             return ChapterNavSerializer(prev_chapter).data
         return None
 
     def get_next_chapter(self, obj: Chapter) -> dict | None:
         """Get next chapter navigation info."""
-        next_chapter = (
-            Chapter.objects.filter(
-                branch_id=obj.branch_id,
-                chapter_number__gt=obj.chapter_number,
-                status=ChapterStatus.PUBLISHED,
-            )
-            .order_by("chapter_number")
-            .first()
-        )
+        _, next_chapter = self._get_neighbors(obj)
         if next_chapter:
             return ChapterNavSerializer(next_chapter).data
         return None
 
 
+class ChapterLiveSerializer(ChapterDetailSerializer):
+    """Per-request fields merged into a cached ChapterPayloadSerializer body."""
+
+    unique_readers = serializers.SerializerMethodField()
+
+    class Meta(ChapterDetailSerializer.Meta):
+        fields = [*CHAPTER_LIVE_FIELDS, "unique_readers"]
+        read_only_fields = fields
+
+    def get_unique_readers(self, obj: Chapter) -> int | None:
+        """Unique-reader estimate recorded with this read (``unique_readers`` in context)."""
+        return self.context.get("unique_readers")
+
+
 class ChapterListSerializer(serializers.ModelSerializer):
     """Serializer for chapter list view (summary)."""
 
@@ -179,6 +278,9 @@ class WikiTagDefinitionCreateSerializer(serializers.Serializer):
 class WikiSnapshotSerializer(serializers.ModelSerializer):
     """Serializer for WikiSnapshot."""
 
+    # Full text, decoded for delta-encoded snapshots
+    content = serializers.CharField(source="text", read_only=True)
+
     class Meta:
         model = WikiSnapshot
         fields = [
@@ -186,11 +288,40 @@ class WikiSnapshotSerializer(serializers.ModelSerializer):
             "content",
             "valid_from_chapter",
             "contributor_type",
+            "contributor",
             "created_at",
         ]
         read_only_fields = fields
 
 
+class WikiSnapshotDiffHunkSerializer(serializers.Serializer):
+    """Changed line range between two snapshot versions (0-based, end exclusive)."""
+
+    tag = serializers.ChoiceField(choices=["replace", "delete", "insert"], read_only=True)
+    old_start = serializers.IntegerField(read_only=True)
+    old_end = serializers.IntegerField(read_only=True)
+    new_start = serializers.IntegerField(read_only=True)
+    new_end = serializers.IntegerField(read_only=True)
+    removed = serializers.ListField(child=serializers.CharField(), read_only=True)
+    added = serializers.ListField(child=serializers.CharField(), read_only=True)
+
+
+class WikiSnapshotDiffSerializer(serializers.Serializer):
+    """Line diff between two snapshot versions of a wiki entry."""
+
+    from_chapter = serializers.IntegerField(source="old.valid_from_chapter", read_only=True)
+    to_chapter = serializers.IntegerField(source="new.valid_from_chapter", read_only=True)
+    hunks = WikiSnapshotDiffHunkSerializer(many=True, read_only=True)
+
+
+class SnapshotIntervalSerializer(serializers.Serializer):
+    """Chapters a snapshot is valid for (``valid_until_chapter`` is None for the last one)."""
+
+    id = serializers.IntegerField(read_only=True)
+    valid_from_chapter = serializers.IntegerField(read_only=True)
+    valid_until_chapter = serializers.IntegerField(read_only=True, allow_null=True)
+
+
 class WikiSnapshotCreateSerializer(serializers.Serializer):
     """Serializer for creating a snapshot."""
 
@@ -216,6 +347,38 @@ class WikiEntryListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class WikiEntryAtChapterSerializer(WikiEntryListSerializer):
+    """Wiki list entry with the snapshot valid at the reader's chapter."""
+
+    snapshot = WikiSnapshotSerializer(source="snapshot_at_chapter", read_only=True, allow_null=True)
+
+    class Meta(WikiEntryListSerializer.Meta):
+        fields = [*WikiEntryListSerializer.Meta.fields, "snapshot"]
+        read_only_fields = fields
+
+
+class WikiSearchResultSerializer(serializers.Serializer):
+    """Wiki search hit with a highlighted excerpt of its snapshot (HTML, ``<mark>``)."""
+
+    id = serializers.IntegerField(source="entry.id", read_only=True)
+    name = serializers.CharField(source="entry.name", read_only=True)
+    image_url = serializers.CharField(source="entry.image_url", read_only=True)
+    first_appearance = serializers.IntegerField(
+        source="entry.first_appearance", read_only=True, allow_null=True
+    )
+    score = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+
+class WikiTimelineSerializer(serializers.Serializer):
+    """Snapshot validity table of a wiki entry, for scrubbing chapters client-side."""
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    first_appearance = serializers.IntegerField(read_only=True, allow_null=True)
+    snapshots = SnapshotIntervalSerializer(many=True, read_only=True)
+
+
 class WikiEntryDetailSerializer(serializers.ModelSerializer):
     """Serializer for wiki detail view."""
 
@@ -246,7 +409,15 @@ class WikiEntryDetailSerializer(serializers.ModelSerializer):
         if chapter is not None:
             from .services import WikiService
 
-            snapshot = WikiService.get_snapshot_for_chapter(obj.id, chapter)
+            if "snapshots" in getattr(obj, "_prefetched_objects_cache", {}):
+                # Resolve from the prefetched snapshots instead of another query
+                snapshot = max(
+                    (s for s in obj.snapshots.all() if s.valid_from_chapter <= chapter),
+                    key=lambda s: s.valid_from_chapter,
+                    default=None,
+                )
+            else:
+                snapshot = WikiService.get_snapshot_for_chapter(obj.id, chapter)
             if snapshot:
                 return WikiSnapshotSerializer(snapshot).data
         return None
@@ -285,10 +456,14 @@ class WikiTagUpdateSerializer(serializers.Serializer):
 class MapObjectSerializer(serializers.ModelSerializer):
     """Serializer for map object."""
 
+    # Stable across snapshots that continue one another (see MapSnapshotHistory)
+    key = serializers.IntegerField(source="identity", read_only=True)
+
     class Meta:
         model = MapObject
         fields = [
             "id",
+            "key",
             "object_type",
             "coordinates",
             "label",
@@ -311,15 +486,42 @@ class MapObjectCreateSerializer(serializers.Serializer):
     style_json = serializers.JSONField(required=False, allow_null=True)
 
 
+class MapImportSerializer(serializers.Serializer):
+    """Serializer for a GeoJSON FeatureCollection upload into a layer."""
+
+    file = serializers.FileField()
+
+
+class MapImportResultSerializer(serializers.Serializer):
+    """Objects created or updated by a GeoJSON import, in feature order."""
+
+    created = serializers.IntegerField(read_only=True)
+    updated = serializers.IntegerField(read_only=True)
+    objects = MapObjectSerializer(many=True, read_only=True)
+
+
+class MapForkJobSerializer(serializers.Serializer):
+    """Progress of copying a parent branch's maps into a fork."""
+
+    job_id = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    copied = serializers.IntegerField(read_only=True)
+    total = serializers.IntegerField(read_only=True)
+    maps = serializers.IntegerField(read_only=True, required=False)
+    error = serializers.CharField(read_only=True, required=False)
+
+
 class MapLayerSerializer(serializers.ModelSerializer):
     """Serializer for map layer."""
 
     objects = MapObjectSerializer(source="map_objects", many=True, read_only=True)
+    key = serializers.IntegerField(source="identity", read_only=True)
 
     class Meta:
         model = MapLayer
         fields = [
             "id",
+            "key",
             "name",
             "layer_type",
             "z_index",
@@ -345,6 +547,7 @@ class MapSnapshotSerializer(serializers.ModelSerializer):
     """Serializer for map snapshot."""
 
     layers = MapLayerSerializer(many=True, read_only=True)
+    tile_version = serializers.SerializerMethodField()
 
     class Meta:
         model = MapSnapshot
@@ -353,16 +556,22 @@ class MapSnapshotSerializer(serializers.ModelSerializer):
             "valid_from_chapter",
             "base_image_url",
             "layers",
+            "tile_version",
             "created_at",
         ]
         read_only_fields = fields
 
+    def get_tile_version(self, obj: MapSnapshot) -> str:
+        """Value of ``v`` for this snapshot's tile URLs (changes with every layer/object edit)."""
+        return MapTileService.version(obj.updated_at)
+
 
 class MapSnapshotCreateSerializer(serializers.Serializer):
     """Serializer for creating a map snapshot."""
 
     valid_from_chapter = serializers.IntegerField()
     base_image_url = serializers.URLField(required=False, default="", max_length=500)
+    copy_previous = serializers.BooleanField(required=False, default=False)
 
 
 class MapListSerializer(serializers.ModelSerializer):
@@ -381,6 +590,35 @@ class MapListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class MapTimelineSerializer(serializers.Serializer):
+    """Snapshot validity table of a map, for scrubbing chapters client-side."""
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    snapshots = SnapshotIntervalSerializer(many=True, read_only=True)
+
+
+class MapTileSerializer(serializers.Serializer):
+    """One z/x/y tile of a map snapshot (see MapTileService for the geometry encoding)."""
+
+    z = serializers.IntegerField(read_only=True)
+    x = serializers.IntegerField(read_only=True)
+    y = serializers.IntegerField(read_only=True)
+    extent = serializers.IntegerField(read_only=True)
+    version = serializers.CharField(read_only=True)
+    layers = serializers.ListField(child=serializers.DictField(), read_only=True)
+
+
+class MapScrubSerializer(serializers.Serializer):
+    """Map state at the start of a chapter range and the changes of each snapshot in it."""
+
+    map_id = serializers.IntegerField(read_only=True)
+    from_chapter = serializers.IntegerField(read_only=True)
+    to_chapter = serializers.IntegerField(read_only=True)
+    keyframe = serializers.DictField(read_only=True, allow_null=True)
+    deltas = serializers.ListField(child=serializers.DictField(), read_only=True)
+
+
 class MapDetailSerializer(serializers.ModelSerializer):
     """Serializer for map detail view."""
 
@@ -409,7 +647,9 @@ class MapDetailSerializer(serializers.ModelSerializer):
         if chapter is not None:
             from .map_services import MapService
 
-            snapshot = MapService.get_snapshot_for_chapter(obj.id, chapter)
+            snapshot = MapService.get_snapshot_for_chapter(
+                obj.id, chapter, cap=self.context.get("cap")
+            )
             if snapshot:
                 return MapSnapshotSerializer(snapshot).data
         return None
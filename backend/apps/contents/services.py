@@ -1,17 +1,27 @@
 """
 ChapterService - Business logic for Chapter management.
+ChapterNavigationService - Cached prev/next/TOC index of published chapters.
 WikiService - Business logic for Wiki management.
 """
 
 import builtins
+import logging
 import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from datetime import datetime
+from html.parser import HTMLParser
+from itertools import islice
 
 import markdown
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.db import connection, transaction
 from django.db.models import F, Prefetch, Q, QuerySet
+from django.db.models.functions import Substr
 from django.utils import timezone
 
+from apps.contents.lineage import BranchLineage
 from apps.contents.models import (
     AccessType,
     Chapter,
@@ -21,8 +31,13 @@ from apps.contents.models import (
     WikiSnapshot,
     WikiTagDefinition,
 )
+from apps.contents.snapshot_index import SnapshotIntervalIndex
+from apps.contents.wiki_history import WikiSnapshotHistory
 from apps.novels.models import Branch
 from apps.users.models import User
+from common.db import bulk_increment
+
+logger = logging.getLogger(__name__)
 
 
 class ChapterService:
@@ -65,6 +80,7 @@ class ChapterService:
             title=title,
             content=content,
             content_html=content_html,
+            paragraph_offsets=self.compute_paragraph_offsets(content_html),
             word_count=word_count,
             status=ChapterStatus.DRAFT,
             access_type=access_type,
@@ -108,6 +124,7 @@ class ChapterService:
         if content is not None:
             chapter.content = content
             chapter.content_html = self.convert_markdown(content)
+            chapter.paragraph_offsets = self.compute_paragraph_offsets(chapter.content_html)
             chapter.word_count = self.calculate_word_count(content)
 
         if access_type is not None:
@@ -117,6 +134,12 @@ class ChapterService:
             chapter.price = price
 
         chapter.save()
+
+        if chapter.status == ChapterStatus.PUBLISHED:
+            Branch.bump_version(chapter.branch_id)
+            if title is not None:
+                ChapterNavigationService.invalidate(chapter.branch_id)
+
         return chapter
 
     def publish(self, chapter: Chapter) -> Chapter:
@@ -143,10 +166,33 @@ class ChapterService:
         branch = chapter.branch
         branch.chapter_count = F("chapter_count") + 1
         branch.version = F("version") + 1
-        branch.save(update_fields=["chapter_count", "version"])
+        branch.updated_at = timezone.now()
+        branch.save(update_fields=["chapter_count", "version", "updated_at"])
+
+        ChapterNavigationService.invalidate(chapter.branch_id)
 
         return chapter
 
+    def delete(self, chapter: Chapter) -> None:
+        """
+        회차를 삭제합니다. 발행된 회차였다면 브랜치의 회차 수와 버전을 갱신하고 내비게이션 인덱스를 무효화합니다.
+
+        Parameters:
+            chapter (Chapter): 삭제할 Chapter 인스턴스
+        """
+        was_published = chapter.status == ChapterStatus.PUBLISHED
+        branch_id = chapter.branch_id
+
+        chapter.delete()
+
+        if was_published:
+            Branch.objects.filter(id=branch_id).update(
+                chapter_count=F("chapter_count") - 1,
+                version=F("version") + 1,
+                updated_at=timezone.now(),
+            )
+            ChapterNavigationService.invalidate(branch_id)
+
     def schedule(self, chapter: Chapter, scheduled_at: datetime) -> Chapter:
         """
         Schedule a chapter for future publication.
@@ -171,21 +217,94 @@ class ChapterService:
         chapter.scheduled_at = scheduled_at
         chapter.save()
 
+        transaction.on_commit(lambda: self._enqueue_publish(chapter.id, scheduled_at))
+
         return chapter
 
-    def retrieve(self, branch_id: int, chapter_number: int) -> Chapter | None:
+    @staticmethod
+    def _enqueue_publish(chapter_id: int, scheduled_at: datetime) -> None:
+        """Queue an ETA task for the exact publish time; the periodic sweep is the fallback."""
+        from apps.contents.tasks import publish_scheduled_chapter
+
+        try:
+            publish_scheduled_chapter.apply_async(args=[chapter_id], eta=scheduled_at)
+        except Exception as e:  # broker unavailable
+            logger.warning(f"Failed to enqueue publish of chapter {chapter_id}: {e}")
+
+    def publish_due(self, chapter_ids: builtins.list[int] | None = None) -> int:
+        """
+        예약 시간이 지난 SCHEDULED 회차를 한 번의 UPDATE로 일괄 발행합니다.
+
+        브랜치의 chapter_count/version 갱신은 브랜치별로 합산하여 반영하므로,
+        같은 시각에 수백 개 회차가 공개되어도 쿼리 수는 브랜치 수가 아닌 배치 수에 비례합니다.
+
+        Parameters:
+            chapter_ids (list[int] | None): 지정하면 해당 회차만 대상으로 한다 (ETA 작업용).
+
+        Returns:
+            int: 발행된 회차 수
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            rows = self._publish_due_rows(now, chapter_ids)
+            published_per_branch = Counter(branch_id for _, branch_id in rows)
+            bulk_increment(Branch, "chapter_count", published_per_branch)
+            Branch.objects.filter(id__in=published_per_branch).update(
+                version=F("version") + 1, updated_at=now
+            )
+
+        for branch_id in published_per_branch:
+            ChapterNavigationService.invalidate(branch_id)
+
+        return len(rows)
+
+    @staticmethod
+    def _publish_due_rows(
+        now: datetime, chapter_ids: builtins.list[int] | None
+    ) -> builtins.list[tuple[int, int]]:
+        """Flip due chapters to PUBLISHED and return their ``(id, branch_id)`` pairs."""
+        due = Chapter.objects.filter(status=ChapterStatus.SCHEDULED, scheduled_at__lte=now)
+        if chapter_ids is not None:
+            due = due.filter(id__in=chapter_ids)
+
+        if connection.vendor == "postgresql":
+            # Single UPDATE ... RETURNING; rows locked by a concurrent run are skipped.
+            locked = due.select_for_update(skip_locked=True).values("id")
+            sql, params = locked.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {Chapter._meta.db_table} "
+                    "SET status = %s, published_at = %s, updated_at = %s "
+                    f"WHERE id IN ({sql}) RETURNING id, branch_id",
+                    [ChapterStatus.PUBLISHED, now, now, *params],
+                )
+                return cursor.fetchall()
+
+        rows = builtins.list(due.select_for_update().values_list("id", "branch_id"))
+        Chapter.objects.filter(id__in=[chapter_id for chapter_id, _ in rows]).update(
+            status=ChapterStatus.PUBLISHED, published_at=now, updated_at=now
+        )
+        return rows
+
+    def retrieve(
+        self, branch_id: int, chapter_number: int, defer_body: bool = False
+    ) -> Chapter | None:
         """
         Retrieve a chapter by branch and chapter number.
 
         Args:
             branch_id: Branch ID
             chapter_number: Chapter number within branch
+            defer_body: Defer content/content_html (loaded on first access)
 
         Returns:
             Chapter instance or None if not found
         """
+        qs = Chapter.objects.select_related("branch")
+        if defer_body:
+            qs = qs.defer(*Chapter.HEAVY_FIELDS)
         try:
-            return Chapter.objects.get(branch_id=branch_id, chapter_number=chapter_number)
+            return qs.get(branch_id=branch_id, chapter_number=chapter_number)
         except Chapter.DoesNotExist:
             return None
 
@@ -198,9 +317,13 @@ class ChapterService:
             published_only (bool): True이면 공개 상태(PUBLISHED)인 챕터만 포함한다.
         
         Returns:
-            QuerySet[Chapter]: chapter_number 순으로 정렬된 챕터 쿼리셋.
+            QuerySet[Chapter]: chapter_number 순으로 정렬된 챕터 쿼리셋. 본문 컬럼은 로드하지 않는다.
         """
-        qs = Chapter.objects.filter(branch_id=branch_id).order_by("chapter_number")
+        qs = (
+            Chapter.objects.filter(branch_id=branch_id)
+            .defer(*Chapter.HEAVY_FIELDS)
+            .order_by("chapter_number")
+        )
 
         if published_only:
             qs = qs.filter(status=ChapterStatus.PUBLISHED)
@@ -217,6 +340,63 @@ class ChapterService:
         md = markdown.Markdown(extensions=["extra", "codehilite", "toc"])
         return md.convert(content)
 
+    @staticmethod
+    def compute_paragraph_offsets(content_html: str) -> builtins.list[int]:
+        """
+        content_html에서 최상위 블록 요소(문단, 제목, 코드 블록 등)가 시작하는 문자 오프셋 목록을 계산합니다.
+
+        i번째 문단의 HTML은 ``content_html[offsets[i]:offsets[i + 1]]``(마지막 문단은 끝까지)이며,
+        문단 댓글의 paragraph_index와 같은 번호 체계를 사용합니다.
+        """
+        return _ParagraphOffsetParser.parse(content_html)
+
+    def get_paragraph_window(self, chapter: Chapter, start: int, count: int) -> builtins.list[dict]:
+        """
+        회차의 [start, start + count) 범위 문단 HTML을 반환합니다.
+
+        본문 전체를 읽지 않고 해당 범위의 문자열만 DB에서 잘라(SUBSTR) 가져옵니다.
+        오프셋이 아직 계산되지 않은 회차(이전 데이터)는 이 시점에 계산하여 저장합니다.
+
+        Parameters:
+            chapter (Chapter): 대상 회차. paragraph_offsets가 로드되어 있어야 합니다.
+            start (int): 시작 문단 인덱스.
+            count (int): 가져올 문단 수.
+
+        Returns:
+            list[dict]: ``{"index", "html"}`` 목록.
+        """
+        offsets = chapter.paragraph_offsets
+        if not offsets:
+            html = Chapter.objects.values_list("content_html", flat=True).get(pk=chapter.pk)
+            offsets = self.compute_paragraph_offsets(html)
+            if offsets:
+                Chapter.objects.filter(pk=chapter.pk).update(paragraph_offsets=offsets)
+                chapter.paragraph_offsets = offsets
+
+        window = offsets[start : start + count]
+        if not window:
+            return []
+
+        begin = window[0]
+        end = offsets[start + count] if start + count < len(offsets) else None
+        html_field = (
+            Substr("content_html", begin + 1, end - begin)
+            if end is not None
+            else Substr("content_html", begin + 1)
+        )
+        html = (
+            Chapter.objects.filter(pk=chapter.pk)
+            .annotate(window=html_field)
+            .values_list("window", flat=True)
+            .get()
+        )
+
+        bounds = [*window, begin + len(html)]
+        return [
+            {"index": start + i, "html": html[bounds[i] - begin : bounds[i + 1] - begin].strip()}
+            for i in range(len(window))
+        ]
+
     def calculate_word_count(self, content: str) -> int:
         """
         문서 콘텐츠의 단어 수를 계산한다. 한국어는 문자 단위로, 영어는 공백으로 구분된 단어 단위로 계산한다.
@@ -239,9 +419,119 @@ class ChapterService:
         return len(words)
 
 
+class _ParagraphOffsetParser(HTMLParser):
+    """Collect start offsets of top-level elements in rendered chapter HTML."""
+
+    VOID_TAGS = frozenset({"br", "hr", "img", "input", "meta", "link", "wbr"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.depth = 0
+        self.offsets: builtins.list[int] = []
+        self._line_starts: builtins.list[int] = [0]
+
+    @classmethod
+    def parse(cls, html: str) -> builtins.list[int]:
+        parser = cls()
+        parser._line_starts += [m.end() for m in re.finditer("\n", html)]
+        parser.feed(html)
+        parser.close()
+        return parser.offsets
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag: str, attrs: builtins.list) -> None:
+        if self.depth == 0:
+            self.offsets.append(self._offset())
+        if tag not in self.VOID_TAGS:
+            self.depth += 1
+
+    def handle_startendtag(self, tag: str, attrs: builtins.list) -> None:
+        if self.depth == 0:
+            self.offsets.append(self._offset())
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self.VOID_TAGS:
+            self.depth = max(0, self.depth - 1)
+
+
+class ChapterNavigationService:
+    """
+    Per-branch navigation index of published chapters.
+
+    The index is a list of ``{"id", "chapter_number", "title"}`` entries ordered by
+    chapter_number. It is built with a single query, kept in the cache and invalidated
+    whenever a chapter is published, retitled after publish, or deleted.
+    """
+
+    CACHE_KEY = "chapter_nav:{branch_id}"
+    TIMEOUT = 24 * 60 * 60  # 24 hours
+
+    @classmethod
+    def _get_key(cls, branch_id: int) -> str:
+        return cls.CACHE_KEY.format(branch_id=branch_id)
+
+    @classmethod
+    def get_index(cls, branch_id: int) -> builtins.list[dict]:
+        """
+        브랜치의 발행된 회차 인덱스를 반환합니다. 캐시에 없으면 한 번의 쿼리로 생성해 저장합니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID
+
+        Returns:
+            list[dict]: chapter_number 오름차순의 `id`, `chapter_number`, `title` 목록
+        """
+        key = cls._get_key(branch_id)
+        index = cache.get(key)
+        if index is None:
+            index = builtins.list(
+                Chapter.objects.filter(branch_id=branch_id, status=ChapterStatus.PUBLISHED)
+                .order_by("chapter_number")
+                .values("id", "chapter_number", "title")
+            )
+            cache.set(key, index, cls.TIMEOUT)
+        return index
+
+    @classmethod
+    def get_neighbors(cls, branch_id: int, chapter_number: int) -> tuple[dict | None, dict | None]:
+        """
+        주어진 회차의 이전/다음 발행 회차를 인덱스에서 이진 탐색으로 찾습니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID
+            chapter_number (int): 기준 회차 번호 (발행 여부와 무관)
+
+        Returns:
+            tuple: (이전 회차, 다음 회차). 없으면 각각 None
+        """
+        index = cls.get_index(branch_id)
+        numbers = [entry["chapter_number"] for entry in index]
+
+        prev_pos = bisect_left(numbers, chapter_number)
+        next_pos = bisect_right(numbers, chapter_number)
+
+        prev_entry = index[prev_pos - 1] if prev_pos > 0 else None
+        next_entry = index[next_pos] if next_pos < len(index) else None
+        return prev_entry, next_entry
+
+    @classmethod
+    def invalidate(cls, branch_id: int) -> None:
+        """Drop the cached index for a branch."""
+        cache.delete(cls._get_key(branch_id))
+
+
 class WikiService:
     """Service for managing wiki entries and tags."""
 
+    # list_at_chapter() results are cached per (branch, version, chapter bucket).
+    # Every wiki mutation bumps Branch.version, which retires the old keys.
+    CONTEXT_CACHE_KEY = "wiki_at_chapter:{branch_id}:{version}:{bucket}"
+    CONTEXT_CACHE_TIMEOUT = 60 * 60  # 1 hour
+    CHAPTER_BUCKET_SIZE = 10
+
     @staticmethod
     def _check_branch_author(branch: Branch, user: User) -> None:
         """Check if user is the branch author."""
@@ -286,8 +576,9 @@ class WikiService:
 
         WikiService._check_branch_author(branch, user)
 
-        # Check for duplicate name
-        if WikiEntry.objects.filter(branch=branch, name=name).exists():
+        # Check for duplicate name, including entries inherited by a fork
+        lineage = BranchLineage.resolve(branch.id)
+        if WikiEntry.objects.filter(WikiService._visible_entries(lineage), name=name).exists():
             raise ValueError(f"이미 존재하는 위키 이름입니다: {name}")
 
         wiki = WikiEntry.objects.create(
@@ -301,14 +592,16 @@ class WikiService:
 
         # Create initial snapshot if content provided
         if initial_content:
-            WikiSnapshot.objects.create(
+            snapshot = WikiSnapshot.objects.create(
                 wiki_entry=wiki,
                 content=initial_content,
                 valid_from_chapter=0,
                 contributor_type=ContributorType.USER,
                 contributor=user,
             )
+            WikiSnapshotHistory.index_search_vectors([snapshot])
 
+        Branch.bump_version(branch.id)
         return wiki
 
     @staticmethod
@@ -359,6 +652,7 @@ class WikiService:
             wiki.ai_metadata = ai_metadata
 
         wiki.save()
+        Branch.bump_version(wiki.branch_id)
         return wiki
 
     @staticmethod
@@ -375,12 +669,16 @@ class WikiService:
         Raises:
             ValueError: 지정한 ID의 위키가 존재하지 않을 경우
         """
+        snapshots = WikiSnapshot.objects.defer(*WikiSnapshot.HEAVY_FIELDS)
         try:
-            return WikiEntry.objects.prefetch_related(
-                "tags", Prefetch("snapshots", WikiSnapshot.objects.order_by("valid_from_chapter"))
+            wiki = WikiEntry.objects.prefetch_related(
+                "tags",
+                Prefetch("snapshots", snapshots.order_by("valid_from_chapter")),
             ).get(id=wiki_id)
         except WikiEntry.DoesNotExist as e:
             raise ValueError("존재하지 않는 위키입니다.") from e
+        WikiSnapshotHistory.materialize(builtins.list(wiki.snapshots.all()))
+        return wiki
 
     @staticmethod
     def retrieve_for_snapshots(wiki_id: int) -> WikiEntry:
@@ -396,31 +694,48 @@ class WikiService:
         Raises:
             ValueError: 지정한 ID의 위키가 존재하지 않을 경우.
         """
+        snapshots = WikiSnapshot.objects.defer(*WikiSnapshot.HEAVY_FIELDS)
         try:
-            return WikiEntry.objects.prefetch_related(
-                Prefetch("snapshots", WikiSnapshot.objects.order_by("valid_from_chapter"))
+            wiki = WikiEntry.objects.prefetch_related(
+                Prefetch("snapshots", snapshots.order_by("valid_from_chapter"))
             ).get(id=wiki_id)
         except WikiEntry.DoesNotExist as e:
             raise ValueError("존재하지 않는 위키입니다.") from e
+        WikiSnapshotHistory.materialize(builtins.list(wiki.snapshots.all()))
+        return wiki
 
     @staticmethod
     def list(
         branch_id: int,
         tag_id: int | None = None,
         current_chapter: int | None = None,
+        lineage: BranchLineage | None = None,
     ) -> QuerySet[WikiEntry]:
         """
         브랜치에 속한 위키 항목을 이름 순으로 조회한다.
         
+        포크 브랜치는 분기 회차까지의 상위 브랜치 항목을 물려받는다 (BranchLineage 참고).
+        
         Parameters:
             branch_id (int): 조회할 브랜치의 ID.
             tag_id (int | None): 주어진 경우 해당 태그를 가진 항목만 필터한다.
             current_chapter (int | None): 주어진 경우 first_appearance가 이 값보다 작거나 같거나 비어있는 항목만 포함하여 현재 챕터 기준으로 노출 가능한 항목을 필터한다.
+            lineage (BranchLineage | None): 이미 조회한 브랜치 계보 (없으면 조회한다).
         
         Returns:
             QuerySet[WikiEntry]: 조건에 맞는 WikiEntry 객체들의 QuerySet(이름 순 정렬).
         """
-        qs = WikiEntry.objects.filter(branch_id=branch_id).prefetch_related("tags")
+        if lineage is None:
+            try:
+                lineage = BranchLineage.resolve(branch_id)
+            except ValueError:
+                return WikiEntry.objects.none()
+
+        qs = (
+            WikiEntry.objects.filter(WikiService._visible_entries(lineage))
+            .defer(*WikiEntry.HEAVY_FIELDS)
+            .prefetch_related("tags")
+        )
 
         if tag_id is not None:
             qs = qs.filter(tags__id=tag_id)
@@ -432,6 +747,215 @@ class WikiService:
 
         return qs.order_by("name")
 
+    @staticmethod
+    def _visible_entries(lineage: BranchLineage) -> Q:
+        """
+        Entries of the branch plus those inherited from its ancestors.
+
+        An inherited entry is hidden once a nearer branch materialized a copy of
+        it (``source_wiki``), so each entry appears once.
+        """
+        if not lineage.is_fork:
+            return Q(branch_id=lineage.branch_id)
+        materialized = WikiEntry.objects.filter(
+            branch_id__in=lineage.branch_ids, source_wiki__isnull=False
+        ).values("source_wiki_id")
+        return lineage.filter("branch_id", "first_appearance", null_visible=True) & ~Q(
+            id__in=materialized
+        )
+
+    @classmethod
+    def list_at_chapter(
+        cls, branch_id: int, chapter: int, lineage: BranchLineage | None = None
+    ) -> builtins.list[WikiEntry]:
+        """
+        회차 N 시점의 위키 목록을 태그, 해당 회차에 유효한 스냅샷과 함께 반환합니다.
+
+        각 항목의 ``snapshot_at_chapter`` 속성에 valid_from_chapter <= N 인 가장 최근 스냅샷
+        (없으면 None)이 담깁니다. 회차 구간(CHAPTER_BUCKET_SIZE) 단위로 구간 시작 시점의
+        스냅샷과 구간 안에서 새로 유효해지는 스냅샷을 한 번에 불러 캐시하므로, 같은 구간의
+        회차를 읽는 동안에는 브랜치 버전 확인 쿼리 한 번으로 목록을 만듭니다.
+
+        포크 브랜치는 상위 브랜치의 항목과 스냅샷을 분기 회차까지 물려받으며, 캐시 키에는
+        계보 전체의 버전이 들어갑니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID
+            chapter (int): 읽고 있는 회차 번호
+            lineage (BranchLineage | None): 이미 조회한 브랜치 계보 (없으면 조회한다)
+
+        Returns:
+            list[WikiEntry]: 이름 순으로 정렬된, 회차 N까지 등장한 위키 항목
+
+        Raises:
+            ValueError: 브랜치가 존재하지 않을 때
+        """
+        if lineage is None:
+            lineage = BranchLineage.resolve(branch_id)
+
+        bucket = chapter // cls.CHAPTER_BUCKET_SIZE
+        key = cls.CONTEXT_CACHE_KEY.format(
+            branch_id=branch_id, version=lineage.stamp, bucket=bucket
+        )
+        rows = cache.get(key)
+        if rows is None:
+            start = bucket * cls.CHAPTER_BUCKET_SIZE
+            rows = cls._load_chapter_bucket(lineage, start, start + cls.CHAPTER_BUCKET_SIZE - 1)
+            cache.set(key, rows, cls.CONTEXT_CACHE_TIMEOUT)
+
+        entries = []
+        for entry, snapshots in rows:
+            if entry.first_appearance is not None and entry.first_appearance > chapter:
+                continue
+            # snapshots are newest first
+            entry.snapshot_at_chapter = next(
+                (snap for snap in snapshots if snap.valid_from_chapter <= chapter), None
+            )
+            entries.append(entry)
+        return entries
+
+    @classmethod
+    def _load_chapter_bucket(
+        cls, lineage: BranchLineage, start: int, end: int
+    ) -> builtins.list[tuple[WikiEntry, builtins.list[WikiSnapshot]]]:
+        """
+        Entries visible by chapter ``end`` with every snapshot that can be current
+        in ``[start, end]``: the one valid at ``start`` plus those starting inside
+        the bucket, newest first. Inherited snapshots stop at the fork point.
+        """
+        entries = builtins.list(
+            WikiEntry.objects.filter(cls._visible_entries(lineage))
+            .filter(Q(first_appearance__lte=end) | Q(first_appearance__isnull=True))
+            .defer(*WikiEntry.HEAVY_FIELDS)
+            .prefetch_related("tags")
+            .order_by("name")
+        )
+
+        snapshots = WikiSnapshot.objects.filter(
+            lineage.filter("wiki_entry__branch_id", "valid_from_chapter")
+        ).defer(*WikiSnapshot.HEAVY_FIELDS)
+        if lineage.is_fork:
+            snapshots = snapshots.filter(wiki_entry_id__in=[entry.id for entry in entries])
+        at_start = snapshots.filter(valid_from_chapter__lte=start).order_by(
+            "wiki_entry_id", "-valid_from_chapter"
+        )
+        if connection.vendor == "postgresql":
+            # One row per entry, read off the (wiki_entry, valid_from_chapter DESC) index
+            at_start = at_start.distinct("wiki_entry_id")
+
+        by_entry: dict[int, builtins.list[WikiSnapshot]] = {}
+        for snap in snapshots.filter(
+            valid_from_chapter__gt=start, valid_from_chapter__lte=end
+        ).order_by("-valid_from_chapter"):
+            by_entry.setdefault(snap.wiki_entry_id, []).append(snap)
+        for snap in at_start:
+            current = by_entry.setdefault(snap.wiki_entry_id, [])
+            if not current or current[-1].valid_from_chapter > start:
+                current.append(snap)
+
+        WikiSnapshotHistory.materialize([snap for snaps in by_entry.values() for snap in snaps])
+        return [(entry, by_entry.get(entry.id, [])) for entry in entries]
+
+    @staticmethod
+    def materialize(branch_id: int, wiki_id: int, user: User) -> WikiEntry:
+        """
+        Copy an inherited wiki entry into a fork so the fork author can edit it.
+
+        The copy keeps a ``source_wiki`` reference and from then on shadows the
+        inherited entry. Only snapshots up to the fork point are copied, tags
+        are matched by name (missing tag definitions are copied too), and the
+        ancestor author's ``hidden_note`` is not carried over. Calling it for an
+        entry the branch already owns (or already materialized) returns that entry.
+
+        Args:
+            branch_id: Fork branch ID
+            wiki_id: WikiEntry ID as seen from the fork
+            user: User performing the edit
+
+        Returns:
+            WikiEntry owned by the branch
+
+        Raises:
+            PermissionDenied: If user is not branch author
+            ValueError: If branch or wiki not found, or the wiki is not visible from the branch
+        """
+        try:
+            branch = Branch.objects.get(id=branch_id)
+            wiki = WikiEntry.objects.get(id=wiki_id)
+        except (Branch.DoesNotExist, WikiEntry.DoesNotExist) as e:
+            raise ValueError("존재하지 않는 위키입니다.") from e
+
+        WikiService._check_branch_author(branch, user)
+
+        if wiki.branch_id == branch_id:
+            return wiki
+        existing = WikiEntry.objects.filter(branch_id=branch_id, source_wiki_id=wiki_id).first()
+        if existing is not None:
+            return existing
+
+        lineage = BranchLineage.resolve(branch_id)
+        if not WikiEntry.objects.filter(WikiService._visible_entries(lineage), id=wiki_id).exists():
+            raise ValueError("이 브랜치에서 볼 수 없는 위키입니다.")
+        cap = lineage.cap_for(wiki.branch_id)
+
+        with transaction.atomic():
+            copy = WikiEntry.objects.create(
+                branch_id=branch_id,
+                source_wiki=wiki,
+                name=wiki.name,
+                image_url=wiki.image_url,
+                first_appearance=wiki.first_appearance,
+                ai_metadata=wiki.ai_metadata,
+            )
+
+            snapshots = wiki.snapshots.all()
+            if cap is not None:
+                snapshots = snapshots.filter(valid_from_chapter__lte=cap)
+            snapshots = builtins.list(snapshots)
+            WikiSnapshotHistory.materialize(snapshots)
+            WikiSnapshot.objects.bulk_create(
+                [
+                    WikiSnapshot(
+                        wiki_entry=copy,
+                        content=snap.text,
+                        valid_from_chapter=snap.valid_from_chapter,
+                        contributor_type=snap.contributor_type,
+                        contributor_id=snap.contributor_id,
+                        search_vector=snap.search_vector,
+                    )
+                    for snap in snapshots
+                ]
+            )
+            WikiSnapshotHistory.compact(copy.id)
+
+            source_tags = builtins.list(wiki.tags.all())
+            if source_tags:
+                own_tags = {
+                    tag.name: tag
+                    for tag in WikiTagDefinition.objects.filter(
+                        branch_id=branch_id, name__in=[tag.name for tag in source_tags]
+                    )
+                }
+                missing = [tag for tag in source_tags if tag.name not in own_tags]
+                for tag in WikiTagDefinition.objects.bulk_create(
+                    [
+                        WikiTagDefinition(
+                            branch_id=branch_id,
+                            name=tag.name,
+                            color=tag.color,
+                            icon=tag.icon,
+                            description=tag.description,
+                            display_order=tag.display_order,
+                        )
+                        for tag in missing
+                    ]
+                ):
+                    own_tags[tag.name] = tag
+                copy.tags.set([own_tags[tag.name] for tag in source_tags])
+
+        Branch.bump_version(branch_id)
+        return copy
+
     @staticmethod
     def delete(wiki_id: int, user: User) -> None:
         """
@@ -452,6 +976,7 @@ class WikiService:
 
         WikiService._check_branch_author(wiki.branch, user)
         wiki.delete()
+        Branch.bump_version(wiki.branch_id)
 
     @staticmethod
     def update_tags(wiki_id: int, user: User, tag_ids: builtins.list[int]) -> WikiEntry:
@@ -479,6 +1004,7 @@ class WikiService:
         # Set tags (replaces existing)
         tags = WikiTagDefinition.objects.filter(id__in=tag_ids, branch=wiki.branch)
         wiki.tags.set(tags)
+        Branch.bump_version(wiki.branch_id)
 
         return wiki
 
@@ -516,7 +1042,7 @@ class WikiService:
 
         WikiService._check_branch_author(branch, user)
 
-        return WikiTagDefinition.objects.create(
+        tag = WikiTagDefinition.objects.create(
             branch=branch,
             name=name,
             color=color,
@@ -524,6 +1050,8 @@ class WikiService:
             description=description,
             display_order=display_order,
         )
+        Branch.bump_version(branch.id)
+        return tag
 
     @staticmethod
     def list_tags(branch_id: int) -> QuerySet[WikiTagDefinition]:
@@ -559,6 +1087,7 @@ class WikiService:
 
         WikiService._check_branch_author(tag.branch, user)
         tag.delete()
+        Branch.bump_version(tag.branch_id)
 
     # --- Snapshot Methods ---
 
@@ -572,6 +1101,9 @@ class WikiService:
         """
         Add a new snapshot to a wiki entry.
 
+        The content is stored as a delta against an earlier keyframe when that is
+        compact enough (see WikiSnapshotHistory).
+
         Args:
             wiki_id: WikiEntry ID
             user: User creating the snapshot
@@ -598,13 +1130,18 @@ class WikiService:
         ).exists():
             raise ValueError(f"이미 회차 {valid_from_chapter}에 스냅샷이 존재합니다.")
 
-        return WikiSnapshot.objects.create(
+        snapshot = WikiSnapshot.objects.create(
             wiki_entry=wiki,
-            content=content,
             valid_from_chapter=valid_from_chapter,
             contributor_type=ContributorType.USER,
             contributor=user,
+            **WikiSnapshotHistory.encode(wiki.id, content, valid_from_chapter),
         )
+        snapshot._text = content
+        WikiSnapshotHistory.index_search_vectors([snapshot])
+        SnapshotIntervalIndex.invalidate("wiki", wiki.id)
+        Branch.bump_version(wiki.branch_id)
+        return snapshot
 
     @staticmethod
     def get_snapshot_for_chapter(
@@ -624,14 +1161,15 @@ class WikiService:
         Returns:
             WikiSnapshot instance or None if no valid snapshot exists
         """
-        return (
-            WikiSnapshot.objects.filter(
-                wiki_entry_id=wiki_id,
-                valid_from_chapter__lte=chapter_number,
-            )
-            .order_by("-valid_from_chapter")
-            .first()
+        snapshot = SnapshotIntervalIndex.load_at(
+            "wiki",
+            wiki_id,
+            chapter_number,
+            WikiSnapshot.objects.defer(*WikiSnapshot.HEAVY_FIELDS),
         )
+        if snapshot is not None:
+            WikiSnapshotHistory.materialize([snapshot])
+        return snapshot
 
     @staticmethod
     def get_wiki_with_context(
@@ -659,8 +1197,45 @@ class WikiService:
             "snapshot": snapshot,
         }
 
+    @classmethod
+    def timeline(
+        cls, branch_id: int, chapter: int | None = None, lineage: BranchLineage | None = None
+    ) -> builtins.list[dict]:
+        """
+        브랜치 위키 항목마다 스냅샷 유효 구간 표를 한 번에 반환합니다 (회차 이동 시 재조회 불필요).
+
+        Parameters:
+            branch_id (int): 브랜치 ID (포크는 물려받은 항목도 분기 회차까지 포함)
+            chapter (int | None): 주어지면 그 회차까지 등장한 항목과 그때까지 시작한 구간만 반환
+            lineage (BranchLineage | None): 이미 조회한 브랜치 계보
+
+        Returns:
+            list[dict]: 이름 순의 ``id``, ``name``, ``first_appearance``, ``snapshots``
+            (SnapshotIntervalIndex.timeline 참고)
+
+        Raises:
+            ValueError: 브랜치가 존재하지 않을 때
+        """
+        if lineage is None:
+            lineage = BranchLineage.resolve(branch_id)
+        entries = (
+            WikiEntry.objects.filter(cls._visible_entries(lineage))
+            .order_by("name")
+            .values("id", "name", "first_appearance")
+        )
+        rows = SnapshotIntervalIndex.timeline("wiki", lineage, entries, chapter=chapter)
+        if chapter is None:
+            return rows
+        return [
+            row
+            for row in rows
+            if row["first_appearance"] is None or row["first_appearance"] <= chapter
+        ]
+
     # --- Fork Methods ---
 
+    FORK_BATCH_SIZE = 1000
+
     @staticmethod
     def fork_wiki_entries(
         source_branch_id: int,
@@ -673,8 +1248,14 @@ class WikiService:
         This copies:
         - All WikiTagDefinitions
         - All WikiEntries (with source_wiki reference)
+        - The entry-tag links
         - All WikiSnapshots
 
+        Each kind of row is copied with ``bulk_create`` in one transaction, so
+        the number of statements depends on the number of batches
+        (FORK_BATCH_SIZE rows each), not on the number of rows. Old to new IDs
+        are mapped from the primary keys ``bulk_create`` returns (RETURNING).
+
         Args:
             source_branch_id: Source branch ID
             target_branch_id: Target branch ID
@@ -683,58 +1264,125 @@ class WikiService:
         Returns:
             List of created WikiEntry instances
         """
-        try:
-            source_branch = Branch.objects.get(id=source_branch_id)
-            target_branch = Branch.objects.get(id=target_branch_id)
-        except Branch.DoesNotExist as e:
-            raise ValueError("존재하지 않는 브랜치입니다.") from e
+        branch_ids = {source_branch_id, target_branch_id}
+        if Branch.objects.filter(id__in=branch_ids).count() != len(branch_ids):
+            raise ValueError("존재하지 않는 브랜치입니다.")
 
-        # 1. Copy tag definitions and create mapping
-        tag_mapping = {}  # old_tag_id -> new_tag
-        source_tags = WikiTagDefinition.objects.filter(branch=source_branch)
-        for source_tag in source_tags:
-            new_tag = WikiTagDefinition.objects.create(
-                branch=target_branch,
-                name=source_tag.name,
-                color=source_tag.color,
-                icon=source_tag.icon,
-                description=source_tag.description,
-                display_order=source_tag.display_order,
+        batch_size = WikiService.FORK_BATCH_SIZE
+        TagLink = WikiEntry.tags.through
+
+        with transaction.atomic():
+            # 1. Copy tag definitions
+            source_tags = builtins.list(
+                WikiTagDefinition.objects.filter(branch_id=source_branch_id).order_by("id")
+            )
+            new_tags = WikiTagDefinition.objects.bulk_create(
+                [
+                    WikiTagDefinition(
+                        branch_id=target_branch_id,
+                        name=tag.name,
+                        color=tag.color,
+                        icon=tag.icon,
+                        description=tag.description,
+                        display_order=tag.display_order,
+                    )
+                    for tag in source_tags
+                ],
+                batch_size=batch_size,
             )
-            tag_mapping[source_tag.id] = new_tag
+            tag_mapping = {
+                old.id: new.id for old, new in zip(source_tags, new_tags, strict=True)
+            }  # old_tag_id -> new_tag_id
 
-        # 2. Copy wiki entries
-        forked_wikis = []
-        source_wikis = WikiEntry.objects.filter(branch=source_branch).prefetch_related(
-            "tags", "snapshots"
-        )
+            # 2. Copy wiki entries
+            source_wikis = builtins.list(
+                WikiEntry.objects.filter(branch_id=source_branch_id).order_by("id")
+            )
+            forked_wikis = WikiEntry.objects.bulk_create(
+                [
+                    WikiEntry(
+                        branch_id=target_branch_id,
+                        source_wiki_id=wiki.id,
+                        name=wiki.name,
+                        image_url=wiki.image_url,
+                        first_appearance=wiki.first_appearance,
+                        hidden_note=wiki.hidden_note,
+                        ai_metadata=wiki.ai_metadata,
+                    )
+                    for wiki in source_wikis
+                ],
+                batch_size=batch_size,
+            )
+            wiki_mapping = {
+                old.id: new.id for old, new in zip(source_wikis, forked_wikis, strict=True)
+            }  # old_wiki_id -> new_wiki_id
 
-        for source_wiki in source_wikis:
-            # Create new wiki with source reference
-            new_wiki = WikiEntry.objects.create(
-                branch=target_branch,
-                source_wiki=source_wiki,
-                name=source_wiki.name,
-                image_url=source_wiki.image_url,
-                first_appearance=source_wiki.first_appearance,
-                hidden_note=source_wiki.hidden_note,
-                ai_metadata=source_wiki.ai_metadata,
+            # 3. Copy entry-tag links
+            links = TagLink.objects.filter(wikientry__branch_id=source_branch_id).values_list(
+                "wikientry_id", "wikitagdefinition_id"
+            )
+            TagLink.objects.bulk_create(
+                [
+                    TagLink(
+                        wikientry_id=wiki_mapping[wiki_id],
+                        wikitagdefinition_id=tag_mapping[tag_id],
+                    )
+                    for wiki_id, tag_id in links
+                    if tag_id in tag_mapping
+                ],
+                batch_size=batch_size,
             )
 
-            # Copy tags using mapping
-            new_tags = [tag_mapping[t.id] for t in source_wiki.tags.all() if t.id in tag_mapping]
-            new_wiki.tags.set(new_tags)
-
-            # Copy snapshots
-            for source_snapshot in source_wiki.snapshots.all():
-                WikiSnapshot.objects.create(
-                    wiki_entry=new_wiki,
-                    content=source_snapshot.content,
-                    valid_from_chapter=source_snapshot.valid_from_chapter,
-                    contributor_type=source_snapshot.contributor_type,
-                    contributor=source_snapshot.contributor,
+            # 4. Copy snapshots, streamed in batches to bound memory. Keyframes come
+            # first so delta rows can point at the copied keyframe.
+            snapshots = (
+                WikiSnapshot.objects.filter(wiki_entry__branch_id=source_branch_id)
+                .order_by(F("base_id").asc(nulls_first=True), "id")
+                .values(
+                    "id",
+                    "wiki_entry_id",
+                    "content",
+                    "base_id",
+                    "delta",
+                    "valid_from_chapter",
+                    "contributor_type",
+                    "contributor_id",
+                    "search_vector",
+                )
+                .iterator(chunk_size=batch_size)
+            )
+            keyframe_mapping: dict[int, int] = {}
+            while batch := builtins.list(islice(snapshots, batch_size)):
+                keyframes = [row for row in batch if row["base_id"] is None]
+                created = WikiSnapshot.objects.bulk_create(
+                    [
+                        WikiSnapshot(
+                            **{
+                                **row,
+                                "id": None,
+                                "wiki_entry_id": wiki_mapping[row["wiki_entry_id"]],
+                            }
+                        )
+                        for row in keyframes
+                    ]
+                )
+                for row, snapshot in zip(keyframes, created, strict=True):
+                    keyframe_mapping[row["id"]] = snapshot.id
+                WikiSnapshot.objects.bulk_create(
+                    [
+                        WikiSnapshot(
+                            **{
+                                **row,
+                                "id": None,
+                                "wiki_entry_id": wiki_mapping[row["wiki_entry_id"]],
+                                "base_id": keyframe_mapping[row["base_id"]],
+                            }
+                        )
+                        for row in batch
+                        if row["base_id"] is not None
+                    ]
                 )
 
-            forked_wikis.append(new_wiki)
-
+            if forked_wikis:
+                Branch.bump_version(target_branch_id)
         return forked_wikis
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+SnapshotIntervalIndex - Cached chapter-to-snapshot lookup for wikis and maps.
+
+A wiki entry or map has one snapshot per version, each valid from its
+``valid_from_chapter`` until the next one starts. The interval index of an
+entity is its sorted ``valid_from_chapter`` values with the matching snapshot
+ids, built with one narrow query and kept in the cache; the snapshot valid at a
+chapter is then found by bisect and loaded by primary key. The index key carries
+a per-entity generation counter that creating a snapshot bumps (again once the
+transaction commits), the way timeline keys carry the lineage stamp, so a reader
+that built its index from rows read before the change can only write it under a
+generation nobody reads any more.
+
+The timeline of a branch is the same table for every wiki entry or map the
+branch can see (inherited ones included, capped at the fork point), built with
+one query per kind and cached by branch version (every version in the lineage
+for forks), so a client scrubbing chapters needs no request per step.
+"""
+
+import builtins
+from bisect import bisect_right
+from itertools import groupby
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+
+from apps.contents.lineage import BranchLineage
+from apps.contents.models import MapSnapshot, WikiSnapshot
+
+# (sorted valid_from_chapter values, snapshot ids)
+Index = tuple[builtins.list[int], builtins.list[int]]
+
+
+class SnapshotIntervalIndex:
+    """Per-entity and per-branch snapshot validity tables."""
+
+    # kind -> (snapshot model, field of the owning entity)
+    KINDS = {
+        "wiki": (WikiSnapshot, "wiki_entry"),
+        "map": (MapSnapshot, "map"),
+    }
+
+    CACHE_KEY = "snapshot_index:{kind}:{id}:{generation}"
+    GENERATION_KEY = "snapshot_index_generation:{kind}:{id}"
+    TIMELINE_CACHE_KEY = "snapshot_timeline:{kind}:{branch_id}:{version}"
+    TIMEOUT = 24 * 60 * 60  # 24 hours
+
+    @classmethod
+    def get_index(cls, kind: str, entity_id: int) -> Index:
+        """
+        위키 항목/지도의 스냅샷 구간 인덱스를 반환합니다. 캐시에 없으면 한 번의 쿼리로 만듭니다.
+
+        Parameters:
+            kind (str): "wiki" 또는 "map"
+            entity_id (int): 위키 항목 또는 지도 ID
+
+        Returns:
+            tuple: (valid_from_chapter 오름차순 목록, 같은 순서의 스냅샷 ID 목록)
+        """
+        generation = cache.get(cls.GENERATION_KEY.format(kind=kind, id=entity_id), 0)
+        key = cls.CACHE_KEY.format(kind=kind, id=entity_id, generation=generation)
+        index = cache.get(key)
+        if index is None:
+            model, owner = cls.KINDS[kind]
+            rows = builtins.list(
+                model.objects.filter(**{f"{owner}_id": entity_id})
+                .order_by("valid_from_chapter")
+                .values_list("valid_from_chapter", "id")
+            )
+            chapters, ids = zip(*rows, strict=True) if rows else ((), ())
+            index = (builtins.list(chapters), builtins.list(ids))
+            cache.set(key, index, cls.TIMEOUT)
+        return index
+
+    @classmethod
+    def snapshot_id_at(cls, kind: str, entity_id: int, chapter: int) -> int | None:
+        """회차 시점에 유효한(valid_from_chapter <= chapter 중 가장 최근) 스냅샷 ID, 없으면 None."""
+        chapters, ids = cls.get_index(kind, entity_id)
+        position = bisect_right(chapters, chapter)
+        return ids[position - 1] if position else None
+
+    @classmethod
+    def load_at(
+        cls, kind: str, entity_id: int, chapter: int, queryset: QuerySet
+    ) -> WikiSnapshot | MapSnapshot | None:
+        """
+        회차 시점에 유효한 스냅샷을 인덱스로 찾아 ``queryset``에서 기본 키로 불러옵니다.
+
+        인덱스가 가리키는 스냅샷이 이미 없으면 인덱스를 한 번 다시 만듭니다.
+        """
+        for _ in range(2):
+            snapshot_id = cls.snapshot_id_at(kind, entity_id, chapter)
+            if snapshot_id is None:
+                return None
+            snapshot = queryset.filter(pk=snapshot_id).first()
+            if snapshot is not None:
+                return snapshot
+            cls.invalidate(kind, entity_id)
+        return None
+
+    @classmethod
+    def invalidate(cls, kind: str, entity_id: int) -> None:
+        """
+        Move the entity's index to a new generation, now and again on commit.
+
+        The second bump retires an index a reader rebuilt from rows read before
+        the transaction committed.
+        """
+        key = cls.GENERATION_KEY.format(kind=kind, id=entity_id)
+        cls._bump(key)
+        transaction.on_commit(lambda: cls._bump(key))
+
+    @staticmethod
+    def _bump(key: str) -> None:
+        # No timeout: a generation that restarted at 0 could revive an old index
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+    @classmethod
+    def timeline(
+        cls,
+        kind: str,
+        lineage: BranchLineage,
+        entities: QuerySet,
+        chapter: int | None = None,
+    ) -> builtins.list[dict[str, Any]]:
+        """
+        브랜치에서 보이는 위키 항목/지도마다 스냅샷 유효 구간 표를 반환합니다.
+
+        Parameters:
+            kind (str): "wiki" 또는 "map"
+            lineage (BranchLineage): 브랜치 계보 (물려받은 스냅샷은 분기 회차까지)
+            entities (QuerySet): 브랜치에서 보이는 항목의 ``values()`` 쿼리셋 (``id`` 포함)
+            chapter (int | None): 주어지면 이 회차 이후에 시작하는 스냅샷은 빼고, 마지막 구간은
+                끝이 없는 것으로 둡니다 (스포일러 방지)
+
+        Returns:
+            list[dict]: 항목의 ``values()`` 필드와 ``snapshots``
+            (``id``, ``valid_from_chapter``, ``valid_until_chapter``; 마지막 구간은 None)
+        """
+        key = cls.TIMELINE_CACHE_KEY.format(
+            kind=kind, branch_id=lineage.branch_id, version=lineage.stamp
+        )
+        rows = cache.get(key)
+        if rows is None:
+            rows = cls._load_timeline(kind, lineage, entities)
+            cache.set(key, rows, cls.TIMEOUT)
+
+        timeline = []
+        for entity, starts in rows:
+            if chapter is not None:
+                starts = starts[: bisect_right([start for _, start in starts], chapter)]
+            timeline.append(
+                {
+                    **entity,
+                    "snapshots": [
+                        {
+                            "id": snapshot_id,
+                            "valid_from_chapter": start,
+                            "valid_until_chapter": (
+                                starts[i + 1][1] - 1 if i + 1 < len(starts) else None
+                            ),
+                        }
+                        for i, (snapshot_id, start) in enumerate(starts)
+                    ],
+                }
+            )
+        return timeline
+
+    @classmethod
+    def _load_timeline(
+        cls, kind: str, lineage: BranchLineage, entities: QuerySet
+    ) -> builtins.list[tuple[dict[str, Any], builtins.list[tuple[int, int]]]]:
+        model, owner = cls.KINDS[kind]
+        entity_rows = builtins.list(entities)
+        snapshots = (
+            model.objects.filter(
+                lineage.filter(f"{owner}__branch_id", "valid_from_chapter"),
+                **{f"{owner}__in": entities.values("id")},
+            )
+            .order_by(f"{owner}_id", "valid_from_chapter")
+            .values_list(f"{owner}_id", "id", "valid_from_chapter")
+        )
+        starts = {
+            entity_id: [(snapshot_id, start) for _, snapshot_id, start in group]
+            for entity_id, group in groupby(snapshots, key=lambda row: row[0])
+        }
+        return [(entity, starts.get(entity["id"], [])) for entity in entity_rows]
@@ -2,9 +2,12 @@
 Celery tasks for contents app.
 
 Scheduled tasks for publishing chapters at their scheduled_at time.
+
+``ChapterService.schedule`` enqueues ``publish_scheduled_chapter`` with an ETA of
+the exact release time; ``publish_scheduled_chapters`` runs every minute from
+beat as a reconciling sweep for tasks lost by the broker.
 """
 
-import json
 import logging
 
 import redis
@@ -20,157 +23,199 @@ from apps.contents.models import Chapter, ChapterStatus
 def publish_scheduled_chapters() -> int:
     """
     예약된 시간(scheduled_at)이 지나 공개해야 하는 모든 SCHEDULED 상태의 챕터를 공개합니다.
-    
-    성공적으로 공개된 챕터 수를 반환합니다.
-    
+
+    ETA 작업이 유실된 경우를 보정하는 주기적 스윕으로, 한 번의 UPDATE로 일괄 처리합니다.
+
     Returns:
         int: 공개된 챕터의 수
     """
     from apps.contents.services import ChapterService
 
-    now = timezone.now()
-    service = ChapterService()
+    return ChapterService().publish_due()
+
 
-    # Find all scheduled chapters ready to publish
-    chapters_to_publish = Chapter.objects.filter(
-        status=ChapterStatus.SCHEDULED,
-        scheduled_at__lte=now,
-    ).select_related("branch")
+@shared_task
+def publish_scheduled_chapter(chapter_id: int) -> int:
+    """
+    예약 시각에 맞춰 단일 챕터를 공개합니다 (ChapterService.schedule이 ETA로 등록).
 
-    published_count = 0
+    예약이 취소되었거나 더 늦은 시각으로 변경된 경우에는 아무것도 하지 않습니다.
 
-    for chapter in chapters_to_publish:
-        try:
-            service.publish(chapter)
-            published_count += 1
-        except ValueError:
-            # Chapter already published, skip
-            pass
+    Returns:
+        int: 공개된 챕터의 수 (0 또는 1)
+    """
+    from apps.contents.services import ChapterService
 
-    return published_count
+    return ChapterService().publish_due(chapter_ids=[chapter_id])
 
 
 @shared_task
 def sync_drafts_to_db() -> str:
     """
-    Redis에 저장된 임시 초안(draft)들을 데이터베이스의 Chapter 레코드로 동기화한다.
-    
-    Redis에서 패턴 "draft:*:*"에 매칭되는 키를 스캔하여 각 키에서 branch_id와 chapter_id를 파싱하고,
-    키가 ":new"로 끝나는 항목은 건너뛴다. Redis 값에서 title과 content를 읽어와 해당 Chapter가 존재하고
-    상태가 DRAFT인 경우에만 제목·내용 및 파생 필드(content_html, word_count)를 업데이트한다.
-    각 챕터 업데이트는 개별 트랜잭션으로 처리되며, 연속된 오류가 10회 발생하면 조기 종료한다.
-    Redis 연결 오류가 발생하면 오류 메시지를 포함한 문자열을 반환한다.
-    
+    마지막 동기화 이후 변경된 임시 초안(draft)들을 데이터베이스의 Chapter 레코드로 동기화한다.
+
+    DraftService가 저장 시 기록한 dirty 목록만 처리하므로 비용은 저장된 초안 수가 아닌
+    분당 편집 수에 비례한다. 초안 값과 마지막 동기화 해시는 한 번의 MGET(cache.get_many)으로
+    가져오고, 내용 해시가 바뀐 DRAFT 상태 회차만 마크다운을 렌더링하여 bulk_update로 저장한다.
+    Redis 또는 DB 오류 시 dirty 목록을 남겨 두어 다음 실행에서 다시 시도한다.
+
     Returns:
-        str: 동기화 결과 요약 문자열. 성공적으로 업데이트된 초안 수와 발생한 오류 수를 포함한다.
-             형식 예시: "Synced {updated_count} drafts. Errors: {errors_count}"
+        str: 동기화 결과 요약 문자열. 형식 예시: "Synced {updated_count} drafts. Unchanged: {n}"
     """
+    from django.core.cache import cache
+
     from apps.contents.services import ChapterService
+    from apps.novels.services import DraftService
 
     logger = logging.getLogger(__name__)
+    drafts = DraftService()
 
     try:
-        # Use django-redis to get the underlying Redis client
-        # This ensures we use the same Redis connection as DraftService (via Django cache)
-        from django_redis import get_redis_connection
+        dirty = drafts.claim_dirty()
+    except redis.RedisError as e:
+        logger.error(f"Redis connection error: {str(e)}")
+        return f"Redis error: {str(e)}"
+
+    draft_keys = {pair: drafts._get_key(*pair) for pair in dirty}
+    synced_keys = {pair: drafts.get_synced_hash_key(*pair) for pair in dirty}
+    values = cache.get_many([*draft_keys.values(), *synced_keys.values()])
+
+    changed: dict[tuple[int, int], dict] = {}
+    for pair in dirty:
+        draft = values.get(draft_keys[pair])
+        if draft is not None:
+            draft = DraftService.unpack(draft)
+        if not draft or draft.get("title") is None or draft.get("content") is None:
+            continue
+        content_hash = draft.get("content_hash") or DraftService.content_hash(
+            draft["title"], draft["content"]
+        )
+        if values.get(synced_keys[pair]) != content_hash:
+            changed[pair] = {**draft, "content_hash": content_hash}
 
-        client = get_redis_connection("default")
+    service = ChapterService()
+    now = timezone.now()
+    updated = []
+    try:
+        with transaction.atomic():
+            # Constraint: Only update if status is DRAFT
+            chapters = (
+                Chapter.objects.select_for_update()
+                .filter(status=ChapterStatus.DRAFT, id__in=[c for _, c in changed])
+                .only("id", "branch_id", "status")
+            )
+            for chapter in chapters:
+                draft = changed.get((chapter.branch_id, chapter.id))
+                if draft is None:
+                    continue
+                chapter.title = draft["title"]
+                chapter.content = draft["content"]
+                chapter.content_html = service.convert_markdown(draft["content"])
+                chapter.paragraph_offsets = service.compute_paragraph_offsets(chapter.content_html)
+                chapter.word_count = service.calculate_word_count(draft["content"])
+                chapter.updated_at = now
+                updated.append(chapter)
+
+            Chapter.objects.bulk_update(
+                updated,
+                [
+                    "title",
+                    "content",
+                    "content_html",
+                    "paragraph_offsets",
+                    "word_count",
+                    "updated_at",
+                ],
+                batch_size=100,
+            )
+    except DatabaseError as e:
+        logger.error(f"Error syncing drafts: {str(e)}")
+        return f"Database error: {str(e)}"
 
-        # Pattern matching
-        pattern = "draft:*:*"
+    try:
+        drafts.release_dirty({pair: draft["content_hash"] for pair, draft in changed.items()})
+    except redis.RedisError as e:
+        logger.error(f"Redis connection error: {str(e)}")
 
-        updated_count = 0
-        errors_count = 0
-        service = ChapterService()
+    return f"Synced {len(updated)} drafts. Unchanged: {len(dirty) - len(changed)}"
 
-        # Use scan_iter for memory efficiency
-        for key in client.scan_iter(match=pattern):
-            key_str = key.decode("utf-8")
 
-            # Filter out keys ending in :new
-            if key_str.endswith(":new"):
-                continue
+@shared_task
+def import_chapters(job_id: str, branch_id: int, path: str, publish: bool = False) -> int:
+    """
+    업로드된 아카이브의 회차들을 브랜치에 일괄 가져옵니다 (ChapterImportService.start가 등록).
 
-            try:
-                # Parse branch_id and chapter_id from key
-                # Expected: draft:{branch_id}:{chapter_id}
-                parts = key_str.split(":")
-                if len(parts) != 3:
-                    continue
+    진행 상황은 작업 ID로 캐시에 기록됩니다.
 
-                _prefix, branch_id_str, chapter_id_str = parts
+    Returns:
+        int: 생성된 회차 수
+    """
+    from apps.contents.importer import ChapterImportService
 
-                try:
-                    branch_id = int(branch_id_str)
-                    chapter_id = int(chapter_id_str)
-                except ValueError:
-                    logger.warning(f"Invalid IDs in key: {key_str}")
-                    continue
+    return ChapterImportService().run(job_id, branch_id, path, publish=publish)
 
-                # Get data from Redis
-                data_raw = client.get(key)
-                if not data_raw:
-                    continue
 
-                try:
-                    data = json.loads(data_raw)
-                except json.JSONDecodeError:
-                    continue
+@shared_task
+def export_branch(
+    job_id: str, branch_id: int, fmt: str, accessible_ids: list[int] | None, path: str
+) -> str:
+    """
+    브랜치의 공개 회차를 EPUB/zip 파일로 내보냅니다 (BranchExportService.request_export가 등록).
 
-                title = data.get("title")
-                content = data.get("content")
+    Returns:
+        str: 저장된 파일 경로
+    """
+    from apps.contents.exporter import BranchExportService
 
-                if title is None or content is None:
-                    continue
+    return BranchExportService().run(job_id, branch_id, fmt, accessible_ids, path)
 
-                try:
-                    # Wrap each chapter update in its own transaction
-                    # This ensures partial success - if one chapter fails,
-                    # others that succeeded remain saved
-                    with transaction.atomic():
-                        chapter = Chapter.objects.select_for_update().get(
-                            id=chapter_id, branch_id=branch_id
-                        )
-
-                        # Constraint: Only update if status is DRAFT
-                        if chapter.status != ChapterStatus.DRAFT:
-                            continue
-
-                        # Check if update is needed
-                        if chapter.title != title or chapter.content != content:
-                            chapter.title = title
-                            chapter.content = content
-
-                            # Update derived fields using service logic
-                            chapter.content_html = service.convert_markdown(content)
-                            chapter.word_count = service.calculate_word_count(content)
-
-                            chapter.save()
-                            updated_count += 1
-
-                except Chapter.DoesNotExist:
-                    # Silently ignore if chapter was deleted from DB
-                    continue
 
-            except (
-                redis.RedisError,
-                ValueError,
-                TypeError,
-                json.JSONDecodeError,
-                DatabaseError,
-            ) as e:
-                logger.error(f"Error processing key {key_str}: {str(e)}")
-                errors_count += 1
-                if errors_count >= 10:
-                    logger.error("Too many errors while syncing drafts, aborting early.")
-                    break
-                continue
-            else:
-                # Reset consecutive error counter after successful iteration
-                errors_count = 0
-
-        return f"Synced {updated_count} drafts. Errors: {errors_count}"
+@shared_task
+def fork_maps(job_id: str, source_branch_id: int, target_branch_id: int, user_id: int) -> int:
+    """
+    원본 브랜치의 지도를 대상 브랜치로 일괄 복사합니다 (MapService.start_fork가 등록).
+
+    진행 상황(복사한 오브젝트 수)은 작업 ID로 캐시에 기록됩니다.
+
+    Returns:
+        int: 복사된 지도 수
+    """
+    from apps.contents.map_services import MapService
+    from apps.users.models import User
+
+    user = User.objects.get(pk=user_id)
+    return MapService.run_fork(job_id, source_branch_id, target_branch_id, user)
+
+
+@shared_task
+def render_map_tiles(snapshot_id: int) -> int:
+    """
+    지도 스냅샷의 앞쪽 확대 수준 타일을 미리 만들어 캐시에 넣습니다 (MapTileService.schedule_render가 등록).
+
+    Returns:
+        int: 캐시에 넣은 타일 수
+    """
+    from apps.contents.map_tiles import MapTileService
+
+    return MapTileService.render(snapshot_id)
+
+
+@shared_task
+def flush_view_counts() -> str:
+    """
+    Redis에 버퍼링된 회차 조회수를 회차/브랜치/소설 조회수 컬럼에 일괄 반영한다.
+
+    Returns:
+        str: 반영 결과 요약 문자열. Redis 오류 시 오류 메시지를 포함한다.
+    """
+    from apps.contents.view_counter import ChapterViewCounter
+
+    logger = logging.getLogger(__name__)
 
+    try:
+        flushed = ChapterViewCounter.flush()
     except redis.RedisError as e:
-        logger.error(f"Redis connection error: {str(e)}")
-        return f"Redis error: {str(e)}"
\ No newline at end of file
+        logger.error(f"Redis error while flushing view counts: {str(e)}")
+        return f"Redis error: {str(e)}"
+
+    return f"Flushed {flushed} views."
@@ -0,0 +1,250 @@
+"""
+BranchExportService Tests - streaming EPUB/zip export of a branch.
+
+Tests:
+- build(): access filtering, wiki snapshots at the last chapter, EPUB layout
+- request_export(): artifacts reused per Branch.version and access scope
+- POST /api/v1/branches/{branch_id}/chapters/export/ - start an export job
+- GET /api/v1/branches/{branch_id}/chapters/export/{job_id}/download/ - ranged download
+"""
+
+import io
+import json
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.exporter import BranchExportService, ExportJobStatus
+from apps.contents.models import AccessType, Chapter, ChapterStatus, WikiEntry, WikiSnapshot
+from apps.contents.tasks import export_branch
+from apps.interactions.models import Purchase
+from apps.novels.models import Branch
+from apps.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def branch() -> Branch:
+    branch = baker.make(Branch, version=3)
+    for number, access_type in [(1, AccessType.FREE), (2, AccessType.SUBSCRIPTION)]:
+        baker.make(
+            Chapter,
+            branch=branch,
+            chapter_number=number,
+            title=f"Chapter {number}",
+            content=f"Body {number}",
+            content_html=f"<p>Body {number}</p>",
+            status=ChapterStatus.PUBLISHED,
+            access_type=access_type,
+        )
+    baker.make(Chapter, branch=branch, chapter_number=3, status=ChapterStatus.DRAFT)
+    return branch
+
+
+def read_zip(path: str) -> zipfile.ZipFile:
+    with default_storage.open(path, "rb") as f:
+        return zipfile.ZipFile(io.BytesIO(f.read()))
+
+
+@pytest.mark.django_db
+class TestBuild:
+    """Tests for BranchExportService.build()"""
+
+    def test_free_scope_exports_only_free_published_chapters(self, branch):
+        """Readers without access get FREE chapters only; drafts are never exported."""
+        service = BranchExportService()
+        path = service.get_artifact_path(branch, "zip", [])
+
+        service.build(branch.id, "zip", [], path)
+
+        bundle = read_zip(path)
+        assert bundle.read("chapters/0001.md").decode() == "# Chapter 1\n\nBody 1\n"
+        assert "chapters/0002.md" not in bundle.namelist()
+        manifest = json.loads(bundle.read("manifest.json"))
+        assert [c["number"] for c in manifest["chapters"]] == [1]
+
+    def test_purchased_and_full_scopes(self, branch):
+        """Purchased chapter IDs are added; None exports every published chapter."""
+        service = BranchExportService()
+        paid = Chapter.objects.get(branch=branch, chapter_number=2)
+
+        purchased = service.build(branch.id, "zip", [paid.id], "exports/purchased.zip")
+        full = service.build(branch.id, "zip", None, "exports/full.zip")
+
+        assert "chapters/0002.md" in read_zip(purchased).namelist()
+        assert "chapters/0003.md" not in read_zip(full).namelist()
+
+    def test_wiki_snapshots_valid_at_last_chapter(self, branch):
+        """Each entry contributes its latest snapshot up to the last exported chapter."""
+        entry = baker.make(WikiEntry, branch=branch, name="Hero", hidden_note="secret")
+        baker.make(WikiSnapshot, wiki_entry=entry, valid_from_chapter=1, content="early")
+        baker.make(WikiSnapshot, wiki_entry=entry, valid_from_chapter=2, content="late")
+
+        path = BranchExportService().build(branch.id, "zip", [], "exports/wiki.zip")
+
+        wiki = json.loads(read_zip(path).read("wiki.json"))
+        assert wiki == [{"name": "Hero", "content": "early"}]
+
+    def test_epub_layout(self, branch):
+        """The EPUB starts with an uncompressed mimetype entry and lists chapters in the spine."""
+        path = BranchExportService().build(branch.id, "epub", None, "exports/book.epub")
+
+        bundle = read_zip(path)
+        first = bundle.infolist()[0]
+        assert first.filename == "mimetype"
+        assert first.compress_type == zipfile.ZIP_STORED
+        assert bundle.read("mimetype") == b"application/epub+zip"
+        opf = bundle.read("OEBPS/content.opf").decode()
+        assert 'idref="chapter-0001"' in opf and 'idref="chapter-0002"' in opf
+        assert "<p>Body 2</p>" in bundle.read("OEBPS/chapter-0002.xhtml").decode()
+
+    def test_zip_round_trips_through_importer(self, branch):
+        """The zip export can be imported back as chapters."""
+        from apps.contents.importer import ChapterImportService
+
+        path = BranchExportService().build(branch.id, "zip", None, "exports/backup.zip")
+        with default_storage.open(path, "rb") as archive:
+            chapters = list(ChapterImportService().parse(archive, path))
+
+        assert chapters == [("Chapter 1", "Body 1"), ("Chapter 2", "Body 2")]
+
+
+@pytest.mark.django_db
+class TestRequestExport:
+    """Tests for BranchExportService.request_export()"""
+
+    def test_reuses_artifact_until_version_changes(
+        self, branch, django_capture_on_commit_callbacks
+    ):
+        """A second request for the same version is DONE immediately; a new version rebuilds."""
+        user = baker.make(User)
+        service = BranchExportService()
+
+        with patch("apps.contents.tasks.export_branch.delay", side_effect=export_branch) as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                _, first = service.request_export(branch, user, "zip")
+            with django_capture_on_commit_callbacks(execute=True):
+                _, second = service.request_export(branch, user, "zip")
+            assert delay.call_count == 1
+
+            Branch.bump_version(branch.id)
+            branch.refresh_from_db()
+            with django_capture_on_commit_callbacks(execute=True):
+                _, third = service.request_export(branch, user, "zip")
+
+        assert first["status"] == ExportJobStatus.PENDING
+        assert second["status"] == ExportJobStatus.DONE
+        assert second["path"] == first["path"]
+        assert third["path"] != first["path"]
+        # The DONE jobs of the old version can still download it
+        assert default_storage.exists(first["path"])
+        assert default_storage.exists(third["path"])
+
+    def test_stale_artifact_is_deleted_once_no_job_leases_it(
+        self, branch, django_capture_on_commit_callbacks
+    ):
+        """Building a new version removes older artifacts whose jobs have expired."""
+        user = baker.make(User)
+        service = BranchExportService()
+
+        with patch("apps.contents.tasks.export_branch.delay", side_effect=export_branch):
+            with django_capture_on_commit_callbacks(execute=True):
+                old_job_id, old = service.request_export(branch, user, "zip")
+            Branch.bump_version(branch.id)
+            branch.refresh_from_db()
+            # The old job expires before the next version is built
+            cache.delete(BranchExportService.LEASE_KEY.format(path=old["path"]))
+            cache.delete(BranchExportService.JOB_KEY.format(job_id=old_job_id))
+            with django_capture_on_commit_callbacks(execute=True):
+                _, new = service.request_export(branch, user, "zip")
+
+        assert not default_storage.exists(old["path"])
+        assert default_storage.exists(new["path"])
+
+    def test_scope_depends_on_access(self, branch):
+        """Author, free reader and purchaser get different artifacts."""
+        service = BranchExportService()
+        buyer = baker.make(User)
+        baker.make(
+            Purchase, user=buyer, chapter=Chapter.objects.get(branch=branch, chapter_number=2)
+        )
+
+        with patch("apps.contents.tasks.export_branch.delay"):
+            paths = {
+                service.request_export(branch, user, "epub")[1]["path"]
+                for user in (branch.author, baker.make(User), buyer)
+            }
+
+        assert len(paths) == 3
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+    """Tests for the export job endpoints."""
+
+    def test_export_and_ranged_download(self, branch, django_capture_on_commit_callbacks):
+        """The requester polls the job and downloads the file, resuming with a Range header."""
+        user = baker.make(User)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = f"/api/v1/branches/{branch.id}/chapters/export/"
+
+        with (
+            patch("apps.contents.tasks.export_branch.delay", side_effect=export_branch),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = client.post(url, {"format": "zip"}, format="json")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["data"]["jobId"]
+        assert client.get(f"{url}{job_id}/").json()["data"]["status"] == ExportJobStatus.DONE
+
+        full = client.get(f"{url}{job_id}/download/")
+        body = b"".join(full.streaming_content)
+        assert full.status_code == status.HTTP_200_OK
+        assert full["Accept-Ranges"] == "bytes"
+        assert zipfile.ZipFile(io.BytesIO(body)).namelist()
+
+        partial = client.get(f"{url}{job_id}/download/", HTTP_RANGE="bytes=10-")
+        assert partial.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert partial["Content-Range"] == f"bytes 10-{len(body) - 1}/{len(body)}"
+        assert b"".join(partial.streaming_content) == body[10:]
+
+    def test_job_is_private_to_requester(self, branch):
+        """Other users cannot see or download someone else's export."""
+        owner = baker.make(User)
+        with patch("apps.contents.tasks.export_branch.delay"):
+            job_id, _ = BranchExportService().request_export(branch, owner, "zip")
+
+        client = APIClient()
+        client.force_authenticate(user=baker.make(User))
+        response = client.get(f"/api/v1/branches/{branch.id}/chapters/export/{job_id}/download/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_download_before_done(self, branch):
+        """A pending job has nothing to download yet."""
+        user = baker.make(User)
+        with patch("apps.contents.tasks.export_branch.delay"):
+            job_id, _ = BranchExportService().request_export(branch, user, "zip")
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(f"/api/v1/branches/{branch.id}/chapters/export/{job_id}/download/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_authentication(self, branch):
+        response = APIClient().post(f"/api/v1/branches/{branch.id}/chapters/export/")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
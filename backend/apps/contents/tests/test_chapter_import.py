@@ -0,0 +1,255 @@
+"""
+ChapterImportService Tests - streaming bulk import of chapters.
+
+Tests:
+- import_archive(): delimited markdown and zip archives, batching, counters
+- POST /api/v1/branches/{branch_id}/chapters/import/ - start an import job
+- GET /api/v1/branches/{branch_id}/chapters/import/{job_id}/ - job progress
+"""
+
+import io
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents import importer
+from apps.contents.importer import ChapterImportService, ImportJobStatus
+from apps.contents.models import Chapter, ChapterStatus
+from apps.contents.tasks import import_chapters
+from apps.novels.models import Branch
+from apps.users.models import User
+
+DELIMITED = "# One\n\nFirst **body**\n\n# Two\n\nSecond\n\nmore\n\n# Three\n\nThird\n"
+
+
+def make_zip(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as bundle:
+        for name, text in files.items():
+            bundle.writestr(name, text)
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportArchive:
+    """Tests for ChapterImportService.import_archive()"""
+
+    def test_delimited_file_appends_after_last_chapter(self):
+        """Each '# Title' starts a chapter, numbered after the existing ones."""
+        branch = baker.make(Branch, chapter_count=0, version=0)
+        baker.make(Chapter, branch=branch, chapter_number=1)
+
+        imported = ChapterImportService().import_archive(
+            branch.id, io.BytesIO(DELIMITED.encode()), "novel.md"
+        )
+
+        assert imported == 3
+        chapters = list(Chapter.objects.filter(branch=branch, chapter_number__gt=1))
+        assert [(c.chapter_number, c.title) for c in chapters] == [
+            (2, "One"),
+            (3, "Two"),
+            (4, "Three"),
+        ]
+        assert chapters[0].content_html == "<p>First <strong>body</strong></p>"
+        assert len(chapters[1].paragraph_offsets) == 2
+        assert all(c.status == ChapterStatus.DRAFT for c in chapters)
+        branch.refresh_from_db()
+        assert branch.chapter_count == 0
+        assert branch.version == 1
+
+    def test_zip_in_file_name_order_and_publish(self):
+        """Zip members are chapters in name order; publish updates chapter_count once."""
+        branch = baker.make(Branch, chapter_count=0)
+        archive = make_zip(
+            {
+                "002.md": "# Second\n\nB",
+                "001.md": "A without heading",
+                "notes/.hidden.md": "skip",
+                "cover.png": "skip",
+            }
+        )
+
+        ChapterImportService().import_archive(
+            branch.id, io.BytesIO(archive), "novel.zip", publish=True
+        )
+
+        chapters = list(Chapter.objects.filter(branch=branch))
+        assert [(c.title, c.content) for c in chapters] == [
+            ("001", "A without heading"),
+            ("Second", "B"),
+        ]
+        assert all(c.status == ChapterStatus.PUBLISHED and c.published_at for c in chapters)
+        branch.refresh_from_db()
+        assert branch.chapter_count == 2
+
+    def test_zip_numbers_sort_naturally(self):
+        """Numbered file names are ordered by number, not character by character."""
+        branch = baker.make(Branch)
+        names = [f"part{part}/chapter{i}.md" for part in (1, 2) for i in range(1, 12)]
+        archive = make_zip({name: f"body of {name}" for name in reversed(names)})
+
+        ChapterImportService().import_archive(branch.id, io.BytesIO(archive), "novel.zip")
+
+        chapters = Chapter.objects.filter(branch=branch).order_by("chapter_number")
+        assert [c.content for c in chapters] == [f"body of {name}" for name in names]
+
+    def test_inserts_in_batches(self):
+        """Chapters are written batch by batch with progress after each batch."""
+        branch = baker.make(Branch)
+        text = "".join(f"# Chapter {i}\n\nBody {i}\n\n" for i in range(5))
+        progress = []
+
+        with patch.object(ChapterImportService, "BATCH_SIZE", 2):
+            ChapterImportService().import_archive(
+                branch.id, io.BytesIO(text.encode()), "novel.md", on_progress=progress.append
+            )
+
+        assert progress == [2, 4, 5]
+        assert Chapter.objects.filter(branch=branch).count() == 5
+
+    def test_renders_in_process_pool(self, settings):
+        """With several workers the bodies are rendered in a process pool."""
+        settings.CHAPTER_IMPORT_WORKERS = 2
+        branch = baker.make(Branch)
+
+        ChapterImportService().import_archive(branch.id, io.BytesIO(DELIMITED.encode()), "a.md")
+
+        assert Chapter.objects.get(branch=branch, chapter_number=3).content_html.startswith(
+            "<p>Third"
+        )
+
+    def test_rejects_corrupt_zip(self):
+        """A broken zip is a ValueError and nothing is written."""
+        branch = baker.make(Branch)
+
+        with pytest.raises(ValueError):
+            ChapterImportService().import_archive(branch.id, io.BytesIO(b"nope"), "a.zip")
+
+        assert not Chapter.objects.filter(branch=branch).exists()
+
+    def test_rejects_oversized_zip(self):
+        """Too many members or an oversized member is refused before anything is written."""
+        branch = baker.make(Branch)
+        service = ChapterImportService()
+
+        with patch.object(ChapterImportService, "MAX_ZIP_MEMBERS", 2):
+            with pytest.raises(ValueError):
+                service.import_archive(
+                    branch.id, io.BytesIO(make_zip({f"{i}.md": "x" for i in range(3)})), "a.zip"
+                )
+        with patch.object(ChapterImportService, "MAX_CHAPTER_BYTES", 10):
+            with pytest.raises(ValueError):
+                service.import_archive(
+                    branch.id, io.BytesIO(make_zip({"1.md": "x", "2.md": "y" * 11})), "a.zip"
+                )
+
+        assert not Chapter.objects.filter(branch=branch).exists()
+
+    def test_failed_batch_keeps_earlier_batches(self):
+        """Each batch commits on its own; counters cover the batches written."""
+        branch = baker.make(Branch, version=0)
+        text = "".join(f"# Chapter {i}\n\nBody {i}\n\n" for i in range(3))
+        render = importer._render
+
+        def fail_on_last(content: str) -> tuple[str, list[int], int]:
+            if content == "Body 2":
+                raise RuntimeError("render failed")
+            return render(content)
+
+        with (
+            patch.object(ChapterImportService, "BATCH_SIZE", 2),
+            patch.object(importer, "_render", fail_on_last),
+            pytest.raises(RuntimeError),
+        ):
+            ChapterImportService().import_archive(branch.id, io.BytesIO(text.encode()), "novel.md")
+
+        assert Chapter.objects.filter(branch=branch).count() == 2
+        branch.refresh_from_db()
+        assert branch.version == 1
+
+    def test_chapters_created_between_batches(self):
+        """A chapter created while an import runs takes the next free number."""
+        branch = baker.make(Branch)
+        text = "".join(f"# Chapter {i}\n\nBody {i}\n\n" for i in range(4))
+
+        def create_between(imported: int) -> None:
+            if imported == 2:
+                baker.make(Chapter, branch=branch, chapter_number=3, title="Written meanwhile")
+
+        with patch.object(ChapterImportService, "BATCH_SIZE", 2):
+            ChapterImportService().import_archive(
+                branch.id, io.BytesIO(text.encode()), "novel.md", on_progress=create_between
+            )
+
+        assert list(Chapter.objects.filter(branch=branch).values_list("title", flat=True)) == [
+            "Chapter 0",
+            "Chapter 1",
+            "Written meanwhile",
+            "Chapter 2",
+            "Chapter 3",
+        ]
+
+
+@pytest.mark.django_db
+class TestImportEndpoint:
+    """Tests for the import job endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_import_job_runs_and_reports_progress(self, django_capture_on_commit_callbacks):
+        """Upload starts a job; polling it reports the imported count."""
+        user = baker.make(User)
+        branch = baker.make(Branch, author=user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        upload = SimpleUploadedFile("novel.md", DELIMITED.encode())
+        url = f"/api/v1/branches/{branch.id}/chapters/import/"
+
+        # Run the queued task in-process
+        with (
+            patch("apps.contents.tasks.import_chapters.delay", side_effect=import_chapters),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = client.post(url, {"file": upload}, format="multipart")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["data"]["jobId"]
+
+        job = client.get(f"{url}{job_id}/").json()["data"]
+        assert job["status"] == ImportJobStatus.DONE
+        assert job["imported"] == 3
+        assert Chapter.objects.filter(branch=branch).count() == 3
+
+    def test_non_author_cannot_import(self):
+        """Only the branch author may import."""
+        branch = baker.make(Branch)
+        client = APIClient()
+        client.force_authenticate(user=baker.make(User))
+        upload = SimpleUploadedFile("novel.md", DELIMITED.encode())
+
+        response = client.post(
+            f"/api/v1/branches/{branch.id}/chapters/import/", {"file": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unsupported_file_type(self):
+        """Uploads other than zip/markdown are rejected."""
+        user = baker.make(User)
+        branch = baker.make(Branch, author=user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        upload = SimpleUploadedFile("novel.pdf", b"%PDF")
+
+        response = client.post(
+            f"/api/v1/branches/{branch.id}/chapters/import/", {"file": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -8,6 +8,8 @@ Tests:
 - schedule(): Schedule a chapter for future publication
 - retrieve(): Get chapter by branch and number
 - list(): List chapters for a branch
+- ChapterNavigationService: Cached prev/next/TOC index
+- compute_paragraph_offsets() / get_paragraph_window(): Paragraph addressing
 """
 
 from datetime import timedelta
@@ -17,10 +19,55 @@ from django.utils import timezone
 from model_bakery import baker
 
 from apps.contents.models import AccessType, Chapter, ChapterStatus
-from apps.contents.services import ChapterService
+from apps.contents.services import ChapterNavigationService, ChapterService
 from apps.novels.models import Branch
 
 
+class TestChapterServiceParagraphOffsets:
+    """Tests for ChapterService.compute_paragraph_offsets()"""
+
+    def test_offsets_mark_top_level_blocks(self):
+        """Nested and multi-line blocks count as a single paragraph."""
+        html = ChapterService().convert_markdown(
+            "# Title\n\nFirst *para*\n\n> quote\n> more\n\n```\ncode\n\nblock\n```\n\n---\n\nLast"
+        )
+
+        offsets = ChapterService.compute_paragraph_offsets(html)
+
+        blocks = [
+            html[a:b].strip() for a, b in zip(offsets, [*offsets[1:], len(html)], strict=True)
+        ]
+        assert len(blocks) == 6
+        assert blocks[0].startswith("<h1")
+        assert blocks[1] == "<p>First <em>para</em></p>"
+        assert blocks[2].startswith("<blockquote>") and blocks[2].endswith("</blockquote>")
+        assert blocks[4] == "<hr />"
+        assert blocks[5] == "<p>Last</p>"
+
+    def test_offsets_are_character_based(self):
+        """Offsets index the str, so multi-byte text does not shift them."""
+        html = "<p>한글 문단</p>\n<p>둘째</p>"
+
+        assert ChapterService.compute_paragraph_offsets(html) == [0, html.index("<p>둘째")]
+
+
+@pytest.mark.django_db
+class TestChapterServiceParagraphWindow:
+    """Tests for ChapterService.get_paragraph_window()"""
+
+    def test_backfills_missing_offsets(self):
+        """Chapters saved before offsets existed get them on first read."""
+        chapter = baker.make(
+            Chapter, content_html="<p>a</p>\n<p>b</p>\n<p>c</p>", paragraph_offsets=[]
+        )
+
+        window = ChapterService().get_paragraph_window(chapter, 1, 5)
+
+        assert window == [{"index": 1, "html": "<p>b</p>"}, {"index": 2, "html": "<p>c</p>"}]
+        chapter.refresh_from_db()
+        assert len(chapter.paragraph_offsets) == 3
+
+
 @pytest.mark.django_db
 class TestChapterServiceCreate:
     """Tests for ChapterService.create()"""
@@ -315,3 +362,77 @@ class TestChapterServiceList:
 
         assert len(result) == 1
         assert result[0] == published
+
+
+@pytest.mark.django_db
+class TestChapterNavigationService:
+    """Tests for ChapterNavigationService"""
+
+    def test_index_contains_published_chapters_in_order(self):
+        """Should list only published chapters ordered by chapter_number."""
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=2, status=ChapterStatus.PUBLISHED)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+        baker.make(Chapter, branch=branch, chapter_number=3, status=ChapterStatus.DRAFT)
+
+        index = ChapterNavigationService.get_index(branch.id)
+
+        assert [entry["chapter_number"] for entry in index] == [1, 2]
+
+    def test_neighbors_skip_unpublished(self):
+        """Prev/next should skip unpublished chapters."""
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+        baker.make(Chapter, branch=branch, chapter_number=2, status=ChapterStatus.DRAFT)
+        baker.make(Chapter, branch=branch, chapter_number=3, status=ChapterStatus.PUBLISHED)
+
+        prev_entry, next_entry = ChapterNavigationService.get_neighbors(branch.id, 2)
+
+        assert prev_entry["chapter_number"] == 1
+        assert next_entry["chapter_number"] == 3
+
+    def test_neighbors_at_edges(self):
+        """First chapter has no prev, last chapter has no next."""
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+        baker.make(Chapter, branch=branch, chapter_number=2, status=ChapterStatus.PUBLISHED)
+
+        assert ChapterNavigationService.get_neighbors(branch.id, 1)[0] is None
+        assert ChapterNavigationService.get_neighbors(branch.id, 2)[1] is None
+
+    def test_cached_index_uses_no_queries(self, django_assert_num_queries):
+        """Second lookup should be served from cache."""
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+
+        ChapterNavigationService.get_index(branch.id)
+
+        with django_assert_num_queries(0):
+            ChapterNavigationService.get_index(branch.id)
+
+    def test_publish_invalidates_index(self):
+        """Publishing a chapter should make it appear in the index."""
+        service = ChapterService()
+        branch = baker.make(Branch)
+        chapter = baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.DRAFT)
+        assert ChapterNavigationService.get_index(branch.id) == []
+
+        service.publish(chapter=chapter)
+
+        assert [e["id"] for e in ChapterNavigationService.get_index(branch.id)] == [chapter.id]
+
+    def test_delete_invalidates_index_and_updates_branch(self):
+        """Deleting a published chapter should drop it from the index."""
+        service = ChapterService()
+        branch = baker.make(Branch, chapter_count=1, version=3)
+        chapter = baker.make(
+            Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED
+        )
+        assert len(ChapterNavigationService.get_index(branch.id)) == 1
+
+        service.delete(chapter)
+
+        branch.refresh_from_db()
+        assert ChapterNavigationService.get_index(branch.id) == []
+        assert branch.chapter_count == 0
+        assert branch.version == 4
@@ -3,7 +3,9 @@ ChapterViewSet Tests - TDD approach for Chapter API endpoints.
 
 Tests:
 - GET /api/v1/branches/{branch_id}/chapters - List chapters
+- GET /api/v1/branches/{branch_id}/chapters/toc - Table of contents
 - GET /api/v1/branches/{branch_id}/chapters/{chapter_number} - Get chapter detail
+- GET /api/v1/branches/{branch_id}/chapters/{chapter_number}/paragraphs - Paragraph window
 - POST /api/v1/branches/{branch_id}/chapters - Create chapter
 - PATCH /api/v1/chapters/{id} - Update chapter
 - POST /api/v1/chapters/{id}/publish - Publish chapter
@@ -21,6 +23,7 @@ from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from apps.contents.models import Chapter, ChapterStatus
+from apps.contents.services import ChapterService
 from apps.novels.models import Branch
 from apps.users.models import User
 
@@ -86,6 +89,17 @@ class TestChapterList:
         assert results[1]["chapterNumber"] == 2
         assert results[2]["chapterNumber"] == 3
 
+    def test_list_skips_chapter_body(self, assert_no_heavy_columns):
+        """List queries should not select content/content_html."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, status=ChapterStatus.PUBLISHED, _quantity=2)
+
+        with assert_no_heavy_columns(Chapter):
+            response = client.get(f"/api/v1/branches/{branch.id}/chapters/")
+
+        assert len(response.json()["data"]["results"]) == 2
+
     def test_author_can_see_all_chapters(self):
         """Branch author should see drafts too."""
         user = baker.make(User)
@@ -140,6 +154,231 @@ class TestChapterDetail:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_cached_payload_matches_serializer(self):
+        """Pre-rendered response should carry the same fields as the serializer."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        chapter = baker.make(
+            Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED
+        )
+        url = f"/api/v1/branches/{branch.id}/chapters/1/"
+
+        first = client.get(url).json()
+        second = client.get(url).json()
+
+        expected_keys = {
+            "id",
+            "chapterNumber",
+            "title",
+            "contentHtml",
+            "wordCount",
+            "status",
+            "accessType",
+            "price",
+            "scheduledAt",
+            "publishedAt",
+            "createdAt",
+            "updatedAt",
+            "viewCount",
+            "likeCount",
+            "commentCount",
+            "prevChapter",
+            "nextChapter",
+            "uniqueReaders",
+        }
+        assert set(first["data"]) == expected_keys
+        assert first["data"] == second["data"]
+        assert second["data"]["id"] == chapter.id
+
+    def test_live_fields_not_cached(self):
+        """Counters should be fresh even when the body comes from cache."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        chapter = baker.make(
+            Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED
+        )
+        url = f"/api/v1/branches/{branch.id}/chapters/1/"
+        client.get(url)
+
+        Chapter.objects.filter(id=chapter.id).update(view_count=42)
+        response = client.get(url)
+
+        assert response.json()["data"]["viewCount"] == 42
+
+    def test_title_change_refreshes_payload(self):
+        """Updating a published chapter's title should produce a new payload."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        chapter = baker.make(
+            Chapter,
+            branch=branch,
+            chapter_number=1,
+            title="Old",
+            status=ChapterStatus.PUBLISHED,
+        )
+        url = f"/api/v1/branches/{branch.id}/chapters/1/"
+        client.get(url)
+
+        chapter.title = "New"
+        chapter.save()
+        response = client.get(url)
+
+        assert response.json()["data"]["title"] == "New"
+
+
+@pytest.mark.django_db
+class TestChapterToc:
+    """Tests for GET /api/v1/branches/{branch_id}/chapters/toc"""
+
+    def test_toc_lists_published_chapters(self):
+        """Should return compact entries for published chapters only."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        chapter = baker.make(
+            Chapter,
+            branch=branch,
+            chapter_number=1,
+            title="First",
+            status=ChapterStatus.PUBLISHED,
+        )
+        baker.make(Chapter, branch=branch, chapter_number=2, status=ChapterStatus.DRAFT)
+
+        response = client.get(f"/api/v1/branches/{branch.id}/chapters/toc/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == [{"id": chapter.id, "chapterNumber": 1, "title": "First"}]
+
+    def test_detail_navigation_served_from_index(self, django_assert_num_queries):
+        """A warm chapter view should only query the chapter itself."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        for number in (1, 2, 3):
+            baker.make(
+                Chapter, branch=branch, chapter_number=number, status=ChapterStatus.PUBLISHED
+            )
+        url = f"/api/v1/branches/{branch.id}/chapters/2/"
+        client.get(url)
+
+        with django_assert_num_queries(1):
+            response = client.get(url)
+
+        data = response.json()["data"]
+        assert data["prevChapter"]["chapterNumber"] == 1
+        assert data["nextChapter"]["chapterNumber"] == 3
+
+
+@pytest.mark.django_db
+class TestChapterParagraphs:
+    """Tests for GET /api/v1/branches/{branch_id}/chapters/{chapter_number}/paragraphs"""
+
+    @pytest.fixture
+    def chapter(self):
+        branch = baker.make(Branch)
+        chapter = ChapterService().create(
+            branch=branch,
+            title="Long",
+            content="\n\n".join(f"Paragraph {i}" for i in range(10)),
+        )
+        Chapter.objects.filter(pk=chapter.pk).update(status=ChapterStatus.PUBLISHED)
+        return chapter
+
+    def test_returns_window(self, chapter):
+        """Only the requested range of paragraphs is returned."""
+        url = f"/api/v1/branches/{chapter.branch_id}/chapters/1/paragraphs/?from=3&count=2"
+
+        response = APIClient().get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["total"] == 10
+        assert data["paragraphs"] == [
+            {"index": 3, "html": "<p>Paragraph 3</p>"},
+            {"index": 4, "html": "<p>Paragraph 4</p>"},
+        ]
+
+    def test_window_past_end(self, chapter):
+        """A window overlapping the end is truncated."""
+        url = f"/api/v1/branches/{chapter.branch_id}/chapters/1/paragraphs/?from=9&count=5"
+
+        data = APIClient().get(url).json()["data"]
+
+        assert [p["index"] for p in data["paragraphs"]] == [9]
+
+    def test_invalid_count(self, chapter):
+        """count above the maximum is rejected."""
+        url = f"/api/v1/branches/{chapter.branch_id}/chapters/1/paragraphs/?count=1000"
+
+        assert APIClient().get(url).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_draft_hidden_from_readers(self):
+        """Unpublished chapters are not exposed."""
+        chapter = baker.make(Chapter, chapter_number=1, status=ChapterStatus.DRAFT)
+        url = f"/api/v1/branches/{chapter.branch_id}/chapters/1/paragraphs/"
+
+        assert APIClient().get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestChapterConditionalGet:
+    """Tests for ETag / Last-Modified on chapter read endpoints"""
+
+    def test_list_not_modified(self):
+        """Revalidating an unchanged chapter list should return 304."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+        url = f"/api/v1/branches/{branch.id}/chapters/"
+
+        response = client.get(url)
+        etag = response["ETag"]
+        assert etag.startswith('W/"')
+        assert "Last-Modified" in response
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_publish_changes_list_etag(self):
+        """Publishing a chapter should invalidate the list validator."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        chapter = baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.DRAFT)
+        url = f"/api/v1/branches/{branch.id}/chapters/"
+        etag = client.get(url)["ETag"]
+
+        ChapterService().publish(chapter)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert len(response.json()["data"]["results"]) == 1
+
+    def test_author_list_has_no_etag(self):
+        """Authors see drafts, which are not covered by Branch.version."""
+        user = baker.make(User)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        branch = baker.make(Branch, author=user)
+
+        response = client.get(f"/api/v1/branches/{branch.id}/chapters/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response
+
+    def test_detail_not_modified(self, django_assert_num_queries):
+        """A 304 for a published chapter should skip payload rendering."""
+        client = APIClient()
+        branch = baker.make(Branch)
+        baker.make(Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED)
+        url = f"/api/v1/branches/{branch.id}/chapters/1/"
+        etag = client.get(url)["ETag"]
+
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
 
 @pytest.mark.django_db
 class TestChapterCreate:
@@ -14,6 +14,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from apps.novels.models import Branch
 from apps.users.models import User
 from apps.contents.models import Chapter
+from apps.novels.services import DraftService
 
 
 def get_tokens_for_user(user):
@@ -140,4 +141,68 @@ class TestChapterDraft:
         response = client.post(url, data, format="json")
         # If I use a serializer or manual check, this should be 400.
         # Since I haven't implemented it yet, I'll expect 400 and implement validation.
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
\ No newline at end of file
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+class TestChapterDraftPatch:
+    """Delta autosave: ops against the last acknowledged version."""
+
+    @pytest.fixture
+    def author_client(self):
+        user = baker.make(User)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        branch = baker.make(Branch, author=user)
+        return client, f"/api/v1/branches/{branch.id}/chapters/draft/"
+
+    def test_full_save_returns_version(self, author_client):
+        """Each full save bumps the draft version."""
+        client, url = author_client
+
+        first = client.post(url, {"content": "Hello"}, format="json")
+        second = client.post(url, {"content": "Hello world"}, format="json")
+
+        assert first.json()["version"] == 1
+        assert second.json()["version"] == 2
+
+    def test_patch_applies_ops(self, author_client):
+        """Ops are applied to the base version's content."""
+        client, url = author_client
+        client.post(url, {"title": "T", "content": "Hello world"}, format="json")
+
+        response = client.post(
+            url,
+            {"baseVersion": 1, "ops": [{"start": 6, "end": 11, "text": "there"}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["version"] == 2
+        branch_id = int(url.split("/")[4])
+        draft = DraftService().get_draft(branch_id)
+        assert draft["content"] == "Hello there"
+        assert draft["title"] == "T"
+
+    def test_patch_on_stale_version_conflicts(self, author_client):
+        """A stale base version is rejected with the current version."""
+        client, url = author_client
+        client.post(url, {"content": "one"}, format="json")
+        client.post(url, {"content": "two"}, format="json")
+
+        response = client.post(
+            url, {"baseVersion": 1, "ops": [{"start": 0, "end": 0, "text": "x"}]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json()["version"] == 2
+
+    def test_patch_with_invalid_range(self, author_client):
+        """Ops outside the base content are a validation error."""
+        client, url = author_client
+        client.post(url, {"content": "short"}, format="json")
+
+        response = client.post(
+            url, {"baseVersion": 1, "ops": [{"start": 3, "end": 99, "text": ""}]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
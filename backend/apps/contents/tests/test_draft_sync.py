@@ -1,93 +1,113 @@
-import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+import redis
 from model_bakery import baker
 
 from apps.contents.models import Chapter, ChapterStatus
 from apps.contents.tasks import sync_drafts_to_db
+from apps.novels.services import DraftService
+
+
+@pytest.fixture
+def redis_client():
+    with patch("django_redis.get_redis_connection") as mock_get_conn:
+        client = MagicMock()
+        client.exists.return_value = False
+        mock_get_conn.return_value = client
+        yield client
+
+
+def mark_dirty(client: MagicMock, *chapters: Chapter) -> None:
+    """Make the mocked dirty hash return the given chapters."""
+    client.hkeys.return_value = [f"{c.branch_id}:{c.id}".encode() for c in chapters]
 
 
 @pytest.mark.django_db
 class TestDraftSync:
-    def test_sync_drafts_success(self):
+    def test_sync_drafts_success(self, redis_client):
         """
-        레디스에 저장된 드래프트 데이터를 데이터베이스의 초안 챕터로 동기화하는 동작을 검증합니다.
-        
-        레디스에서 특정 챕터 키와 새 제목/내용을 반환하도록 모킹한 뒤 sync_drafts_to_db()를 실행하여,
-        대상 챕터가 데이터베이스에서 새 제목과 내용으로 업데이트되고 결과 문자열에 "Synced 1 drafts"가 포함되는지를 확인합니다.
+        dirty 목록에 있는 드래프트를 데이터베이스의 초안 챕터로 동기화하는 동작을 검증합니다.
+
+        저장된 드래프트의 제목/내용으로 챕터가 갱신되고, 동기화 후 SYNCING_KEY가 삭제되는지 확인합니다.
         """
-        # Setup existing chapter
         chapter = baker.make(
             Chapter, status=ChapterStatus.DRAFT, title="Old Title", content="Old Content"
         )
+        DraftService().save_draft(chapter.branch_id, chapter.id, "New Title", "**New** Content")
+        mark_dirty(redis_client, chapter)
 
-        # Prepare Redis data
-        redis_key = f"draft:{chapter.branch.id}:{chapter.id}"
-        new_data = {"title": "New Title", "content": "New Content"}
+        result = sync_drafts_to_db()
 
-        # Mock django-redis get_redis_connection
-        with patch("django_redis.get_redis_connection") as mock_get_conn:
-            mock_client = MagicMock()
-            mock_get_conn.return_value = mock_client
+        chapter.refresh_from_db()
+        assert chapter.title == "New Title"
+        assert chapter.content == "**New** Content"
+        assert "<strong>New</strong>" in chapter.content_html
+        assert "Synced 1 drafts" in result
+        redis_client.delete.assert_called_once_with(DraftService.SYNCING_KEY)
 
-            # Mock scan_iter to return our key (bytes)
-            mock_client.scan_iter.return_value = [redis_key.encode("utf-8")]
+    def test_save_draft_marks_dirty(self, redis_client):
+        """Saving a chapter draft records it in the dirty hash; new-chapter drafts are not."""
+        service = DraftService()
 
-            # Mock get to return our data (bytes)
-            mock_client.get.return_value = json.dumps(new_data).encode("utf-8")
+        service.save_draft(1, 10, "Title", "Content")
+        service.save_draft(1, None, "Title", "Content")
 
-            # Run task
-            result = sync_drafts_to_db()
+        redis_client.hset.assert_called_once_with(
+            DraftService.DIRTY_KEY, "1:10", DraftService.content_hash("Title", "Content")
+        )
 
-            # Verify DB updated
-            chapter.refresh_from_db()
-            assert chapter.title == "New Title"
-            assert chapter.content == "New Content"
-            assert "Synced 1 drafts" in result
+    def test_unchanged_draft_is_not_rewritten(self, redis_client):
+        """A draft whose content hash was already synced is skipped."""
+        chapter = baker.make(Chapter, status=ChapterStatus.DRAFT)
+        DraftService().save_draft(chapter.branch_id, chapter.id, "Title", "Content")
+        mark_dirty(redis_client, chapter)
+        sync_drafts_to_db()
 
-    def test_sync_skip_published(self):
-        """Test that published chapters are NOT updated."""
-        chapter = baker.make(Chapter, status=ChapterStatus.PUBLISHED, title="Published Title")
-        redis_key = f"draft:{chapter.branch.id}:{chapter.id}"
+        with patch.object(Chapter.objects, "bulk_update") as bulk_update:
+            result = sync_drafts_to_db()
+
+        assert bulk_update.call_args.args[0] == []
+        assert result == "Synced 0 drafts. Unchanged: 1"
 
-        with patch("django_redis.get_redis_connection") as mock_get_conn:
-            mock_client = MagicMock()
-            mock_get_conn.return_value = mock_client
-            mock_client.scan_iter.return_value = [redis_key.encode("utf-8")]
-            mock_client.get.return_value = json.dumps(
-                {"title": "Hacked Title", "content": "Hacked Content"}
-            ).encode("utf-8")
+    def test_sync_only_touches_dirty_drafts(self, redis_client, django_assert_num_queries):
+        """Only drafts in the dirty hash are read; no SCAN over all draft keys."""
+        dirty, clean = baker.make(Chapter, status=ChapterStatus.DRAFT, _quantity=2)
+        service = DraftService()
+        service.save_draft(dirty.branch_id, dirty.id, "Dirty", "Content")
+        service.save_draft(clean.branch_id, clean.id, "Clean", "Content")
+        mark_dirty(redis_client, dirty)
 
+        # SAVEPOINT, SELECT FOR UPDATE, bulk UPDATE, RELEASE
+        with django_assert_num_queries(4):
             sync_drafts_to_db()
 
-            chapter.refresh_from_db()
-            assert chapter.title == "Published Title"
+        redis_client.scan_iter.assert_not_called()
+        clean.refresh_from_db()
+        assert clean.title != "Clean"
+
+    def test_sync_skip_published(self, redis_client):
+        """Test that published chapters are NOT updated."""
+        chapter = baker.make(Chapter, status=ChapterStatus.PUBLISHED, title="Published Title")
+        DraftService().save_draft(chapter.branch_id, chapter.id, "Hacked Title", "Hacked")
+        mark_dirty(redis_client, chapter)
 
-    def test_skip_new_key(self):
-        """Redis 키가 ':new'로 끝나는 항목은 동기화 대상에서 제외되는지 검증한다."""
-        redis_key = "draft:1:new"
+        sync_drafts_to_db()
 
-        with patch("django_redis.get_redis_connection") as mock_get_conn:
-            mock_client = MagicMock()
-            mock_get_conn.return_value = mock_client
-            mock_client.scan_iter.return_value = [redis_key.encode("utf-8")]
+        chapter.refresh_from_db()
+        assert chapter.title == "Published Title"
 
-            sync_drafts_to_db()
+    def test_nothing_to_sync(self, redis_client):
+        """RENAME of a missing dirty hash means no drafts changed."""
+        redis_client.rename.side_effect = redis.ResponseError("no such key")
 
-            # Verify get() was never called for this key
-            mock_client.get.assert_not_called()
+        assert sync_drafts_to_db() == "Synced 0 drafts. Unchanged: 0"
+        redis_client.hkeys.assert_not_called()
 
-    def test_handle_redis_error(self):
+    def test_handle_redis_error(self, redis_client):
         """Redis 연결 오류가 발생했을 때 sync_drafts_to_db가 오류 메시지를 포함한 결과를 반환하며 예외 없이 처리되는지 검증한다."""
-        import redis  # Import redis here or at top level
+        redis_client.exists.side_effect = redis.ConnectionError("Connection failed")
 
-        with patch("django_redis.get_redis_connection") as mock_get_conn:
-            mock_client = MagicMock()
-            mock_get_conn.return_value = mock_client
-            # Simulate Redis connection error
-            mock_client.scan_iter.side_effect = redis.ConnectionError("Connection failed")
-
-            result = sync_drafts_to_db()
+        result = sync_drafts_to_db()
 
-            assert "Redis error" in result
\ No newline at end of file
+        assert "Redis error" in result
@@ -0,0 +1,272 @@
+"""
+Copy-on-write wiki/map inheritance for forks.
+
+Tests:
+- BranchLineage.resolve(): ancestry, caps narrowed per level, stamp
+- WikiService: inherited entries up to the fork point, materialize() shadowing
+- MapService: inherited maps up to the fork point, materialize() copying the map tree
+- List endpoints: inherited rows, ETag follows the parent's version
+- Map endpoints with ?branchId=: inherited snapshots capped at the fork point
+"""
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.highlighter import WikiHighlighter
+from apps.contents.lineage import BranchLineage
+from apps.contents.map_services import MapService
+from apps.contents.models import Map, MapLayer, MapObject, MapSnapshot, WikiEntry, WikiSnapshot
+from apps.contents.services import ChapterService, WikiService
+from apps.novels.models import Branch
+
+
+@pytest.fixture
+def parent(db):
+    return baker.make(Branch, version=1)
+
+
+@pytest.fixture
+def fork(parent):
+    return baker.make(Branch, parent_branch=parent, fork_point_chapter=5, version=1)
+
+
+@pytest.mark.django_db
+class TestBranchLineage:
+    def test_root_branch(self, parent, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            lineage = BranchLineage.resolve(parent.id)
+
+        assert lineage.branch_ids == [parent.id]
+        assert not lineage.is_fork
+        assert lineage.cap_for(parent.id) is None
+
+    def test_caps_narrow_per_level(self, parent, fork):
+        grandchild = baker.make(Branch, parent_branch=fork, fork_point_chapter=8)
+        deeper = baker.make(Branch, parent_branch=grandchild, fork_point_chapter=3)
+
+        lineage = BranchLineage.resolve(deeper.id)
+
+        assert lineage.branch_ids == [deeper.id, grandchild.id, fork.id, parent.id]
+        assert [node.cap for node in lineage.nodes] == [None, 3, 3, 3]
+
+    def test_stamp_follows_parent_version(self, parent, fork):
+        before = BranchLineage.resolve(fork.id).stamp
+
+        Branch.bump_version(parent.id)
+
+        assert BranchLineage.resolve(fork.id).stamp != before
+
+    def test_missing_branch(self):
+        with pytest.raises(ValueError):
+            BranchLineage.resolve(999999)
+
+
+@pytest.mark.django_db
+class TestWikiInheritance:
+    def test_fork_creates_no_rows(self, parent, fork):
+        """Forking is O(1): the fork reads the parent's entries without copies."""
+        baker.make(WikiEntry, branch=parent, name="철수", first_appearance=1)
+
+        assert [w.name for w in WikiService.list(fork.id)] == ["철수"]
+        assert WikiEntry.objects.filter(branch=fork).count() == 0
+
+    def test_inherits_up_to_fork_point(self, parent, fork):
+        early = baker.make(WikiEntry, branch=parent, name="철수", first_appearance=2)
+        baker.make(WikiEntry, branch=parent, name="영희", first_appearance=7)
+        baker.make(WikiEntry, branch=parent, name="배경", first_appearance=None)
+        baker.make(WikiSnapshot, wiki_entry=early, valid_from_chapter=1, content="초반")
+        baker.make(WikiSnapshot, wiki_entry=early, valid_from_chapter=6, content="분기 후")
+
+        assert [w.name for w in WikiService.list(fork.id)] == ["배경", "철수"]
+        entries = WikiService.list_at_chapter(fork.id, 9)
+        assert [w.name for w in entries] == ["배경", "철수"]
+        assert entries[1].snapshot_at_chapter.content == "초반"
+
+    def test_materialize_copies_and_shadows(self, parent, fork):
+        tag = baker.make("contents.WikiTagDefinition", branch=parent, name="인물")
+        entry = baker.make(
+            WikiEntry, branch=parent, name="철수", first_appearance=1, hidden_note="비밀"
+        )
+        entry.tags.add(tag)
+        baker.make(WikiSnapshot, wiki_entry=entry, valid_from_chapter=1, content="초반")
+        baker.make(WikiSnapshot, wiki_entry=entry, valid_from_chapter=6, content="분기 후")
+
+        copy = WikiService.materialize(fork.id, entry.id, fork.author)
+
+        assert copy.branch_id == fork.id
+        assert copy.source_wiki_id == entry.id
+        assert copy.hidden_note == ""
+        assert [s.content for s in copy.snapshots.all()] == ["초반"]
+        assert [t.name for t in copy.tags.all()] == ["인물"]
+        assert [w.id for w in WikiService.list(fork.id)] == [copy.id]
+        # Idempotent
+        assert WikiService.materialize(fork.id, entry.id, fork.author).id == copy.id
+
+    def test_materialize_requires_fork_author(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, first_appearance=1)
+
+        with pytest.raises(PermissionDenied):
+            WikiService.materialize(fork.id, entry.id, parent.author)
+
+    def test_materialize_rejects_entry_after_fork_point(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, first_appearance=9)
+
+        with pytest.raises(ValueError):
+            WikiService.materialize(fork.id, entry.id, fork.author)
+
+    def test_create_rejects_inherited_name(self, parent, fork):
+        baker.make(WikiEntry, branch=parent, name="철수", first_appearance=1)
+
+        with pytest.raises(ValueError):
+            WikiService.create(fork.id, fork.author, name="철수")
+
+    def test_parent_change_invalidates_fork_cache(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, name="철수", first_appearance=1)
+        assert [w.name for w in WikiService.list_at_chapter(fork.id, 3)] == ["철수"]
+
+        WikiService.update(entry.id, parent.author, name="영희")
+
+        assert [w.name for w in WikiService.list_at_chapter(fork.id, 3)] == ["영희"]
+
+    def test_highlights_inherited_entries(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, name="영희", first_appearance=1)
+        html = "<p>철수가 영희를 만났다.</p>"
+        chapter = baker.make(
+            "contents.Chapter",
+            branch=fork,
+            chapter_number=6,
+            content_html=html,
+            paragraph_offsets=ChapterService.compute_paragraph_offsets(html),
+        )
+
+        assert WikiHighlighter.highlight(chapter)["wikis"] == [{"id": entry.id, "name": "영희"}]
+
+
+@pytest.mark.django_db
+class TestMapInheritance:
+    def test_materialize_copies_tree_up_to_fork_point(self, parent, fork):
+        source = baker.make(Map, branch=parent, name="대륙")
+        early = baker.make(MapSnapshot, map=source, valid_from_chapter=1)
+        baker.make(MapSnapshot, map=source, valid_from_chapter=6)
+        layer = baker.make(MapLayer, snapshot=early, name="도시")
+        baker.make(MapObject, layer=layer, label="수도", coordinates={"x": 1, "y": 2})
+
+        assert [m.id for m in MapService.list(fork.id)] == [source.id]
+
+        copy = MapService.materialize(fork.id, source.id, fork.author)
+
+        assert copy.source_map_id == source.id
+        snapshots = list(copy.snapshots.all())
+        assert [s.valid_from_chapter for s in snapshots] == [1]
+        assert [layer.name for layer in snapshots[0].layers.all()] == ["도시"]
+        assert MapObject.objects.filter(layer__snapshot__map=copy).get().label == "수도"
+        assert [m.id for m in MapService.list(fork.id)] == [copy.id]
+        assert [m.id for m in MapService.list(parent.id)] == [source.id]
+
+    def test_inherited_snapshots_stop_at_fork_point(self, parent, fork):
+        source = baker.make(Map, branch=parent, name="대륙")
+        baker.make(MapSnapshot, map=source, valid_from_chapter=1)
+        baker.make(MapSnapshot, map=source, valid_from_chapter=6)
+        fork_lineage = BranchLineage.resolve(fork.id)
+
+        retrieved = MapService.retrieve(source.id, lineage=fork_lineage)
+        result = MapService.get_for_chapter(source.id, 9, lineage=fork_lineage)
+
+        assert [s.valid_from_chapter for s in retrieved.snapshots.all()] == [1]
+        assert result["snapshot"].valid_from_chapter == 1
+        assert MapService.get_for_chapter(source.id, 9)["snapshot"].valid_from_chapter == 6
+        parent_lineage = BranchLineage.resolve(parent.id)
+        assert len(MapService.retrieve(source.id, lineage=parent_lineage).snapshots.all()) == 2
+
+    def test_retrieve_hides_maps_of_other_branches(self, parent, fork):
+        source = baker.make(Map, branch=fork, name="대륙")
+
+        with pytest.raises(ValueError):
+            MapService.retrieve(source.id, lineage=BranchLineage.resolve(parent.id))
+
+
+@pytest.mark.django_db
+class TestInheritanceEndpoints:
+    def test_list_etag_follows_parent(self, parent, fork):
+        baker.make(WikiEntry, branch=parent, name="철수", first_appearance=1)
+        client = APIClient()
+        url = f"/api/v1/branches/{fork.id}/wikis/"
+        response = client.get(url)
+        assert [r["name"] for r in response.json()["data"]["results"]] == ["철수"]
+
+        Branch.bump_version(parent.id)
+        response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_materialize_endpoint(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, name="철수", first_appearance=1)
+        source = baker.make(Map, branch=parent, name="대륙")
+        client = APIClient()
+        client.force_authenticate(user=fork.author)
+
+        wiki_response = client.post(f"/api/v1/branches/{fork.id}/wikis/{entry.id}/materialize/")
+        map_response = client.post(f"/api/v1/branches/{fork.id}/maps/{source.id}/materialize/")
+
+        assert wiki_response.status_code == status.HTTP_200_OK
+        assert wiki_response.json()["data"]["id"] != entry.id
+        assert map_response.status_code == status.HTTP_200_OK
+        assert Map.objects.get(id=map_response.json()["data"]["id"]).source_map_id == source.id
+
+    def test_materialize_endpoint_requires_author(self, parent, fork):
+        entry = baker.make(WikiEntry, branch=parent, first_appearance=1)
+        client = APIClient()
+        client.force_authenticate(user=parent.author)
+
+        response = client.post(f"/api/v1/branches/{fork.id}/wikis/{entry.id}/materialize/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestInheritedMapEndpoints:
+    @pytest.fixture
+    def source(self, parent):
+        source = baker.make(Map, branch=parent, name="대륙")
+        baker.make(MapSnapshot, map=source, valid_from_chapter=1)
+        baker.make(MapSnapshot, map=source, valid_from_chapter=6)
+        return source
+
+    def test_detail_from_fork(self, fork, source):
+        response = APIClient().get(
+            f"/api/v1/maps/{source.id}/", {"branchId": fork.id, "currentChapter": 9}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert [s["validFromChapter"] for s in data["snapshots"]] == [1]
+        assert data["snapshot"]["validFromChapter"] == 1
+
+    def test_detail_without_branch_is_uncapped(self, source):
+        response = APIClient().get(f"/api/v1/maps/{source.id}/", {"currentChapter": 9})
+
+        assert response.json()["data"]["snapshot"]["validFromChapter"] == 6
+
+    def test_snapshots_and_scrub_from_fork(self, fork, source):
+        client = APIClient()
+
+        snapshots = client.get(f"/api/v1/maps/{source.id}/snapshots/", {"branchId": fork.id})
+        scrub = client.get(
+            f"/api/v1/maps/{source.id}/scrub/",
+            {"branchId": fork.id, "fromChapter": 1, "toChapter": 9},
+        )
+
+        assert [s["validFromChapter"] for s in snapshots.json()["data"]] == [1]
+        assert scrub.json()["data"]["deltas"] == []
+
+    def test_map_not_visible_from_branch(self, parent, fork, source):
+        other = baker.make(Branch)
+
+        response = APIClient().get(f"/api/v1/maps/{source.id}/", {"branchId": other.id})
+        missing = APIClient().get(f"/api/v1/maps/{source.id}/", {"branchId": 999999})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
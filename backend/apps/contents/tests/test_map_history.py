@@ -0,0 +1,371 @@
+"""
+Map history Tests - keyframe/delta snapshots and timeline scrubbing.
+
+Tests:
+- MapService.create_snapshot(copy_previous=True): delta vs keyframe storage
+- Editing inherited objects in a delta snapshot (override, removal marks)
+- Readers of delta snapshots: retrieve, chapter lookup, viewport, tiles, fork
+- MapSnapshotHistory.scrub() and GET /api/v1/maps/{id}/scrub/
+"""
+
+from unittest.mock import patch
+
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.map_history import MapSnapshotHistory
+from apps.contents.map_services import MapService
+from apps.contents.map_tiles import MapTileService
+from apps.contents.models import LayerType, Map, MapLayer, MapObject, MapSnapshot, ObjectType
+
+
+@pytest.fixture
+def map_obj(db):
+    return baker.make(Map, width=1000, height=1000)
+
+
+@pytest.fixture
+def author(map_obj):
+    return map_obj.branch.author
+
+
+@pytest.fixture
+def keyframe(map_obj, author):
+    snapshot = MapService.create_snapshot(map_obj.id, author, valid_from_chapter=1)
+    layer = MapService.add_layer(snapshot.id, author, name="도시", layer_type=LayerType.MARKER)
+    for label, x in [("수도", 10), ("항구", 50), ("요새", 90)]:
+        MapService.add_object(layer.id, author, ObjectType.POINT, {"x": x, "y": 10}, label=label)
+    return snapshot
+
+
+def continue_at(map_obj: Map, chapter: int) -> MapSnapshot:
+    return MapService.create_snapshot(
+        map_obj.id, map_obj.branch.author, valid_from_chapter=chapter, copy_previous=True
+    )
+
+
+def labels(snapshot: MapSnapshot) -> list[str]:
+    MapSnapshotHistory.materialize([snapshot])
+    return sorted(obj.label for layer in snapshot.layers.all() for obj in layer.map_objects.all())
+
+
+def object_in(snapshot: MapSnapshot, label: str) -> MapObject:
+    return MapObject.objects.get(layer__snapshot=snapshot, label=label)
+
+
+@pytest.mark.django_db
+class TestContinueFrom:
+    def test_delta_stores_layers_only(self, map_obj, keyframe):
+        delta = continue_at(map_obj, 5)
+
+        assert delta.base_id == keyframe.id
+        [layer] = delta.layers.all()
+        assert layer.key == MapLayer.objects.get(snapshot=keyframe).id
+        assert not MapObject.objects.filter(layer__snapshot=delta).exists()
+        assert labels(delta) == ["수도", "요새", "항구"]
+
+    def test_without_copy_previous_starts_empty(self, map_obj, author, keyframe):
+        snapshot = MapService.create_snapshot(map_obj.id, author, valid_from_chapter=5)
+
+        assert snapshot.base_id is None
+        assert labels(snapshot) == []
+
+    def test_delta_carries_previous_changes(self, map_obj, author, keyframe):
+        first = continue_at(map_obj, 5)
+        MapService.update_object(
+            object_in(keyframe, "항구").id, author, label="함락된 항구", snapshot_id=first.id
+        )
+
+        second = continue_at(map_obj, 9)
+
+        assert second.base_id == keyframe.id
+        assert labels(second) == ["수도", "요새", "함락된 항구"]
+        assert MapObject.objects.filter(layer__snapshot=second).count() == 1
+
+    def test_keyframe_after_interval(self, map_obj, keyframe):
+        with patch.object(MapSnapshotHistory, "KEYFRAME_INTERVAL", 1):
+            delta = continue_at(map_obj, 5)
+            full = continue_at(map_obj, 9)
+
+        assert delta.base_id == keyframe.id
+        assert full.base_id is None
+        assert labels(full) == ["수도", "요새", "항구"]
+        # Keys carry over, so the new keyframe's objects still match the originals
+        assert set(
+            MapObject.objects.filter(layer__snapshot=full).values_list("key", flat=True)
+        ) == {obj.id for obj in MapObject.objects.filter(layer__snapshot=keyframe)}
+
+    def test_keyframe_once_changes_pile_up(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        for label in ["수도", "항구"]:
+            MapService.delete_object(object_in(keyframe, label).id, author, snapshot_id=delta.id)
+
+        # 2 carried changes > 3 objects * MAX_DELTA_RATIO
+        full = continue_at(map_obj, 9)
+
+        assert full.base_id is None
+        assert labels(full) == ["요새"]
+
+    def test_delete_map_with_deltas(self, map_obj, author, keyframe):
+        continue_at(map_obj, 5)
+
+        MapService.delete(map_obj.id, author)
+
+        assert not MapSnapshot.objects.exists()
+
+
+@pytest.mark.django_db
+class TestDeltaEdits:
+    def test_update_inherited_object(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        original = object_in(keyframe, "항구")
+
+        copy = MapService.update_object(
+            original.id, author, coordinates={"x": 70, "y": 10}, snapshot_id=delta.id
+        )
+        MapService.update_object(original.id, author, label="무역항", snapshot_id=delta.id)
+
+        original.refresh_from_db()
+        assert (original.label, original.min_x) == ("항구", 50)
+        copy.refresh_from_db()
+        assert (copy.key, copy.label, copy.min_x) == (original.id, "무역항", 70)
+        assert MapObject.objects.filter(layer__snapshot=delta).count() == 1
+        assert labels(delta) == ["무역항", "수도", "요새"]
+
+    def test_remove_inherited_object(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+
+        MapService.delete_object(object_in(keyframe, "요새").id, author, snapshot_id=delta.id)
+
+        assert labels(delta) == ["수도", "항구"]
+        assert labels(keyframe) == ["수도", "요새", "항구"]
+        assert MapObject.objects.get(layer__snapshot=delta).is_removed
+
+    def test_remove_then_update_restores(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        original = object_in(keyframe, "요새")
+        MapService.delete_object(original.id, author, snapshot_id=delta.id)
+
+        MapService.update_object(original.id, author, label="재건된 요새", snapshot_id=delta.id)
+
+        assert labels(delta) == ["수도", "재건된 요새", "항구"]
+
+    def test_delete_own_object(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        added = MapService.add_object(
+            delta.layers.get().id, author, ObjectType.POINT, {"x": 1, "y": 1}, label="새 마을"
+        )
+
+        MapService.delete_object(added.id, author)
+
+        assert not MapObject.objects.filter(id=added.id).exists()
+        assert labels(delta) == ["수도", "요새", "항구"]
+
+    def test_snapshot_that_does_not_inherit(self, map_obj, author, keyframe):
+        other = MapService.create_snapshot(map_obj.id, author, valid_from_chapter=5)
+
+        with pytest.raises(ValueError):
+            MapService.update_object(object_in(keyframe, "수도").id, author, snapshot_id=other.id)
+
+    def test_keyframe_edits_leave_deltas_unchanged(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        MapService.update_object(
+            object_in(keyframe, "항구").id, author, label="함락된 항구", snapshot_id=delta.id
+        )
+        before = MapSnapshot.objects.get(id=delta.id).updated_at
+        layer = MapLayer.objects.get(snapshot=keyframe)
+
+        MapService.update_object(object_in(keyframe, "수도").id, author, label="옛 수도")
+        MapService.update_object(object_in(keyframe, "항구").id, author, label="새 항구")
+        MapService.delete_object(object_in(keyframe, "요새").id, author)
+        MapService.add_object(layer.id, author, ObjectType.POINT, {"x": 1, "y": 1}, label="새 마을")
+
+        assert labels(keyframe) == ["새 마을", "새 항구", "옛 수도"]
+        assert labels(delta) == ["수도", "요새", "함락된 항구"]
+        assert MapSnapshot.objects.get(id=delta.id).updated_at == before
+
+    def test_deleting_keyframe_layer_leaves_deltas_unchanged(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+
+        MapService.delete_layer(MapLayer.objects.get(snapshot=keyframe).id, author)
+
+        assert labels(keyframe) == []
+        assert labels(delta) == ["수도", "요새", "항구"]
+
+    def test_later_chapters_do_not_depend_on_storage(self, map_obj, author, keyframe):
+        # Chapters 2-9 are deltas of chapter 1, chapter 10 starts a new keyframe
+        snapshots = [continue_at(map_obj, chapter) for chapter in range(2, 12)]
+        assert snapshots[-2].base_id is None
+        layer = MapLayer.objects.get(snapshot=keyframe)
+
+        MapService.add_object(layer.id, author, ObjectType.POINT, {"x": 1, "y": 1}, label="새 마을")
+
+        assert all(labels(snapshot) == ["수도", "요새", "항구"] for snapshot in snapshots)
+
+    def test_keyframe_edit_with_deltas_is_atomic(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+
+        with pytest.raises(ValueError):
+            MapService.update_object(object_in(keyframe, "수도").id, author, wiki_entry_id=999999)
+
+        assert not MapObject.objects.filter(layer__snapshot=delta).exists()
+
+
+@pytest.mark.django_db
+class TestDeltaReaders:
+    def test_retrieve_and_chapter_lookup(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        MapService.delete_object(object_in(keyframe, "수도").id, author, snapshot_id=delta.id)
+
+        snapshot = MapService.get_snapshot_for_chapter(map_obj.id, 7)
+        assert snapshot.id == delta.id
+        [layer] = snapshot.layers.all()
+        assert [obj.label for obj in layer.map_objects.all()] == ["항구", "요새"]
+
+        retrieved = {s.id: s for s in MapService.retrieve(map_obj.id).snapshots.all()}
+        assert len(retrieved[delta.id].layers.all()[0].map_objects.all()) == 2
+        assert len(retrieved[keyframe.id].layers.all()[0].map_objects.all()) == 3
+
+    def test_viewport(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        MapService.update_object(
+            object_in(keyframe, "항구").id,
+            author,
+            coordinates={"x": 500, "y": 500},
+            snapshot_id=delta.id,
+        )
+
+        [layer] = MapService.get_viewport(map_obj.id, delta.id, (0, 0, 100, 100))
+
+        assert layer.snapshot_id == delta.id
+        assert sorted(obj.label for obj in layer.map_objects.all()) == ["수도", "요새"]
+
+    def test_tiles(self, map_obj, keyframe):
+        delta = continue_at(map_obj, 5)
+
+        tile = MapTileService.get_tile(map_obj.id, delta.id, 0, 0, -1)
+
+        [layer] = tile["layers"]
+        assert layer["id"] == delta.layers.get().id
+        assert sorted(obj["label"] for obj in layer["objects"]) == ["수도", "요새", "항구"]
+
+    def test_fork_keeps_deltas(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        MapService.delete_object(object_in(keyframe, "수도").id, author, snapshot_id=delta.id)
+        target = baker.make("novels.Branch")
+
+        MapService.fork_maps(map_obj.branch_id, target.id, target.author)
+
+        copies = {s.valid_from_chapter: s for s in MapSnapshot.objects.filter(map__branch=target)}
+        assert copies[5].base_id == copies[1].id
+        assert labels(copies[5]) == ["요새", "항구"]
+        assert labels(copies[1]) == ["수도", "요새", "항구"]
+
+
+@pytest.mark.django_db
+class TestScrub:
+    @pytest.fixture
+    def history(self, map_obj, author, keyframe):
+        second = continue_at(map_obj, 5)
+        MapService.update_object(
+            object_in(keyframe, "항구").id, author, label="함락된 항구", snapshot_id=second.id
+        )
+        third = continue_at(map_obj, 9)
+        MapService.delete_object(object_in(keyframe, "요새").id, author, snapshot_id=third.id)
+        return keyframe, second, third
+
+    def test_keyframe_and_deltas(self, map_obj, history):
+        keyframe, second, third = history
+        harbour = object_in(keyframe, "항구")
+
+        data = MapSnapshotHistory.scrub(map_obj.id, 1, 10)
+
+        assert data["keyframe"]["snapshot_id"] == keyframe.id
+        [layer] = data["keyframe"]["layers"]
+        assert [obj["label"] for obj in layer["objects"]] == ["수도", "항구", "요새"]
+
+        first, last = data["deltas"]
+        assert (first["snapshot_id"], first["valid_from_chapter"]) == (second.id, 5)
+        assert [(obj["key"], obj["label"]) for obj in first["objects"]] == [
+            (harbour.id, "함락된 항구")
+        ]
+        assert first["layers"] == first["removed_objects"] == []
+        assert last["objects"] == []
+        assert last["removed_objects"] == [object_in(keyframe, "요새").id]
+
+    def test_range_starts_from_state_at_from_chapter(self, map_obj, history):
+        _, second, third = history
+
+        data = MapSnapshotHistory.scrub(map_obj.id, 6, 8)
+
+        assert data["keyframe"]["snapshot_id"] == second.id
+        assert "함락된 항구" in [obj["label"] for obj in data["keyframe"]["layers"][0]["objects"]]
+        assert data["deltas"] == []
+
+    def test_before_first_snapshot(self, map_obj, keyframe):
+        data = MapSnapshotHistory.scrub(map_obj.id, 0, 3)
+
+        assert data["keyframe"] is None
+        [delta] = data["deltas"]
+        assert len(delta["layers"]) == 1
+        assert len(delta["objects"]) == 3
+
+    def test_query_count(self, map_obj, history, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            MapSnapshotHistory.scrub(map_obj.id, 1, 10)
+
+
+@pytest.mark.django_db
+class TestScrubEndpoint:
+    def url(self, map_obj: Map, query: str = "?fromChapter=1&toChapter=10") -> str:
+        return f"/api/v1/maps/{map_obj.id}/scrub/{query}"
+
+    def test_scrub(self, map_obj, author, keyframe):
+        delta = continue_at(map_obj, 5)
+        MapService.delete_object(object_in(keyframe, "수도").id, author, snapshot_id=delta.id)
+
+        response = APIClient().get(self.url(map_obj))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert (data["fromChapter"], data["toChapter"]) == (1, 10)
+        assert data["keyframe"]["snapshotId"] == keyframe.id
+        assert data["deltas"][0]["removedObjects"] == [object_in(keyframe, "수도").id]
+
+    def test_revalidation(self, map_obj, keyframe):
+        client = APIClient()
+        etag = client.get(self.url(map_obj))["ETag"]
+
+        response = client.get(self.url(map_obj), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize(
+        "query", ["", "?fromChapter=1", "?fromChapter=a&toChapter=2", "?fromChapter=5&toChapter=2"]
+    )
+    def test_invalid_parameters(self, map_obj, query):
+        response = APIClient().get(self.url(map_obj, query))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_missing_map(self, db):
+        response = APIClient().get("/api/v1/maps/999999/scrub/?fromChapter=1&toChapter=2")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_snapshot_copying_previous(self, map_obj, author, keyframe):
+        client = APIClient()
+        client.force_authenticate(user=author)
+
+        response = client.post(
+            f"/api/v1/maps/{map_obj.id}/snapshots/",
+            {"validFromChapter": 5, "copyPrevious": True},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        [layer] = response.json()["data"]["layers"]
+        assert layer["key"] == MapLayer.objects.get(snapshot=keyframe).id
+        assert [obj["label"] for obj in layer["objects"]] == ["수도", "항구", "요새"]
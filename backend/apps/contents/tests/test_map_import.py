@@ -0,0 +1,321 @@
+"""
+Map import Tests - bulk GeoJSON upsert of a layer's objects.
+
+Tests:
+- map_geometry.from_geojson(): GeoJSON geometries to MapObject coordinates
+- iter_features(): streaming FeatureCollection reader
+- MapImportService.import_features(): create/update, wiki links, per-feature errors
+- POST /api/v1/layers/{layer_id}/objects/import/
+"""
+
+import io
+import json
+from typing import Any
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.map_geometry import from_geojson
+from apps.contents.map_history import MapSnapshotHistory
+from apps.contents.map_import import FeatureImportError, MapImportService, iter_features
+from apps.contents.map_services import MapService
+from apps.contents.models import MapLayer, MapObject, MapSnapshot, ObjectType, WikiEntry
+
+
+def point(x: float, y: float, **properties: Any) -> dict[str, Any]:
+    feature = {"type": "Feature", "geometry": {"type": "Point", "coordinates": [x, y]}}
+    if "id" in properties:
+        feature["id"] = properties.pop("id")
+    return {**feature, "properties": properties}
+
+
+def collection(*features: dict[str, Any]) -> bytes:
+    return json.dumps({"type": "FeatureCollection", "features": list(features)}).encode()
+
+
+@pytest.fixture
+def layer(db):
+    snapshot = baker.make(MapSnapshot, map__width=1000, map__height=1000, valid_from_chapter=1)
+    return MapService.add_layer(snapshot.id, snapshot.map.branch.author, name="도시")
+
+
+@pytest.fixture
+def author(layer):
+    return layer.snapshot.map.branch.author
+
+
+def run_import(layer: MapLayer, data: bytes) -> dict[str, Any]:
+    return MapImportService.import_features(
+        layer.id, layer.snapshot.map.branch.author, io.BytesIO(data)
+    )
+
+
+class TestFromGeoJSON:
+    @pytest.mark.parametrize(
+        "geometry, expected",
+        [
+            ({"type": "Point", "coordinates": [3, 4, 100]}, {"x": 3, "y": 4}),
+            ({"type": "LineString", "coordinates": [[0, 1], [2, 3]]}, [[1, 0], [3, 2]]),
+            (
+                {"type": "MultiLineString", "coordinates": [[[0, 0], [1, 1]], [[5, 5], [6, 6]]]},
+                [[[0, 0], [1, 1]], [[5, 5], [6, 6]]],
+            ),
+            (
+                {"type": "Polygon", "coordinates": [[[0, 0], [2, 0], [2, 1], [0, 0]]]},
+                [[0, 0], [0, 2], [1, 2]],
+            ),
+            (
+                {
+                    "type": "MultiPolygon",
+                    "coordinates": [
+                        [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+                        [[[5, 5], [6, 5], [6, 6], [5, 5]]],
+                    ],
+                },
+                [[[0, 0], [0, 1], [1, 1]], [[5, 5], [5, 6], [6, 6]]],
+            ),
+        ],
+    )
+    def test_conversion(self, geometry, expected):
+        assert from_geojson(geometry) == expected
+
+    @pytest.mark.parametrize(
+        "geometry",
+        [
+            None,
+            {"type": "Point", "coordinates": [1]},
+            {"type": "Point", "coordinates": ["1", 2]},
+            {"type": "LineString", "coordinates": [[0, 0]]},
+            {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]},
+            {"type": "MultiPoint", "coordinates": [[0, 0]]},
+        ],
+    )
+    def test_invalid(self, geometry):
+        with pytest.raises(ValueError):
+            from_geojson(geometry)
+
+
+class TestIterFeatures:
+    def test_reads_in_small_chunks(self):
+        features = [point(i, i, label=f"마을 {i}") for i in range(20)]
+        data = json.dumps(
+            {"features": features, "bbox": [0, 0, 19, 19], "type": "FeatureCollection"}
+        ).encode()
+
+        assert list(iter_features(io.BytesIO(data), chunk_size=7)) == features
+
+    def test_number_split_across_chunks(self):
+        data = b'{"type": "FeatureCollection", "features": [], "count": 123456}'
+
+        assert list(iter_features(io.BytesIO(data), chunk_size=len(data) - 3)) == []
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"[]",
+            b'{"type": "Feature", "features": []}',
+            b'{"type": "FeatureCollection"}',
+            b'{"type": "FeatureCollection", "features": [{"type": "Feature"}',
+            b'{"type": "FeatureCollection", "features": []} trailing',
+            '{"type": "FeatureCollection", "features": ["지도"]}'.encode("utf-16"),
+        ],
+    )
+    def test_invalid_documents(self, data):
+        with pytest.raises(ValueError):
+            list(iter_features(io.BytesIO(data), chunk_size=8))
+
+
+@pytest.mark.django_db
+class TestImportFeatures:
+    def test_creates_objects(self, layer):
+        wiki = baker.make(WikiEntry)
+        data = collection(
+            point(10, 20, label="수도", wikiEntryId=wiki.id, styleJson={"color": "red"}),
+            point(30, 40, objectType=ObjectType.CIRCLE, radius=5),
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [100, 50]]},
+                "properties": None,
+            },
+        )
+
+        result = run_import(layer, data)
+
+        assert (result["created"], result["updated"]) == (3, 0)
+        capital, circle, road = result["objects"]
+        capital.refresh_from_db()
+        assert (capital.label, capital.wiki_entry_id, capital.style_json) == (
+            "수도",
+            wiki.id,
+            {"color": "red"},
+        )
+        assert (capital.coordinates, capital.min_x, capital.max_y) == ({"x": 10, "y": 20}, 10, 20)
+        assert circle.coordinates == {"center": {"x": 30, "y": 40}, "radius": 5}
+        assert (circle.object_type, circle.min_x) == (ObjectType.CIRCLE, 25)
+        assert road.object_type == ObjectType.LINE
+        assert MapObject.objects.filter(layer=layer).count() == 3
+
+    def test_query_count_does_not_grow_with_features(self, layer, author):
+        wikis = baker.make(WikiEntry, _quantity=3)
+
+        def count(n: int) -> int:
+            features = [point(i, i, wikiEntryId=wikis[i % 3].id) for i in range(n)]
+            with CaptureQueriesContext(connection) as queries:
+                MapImportService.import_features(
+                    layer.id, author, io.BytesIO(collection(*features))
+                )
+            return len(queries)
+
+        assert count(5) == count(40)
+
+    def test_updates_by_key(self, layer, author):
+        obj = MapService.add_object(
+            layer.id, author, ObjectType.POINT, {"x": 1, "y": 1}, label="마을", description="작음"
+        )
+
+        result = run_import(layer, collection(point(50, 60, id=obj.id, label="도시")))
+
+        assert (result["created"], result["updated"]) == (0, 1)
+        obj.refresh_from_db()
+        assert (obj.label, obj.description, obj.min_x) == ("도시", "작음", 50)
+        assert MapObject.objects.filter(layer=layer).count() == 1
+
+    def test_updates_inherited_object_in_delta(self, layer, author):
+        obj = MapService.add_object(layer.id, author, ObjectType.POINT, {"x": 1, "y": 1})
+        delta = MapService.create_snapshot(
+            layer.snapshot.map_id, author, valid_from_chapter=5, copy_previous=True
+        )
+        delta_layer = MapLayer.objects.get(snapshot=delta)
+
+        result = run_import(delta_layer, collection(point(9, 9, id=obj.id, label="점령지")))
+
+        assert (result["created"], result["updated"]) == (0, 1)
+        copy = MapObject.objects.get(layer=delta_layer)
+        assert (copy.key, copy.label) == (obj.id, "점령지")
+        obj.refresh_from_db()
+        assert obj.label == ""
+
+    def test_keyframe_import_leaves_deltas_unchanged(self, layer, author):
+        obj = MapService.add_object(layer.id, author, ObjectType.POINT, {"x": 1, "y": 1})
+        delta = MapService.create_snapshot(
+            layer.snapshot.map_id, author, valid_from_chapter=5, copy_previous=True
+        )
+
+        run_import(layer, collection(point(9, 9, id=obj.id, label="점령지"), point(2, 2)))
+
+        assert MapObject.objects.filter(layer=layer).count() == 2
+        MapSnapshotHistory.materialize([delta])
+        [delta_layer] = delta.layers.all()
+        [inherited] = delta_layer.map_objects.all()
+        assert (inherited.identity, inherited.label, inherited.min_x) == (obj.id, "", 1)
+
+    def test_reports_every_invalid_feature(self, layer, author):
+        other = MapService.add_object(
+            MapService.add_layer(layer.snapshot_id, author, name="다른 레이어").id,
+            author,
+            ObjectType.POINT,
+            {"x": 1, "y": 1},
+        )
+        data = collection(
+            point(1, 1, label="정상"),
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [1]}},
+            point(1, 1, wikiEntryId=999999),
+            point(1, 1, id=other.id),
+            point(1, 1, objectType=ObjectType.CIRCLE),
+            point(1, 1, objectType=ObjectType.LINE, label="x" * 101),
+            {"type": "Polygon"},
+        )
+
+        with pytest.raises(FeatureImportError) as excinfo:
+            run_import(layer, data)
+
+        errors = excinfo.value.errors
+        assert list(errors) == ["1", "2", "3", "4", "5", "6"]
+        assert list(errors["1"]) == ["geometry"]
+        assert list(errors["2"]) == ["wiki_entry_id"]
+        assert list(errors["3"]) == ["id"]
+        assert list(errors["4"]) == ["radius"]
+        assert sorted(errors["5"]) == ["label", "object_type"]
+        assert list(errors["6"]) == ["type"]
+        assert not MapObject.objects.filter(layer=layer).exists()
+
+    def test_duplicate_ids(self, layer, author):
+        obj = MapService.add_object(layer.id, author, ObjectType.POINT, {"x": 1, "y": 1})
+
+        with pytest.raises(FeatureImportError) as excinfo:
+            run_import(layer, collection(point(1, 1, id=obj.id), point(2, 2, id=obj.id)))
+
+        assert list(excinfo.value.errors) == ["1"]
+
+    def test_too_many_features(self, layer, monkeypatch):
+        monkeypatch.setattr(MapImportService, "MAX_FEATURES", 2)
+
+        with pytest.raises(ValueError):
+            run_import(layer, collection(point(1, 1), point(2, 2), point(3, 3)))
+
+    def test_only_branch_author(self, layer):
+        from django.core.exceptions import PermissionDenied
+
+        with pytest.raises(PermissionDenied):
+            MapImportService.import_features(
+                layer.id, baker.make("users.User"), io.BytesIO(collection())
+            )
+
+
+@pytest.mark.django_db
+class TestImportEndpoint:
+    def url(self, layer: MapLayer) -> str:
+        return f"/api/v1/layers/{layer.id}/objects/import/"
+
+    def upload(self, client: APIClient, layer: MapLayer, data: bytes, name: str = "map.geojson"):
+        return client.post(
+            self.url(layer),
+            {"file": SimpleUploadedFile(name, data, content_type="application/geo+json")},
+            format="multipart",
+        )
+
+    @pytest.fixture
+    def client(self, author):
+        client = APIClient()
+        client.force_authenticate(user=author)
+        return client
+
+    def test_import(self, client, layer):
+        response = self.upload(client, layer, collection(point(1, 2, label="수도")))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert (data["created"], data["updated"]) == (1, 0)
+        [obj] = data["objects"]
+        assert (obj["label"], obj["key"]) == ("수도", obj["id"])
+
+    def test_invalid_features(self, client, layer):
+        response = self.upload(
+            client, layer, collection(point(1, 2), point(1, 2, wikiEntryId=999999))
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()["errors"]["features"]) == ["1"]
+
+    def test_not_geojson(self, client, layer):
+        assert self.upload(client, layer, b"[]").status_code == status.HTTP_400_BAD_REQUEST
+        response = self.upload(client, layer, collection(), name="map.txt")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_not_author(self, layer):
+        client = APIClient()
+        client.force_authenticate(user=baker.make("users.User"))
+
+        response = self.upload(client, layer, collection(point(1, 2)))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_missing_layer(self, client, layer):
+        response = client.post("/api/v1/layers/999999/objects/import/", {}, format="multipart")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
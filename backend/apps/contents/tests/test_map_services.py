@@ -3,11 +3,13 @@ TDD: MapService 테스트
 RED → GREEN → REFACTOR
 """
 
+from unittest.mock import patch
+
 import pytest
 from django.core.exceptions import PermissionDenied
 from model_bakery import baker
 
-from apps.contents.map_services import MapService
+from apps.contents.map_services import ForkJobStatus, MapService
 from apps.contents.models import LayerType, Map, ObjectType
 
 pytestmark = pytest.mark.django_db
@@ -349,3 +351,107 @@ class TestMapServiceFork:
         forked_layers = forked_snapshots[0].layers.all()
         assert forked_layers.count() == 1
         assert forked_layers[0].map_objects.count() == 1
+
+    @staticmethod
+    def _make_world(branch, maps: int) -> None:
+        for i in range(maps):
+            map_obj = baker.make("contents.Map", branch=branch, name=f"지도 {i}")
+            for chapter in (1, 5):
+                snapshot = baker.make(
+                    "contents.MapSnapshot", map=map_obj, valid_from_chapter=chapter
+                )
+                for z_index in range(2):
+                    layer = baker.make("contents.MapLayer", snapshot=snapshot, z_index=z_index)
+                    baker.make("contents.MapObject", layer=layer, _quantity=3)
+
+    @pytest.mark.parametrize("size", [1, 4])
+    def test_fork_statement_count_is_independent_of_size(self, size, django_assert_num_queries):
+        """지도 규모와 무관하게 일정한 수의 쿼리로 포크"""
+        source_branch = baker.make("novels.Branch")
+        target_branch = baker.make("novels.Branch")
+        self._make_world(source_branch, size)
+
+        # branch check, SAVEPOINT/RELEASE, select + insert for maps, snapshots, layers
+        # and objects, version bump
+        with django_assert_num_queries(12):
+            MapService.fork_maps(source_branch.id, target_branch.id, target_branch.author)
+
+        forked = Map.objects.filter(branch=target_branch)
+        assert forked.count() == size
+        for forked_map in forked:
+            assert forked_map.snapshots.count() == 2
+            for snapshot in forked_map.snapshots.all():
+                assert [layer.map_objects.count() for layer in snapshot.layers.all()] == [3, 3]
+
+    def test_fork_reports_progress(self):
+        """오브젝트 복사 진행 상황 콜백"""
+        source_branch = baker.make("novels.Branch")
+        target_branch = baker.make("novels.Branch")
+        self._make_world(source_branch, 2)
+        progress = []
+
+        MapService.fork_maps(
+            source_branch.id, target_branch.id, target_branch.author, on_progress=progress.append
+        )
+
+        assert progress == [24]
+
+    def test_fork_stops_at_fork_point(self):
+        """분기 회차 이후의 원본 스냅샷은 복사하지 않음"""
+        parent = baker.make("novels.Branch")
+        fork = baker.make("novels.Branch", parent_branch=parent, fork_point_chapter=3)
+        self._make_world(parent, 1)
+
+        job = MapService.start_fork(parent.id, fork.id, fork.author)
+
+        forked = Map.objects.get(branch=fork)
+        assert [s.valid_from_chapter for s in forked.snapshots.all()] == [1]
+        assert (job["copied"], job["total"]) == (6, 6)
+
+    def test_fork_skips_maps_already_copied(self):
+        """다시 포크하거나 이미 구체화·같은 이름의 지도가 있으면 건너뜀"""
+        parent = baker.make("novels.Branch")
+        fork = baker.make("novels.Branch", parent_branch=parent)
+        self._make_world(parent, 3)
+        materialized, named, _ = Map.objects.filter(branch=parent).order_by("id")
+        baker.make("contents.Map", branch=fork, source_map=materialized, name="구체화된 지도")
+        baker.make("contents.Map", branch=fork, name=named.name)
+
+        assert len(MapService.fork_maps(parent.id, fork.id, fork.author)) == 1
+        job = MapService.start_fork(parent.id, fork.id, fork.author)
+
+        assert (job["status"], job["total"], job["maps"]) == (ForkJobStatus.DONE, 0, 0)
+        assert Map.objects.filter(branch=fork).count() == 3
+
+    def test_start_fork_runs_small_forks_inline(self):
+        """임계값 이하이면 바로 복사"""
+        source_branch = baker.make("novels.Branch")
+        target_branch = baker.make("novels.Branch")
+        self._make_world(source_branch, 1)
+
+        job = MapService.start_fork(source_branch.id, target_branch.id, target_branch.author)
+
+        assert job["status"] == ForkJobStatus.DONE
+        assert (job["copied"], job["total"], job["maps"]) == (12, 12, 1)
+        assert MapService.get_fork_job(job["job_id"])["status"] == ForkJobStatus.DONE
+
+    def test_start_fork_queues_large_forks(self, monkeypatch, django_capture_on_commit_callbacks):
+        """임계값을 넘으면 백그라운드 작업으로 복사"""
+        from apps.contents.tasks import fork_maps
+
+        monkeypatch.setattr(MapService, "FORK_ASYNC_THRESHOLD", 10)
+        source_branch = baker.make("novels.Branch")
+        target_branch = baker.make("novels.Branch")
+        self._make_world(source_branch, 1)
+
+        with patch("apps.contents.tasks.fork_maps.delay", side_effect=fork_maps) as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                job = MapService.start_fork(
+                    source_branch.id, target_branch.id, target_branch.author
+                )
+                assert job["status"] == ForkJobStatus.PENDING
+                assert not Map.objects.filter(branch=target_branch).exists()
+
+        delay.assert_called_once()
+        assert MapService.get_fork_job(job["job_id"])["status"] == ForkJobStatus.DONE
+        assert Map.objects.filter(branch=target_branch).count() == 1
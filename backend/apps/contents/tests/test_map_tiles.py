@@ -0,0 +1,267 @@
+"""
+Map tile Tests - geometry simplification, encoding and tiled delivery.
+
+Tests:
+- map_geometry: Douglas–Peucker, clipping, point encoding
+- MapTileService.get_tile(): tile contents, per-zoom simplification, caching by version
+- MapTileService.render(): background prewarm, scheduling on layer/object changes
+- GET /api/v1/maps/{map_id}/snapshots/{id}/tiles/{z}/{x}/{y}/
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.map_geometry import (
+    clip_line,
+    clip_polygon,
+    decode_points,
+    encode_points,
+    parts,
+    simplify,
+)
+from apps.contents.map_services import MapService
+from apps.contents.map_tiles import MapTileService
+from apps.contents.models import LayerType, MapSnapshot, ObjectType
+
+
+@pytest.fixture
+def snapshot(db):
+    return baker.make(MapSnapshot, map__width=1024, map__height=1024, valid_from_chapter=1)
+
+
+@pytest.fixture
+def layer(snapshot):
+    return MapService.add_layer(
+        snapshot.id, snapshot.map.branch.author, name="지형", layer_type=LayerType.REGION
+    )
+
+
+def add(layer, object_type: str, coordinates, label: str = "") -> None:
+    MapService.add_object(
+        layer.id, layer.snapshot.map.branch.author, object_type, coordinates, label=label
+    )
+
+
+def tile_objects(snapshot: MapSnapshot, z: int, x: int, y: int) -> dict[str, dict]:
+    tile = MapTileService.get_tile(snapshot.map_id, snapshot.id, z, x, y)
+    return {obj["label"]: obj for layer in tile["layers"] for obj in layer["objects"]}
+
+
+def wiggly_line(n: int = 200) -> list[list[float]]:
+    # [lat, lng] pairs: a straight east-west line with sub-unit noise
+    return [[500 + 0.2 * (i % 2), 20 + i * 4] for i in range(n)]
+
+
+def leaflet_tile(x: float, y: float, z: int) -> tuple[int, int, list[int]]:
+    """Tile and in-tile grid position of a map point, by Leaflet's CRS.Simple math."""
+    # CRS.Simple projects latLng(y, x) with transformation (1, 0, -1, 0) and scale 2 ** z
+    pixel = np.array([x * 2**z, -y * 2**z])
+    tile = np.floor(pixel / MapTileService.TILE_SIZE)
+    offset = (pixel - tile * MapTileService.TILE_SIZE) * (
+        MapTileService.EXTENT / MapTileService.TILE_SIZE
+    )
+    return int(tile[0]), int(tile[1]), np.rint(offset).astype(int).tolist()
+
+
+class TestGeometry:
+    def test_parts(self):
+        assert [len(run) for run in parts([[[0, 0], [1, 1], [2, 0]], [[5, 5], [6, 6]]])] == [3, 2]
+        assert parts({"center": {"x": 1, "y": 2}, "radius": 3})[0].tolist() == [[1, 2]]
+        assert parts({"type": "unknown"}) == []
+
+    def test_simplify(self):
+        line = np.array([[0, 0], [1, 0.1], [2, -0.1], [3, 5], [4, 6], [5, 7]], dtype=float)
+
+        assert simplify(line, 0.5).tolist() == [[0, 0], [2, -0.1], [3, 5], [5, 7]]
+        assert simplify(line, 100).tolist() == [[0, 0], [5, 7]]
+        assert simplify(line, 0).tolist() == line.tolist()
+
+    def test_clip_polygon(self):
+        square = np.array([[-5, -5], [5, -5], [5, 5], [-5, 5]], dtype=float)
+
+        clipped = clip_polygon(square, (0, 0, 10, 10))
+
+        assert sorted(map(tuple, clipped.tolist())) == [(0, 0), (0, 5), (5, 0), (5, 5)]
+        assert len(clip_polygon(square, (20, 20, 30, 30))) == 0
+
+    def test_clip_line(self):
+        line = np.array([[-10, 0], [-5, 0], [1, 0], [5, 0], [15, 0], [20, 0], [5, 1]])
+
+        pieces = clip_line(line, (0, -1, 10, 1))
+
+        assert [piece[:, 0].tolist() for piece in pieces] == [[-5, 1, 5, 15], [20, 5]]
+
+    def test_encoding_round_trip(self):
+        runs = [np.array([[0, 0], [4096, 10], [-3, 200000]]), np.array([[7, 7]])]
+
+        encoded = encode_points(runs)
+
+        assert decode_points(encoded, [3, 1]) == [[[0, 0], [4096, 10], [-3, 200000]], [[7, 7]]]
+        assert len(encoded) < len(str([run.tolist() for run in runs]))
+
+
+@pytest.mark.django_db
+class TestGetTile:
+    def test_objects_are_cut_into_tiles(self, snapshot, layer):
+        add(layer, ObjectType.POINT, {"x": 10, "y": 10}, "마을")
+        add(layer, ObjectType.POINT, {"x": 700, "y": 10}, "성")
+        add(layer, ObjectType.POLYGON, [[0, 0], [0, 1000], [1000, 1000], [1000, 0]], "대륙")
+
+        # zoom 0: 256-unit tiles, the bottom edge of the map (y = 0) on row -1
+        first = tile_objects(snapshot, 0, 0, -1)
+        assert sorted(first) == ["대륙", "마을"]
+        assert decode_points(first["마을"]["geometry"], first["마을"]["parts"]) == [[[160, 3936]]]
+        [ring] = decode_points(first["대륙"]["geometry"], first["대륙"]["parts"])
+        assert max(max(point) for point in ring) <= 4096 + MapTileService.BUFFER
+
+        assert sorted(tile_objects(snapshot, 0, 2, -1)) == ["대륙", "성"]
+        assert sorted(tile_objects(snapshot, 0, 0, -4)) == ["대륙"]
+        assert tile_objects(snapshot, 0, 0, -5) == {}
+
+    @pytest.mark.parametrize(
+        "x, y, z",
+        [(10, 10, 0), (700, 1000, 0), (123.4, 567.8, 2), (1000, 3, -2), (-30, 20, 1)],
+    )
+    def test_matches_leaflet_tile_math(self, snapshot, layer, x, y, z):
+        add(layer, ObjectType.POINT, {"x": x, "y": y}, "마을")
+        column, row, offset = leaflet_tile(x, y, z)
+
+        village = tile_objects(snapshot, z, column, row)["마을"]
+
+        assert decode_points(village["geometry"], village["parts"]) == [[offset]]
+
+    def test_simplified_per_zoom(self, snapshot, layer):
+        add(layer, ObjectType.LINE, wiggly_line(), "강")
+
+        # The whole map in one tile: noise well under half a pixel is dropped
+        coarse = tile_objects(snapshot, -2, 0, -1)["강"]
+        assert coarse["parts"] == [2]
+
+        fine = tile_objects(snapshot, 3, 0, -16)["강"]
+        assert sum(fine["parts"]) > 2
+
+    def test_tiny_shapes_and_hidden_layers_are_left_out(self, snapshot, layer):
+        add(layer, ObjectType.POLYGON, [[0, 0], [0, 1], [1, 1]], "작은 섬")
+        hidden = MapService.add_layer(
+            snapshot.id, snapshot.map.branch.author, name="숨김", is_visible=False
+        )
+        add(hidden, ObjectType.POINT, {"x": 1, "y": 1}, "숨은 마을")
+
+        assert tile_objects(snapshot, -2, 0, -1) == {}
+        assert sorted(tile_objects(snapshot, 3, 0, -1)) == ["작은 섬"]
+
+    def test_circle_radius_in_tile_units(self, snapshot, layer):
+        add(layer, ObjectType.CIRCLE, {"center": {"x": 128, "y": 128}, "radius": 16}, "원")
+
+        circle = tile_objects(snapshot, 0, 0, -1)["원"]
+
+        assert circle["radius"] == 256
+        assert decode_points(circle["geometry"], circle["parts"]) == [[[2048, 2048]]]
+
+    def test_cached_until_snapshot_changes(self, snapshot, layer, django_assert_num_queries):
+        add(layer, ObjectType.POINT, {"x": 10, "y": 10}, "마을")
+        tile_objects(snapshot, 0, 0, -1)
+
+        with django_assert_num_queries(1):
+            tile_objects(snapshot, 0, 0, -1)
+
+        add(layer, ObjectType.POINT, {"x": 20, "y": 20}, "성")
+        assert sorted(tile_objects(snapshot, 0, 0, -1)) == ["마을", "성"]
+
+    def test_missing_snapshot(self, db):
+        with pytest.raises(ValueError):
+            MapTileService.get_tile(999999, 999999, 0, 0, 0)
+
+
+@pytest.mark.django_db
+class TestRender:
+    def test_prewarms_first_zoom_levels(self, snapshot, layer, django_assert_num_queries):
+        add(layer, ObjectType.POINT, {"x": 100, "y": 100}, "마을")
+        add(layer, ObjectType.LINE, wiggly_line(), "강")
+
+        # 1024-unit map: zoom -2 fits one tile; zoom -2, -1 and 0 are rendered.
+        # Only tiles with objects: the river crosses 1, 2 and 4 of them, the village 1 more at 0
+        assert MapTileService.base_zoom(1024, 1024) == -2
+        with django_assert_num_queries(3):
+            rendered = MapTileService.render(snapshot.id)
+        assert rendered == 1 + 2 + 5
+
+        with django_assert_num_queries(1):
+            assert sorted(tile_objects(snapshot, -1, 0, -1)) == ["강", "마을"]
+
+    def test_changes_schedule_one_render(self, snapshot, layer, django_capture_on_commit_callbacks):
+        cache.clear()
+        with patch("apps.contents.tasks.render_map_tiles.apply_async") as apply_async:
+            with django_capture_on_commit_callbacks(execute=True):
+                add(layer, ObjectType.POINT, {"x": 10, "y": 10})
+                add(layer, ObjectType.POINT, {"x": 20, "y": 20})
+
+        apply_async.assert_called_once_with((snapshot.id,), countdown=MapTileService.RENDER_DELAY)
+
+    def test_change_moves_tile_version(self, snapshot, layer):
+        before = MapSnapshot.objects.get(id=snapshot.id).updated_at
+
+        add(layer, ObjectType.POINT, {"x": 10, "y": 10})
+
+        assert MapSnapshot.objects.get(id=snapshot.id).updated_at > before
+
+
+@pytest.mark.django_db
+class TestTileEndpoint:
+    def url(self, snapshot: MapSnapshot, z: int, x: int, y: int) -> str:
+        return f"/api/v1/maps/{snapshot.map_id}/snapshots/{snapshot.id}/tiles/{z}/{x}/{y}/"
+
+    def test_tile(self, snapshot, layer):
+        add(layer, ObjectType.POINT, {"x": 10, "y": 10}, "마을")
+
+        response = APIClient().get(self.url(snapshot, -2, 0, -1))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert (data["z"], data["x"], data["y"]) == (-2, 0, -1)
+        assert data["extent"] == MapTileService.EXTENT
+        [obj] = data["layers"][0]["objects"]
+        assert obj["label"] == "마을"
+        assert obj["objectType"] == ObjectType.POINT
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_versioned_url_is_cached_for_good(self, snapshot, layer):
+        version = (
+            APIClient()
+            .get(f"/api/v1/maps/{snapshot.map_id}/snapshots/")
+            .json()["data"][0]["tileVersion"]
+        )
+
+        response = APIClient().get(f"{self.url(snapshot, 0, 0, 0)}?v={version}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "immutable" in response["Cache-Control"]
+        assert f"max-age={MapTileService.HTTP_MAX_AGE}" in response["Cache-Control"]
+
+    def test_revalidation(self, snapshot, layer):
+        client = APIClient()
+        etag = client.get(self.url(snapshot, 0, 0, 0))["ETag"]
+
+        response = client.get(self.url(snapshot, 0, 0, 0), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_zoom_out_of_range(self, snapshot):
+        response = APIClient().get(self.url(snapshot, 99, 0, 0))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_snapshot_of_another_map(self, snapshot):
+        other = baker.make(MapSnapshot, valid_from_chapter=1)
+
+        response = APIClient().get(
+            f"/api/v1/maps/{other.map_id}/snapshots/{snapshot.id}/tiles/0/0/0/"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
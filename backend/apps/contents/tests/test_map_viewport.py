@@ -0,0 +1,160 @@
+"""
+Map viewport Tests - object bounding boxes and viewport queries.
+
+Tests:
+- map_geometry: bounding boxes of the coordinate shapes in use, bbox parsing
+- MapService keeps bounding-box columns in sync (add/update/fork)
+- MapService.get_viewport(): intersecting objects, zoom culling
+- GET /api/v1/maps/{map_id}/snapshots/{id}/viewport/
+"""
+
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.map_geometry import bounding_box, parse_bbox
+from apps.contents.map_services import MapService
+from apps.contents.models import LayerType, MapObject, MapSnapshot, ObjectType
+
+
+@pytest.fixture
+def snapshot(db):
+    return baker.make(MapSnapshot, map__width=1000, map__height=1000, valid_from_chapter=1)
+
+
+@pytest.fixture
+def layer(snapshot):
+    return MapService.add_layer(
+        snapshot.id, snapshot.map.branch.author, name="도시", layer_type=LayerType.MARKER
+    )
+
+
+def add(layer, object_type: str, coordinates, label: str = "") -> MapObject:
+    return MapService.add_object(
+        layer.id, layer.snapshot.map.branch.author, object_type, coordinates, label=label
+    )
+
+
+def labels(snapshot: MapSnapshot, bbox: tuple, zoom: int | None = None) -> list[str]:
+    layers = MapService.get_viewport(snapshot.map_id, snapshot.id, bbox, zoom=zoom)
+    return sorted(obj.label for layer in layers for obj in layer.map_objects.all())
+
+
+def viewport_url(snapshot: MapSnapshot) -> str:
+    return f"/api/v1/maps/{snapshot.map_id}/snapshots/{snapshot.id}/viewport/"
+
+
+class TestGeometry:
+    @pytest.mark.parametrize(
+        "coordinates, expected",
+        [
+            ({"x": 3, "y": 4}, (3, 4, 3, 4)),
+            ({"lat": 4, "lng": 3}, (3, 4, 3, 4)),
+            ([4, 3], (3, 4, 3, 4)),
+            ([[0, 0], [10, 5], {"x": -2, "y": 1}], (-2, 0, 5, 10)),
+            ([[[0, 0], [2, 2]], [[5, 5], [6, 6]]], (0, 0, 6, 6)),
+            ({"center": {"x": 10, "y": 10}, "radius": 3}, (7, 7, 13, 13)),
+            ({"x": 10, "y": 10, "radius": 3}, (7, 7, 13, 13)),
+        ],
+    )
+    def test_bounding_box(self, coordinates, expected):
+        assert bounding_box(coordinates) == expected
+
+    @pytest.mark.parametrize("coordinates", [{}, [], "서울", {"x": "1", "y": 2}, [True, 1]])
+    def test_unknown_shapes(self, coordinates):
+        assert bounding_box(coordinates) is None
+
+    def test_parse_bbox(self):
+        assert parse_bbox("10,0,0,5.5") == (0, 0, 10, 5.5)
+        for value in ["", "1,2,3", "a,b,c,d", "0,0,inf,1"]:
+            with pytest.raises(ValueError):
+                parse_bbox(value)
+
+
+@pytest.mark.django_db
+class TestBoundingBoxColumns:
+    def test_add_and_update(self, layer):
+        obj = add(layer, ObjectType.LINE, [[0, 0], [10, 20]])
+        assert (obj.min_x, obj.min_y, obj.max_x, obj.max_y) == (0, 0, 20, 10)
+
+        MapService.update_object(obj.id, layer.snapshot.map.branch.author, coordinates={"x": 5})
+        obj.refresh_from_db()
+        assert obj.min_x is None
+
+    def test_fork_copies_bounds(self, layer):
+        add(layer, ObjectType.POINT, {"x": 1, "y": 2})
+        target = baker.make("novels.Branch")
+
+        MapService.fork_maps(layer.snapshot.map.branch_id, target.id, target.author)
+
+        copy = MapObject.objects.get(layer__snapshot__map__branch=target)
+        assert (copy.min_x, copy.max_y) == (1, 2)
+
+
+@pytest.mark.django_db
+class TestViewport:
+    def test_intersecting_objects_only(self, snapshot, layer):
+        add(layer, ObjectType.POINT, {"x": 50, "y": 50}, "안")
+        add(layer, ObjectType.POINT, {"x": 500, "y": 500}, "밖")
+        add(layer, ObjectType.LINE, [[0, 0], [500, 500]], "가로지름")
+        add(layer, ObjectType.CIRCLE, {"center": {"x": 120, "y": 50}, "radius": 30}, "원")
+        add(layer, ObjectType.POLYGON, {"type": "unknown"}, "모름")
+
+        assert labels(snapshot, (0, 0, 100, 100)) == ["가로지름", "모름", "안", "원"]
+
+    def test_hidden_layers_are_skipped(self, snapshot, layer):
+        add(layer, ObjectType.POINT, {"x": 1, "y": 1}, "안")
+        layer.is_visible = False
+        layer.save()
+
+        assert MapService.get_viewport(snapshot.map_id, snapshot.id, (0, 0, 10, 10)) == []
+
+    def test_zoom_culls_tiny_shapes(self, snapshot, layer):
+        add(layer, ObjectType.POLYGON, [[0, 0], [0, 0.5], [0.5, 0.5]], "작은 섬")
+        add(layer, ObjectType.POLYGON, [[0, 0], [0, 50], [50, 50]], "대륙")
+        add(layer, ObjectType.POINT, {"x": 1, "y": 1}, "마을")
+
+        # zoom -2: one map unit is a quarter pixel
+        assert labels(snapshot, (0, 0, 100, 100), zoom=-2) == ["대륙", "마을"]
+        assert len(labels(snapshot, (0, 0, 100, 100), zoom=3)) == 3
+
+    def test_missing_snapshot(self, db):
+        with pytest.raises(ValueError):
+            MapService.get_viewport(999999, 999999, (0, 0, 1, 1))
+
+
+@pytest.mark.django_db
+class TestViewportEndpoint:
+    def test_viewport(self, snapshot, layer):
+        add(layer, ObjectType.POINT, {"x": 50, "y": 50}, "안")
+        add(layer, ObjectType.POINT, {"x": 500, "y": 500}, "밖")
+
+        response = APIClient().get(f"{viewport_url(snapshot)}?bbox=0,0,100,100")
+
+        assert response.status_code == status.HTTP_200_OK
+        [data] = response.json()["data"]
+        assert data["id"] == layer.id
+        assert [obj["label"] for obj in data["objects"]] == ["안"]
+
+    @pytest.mark.parametrize(
+        "query", ["", "?bbox=1,2,3", "?bbox=0,0,1,1&zoom=x", "?bbox=0,0,1,1&zoom=99"]
+    )
+    def test_invalid_parameters(self, snapshot, query):
+        response = APIClient().get(f"{viewport_url(snapshot)}{query}")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_snapshot_of_another_map(self, snapshot):
+        other = baker.make(MapSnapshot, valid_from_chapter=1)
+
+        response = APIClient().get(
+            f"/api/v1/maps/{other.map_id}/snapshots/{snapshot.id}/viewport/?bbox=0,0,1,1"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_missing_snapshot(self, db):
+        response = APIClient().get("/api/v1/maps/999999/snapshots/999999/viewport/?bbox=0,0,1,1")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -5,13 +5,16 @@ RED → GREEN → REFACTOR
 
 import json
 from typing import Any
+from unittest.mock import patch
 
 import pytest
+from django.db import IntegrityError
 from model_bakery import baker
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from apps.contents.map_services import MapService
 from apps.contents.models import Map, MapObject
 
 pytestmark = pytest.mark.django_db
@@ -119,6 +122,71 @@ class TestMapViewSet:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not Map.objects.filter(id=map_obj.id).exists()
 
+    def test_fork_parent_maps(self):
+        """상위 브랜치 지도 복사 작업 시작과 진행 상황 조회"""
+        parent = baker.make("novels.Branch", novel=self.novel)
+        fork = baker.make("novels.Branch", novel=self.novel, author=self.user, parent_branch=parent)
+        source = baker.make("contents.Map", branch=parent, name="세계 지도")
+        snapshot = baker.make("contents.MapSnapshot", map=source, valid_from_chapter=1)
+        baker.make("contents.MapObject", layer__snapshot=snapshot, _quantity=2)
+
+        response = self.client.post(f"/api/v1/branches/{fork.id}/maps/fork/")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = get_json(response)["data"]
+        assert (job["status"], job["copied"], job["total"], job["maps"]) == ("DONE", 2, 2, 1)
+        assert Map.objects.get(branch=fork).source_map_id == source.id
+
+        response = self.client.get(f"/api/v1/branches/{fork.id}/maps/fork/{job['jobId']}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert get_json(response)["data"]["status"] == "DONE"
+
+    def test_fork_twice(self):
+        """다시 복사해도 이미 복사된 지도는 건너뜀"""
+        parent = baker.make("novels.Branch", novel=self.novel)
+        fork = baker.make("novels.Branch", novel=self.novel, author=self.user, parent_branch=parent)
+        baker.make("contents.MapSnapshot", map__branch=parent, valid_from_chapter=1)
+        url = f"/api/v1/branches/{fork.id}/maps/fork/"
+
+        self.client.post(url)
+        response = self.client.post(url)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert get_json(response)["data"]["maps"] == 0
+        assert Map.objects.filter(branch=fork).count() == 1
+
+    def test_fork_conflict(self):
+        """동시에 진행된 복사와 겹치면 409"""
+        fork = baker.make("novels.Branch", author=self.user, parent_branch=self.branch)
+
+        with patch.object(MapService, "fork_maps", side_effect=IntegrityError):
+            response = self.client.post(f"/api/v1/branches/{fork.id}/maps/fork/")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_fork_requires_fork_branch_and_author(self):
+        """상위 브랜치가 없거나 작가가 아니면 시작할 수 없음"""
+        other = baker.make("novels.Branch", parent_branch=self.branch)
+
+        assert (
+            self.client.post(f"/api/v1/branches/{self.branch.id}/maps/fork/").status_code
+            == status.HTTP_400_BAD_REQUEST
+        )
+        assert (
+            self.client.post(f"/api/v1/branches/{other.id}/maps/fork/").status_code
+            == status.HTTP_403_FORBIDDEN
+        )
+
+    def test_fork_status_of_another_branch(self):
+        """다른 브랜치의 작업은 조회할 수 없음"""
+        fork = baker.make("novels.Branch", author=self.user, parent_branch=self.branch)
+        job_id = self.client.post(f"/api/v1/branches/{fork.id}/maps/fork/").json()["data"]["jobId"]
+
+        response = self.client.get(f"/api/v1/branches/{self.branch.id}/maps/fork/{job_id}/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
 
 class TestMapSnapshotViewSet:
     """MapSnapshot 관련 테스트"""
@@ -254,6 +322,21 @@ class TestMapObjectViewSet:
         results = data if isinstance(data, list) else data.get("results", data)
         assert len(results) == 2
 
+    def test_list_objects_revalidation(self):
+        """오브젝트 추가 전에는 304, 추가 후에는 새 ETag"""
+        url = f"/api/v1/layers/{self.layer.id}/objects/"
+        etag = self.client.get(url)["ETag"]
+
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        self.client.post(
+            url, {"objectType": "POINT", "coordinates": {"x": 1, "y": 2}}, format="json"
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
     def test_create_object_with_wiki_link(self):
         """위키 연결된 오브젝트 생성"""
         wiki = baker.make("contents.WikiEntry", branch=self.branch)
@@ -0,0 +1,206 @@
+"""
+SnapshotIntervalIndex Tests - cached chapter-to-snapshot lookup and timelines.
+
+Tests:
+- get_snapshot_for_chapter() through the cached index (wiki and map)
+- Invalidation on snapshot create, recovery from a stale index
+- timeline(): validity intervals, chapter bound, fork cap
+- GET /api/v1/branches/{branch_id}/wikis/timeline/, /maps/timeline/
+"""
+
+import pytest
+from django.core.cache import cache
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.map_services import MapService
+from apps.contents.models import Map, MapSnapshot, WikiEntry, WikiSnapshot
+from apps.contents.services import WikiService
+from apps.contents.snapshot_index import SnapshotIntervalIndex
+from apps.novels.models import Branch
+
+
+@pytest.fixture
+def branch(db):
+    return baker.make(Branch)
+
+
+def make_wiki(branch: Branch, name: str, *chapters: int, first: int | None = 1) -> WikiEntry:
+    wiki = baker.make(WikiEntry, branch=branch, name=name, first_appearance=first)
+    for chapter in chapters:
+        WikiService.add_snapshot(wiki.id, branch.author, f"{name} {chapter}", chapter)
+    return wiki
+
+
+def make_map(branch: Branch, name: str, *chapters: int) -> Map:
+    map_obj = baker.make(Map, branch=branch, name=name, width=100, height=100)
+    for chapter in chapters:
+        MapService.create_snapshot(map_obj.id, branch.author, chapter)
+    return map_obj
+
+
+def intervals(row: dict) -> list[tuple[int, int | None]]:
+    return [(s["valid_from_chapter"], s["valid_until_chapter"]) for s in row["snapshots"]]
+
+
+@pytest.mark.django_db
+class TestIntervalIndex:
+    def test_bisect_lookup(self, branch):
+        wiki = make_wiki(branch, "철수", 1, 5, 10)
+
+        assert SnapshotIntervalIndex.get_index("wiki", wiki.id)[0] == [1, 5, 10]
+        assert SnapshotIntervalIndex.snapshot_id_at("wiki", wiki.id, 0) is None
+        for chapter, expected in [(1, 1), (4, 1), (5, 5), (9, 5), (300, 10)]:
+            snapshot = WikiService.get_snapshot_for_chapter(wiki.id, chapter)
+            assert snapshot.valid_from_chapter == expected
+            assert snapshot.text == f"철수 {expected}"
+
+    def test_scrubbing_loads_by_primary_key_only(self, branch, django_assert_num_queries):
+        wiki = make_wiki(branch, "철수", 1, 5, 10)
+        SnapshotIntervalIndex.get_index("wiki", wiki.id)
+
+        with django_assert_num_queries(1):
+            WikiService.get_snapshot_for_chapter(wiki.id, 7)
+
+    def test_add_snapshot_invalidates(self, branch):
+        wiki = make_wiki(branch, "철수", 1, 10)
+        assert WikiService.get_snapshot_for_chapter(wiki.id, 5).valid_from_chapter == 1
+
+        WikiService.add_snapshot(wiki.id, branch.author, "새 설정", valid_from_chapter=5)
+
+        assert WikiService.get_snapshot_for_chapter(wiki.id, 5).valid_from_chapter == 5
+
+    def test_stale_reader_cannot_restore_old_index(
+        self, branch, django_capture_on_commit_callbacks
+    ):
+        wiki = make_wiki(branch, "철수", 1, 10)
+        old_key = SnapshotIntervalIndex.CACHE_KEY.format(kind="wiki", id=wiki.id, generation=0)
+        stale = SnapshotIntervalIndex.get_index("wiki", wiki.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            WikiService.add_snapshot(wiki.id, branch.author, "새 설정", valid_from_chapter=5)
+            # A reader that queried before the commit writes its result back late
+            cache.set(old_key, stale)
+
+        assert WikiService.get_snapshot_for_chapter(wiki.id, 5).valid_from_chapter == 5
+
+    def test_reader_between_bump_and_commit_is_retired(
+        self, branch, django_capture_on_commit_callbacks
+    ):
+        wiki = make_wiki(branch, "철수", 1, 10)
+        stale = SnapshotIntervalIndex.get_index("wiki", wiki.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            WikiService.add_snapshot(wiki.id, branch.author, "새 설정", valid_from_chapter=5)
+            # Another request reads the bumped generation but not yet the new row
+            generation = cache.get(
+                SnapshotIntervalIndex.GENERATION_KEY.format(kind="wiki", id=wiki.id)
+            )
+            cache.set(
+                SnapshotIntervalIndex.CACHE_KEY.format(
+                    kind="wiki", id=wiki.id, generation=generation
+                ),
+                stale,
+            )
+
+        assert WikiService.get_snapshot_for_chapter(wiki.id, 5).valid_from_chapter == 5
+
+    def test_stale_index_is_rebuilt(self, branch):
+        wiki = make_wiki(branch, "철수", 1, 5)
+        SnapshotIntervalIndex.get_index("wiki", wiki.id)
+        WikiSnapshot.objects.filter(wiki_entry=wiki, valid_from_chapter=5).delete()
+
+        assert WikiService.get_snapshot_for_chapter(wiki.id, 7).valid_from_chapter == 1
+
+    def test_map_snapshot_lookup(self, branch):
+        map_obj = make_map(branch, "대륙", 1, 8)
+        assert MapService.get_snapshot_for_chapter(map_obj.id, 3).valid_from_chapter == 1
+
+        MapService.create_snapshot(map_obj.id, branch.author, valid_from_chapter=3)
+
+        snapshot = MapService.get_snapshot_for_chapter(map_obj.id, 3)
+        assert isinstance(snapshot, MapSnapshot)
+        assert snapshot.valid_from_chapter == 3
+        assert list(snapshot.layers.all()) == []
+
+
+@pytest.mark.django_db
+class TestTimeline:
+    def test_wiki_intervals(self, branch):
+        make_wiki(branch, "철수", 1, 5, 10)
+        make_wiki(branch, "영희", first=None)
+
+        rows = WikiService.timeline(branch.id)
+
+        assert [row["name"] for row in rows] == ["영희", "철수"]
+        assert intervals(rows[0]) == []
+        assert intervals(rows[1]) == [(1, 4), (5, 9), (10, None)]
+
+    def test_chapter_bound(self, branch):
+        make_wiki(branch, "철수", 1, 5, 10)
+        make_wiki(branch, "마왕", 20, first=20)
+
+        [row] = WikiService.timeline(branch.id, chapter=7)
+
+        assert row["name"] == "철수"
+        assert intervals(row) == [(1, 4), (5, None)]
+
+    def test_fork_inherits_up_to_fork_point(self, branch):
+        make_wiki(branch, "철수", 1, 5, 10)
+        make_map(branch, "대륙", 1, 8)
+        fork = baker.make(Branch, parent_branch=branch, fork_point_chapter=6)
+
+        [wiki_row] = WikiService.timeline(fork.id)
+        [map_row] = MapService.timeline(fork.id)
+
+        assert intervals(wiki_row) == [(1, 4), (5, None)]
+        assert intervals(map_row) == [(1, None)]
+
+    def test_cached_until_branch_changes(self, branch, django_assert_num_queries):
+        wiki = make_wiki(branch, "철수", 1)
+        WikiService.timeline(branch.id)
+
+        # Lineage only
+        with django_assert_num_queries(1):
+            WikiService.timeline(branch.id)
+
+        WikiService.add_snapshot(wiki.id, branch.author, "새 설정", valid_from_chapter=3)
+        [row] = WikiService.timeline(branch.id)
+        assert intervals(row) == [(1, 2), (3, None)]
+
+
+@pytest.mark.django_db
+class TestTimelineEndpoints:
+    def test_wiki_timeline(self, branch):
+        wiki = make_wiki(branch, "철수", 1, 5)
+
+        response = APIClient().get(f"/api/v1/branches/{branch.id}/wikis/timeline/")
+
+        assert response.status_code == status.HTTP_200_OK
+        [row] = response.json()["data"]
+        assert row["id"] == wiki.id
+        assert row["snapshots"][0]["validUntilChapter"] == 4
+        assert row["snapshots"][1]["validUntilChapter"] is None
+
+    def test_map_timeline(self, branch):
+        map_obj = make_map(branch, "대륙", 1, 8)
+
+        response = APIClient().get(f"/api/v1/branches/{branch.id}/maps/timeline/?currentChapter=3")
+
+        assert response.status_code == status.HTTP_200_OK
+        [row] = response.json()["data"]
+        assert row["id"] == map_obj.id
+        assert [s["validFromChapter"] for s in row["snapshots"]] == [1]
+
+    def test_invalid_chapter(self, branch):
+        response = APIClient().get(
+            f"/api/v1/branches/{branch.id}/wikis/timeline/?currentChapter=abc"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_missing_branch(self):
+        response = APIClient().get("/api/v1/branches/999999/maps/timeline/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -3,16 +3,19 @@ Celery tasks Tests - TDD approach for scheduled publishing.
 
 Tests:
 - publish_scheduled_chapters: Auto-publish scheduled chapters
+- publish_scheduled_chapter: ETA task queued by ChapterService.schedule
 """
 
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 from model_bakery import baker
 
 from apps.contents.models import Chapter, ChapterStatus
-from apps.contents.tasks import publish_scheduled_chapters
+from apps.contents.services import ChapterService
+from apps.contents.tasks import publish_scheduled_chapter, publish_scheduled_chapters
 from apps.novels.models import Branch
 
 
@@ -121,3 +124,67 @@ class TestPublishScheduledChapters:
         assert result == 3
         branch.refresh_from_db()
         assert branch.chapter_count == 3
+
+    def test_release_wave_is_set_based(self, django_assert_max_num_queries):
+        """Query count should not grow with the number of due chapters."""
+        branches = baker.make(Branch, chapter_count=0, version=0, _quantity=3)
+        past_time = timezone.now() - timedelta(minutes=1)
+        for branch in branches:
+            for number in range(1, 11):
+                baker.make(
+                    Chapter,
+                    branch=branch,
+                    chapter_number=number,
+                    status=ChapterStatus.SCHEDULED,
+                    scheduled_at=past_time,
+                )
+
+        # SAVEPOINT, SELECT + UPDATE chapters, counter UPDATE, version UPDATE, RELEASE
+        with django_assert_max_num_queries(6):
+            result = publish_scheduled_chapters()
+
+        assert result == 30
+        for branch in branches:
+            branch.refresh_from_db()
+            assert branch.chapter_count == 10
+            assert branch.version == 1
+
+
+@pytest.mark.django_db
+class TestPublishScheduledChapter:
+    """Tests for the per-chapter ETA task."""
+
+    def test_schedule_enqueues_eta_task(self, django_capture_on_commit_callbacks):
+        """Scheduling should queue a publish task at the exact release time."""
+        chapter = baker.make(Chapter, status=ChapterStatus.DRAFT)
+        scheduled_at = timezone.now() + timedelta(hours=1)
+
+        with patch("apps.contents.tasks.publish_scheduled_chapter.apply_async") as apply_async:
+            with django_capture_on_commit_callbacks(execute=True):
+                ChapterService().schedule(chapter, scheduled_at)
+
+        apply_async.assert_called_once_with(args=[chapter.id], eta=scheduled_at)
+
+    def test_publishes_due_chapter(self):
+        """The ETA task publishes its chapter once due."""
+        chapter = baker.make(
+            Chapter,
+            status=ChapterStatus.SCHEDULED,
+            scheduled_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        assert publish_scheduled_chapter(chapter.id) == 1
+        chapter.refresh_from_db()
+        assert chapter.status == ChapterStatus.PUBLISHED
+
+    def test_skips_rescheduled_chapter(self):
+        """A task from an earlier schedule must not publish a postponed chapter."""
+        chapter = baker.make(
+            Chapter,
+            status=ChapterStatus.SCHEDULED,
+            scheduled_at=timezone.now() + timedelta(hours=1),
+        )
+
+        assert publish_scheduled_chapter(chapter.id) == 0
+        chapter.refresh_from_db()
+        assert chapter.status == ChapterStatus.SCHEDULED
@@ -0,0 +1,159 @@
+"""
+ChapterViewCounter Tests - Redis-buffered view ingestion.
+
+Tests:
+- record: one pipelined round trip returning the unique-reader estimate,
+  Redis errors never fail the read
+- flush / flush_view_counts: deltas applied to chapters, branches and novels,
+  one flush at a time, each batch applied at most once
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from django.core.cache import cache
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from apps.contents.models import Chapter, ChapterStatus
+from apps.contents.tasks import flush_view_counts
+from apps.contents.view_counter import ChapterViewCounter
+from apps.novels.models import Branch, Novel
+
+
+@pytest.fixture
+def redis_client():
+    with patch("django_redis.get_redis_connection") as mock_get_conn:
+        client = MagicMock()
+        mock_get_conn.return_value = client
+        yield client
+
+
+class TestRecord:
+    """Tests for ChapterViewCounter.record"""
+
+    def test_record_uses_single_pipeline(self, redis_client):
+        """A read should be one HINCRBY + PFADD + PFCOUNT pipeline round trip."""
+        pipe = redis_client.pipeline.return_value
+        pipe.execute.return_value = [1, 1, True, 42]
+
+        assert ChapterViewCounter.record(7, "user:1") == 42
+
+        pipe.hincrby.assert_called_once_with(ChapterViewCounter.PENDING_KEY, 7, 1)
+        pipe.pfadd.assert_called_once_with("views:readers:7", "user:1")
+        pipe.pfcount.assert_called_once_with("views:readers:7")
+        pipe.execute.assert_called_once()
+
+    def test_record_swallows_redis_error(self, redis_client):
+        """Redis outages should not fail chapter reads."""
+        redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        assert ChapterViewCounter.record(7, "user:1") is None
+
+    @pytest.mark.django_db
+    def test_detail_view_records_view(self):
+        """Reading a published chapter records a view without writing to the DB."""
+        branch = baker.make(Branch)
+        chapter = baker.make(
+            Chapter, branch=branch, chapter_number=1, status=ChapterStatus.PUBLISHED
+        )
+
+        with patch.object(ChapterViewCounter, "record", return_value=42) as record:
+            response = APIClient().get(
+                f"/api/v1/branches/{branch.id}/chapters/1/", REMOTE_ADDR="1.2.3.4"
+            )
+
+        record.assert_called_once_with(chapter.id, "anon:1.2.3.4")
+        assert response.json()["data"]["uniqueReaders"] == 42
+        chapter.refresh_from_db()
+        assert chapter.view_count == 0
+
+
+@pytest.mark.django_db
+class TestFlush:
+    """Tests for ChapterViewCounter.flush and the flush_view_counts task"""
+
+    def test_flush_applies_deltas_to_all_levels(self, redis_client):
+        """Deltas are aggregated per branch and per novel."""
+        novel = baker.make(Novel, total_view_count=10)
+        branch = baker.make(Branch, novel=novel, view_count=5)
+        ch1 = baker.make(Chapter, branch=branch, chapter_number=1, view_count=1)
+        ch2 = baker.make(Chapter, branch=branch, chapter_number=2)
+        pipe = redis_client.pipeline.return_value
+        pipe.execute.return_value = [
+            True,
+            {str(ch1.id).encode(): b"3", str(ch2.id).encode(): b"2"},
+            1,
+        ]
+
+        result = flush_view_counts()
+
+        # The buffer is claimed under a key of its own and dropped in the same transaction
+        flushing_key = pipe.rename.call_args.args[1]
+        assert pipe.rename.call_args.args[0] == ChapterViewCounter.PENDING_KEY
+        assert flushing_key.startswith("views:flushing:")
+        pipe.hgetall.assert_called_once_with(flushing_key)
+        pipe.delete.assert_called_once_with(flushing_key)
+        assert result == "Flushed 5 views."
+        ch1.refresh_from_db()
+        ch2.refresh_from_db()
+        branch.refresh_from_db()
+        novel.refresh_from_db()
+        assert (ch1.view_count, ch2.view_count) == (4, 2)
+        assert branch.view_count == 10
+        assert novel.total_view_count == 15
+
+    def test_flushes_claim_separate_batches(self, redis_client):
+        """Each flush renames the buffer to a new key, so no batch is applied twice."""
+        chapter = baker.make(Chapter)
+        pipe = redis_client.pipeline.return_value
+        pipe.execute.side_effect = [
+            [True, {str(chapter.id).encode(): b"1"}, 1],
+            [redis.ResponseError("no such key"), {}, 0],
+        ]
+
+        assert ChapterViewCounter.flush() == 1
+        assert ChapterViewCounter.flush() == 0
+
+        first, second = (c.args[1] for c in pipe.rename.call_args_list)
+        assert first != second
+        chapter.refresh_from_db()
+        assert chapter.view_count == 1
+
+    def test_flush_skips_while_another_runs(self, redis_client):
+        """A flush that overlaps a running one leaves the buffer alone."""
+        cache.add(ChapterViewCounter.FLUSH_LOCK_KEY, True)
+
+        try:
+            assert ChapterViewCounter.flush() == 0
+        finally:
+            cache.delete(ChapterViewCounter.FLUSH_LOCK_KEY)
+
+        redis_client.pipeline.assert_not_called()
+
+    def test_flush_releases_lock_on_error(self, redis_client):
+        """A failed flush does not block the next one."""
+        redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        with pytest.raises(redis.ConnectionError):
+            ChapterViewCounter.flush()
+
+        assert cache.add(ChapterViewCounter.FLUSH_LOCK_KEY, True)
+        cache.delete(ChapterViewCounter.FLUSH_LOCK_KEY)
+
+    def test_flush_without_pending_views(self, redis_client):
+        """RENAME of a missing key means there is nothing to flush."""
+        redis_client.pipeline.return_value.execute.return_value = [
+            redis.ResponseError("no such key"),
+            {},
+            0,
+        ]
+
+        assert ChapterViewCounter.flush() == 0
+
+    def test_task_reports_redis_error(self, redis_client):
+        """Connection errors are reported instead of raised."""
+        redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        assert "Redis error" in flush_view_counts()
@@ -67,3 +67,71 @@ class TestWikiContextFiltering:
         results = WikiService.list(branch_id=branch.id, current_chapter=9)
 
         assert len(results) == 0
+
+
+class TestListAtChapter:
+    """Test WikiService.list_at_chapter() - entries with the snapshot valid at chapter N."""
+
+    @pytest.fixture
+    def branch(self):
+        branch = baker.make("novels.Branch")
+        hero = baker.make("contents.WikiEntry", branch=branch, name="Hero", first_appearance=1)
+        baker.make("contents.WikiEntry", branch=branch, name="Villain", first_appearance=12)
+        for chapter, content in [(0, "v0"), (5, "v5"), (13, "v13")]:
+            baker.make(
+                "contents.WikiSnapshot",
+                wiki_entry=hero,
+                valid_from_chapter=chapter,
+                content=content,
+            )
+        hero.tags.add(baker.make("contents.WikiTagDefinition", branch=branch))
+        return branch
+
+    @staticmethod
+    def resolved(entries):
+        return [
+            (e.name, e.snapshot_at_chapter.content if e.snapshot_at_chapter else None)
+            for e in entries
+        ]
+
+    def test_resolves_snapshot_per_chapter(self, branch):
+        """Each entry carries its latest snapshot with valid_from_chapter <= N."""
+        assert self.resolved(WikiService.list_at_chapter(branch.id, 4)) == [("Hero", "v0")]
+        assert self.resolved(WikiService.list_at_chapter(branch.id, 9)) == [("Hero", "v5")]
+        assert self.resolved(WikiService.list_at_chapter(branch.id, 12)) == [
+            ("Hero", "v5"),
+            ("Villain", None),
+        ]
+        assert self.resolved(WikiService.list_at_chapter(branch.id, 15)) == [
+            ("Hero", "v13"),
+            ("Villain", None),
+        ]
+
+    def test_constant_queries_and_bucket_cache(self, branch, django_assert_num_queries):
+        """A cold bucket costs a fixed number of queries; later chapters in it cost one."""
+        for i in range(5):
+            baker.make("contents.WikiEntry", branch=branch, name=f"Extra {i}", first_appearance=1)
+
+        # version, entries, tags, snapshots inside the bucket, snapshots at its start
+        with django_assert_num_queries(5):
+            entries = WikiService.list_at_chapter(branch.id, 10)
+        assert len(entries) == 6
+
+        with django_assert_num_queries(1):
+            entries = WikiService.list_at_chapter(branch.id, 19)
+            hero = entries[5]
+            assert (hero.name, hero.snapshot_at_chapter.content) == ("Hero", "v13")
+            assert len(hero.tags.all()) == 1
+
+    def test_branch_version_bump_invalidates(self, branch):
+        """Mutations bump Branch.version, so stale results are not served."""
+        hero = branch.wiki_entries.get(name="Hero")
+        WikiService.list_at_chapter(branch.id, 6)
+
+        WikiService.add_snapshot(hero.id, branch.author, content="v6", valid_from_chapter=6)
+
+        assert self.resolved(WikiService.list_at_chapter(branch.id, 6)) == [("Hero", "v6")]
+
+    def test_unknown_branch(self):
+        with pytest.raises(ValueError):
+            WikiService.list_at_chapter(999999, 1)
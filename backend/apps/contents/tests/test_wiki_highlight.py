@@ -0,0 +1,155 @@
+"""
+WikiHighlighter Tests - wiki keyword highlighting in chapter text.
+
+Tests:
+- highlight(): per-paragraph spans, first_appearance filter, aliases, word boundaries
+- get_automaton(): cached per Branch.version
+- GET /api/v1/branches/{branch_id}/chapters/{number}/wiki-highlights/
+"""
+
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.highlighter import WikiHighlighter
+from apps.contents.models import Chapter, ChapterStatus, WikiEntry
+from apps.contents.services import ChapterService, WikiService
+from apps.novels.models import Branch
+
+HTML = "<p>철수가 <strong>영희</strong>를 만났다.</p>\n<p>Ann &amp; Annual 철수</p>"
+
+
+def make_chapter(branch: Branch, number: int = 3, html: str = HTML) -> Chapter:
+    return baker.make(
+        Chapter,
+        branch=branch,
+        chapter_number=number,
+        content_html=html,
+        paragraph_offsets=ChapterService.compute_paragraph_offsets(html),
+        status=ChapterStatus.PUBLISHED,
+    )
+
+
+@pytest.mark.django_db
+class TestHighlight:
+    """Tests for WikiHighlighter.highlight()"""
+
+    def test_spans_per_paragraph_text(self):
+        """Offsets index into each paragraph's text content, across inline tags."""
+        branch = baker.make(Branch)
+        cheolsu = baker.make(WikiEntry, branch=branch, name="철수", first_appearance=1)
+        younghee = baker.make(WikiEntry, branch=branch, name="영희", first_appearance=None)
+
+        result = WikiHighlighter.highlight(make_chapter(branch))
+
+        assert result["spans"] == [
+            {"paragraph": 0, "start": 0, "end": 2, "wiki_id": cheolsu.id},
+            {"paragraph": 0, "start": 4, "end": 6, "wiki_id": younghee.id},
+            {"paragraph": 1, "start": 13, "end": 15, "wiki_id": cheolsu.id},
+        ]
+        assert result["wikis"] == [
+            {"id": cheolsu.id, "name": "철수"},
+            {"id": younghee.id, "name": "영희"},
+        ]
+
+    def test_hides_entries_not_yet_appeared(self):
+        """Entries with first_appearance after the chapter are not highlighted."""
+        branch = baker.make(Branch)
+        baker.make(WikiEntry, branch=branch, name="영희", first_appearance=4)
+
+        assert WikiHighlighter.highlight(make_chapter(branch, number=3))["spans"] == []
+
+    def test_aliases_and_word_boundaries(self):
+        """Aliases from ai_metadata match; Latin names only match whole words."""
+        branch = baker.make(Branch)
+        ann = baker.make(WikiEntry, branch=branch, name="Ann", ai_metadata={"aliases": ["영희"]})
+
+        spans = WikiHighlighter.highlight(make_chapter(branch))["spans"]
+
+        assert [(s["paragraph"], s["start"], s["wiki_id"]) for s in spans] == [
+            (0, 4, ann.id),
+            (1, 0, ann.id),
+        ]
+
+    def test_shared_alias_picks_entry_that_appeared(self):
+        """An entry that has not appeared yet does not shadow one sharing its alias."""
+        branch = baker.make(Branch)
+        later = baker.make(
+            WikiEntry,
+            branch=branch,
+            name="Ann",
+            first_appearance=5,
+            ai_metadata={"aliases": ["영희"]},
+        )
+        earlier = baker.make(
+            WikiEntry,
+            branch=branch,
+            name="Bob",
+            first_appearance=1,
+            ai_metadata={"aliases": ["영희"]},
+        )
+
+        spans = WikiHighlighter.highlight(make_chapter(branch, number=3))["spans"]
+        assert [(s["start"], s["wiki_id"]) for s in spans] == [(4, earlier.id)]
+
+        spans = WikiHighlighter.highlight(make_chapter(branch, number=6))["spans"]
+        assert [(s["start"], s["wiki_id"]) for s in spans] == [(4, later.id), (0, later.id)]
+
+    def test_alias_of_hidden_entry_does_not_shadow(self):
+        """A hidden entry's alias equal to a visible entry's name leaves the name matching."""
+        branch = baker.make(Branch)
+        baker.make(
+            WikiEntry,
+            branch=branch,
+            name="Ann",
+            first_appearance=5,
+            ai_metadata={"aliases": ["철수"]},
+        )
+        cheolsu = baker.make(WikiEntry, branch=branch, name="철수", first_appearance=1)
+
+        spans = WikiHighlighter.highlight(make_chapter(branch, number=3))["spans"]
+
+        assert [s["wiki_id"] for s in spans] == [cheolsu.id, cheolsu.id]
+
+    def test_automaton_cached_per_branch_version(self, django_assert_num_queries):
+        """The automaton is reused until a wiki change bumps Branch.version."""
+        branch = baker.make(Branch, version=1)
+        entry = baker.make(WikiEntry, branch=branch, name="철수")
+
+        WikiHighlighter.get_automaton(branch.id, 1)
+        with django_assert_num_queries(0):
+            WikiHighlighter.get_automaton(branch.id, 1)
+
+        WikiService.update(entry.id, branch.author, name="영희")
+        branch.refresh_from_db()
+        automaton = WikiHighlighter.get_automaton(branch.id, branch.version)
+
+        assert [m[2][0][1] for m in automaton.find_longest("철수와 영희")] == ["영희"]
+
+
+@pytest.mark.django_db
+class TestWikiHighlightEndpoint:
+    """Tests for the wiki-highlights action."""
+
+    def test_returns_spans(self):
+        branch = baker.make(Branch)
+        entry = baker.make(WikiEntry, branch=branch, name="영희")
+        make_chapter(branch)
+
+        response = APIClient().get(f"/api/v1/branches/{branch.id}/chapters/3/wiki-highlights/")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["spans"] == [{"paragraph": 0, "start": 4, "end": 6, "wikiId": entry.id}]
+        assert data["wikis"] == [{"id": entry.id, "name": "영희"}]
+        assert response["ETag"]
+
+    def test_draft_hidden_from_readers(self):
+        branch = baker.make(Branch)
+        chapter = make_chapter(branch)
+        Chapter.objects.filter(pk=chapter.pk).update(status=ChapterStatus.DRAFT)
+
+        response = APIClient().get(f"/api/v1/branches/{branch.id}/chapters/3/wiki-highlights/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
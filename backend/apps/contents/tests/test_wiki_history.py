@@ -0,0 +1,159 @@
+"""
+WikiSnapshotHistory Tests - keyframe/delta snapshot storage and diffs.
+
+Tests:
+- add_snapshot(): delta against the previous keyframe, keyframe interval, large rewrites
+- materialize(): batch decoding, cached texts
+- compact(): re-encoding full histories
+- GET /api/v1/wikis/{wiki_id}/snapshots/ and /snapshots/diff/
+"""
+
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.models import WikiEntry, WikiSnapshot
+from apps.contents.services import WikiService
+from apps.contents.wiki_history import WikiSnapshotHistory
+
+LINES = [f"설정 {i}: {'가나다라마바사' * 3}\n" for i in range(20)]
+
+
+def version(number: int) -> str:
+    """A long page where each version changes one line."""
+    lines = list(LINES)
+    lines[number % len(lines)] = f"변경 {number}\n"
+    return "".join(lines)
+
+
+@pytest.fixture
+def wiki(db):
+    return baker.make(WikiEntry)
+
+
+@pytest.mark.django_db
+class TestEncoding:
+    def test_small_change_stored_as_delta(self, wiki):
+        author = wiki.branch.author
+        first = WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        second = WikiService.add_snapshot(wiki.id, author, version(2), valid_from_chapter=5)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.is_keyframe
+        assert second.base_id == first.id
+        assert second.content == ""
+        assert second.text == version(2)
+
+    def test_keyframe_interval(self, wiki):
+        author = wiki.branch.author
+        for chapter in range(1, WikiSnapshotHistory.KEYFRAME_INTERVAL + 3):
+            WikiService.add_snapshot(wiki.id, author, version(chapter), valid_from_chapter=chapter)
+
+        keyframes = list(
+            wiki.snapshots.filter(delta__isnull=True).values_list("valid_from_chapter", flat=True)
+        )
+        assert keyframes == [1, WikiSnapshotHistory.KEYFRAME_INTERVAL + 2]
+
+    def test_rewrite_stored_as_keyframe(self, wiki):
+        author = wiki.branch.author
+        WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        rewrite = WikiService.add_snapshot(
+            wiki.id, author, "완전히 새 내용\n", valid_from_chapter=2
+        )
+
+        rewrite.refresh_from_db()
+        assert rewrite.is_keyframe
+
+    def test_materialize_is_batched_and_cached(self, wiki, django_assert_num_queries):
+        author = wiki.branch.author
+        for chapter in range(1, 5):
+            WikiService.add_snapshot(wiki.id, author, version(chapter), valid_from_chapter=chapter)
+
+        snapshots = list(WikiSnapshot.objects.filter(wiki_entry=wiki))
+        with django_assert_num_queries(1):
+            WikiSnapshotHistory.materialize(snapshots)
+        assert [s.text for s in snapshots] == [version(c) for c in range(1, 5)]
+
+        snapshots = list(WikiSnapshot.objects.filter(wiki_entry=wiki))
+        with django_assert_num_queries(0):
+            WikiSnapshotHistory.materialize(snapshots)
+            assert snapshots[-1].text == version(4)
+
+    def test_compact_keeps_texts(self, wiki):
+        for chapter in range(1, 12):
+            baker.make(
+                WikiSnapshot, wiki_entry=wiki, valid_from_chapter=chapter, content=version(chapter)
+            )
+
+        assert WikiSnapshotHistory.compact(wiki.id) == 9
+
+        snapshots = list(WikiSnapshot.objects.filter(wiki_entry=wiki))
+        assert sum(len(s.content) for s in snapshots) < 3 * len(version(1))
+        assert [s.text for s in snapshots] == [version(c) for c in range(1, 12)]
+
+    def test_fork_copies_delta_rows(self, wiki):
+        author = wiki.branch.author
+        WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        WikiService.add_snapshot(wiki.id, author, version(2), valid_from_chapter=2)
+        target = baker.make("novels.Branch", author=author)
+
+        [forked] = WikiService.fork_wiki_entries(wiki.branch_id, target.id, author)
+
+        snapshots = list(forked.snapshots.all())
+        assert snapshots[1].base_id == snapshots[0].id
+        assert [s.text for s in snapshots] == [version(1), version(2)]
+
+
+@pytest.mark.django_db
+class TestSnapshotEndpoints:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_list_returns_full_content(self, wiki):
+        author = wiki.branch.author
+        WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        WikiService.add_snapshot(wiki.id, author, version(2), valid_from_chapter=3)
+
+        response = self.client.get(f"/api/v1/wikis/{wiki.id}/snapshots/")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert [s["content"] for s in data] == [version(1), version(2)]
+        assert data[1]["contributor"] == author.id
+
+    def test_diff(self, wiki):
+        author = wiki.branch.author
+        WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        WikiService.add_snapshot(wiki.id, author, version(2), valid_from_chapter=3)
+
+        response = self.client.get(f"/api/v1/wikis/{wiki.id}/snapshots/diff/?from=1&to=3")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert (data["fromChapter"], data["toChapter"]) == (1, 3)
+        assert [(h["tag"], h["removed"], h["added"]) for h in data["hunks"]] == [
+            ("replace", ["변경 1", LINES[2].rstrip()], [LINES[1].rstrip(), "변경 2"])
+        ]
+
+    def test_diff_is_cached(self, wiki, django_assert_max_num_queries):
+        author = wiki.branch.author
+        WikiService.add_snapshot(wiki.id, author, version(1), valid_from_chapter=1)
+        WikiService.add_snapshot(wiki.id, author, version(2), valid_from_chapter=3)
+        WikiSnapshotHistory.diff(wiki.id, 1, 3)
+
+        with django_assert_max_num_queries(1):
+            result = WikiSnapshotHistory.diff(wiki.id, 1, 3)
+
+        assert len(result["hunks"]) == 1
+
+    def test_diff_missing_version(self, wiki):
+        response = self.client.get(f"/api/v1/wikis/{wiki.id}/snapshots/diff/?from=1&to=3")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_diff_requires_chapters(self, wiki):
+        response = self.client.get(f"/api/v1/wikis/{wiki.id}/snapshots/diff/?from=1")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,115 @@
+"""
+WikiSearchService Tests - branch-scoped, spoiler-bounded wiki search.
+
+Tests:
+- search(): name and content matches, ranking, chapter bound, snippets
+- GET /api/v1/branches/{branch_id}/wikis/search/
+"""
+
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contents.models import WikiEntry
+from apps.contents.services import WikiService
+from apps.contents.wiki_search import WikiSearchService
+from apps.novels.models import Branch
+
+
+@pytest.fixture
+def branch(db):
+    return baker.make(Branch)
+
+
+def make_wiki(branch: Branch, name: str, *versions: tuple[int, str], first: int = 1) -> WikiEntry:
+    wiki = baker.make(WikiEntry, branch=branch, name=name, first_appearance=first)
+    for chapter, content in versions:
+        WikiService.add_snapshot(wiki.id, branch.author, content, valid_from_chapter=chapter)
+    return wiki
+
+
+def names(results: list[dict]) -> list[str]:
+    return [r["entry"].name for r in results]
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_name_match_ranks_above_content(self, branch):
+        make_wiki(branch, "영희", (1, "철수의 소꿉친구."))
+        make_wiki(branch, "철수", (1, "주인공."))
+        make_wiki(branch, "배경", (1, "관련 없음."))
+
+        assert names(WikiSearchService.search(branch.id, "철수")) == ["철수", "영희"]
+
+    def test_content_requires_every_term(self, branch):
+        make_wiki(branch, "A", (1, "붉은 검을 든 기사"))
+        make_wiki(branch, "B", (1, "푸른 검을 든 기사"))
+
+        assert names(WikiSearchService.search(branch.id, "붉은 기사")) == ["A"]
+
+    def test_bounded_by_reader_chapter(self, branch):
+        make_wiki(branch, "영희", (1, "평범한 학생."), (10, "사실은 마왕."))
+        make_wiki(branch, "마왕", (1, "최종 보스."), first=20)
+
+        assert WikiSearchService.search(branch.id, "마왕", chapter=5) == []
+        assert names(WikiSearchService.search(branch.id, "마왕", chapter=12)) == ["영희"]
+        # Superseded versions are not searched either
+        assert WikiSearchService.search(branch.id, "평범한", chapter=12) == []
+
+    def test_searches_delta_encoded_snapshots(self, branch):
+        base = "".join(f"설정 {i}\n" for i in range(30))
+        wiki = make_wiki(branch, "도시", (1, base), (5, base + "숨겨진 성문\n"))
+        assert wiki.snapshots.get(valid_from_chapter=5).delta is not None
+
+        results = WikiSearchService.search(branch.id, "성문", chapter=5)
+
+        assert names(results) == ["도시"]
+        assert "<mark>성문</mark>" in results[0]["snippet"]
+
+    def test_snippet_is_escaped_and_trimmed(self, branch):
+        text = "가" * 100 + " <b>철수</b> & 영희 " + "나" * 100
+        make_wiki(branch, "인물", (1, text))
+
+        [result] = WikiSearchService.search(branch.id, "철수")
+
+        snippet = result["snippet"]
+        assert "&lt;b&gt;<mark>철수</mark>&lt;/b&gt; &amp; 영희" in snippet
+        assert snippet.startswith("…") and snippet.endswith("…")
+
+    def test_fork_searches_inherited_entries(self, branch):
+        make_wiki(branch, "철수", (1, "주인공."))
+        make_wiki(branch, "후반", (1, "분기 이후 등장."), first=9)
+        fork = baker.make(Branch, parent_branch=branch, fork_point_chapter=5)
+
+        assert names(WikiSearchService.search(fork.id, "철수")) == ["철수"]
+        assert WikiSearchService.search(fork.id, "분기") == []
+
+    def test_empty_query(self, branch):
+        assert WikiSearchService.search(branch.id, "  !? ") == []
+
+
+@pytest.mark.django_db
+class TestSearchEndpoint:
+    def test_search(self, branch):
+        wiki = make_wiki(branch, "철수", (1, "주인공."))
+
+        response = APIClient().get(
+            f"/api/v1/branches/{branch.id}/wikis/search/?q=철수&currentChapter=3"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        [hit] = response.json()["data"]
+        assert hit["id"] == wiki.id
+        assert hit["snippet"] == "주인공."
+        assert hit["score"] > 0
+
+    def test_requires_query(self, branch):
+        response = APIClient().get(f"/api/v1/branches/{branch.id}/wikis/search/")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_missing_branch(self):
+        response = APIClient().get("/api/v1/branches/999999/wikis/search/?q=철수")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
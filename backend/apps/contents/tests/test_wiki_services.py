@@ -5,9 +5,10 @@ RED → GREEN → REFACTOR
 
 import pytest
 from django.core.exceptions import PermissionDenied
+from django.db import connection
 from model_bakery import baker
 
-from apps.contents.models import WikiEntry, WikiTagDefinition
+from apps.contents.models import WikiEntry, WikiSnapshot, WikiTagDefinition
 from apps.contents.services import WikiService
 
 pytestmark = pytest.mark.django_db
@@ -463,3 +464,37 @@ class TestWikiServiceFork:
         )
 
         assert len(forked_wikis) == 0
+
+    @pytest.mark.parametrize("size", [1, 10, 50])
+    def test_fork_statement_count_is_independent_of_size(self, size, django_assert_num_queries):
+        """위키 규모와 무관하게 일정한 수의 쿼리로 포크"""
+        source_branch = baker.make("novels.Branch")
+        tags = baker.make("contents.WikiTagDefinition", branch=source_branch, _quantity=3)
+        wikis = WikiEntry.objects.bulk_create(
+            [WikiEntry(branch=source_branch, name=f"위키 {i}") for i in range(size)]
+        )
+        for wiki in wikis:
+            wiki.tags.add(*tags[:2])
+        WikiSnapshot.objects.bulk_create(
+            [
+                WikiSnapshot(wiki_entry=wiki, valid_from_chapter=chapter, content="내용")
+                for wiki in wikis
+                for chapter in (0, 5)
+            ]
+        )
+        target_branch = baker.make("novels.Branch")
+
+        # branch check, SAVEPOINT/RELEASE, select + insert for tags, entries, links
+        # and snapshots, version bump. SQLite caps bound parameters per statement,
+        # so a large snapshot insert is split there.
+        fields = [f for f in WikiSnapshot._meta.concrete_fields if not f.primary_key]
+        insert_batches = -(-size * 2 // connection.ops.bulk_batch_size(fields, [None] * size * 2))
+        with django_assert_num_queries(11 + insert_batches):
+            WikiService.fork_wiki_entries(source_branch.id, target_branch.id, target_branch.author)
+
+        forked = WikiEntry.objects.filter(branch=target_branch)
+        assert forked.count() == size
+        assert WikiSnapshot.objects.filter(wiki_entry__branch=target_branch).count() == size * 2
+        assert WikiEntry.tags.through.objects.filter(wikientry__branch=target_branch).count() == (
+            size * 2
+        )
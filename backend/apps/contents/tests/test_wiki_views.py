@@ -12,6 +12,9 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from apps.contents.models import WikiEntry
+from apps.contents.services import WikiService
+
 pytestmark = pytest.mark.django_db
 
 
@@ -45,6 +48,31 @@ class TestWikiEntryViewSet:
         results = data.get("results") or data
         assert len(results) == 2
 
+    def test_list_skips_private_columns(self, assert_no_heavy_columns):
+        """위키 목록 조회 시 hidden_note/ai_metadata 컬럼을 로드하지 않음"""
+        baker.make("contents.WikiEntry", branch=self.branch, hidden_note="비밀")
+
+        with assert_no_heavy_columns(WikiEntry):
+            response = self.client.get(f"/api/v1/branches/{self.branch.id}/wikis/")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_at_current_chapter_includes_snapshot(self):
+        """currentChapter 지정 시 회차 시점의 스냅샷을 함께 반환"""
+        wiki = baker.make(
+            "contents.WikiEntry", branch=self.branch, name="캐릭터", first_appearance=1
+        )
+        baker.make("contents.WikiSnapshot", wiki_entry=wiki, valid_from_chapter=1, content="초반")
+        baker.make("contents.WikiSnapshot", wiki_entry=wiki, valid_from_chapter=5, content="후반")
+        baker.make("contents.WikiEntry", branch=self.branch, name="미등장", first_appearance=9)
+
+        response = self.client.get(f"/api/v1/branches/{self.branch.id}/wikis/?currentChapter=3")
+
+        assert response.status_code == status.HTTP_200_OK
+        results = get_json(response)["data"]["results"]
+        assert [r["name"] for r in results] == ["캐릭터"]
+        assert results[0]["snapshot"]["content"] == "초반"
+
     def test_create_wiki_entry(self):
         """위키 생성"""
         url = f"/api/v1/branches/{self.branch.id}/wikis/"
@@ -157,6 +185,49 @@ class TestWikiEntryViewSet:
         assert not WikiEntry.objects.filter(id=wiki.id).exists()
 
 
+class TestWikiConditionalGet:
+    """위키 조회 ETag / Last-Modified 테스트"""
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = baker.make("users.User")
+        self.branch = baker.make("novels.Branch", author=self.user)
+        self.wiki = baker.make("contents.WikiEntry", branch=self.branch, name="캐릭터")
+
+    def test_list_not_modified(self):
+        """변경이 없으면 304 반환"""
+        url = f"/api/v1/branches/{self.branch.id}/wikis/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_snapshot_changes_detail_etag(self):
+        """스냅샷 추가 시 상세 ETag 변경"""
+        url = f"/api/v1/wikis/{self.wiki.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        WikiService.add_snapshot(self.wiki.id, self.user, "내용", valid_from_chapter=1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_query_params_change_etag(self):
+        """다른 쿼리 파라미터는 다른 ETag"""
+        url = f"/api/v1/wikis/{self.wiki.id}/"
+
+        assert self.client.get(url)["ETag"] != self.client.get(f"{url}?chapter=3")["ETag"]
+
+    def test_missing_wiki_still_404(self):
+        """존재하지 않는 위키는 검증자 없이 404"""
+        response = self.client.get("/api/v1/wikis/999999/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "ETag" not in response
+
+
 class TestWikiTagViewSet:
     """WikiTagDefinitionViewSet 테스트"""
 
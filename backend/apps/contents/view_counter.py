@@ -0,0 +1,131 @@
+"""
+ChapterViewCounter - Buffered view ingestion for chapters, branches and novels.
+
+A chapter read costs a single pipelined Redis round trip and no database
+writes: ``HINCRBY`` on a shared pending hash (chapter id -> views) plus
+``PFADD``/``PFCOUNT`` on a per-chapter HyperLogLog of reader keys, whose
+unique-reader estimate is returned with the chapter detail.
+``flush_view_counts`` periodically claims the pending hash by renaming it to a
+key of its own and applies the accumulated deltas to ``Chapter.view_count``,
+``Branch.view_count`` and ``Novel.total_view_count`` in batched UPDATEs, so
+popular rows are written once per flush instead of once per read.
+"""
+
+import logging
+import uuid
+from collections import Counter
+
+import redis
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.contents.models import Chapter
+from apps.novels.models import Branch, Novel
+from common.db import bulk_increment
+
+logger = logging.getLogger(__name__)
+
+
+class ChapterViewCounter:
+    """Redis-buffered chapter view counts."""
+
+    PENDING_KEY = "views:pending"
+    FLUSHING_KEY = "views:flushing:{batch_id}"
+    FLUSH_LOCK_KEY = "views:flush_lock"
+    FLUSH_LOCK_TIMEOUT = 5 * 60  # outlives any flush; a crashed flush frees it on expiry
+    READERS_KEY = "views:readers:{chapter_id}"
+    READERS_TIMEOUT = 30 * 24 * 60 * 60  # 30 days since the last read
+
+    @staticmethod
+    def _get_client() -> redis.Redis | None:
+        from django_redis import get_redis_connection
+
+        try:
+            return get_redis_connection("default")
+        except NotImplementedError:
+            # Cache backend without a raw Redis client (e.g. LocMemCache in tests).
+            return None
+
+    @classmethod
+    def record(cls, chapter_id: int, reader_key: str) -> int | None:
+        """
+        회차 조회 1회를 버퍼에 기록한다. Redis 오류는 읽기 요청을 실패시키지 않도록 로그만 남긴다.
+
+        Parameters:
+            chapter_id (int): 조회된 회차 ID.
+            reader_key (str): 고유 독자 추정용 키 (예: "user:1", "anon:1.2.3.4").
+
+        Returns:
+            int | None: 회차의 고유 독자 수 추정치(HyperLogLog, 표준 오차 약 0.81%).
+                Redis를 쓸 수 없으면 None.
+        """
+        client = cls._get_client()
+        if client is None:
+            return None
+
+        readers_key = cls.READERS_KEY.format(chapter_id=chapter_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(cls.PENDING_KEY, chapter_id, 1)
+            pipe.pfadd(readers_key, reader_key)
+            pipe.expire(readers_key, cls.READERS_TIMEOUT)
+            pipe.pfcount(readers_key)
+            *_, unique_readers = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record view for chapter {chapter_id}: {e}")
+            return None
+        return unique_readers
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        버퍼에 쌓인 조회수를 회차/브랜치/소설 테이블에 일괄 반영한다.
+
+        한 번에 하나의 flush만 실행된다. 버퍼는 RENAME으로 고유한 키에 옮겨 읽은 뒤 반영 전에 지우므로,
+        flush가 겹치거나 중간에 중단되어도 같은 조회가 두 번 반영되지 않는다 (중단된 배치는 버려진다).
+
+        Returns:
+            int: 반영된 조회 수 합계. 다른 flush가 실행 중이면 0.
+
+        Raises:
+            redis.RedisError: Redis 통신 실패 시.
+        """
+        client = cls._get_client()
+        if client is None:
+            return 0
+
+        if not cache.add(cls.FLUSH_LOCK_KEY, True, cls.FLUSH_LOCK_TIMEOUT):
+            return 0
+        try:
+            return cls._flush_batch(client)
+        finally:
+            cache.delete(cls.FLUSH_LOCK_KEY)
+
+    @classmethod
+    def _flush_batch(cls, client: redis.Redis) -> int:
+        flushing_key = cls.FLUSHING_KEY.format(batch_id=uuid.uuid4().hex)
+        pipe = client.pipeline()
+        pipe.rename(cls.PENDING_KEY, flushing_key)
+        pipe.hgetall(flushing_key)
+        pipe.delete(flushing_key)
+        renamed, raw, _ = pipe.execute(raise_on_error=False)
+        if isinstance(renamed, redis.ResponseError):
+            # No pending views since the last flush
+            return 0
+        chapter_deltas = {int(chapter_id): int(count) for chapter_id, count in raw.items()}
+
+        branch_deltas: Counter[int] = Counter()
+        novel_deltas: Counter[int] = Counter()
+        rows = Chapter.objects.filter(id__in=chapter_deltas).values_list(
+            "id", "branch_id", "branch__novel_id"
+        )
+        for chapter_id, branch_id, novel_id in rows:
+            branch_deltas[branch_id] += chapter_deltas[chapter_id]
+            novel_deltas[novel_id] += chapter_deltas[chapter_id]
+
+        with transaction.atomic():
+            bulk_increment(Chapter, "view_count", chapter_deltas)
+            bulk_increment(Branch, "view_count", branch_deltas)
+            bulk_increment(Novel, "total_view_count", novel_deltas)
+
+        return sum(branch_deltas.values())
@@ -10,52 +10,170 @@ Contains views for:
 - WikiSnapshotViewSet: Nested under wikis for list/create
 """
 
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+from django.http import HttpResponse
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.contents.exporter import BranchExportService, ExportFormat, ExportJobStatus
+from apps.contents.highlighter import WikiHighlighter
+from apps.contents.importer import ChapterImportService
+from apps.contents.lineage import BranchLineage
+from apps.contents.map_geometry import parse_bbox
+from apps.contents.map_history import MapSnapshotHistory
+from apps.contents.map_import import FeatureImportError, MapImportService
 from apps.contents.map_services import MapService
+from apps.contents.map_tiles import MapTileService
 from apps.contents.models import (
     Chapter,
     ChapterStatus,
+    Map,
     MapLayer,
     MapSnapshot,
+    WikiEntry,
 )
+from apps.contents.payload_cache import ChapterPayloadCache
 from apps.contents.serializers import (
     ChapterCreateSerializer,
     ChapterDetailSerializer,
+    ChapterExportJobSerializer,
+    ChapterExportSerializer,
+    ChapterImportJobSerializer,
+    ChapterImportSerializer,
     ChapterListSerializer,
+    ChapterLiveSerializer,
+    ChapterParagraphWindowSerializer,
     ChapterScheduleSerializer,
+    ChapterTocSerializer,
     ChapterUpdateSerializer,
+    ChapterWikiHighlightSerializer,
     MapCreateSerializer,
     MapDetailSerializer,
+    MapForkJobSerializer,
+    MapImportResultSerializer,
+    MapImportSerializer,
     MapLayerCreateSerializer,
     MapLayerSerializer,
     MapListSerializer,
     MapObjectCreateSerializer,
     MapObjectSerializer,
+    MapScrubSerializer,
     MapSnapshotCreateSerializer,
     MapSnapshotSerializer,
+    MapTileSerializer,
+    MapTimelineSerializer,
     MapUpdateSerializer,
+    WikiEntryAtChapterSerializer,
     WikiEntryCreateSerializer,
     WikiEntryDetailSerializer,
     WikiEntryListSerializer,
     WikiEntryUpdateSerializer,
+    WikiSearchResultSerializer,
     WikiSnapshotCreateSerializer,
+    WikiSnapshotDiffSerializer,
     WikiSnapshotSerializer,
     WikiTagDefinitionCreateSerializer,
     WikiTagDefinitionSerializer,
     WikiTagUpdateSerializer,
+    WikiTimelineSerializer,
 )
-from apps.contents.services import ChapterService, WikiService
+from apps.contents.services import ChapterNavigationService, ChapterService, WikiService
+from apps.contents.view_counter import ChapterViewCounter
+from apps.contents.wiki_history import WikiSnapshotHistory
+from apps.contents.wiki_search import WikiSearchService
 from apps.novels.models import Branch
 from apps.novels.services.draft_service import DraftService
-from common.pagination import StandardPagination
+from common.conditional import ConditionalGet
+from common.pagination import KeysetPagination, StandardPagination
+from common.ranges import ranged_file_response
+from common.renderers import StandardJSONRenderer
+
+
+def _lineage_conditional(
+    request: Request, scope: str, branch_pk: int
+) -> tuple[ConditionalGet, BranchLineage | None]:
+    """
+    Validators for branch lists that include rows a fork inherits from its ancestors.
+
+    Uses every version in the lineage, so a parent's change revalidates its forks.
+    Disabled (lineage None) if the branch does not exist.
+    """
+    try:
+        lineage = BranchLineage.resolve(branch_pk)
+    except ValueError:
+        return ConditionalGet(request, enabled=False), None
+    last_modified = lineage.last_modified
+    return (
+        ConditionalGet(
+            request,
+            scope,
+            lineage.branch_id,
+            lineage.stamp,
+            last_modified.timestamp(),
+            last_modified=last_modified,
+        ),
+        lineage,
+    )
+
+
+def _map_conditional(
+    request: Request, scope: str, map_pk: int
+) -> tuple[ConditionalGet, BranchLineage | None]:
+    """
+    Validators for a map read, from the branch given as ``?branchId=`` if any.
+
+    A fork reads its inherited maps only up to the fork point, so with ``branchId``
+    the validators follow the whole lineage (see ``_lineage_conditional``) and the
+    lineage is returned for the service to cap the snapshots with.
+
+    Raises:
+        NotFound: If ``branchId`` is not an existing branch.
+    """
+    branch_id = request.query_params.get("branchId")
+    if not branch_id:
+        return ConditionalGet.for_branch_row(request, scope, Map.objects.filter(pk=map_pk)), None
+    try:
+        lineage = BranchLineage.resolve(int(branch_id))
+    except ValueError:
+        raise NotFound("브랜치를 찾을 수 없습니다.")
+    last_modified = lineage.last_modified
+    return (
+        ConditionalGet(
+            request,
+            scope,
+            map_pk,
+            lineage.stamp,
+            last_modified.timestamp(),
+            last_modified=last_modified,
+        ),
+        lineage,
+    )
+
+
+def _optional_chapter(request: Request) -> int | None:
+    """``currentChapter`` query parameter as an int (None if absent)."""
+    value = request.query_params.get("currentChapter")
+    if not value:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        raise ValidationError("currentChapter must be a number")
+
+
+class MapForkConflict(APIException):
+    """A concurrent fork copied the same maps first."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "이미 복사된 지도와 충돌했습니다. 다시 시도해주세요."
+    default_code = "map_fork_conflict"
 
 
 class IsBranchAuthor:
@@ -96,14 +214,16 @@ class ChapterViewSet(viewsets.ViewSet):
 
     Routes:
     - GET /branches/{branch_id}/chapters/ - List chapters
+    - GET /branches/{branch_id}/chapters/toc/ - Compact table of contents
     - GET /branches/{branch_id}/chapters/{chapter_number}/ - Get chapter detail
     - POST /branches/{branch_id}/chapters/ - Create chapter
+    - POST /branches/{branch_id}/chapters/export/ - Export readable chapters (EPUB/zip)
     """
 
-    pagination_class = StandardPagination
+    pagination_class = KeysetPagination
 
     def get_permissions(self) -> list:
-        if self.action in ["create"]:
+        if self.action in ["create", "export", "export_status", "export_download"]:
             return [IsAuthenticated()]
         return [AllowAny()]
 
@@ -131,13 +251,26 @@ class ChapterViewSet(viewsets.ViewSet):
             raise NotFound("브랜치를 찾을 수 없습니다.")
 
         is_author = request.user.is_authenticated and branch.author == request.user
+
+        # Readers only see published chapters, which change only with Branch.version.
+        conditional = ConditionalGet(
+            request,
+            "chapters",
+            branch.pk,
+            branch.version,
+            last_modified=branch.updated_at,
+            enabled=not is_author,
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         chapters = service.list(branch_id=branch_pk, published_only=not is_author)
 
-        paginator = StandardPagination()
+        paginator = KeysetPagination(ordering=("chapter_number",), count_mode="estimate")
         page = paginator.paginate_queryset(chapters, request)
         serializer = ChapterListSerializer(page, many=True)
 
-        return paginator.get_paginated_response(serializer.data)
+        return conditional.finalize(paginator.get_paginated_response(serializer.data))
 
     def retrieve(
         self, request: Request, branch_pk: int | None = None, pk: int | None = None
@@ -169,7 +302,9 @@ class ChapterViewSet(viewsets.ViewSet):
         except (ValueError, TypeError):
             raise ValidationError("잘못된 회차 번호입니다.")
 
-        chapter = service.retrieve(branch_id=branch_pk, chapter_number=chapter_number)
+        chapter = service.retrieve(
+            branch_id=branch_pk, chapter_number=chapter_number, defer_body=True
+        )
 
         if not chapter:
             raise NotFound("회차를 찾을 수 없습니다.")
@@ -179,8 +314,37 @@ class ChapterViewSet(viewsets.ViewSet):
             if not request.user.is_authenticated or chapter.branch.author != request.user:
                 raise NotFound("회차를 찾을 수 없습니다.")
 
-        serializer = ChapterDetailSerializer(chapter)
-        return Response(serializer.data)
+            serializer = ChapterDetailSerializer(chapter)
+            return Response(serializer.data)
+
+        # Revalidated (304) reads are still reads, so count before the conditional check.
+        unique_readers = ChapterViewCounter.record(chapter.id, self._reader_key(request))
+
+        conditional = ConditionalGet(
+            request,
+            "chapter",
+            chapter.pk,
+            chapter.branch.version,
+            chapter.updated_at.timestamp(),
+            last_modified=max(chapter.updated_at, chapter.branch.updated_at),
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        # Published body is immutable: serve the cached pre-rendered payload and
+        # only render the live fields for this request.
+        live = ChapterLiveSerializer(chapter, context={"unique_readers": unique_readers}).data
+        body = ChapterPayloadCache.render(chapter, live)
+        return conditional.finalize(
+            HttpResponse(StandardJSONRenderer.wrap_rendered(body), content_type="application/json")
+        )
+
+    @staticmethod
+    def _reader_key(request: Request) -> str:
+        """Identify the reader for unique-reader estimation (user id, else client IP)."""
+        if request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"anon:{request.META.get('REMOTE_ADDR', '')}"
 
     def create(self, request: Request, branch_pk: int | None = None) -> Response:
         """
@@ -221,9 +385,346 @@ class ChapterViewSet(viewsets.ViewSet):
         response_serializer = ChapterDetailSerializer(chapter)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="회차 일괄 가져오기",
+        description=(
+            "여러 회차가 담긴 아카이브(zip: 파일당 한 회차, 또는 '# 제목' 줄로 회차를 구분한 "
+            "단일 마크다운 파일)를 업로드해 브랜치 마지막 회차 뒤에 일괄 추가합니다. "
+            "처리는 백그라운드에서 진행되며 반환된 jobId로 진행 상황을 조회합니다."
+        ),
+        tags=["Chapters"],
+        request={"multipart/form-data": ChapterImportSerializer},
+        responses={202: ChapterImportJobSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_archive(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        회차 아카이브를 업로드하고 가져오기 작업을 시작한다.
+
+        Returns:
+            Response: 202 응답과 작업 ID, 초기 상태.
+
+        Raises:
+            NotFound: 브랜치가 없을 때.
+            PermissionDenied: 요청 사용자가 브랜치 작가가 아닐 때.
+            ValidationError: 파일이 없거나 지원하지 않는 형식일 때.
+        """
+        branch = self._get_authored_branch(request, branch_pk)
+
+        serializer = ChapterImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        if not upload.name.lower().endswith((".zip", ".md", ".markdown", ".txt")):
+            raise ValidationError("zip 또는 마크다운(.md, .txt) 파일만 가져올 수 있습니다.")
+
+        service = ChapterImportService()
+        job_id = service.start(
+            branch, upload, upload.name, publish=serializer.validated_data["publish"]
+        )
+        job = ChapterImportJobSerializer({"job_id": job_id, **service.get_job(job_id)})
+        return Response(job.data, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(
+        summary="회차 일괄 가져오기 진행 상황",
+        tags=["Chapters"],
+        responses={200: ChapterImportJobSerializer},
+    )
+    @action(detail=False, methods=["get"], url_path=r"import/(?P<job_id>[0-9a-f]{32})")
+    def import_status(
+        self, request: Request, branch_pk: int | None = None, job_id: str | None = None
+    ) -> Response:
+        """
+        가져오기 작업의 상태(PENDING/RUNNING/DONE/FAILED)와 생성된 회차 수를 반환한다.
+
+        Raises:
+            NotFound: 작업이 없거나 다른 브랜치의 작업일 때.
+        """
+        branch = self._get_authored_branch(request, branch_pk)
+
+        job = ChapterImportService().get_job(job_id)
+        if job is None or job.get("branch_id") != branch.id:
+            raise NotFound("가져오기 작업을 찾을 수 없습니다.")
+        return Response(ChapterImportJobSerializer({"job_id": job_id, **job}).data)
+
+    @staticmethod
+    def _get_authored_branch(request: Request, branch_pk: int | None) -> Branch:
+        """Return the branch if the requester is its author."""
+        try:
+            branch = Branch.objects.get(pk=branch_pk)
+        except Branch.DoesNotExist:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        if not request.user.is_authenticated or branch.author_id != request.user.id:
+            raise PermissionDenied("권한이 없습니다.")
+        return branch
+
+    @extend_schema(
+        summary="브랜치 내보내기 (EPUB/zip)",
+        description=(
+            "요청 사용자가 읽을 수 있는 공개 회차와 마지막 회차 시점의 위키를 EPUB 또는 zip "
+            "파일로 내보냅니다. 같은 브랜치 버전의 파일이 이미 있으면 바로 완료 상태로 응답하며, "
+            "반환된 jobId로 상태를 조회한 뒤 download 주소에서 받습니다 (Range 요청 지원)."
+        ),
+        tags=["Chapters"],
+        request=ChapterExportSerializer,
+        responses={202: ChapterExportJobSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="export")
+    def export(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        브랜치 내보내기 작업을 요청한다.
+
+        Returns:
+            Response: 202 응답과 작업 ID, 상태.
+
+        Raises:
+            NotFound: 브랜치가 없을 때.
+        """
+        try:
+            branch = Branch.objects.select_related("novel").get(pk=branch_pk)
+        except Branch.DoesNotExist:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        serializer = ChapterExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job_id, job = BranchExportService().request_export(
+            branch, request.user, serializer.validated_data["format"]
+        )
+        return Response(
+            ChapterExportJobSerializer({"job_id": job_id, **job}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @extend_schema(
+        summary="브랜치 내보내기 상태",
+        tags=["Chapters"],
+        responses={200: ChapterExportJobSerializer},
+    )
+    @action(detail=False, methods=["get"], url_path=r"export/(?P<job_id>[0-9a-f]{32})")
+    def export_status(
+        self, request: Request, branch_pk: int | None = None, job_id: str | None = None
+    ) -> Response:
+        """내보내기 작업의 상태(PENDING/DONE/FAILED)를 반환한다."""
+        job = self._get_export_job(request, branch_pk, job_id)
+        return Response(ChapterExportJobSerializer({"job_id": job_id, **job}).data)
+
+    @extend_schema(
+        summary="브랜치 내보내기 파일 다운로드",
+        description="완료된 내보내기 파일을 내려받습니다. 단일 Range 요청으로 이어받기를 지원합니다.",
+        tags=["Chapters"],
+        responses={(200, "application/octet-stream"): bytes},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"export/(?P<job_id>[0-9a-f]{32})/download",
+    )
+    def export_download(
+        self, request: Request, branch_pk: int | None = None, job_id: str | None = None
+    ) -> HttpResponse:
+        """
+        완료된 내보내기 파일을 전송한다.
+
+        Raises:
+            NotFound: 작업이 없거나 아직 완료되지 않았을 때.
+        """
+        job = self._get_export_job(request, branch_pk, job_id)
+        if job["status"] != ExportJobStatus.DONE or not default_storage.exists(job["path"]):
+            raise NotFound("내보내기 파일이 아직 준비되지 않았습니다.")
+
+        path = job["path"]
+        fmt = job["format"]
+        return ranged_file_response(
+            request,
+            default_storage.open(path, "rb"),
+            default_storage.size(path),
+            filename=f"branch-{branch_pk}.{fmt}",
+            content_type=ExportFormat.CONTENT_TYPES[fmt],
+        )
+
+    @staticmethod
+    def _get_export_job(request: Request, branch_pk: int | None, job_id: str | None) -> dict:
+        """Return the export job if it belongs to the branch and the requester."""
+        job = BranchExportService().get_job(job_id)
+        if (
+            job is None
+            or str(job.get("branch_id")) != str(branch_pk)
+            or job.get("user_id") != request.user.id
+        ):
+            raise NotFound("내보내기 작업을 찾을 수 없습니다.")
+        return job
+
+    MAX_PARAGRAPH_WINDOW = 200
+
+    @extend_schema(
+        summary="회차 문단 범위 조회",
+        description="회차 본문 중 지정한 범위의 문단 HTML만 조회합니다. 긴 회차의 첫 화면을 빠르게 그릴 때 사용합니다.",
+        tags=["Chapters"],
+        parameters=[
+            OpenApiParameter(name="from", type=int, description="시작 문단 인덱스 (기본 0)"),
+            OpenApiParameter(name="count", type=int, description="문단 수 (기본 40, 최대 200)"),
+        ],
+        responses={200: ChapterParagraphWindowSerializer},
+    )
+    @action(detail=True, methods=["get"], url_path="paragraphs")
+    def paragraphs(
+        self, request: Request, branch_pk: int | None = None, pk: int | None = None
+    ) -> Response:
+        """
+        회차의 문단 범위(``?from=120&count=40``)와 해당 HTML 조각을 반환한다.
+
+        Parameters:
+            branch_pk (int | None): 회차가 속한 브랜치의 ID.
+            pk (int | None): 회차 번호.
+
+        Returns:
+            Response: `total`(전체 문단 수)과 `paragraphs`(`index`, `html` 목록).
+
+        Raises:
+            NotFound: 회차가 없거나 발행되지 않았고 요청자가 작가가 아닐 때.
+            ValidationError: 회차 번호나 from/count가 올바른 정수가 아닐 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        try:
+            chapter_number = int(pk)
+            start = int(request.query_params.get("from", 0))
+            count = int(request.query_params.get("count", 40))
+        except (ValueError, TypeError):
+            raise ValidationError("잘못된 요청 값입니다.")
+        if start < 0 or not 0 < count <= self.MAX_PARAGRAPH_WINDOW:
+            raise ValidationError(
+                f"from은 0 이상, count는 1~{self.MAX_PARAGRAPH_WINDOW} 사이여야 합니다."
+            )
+
+        service = ChapterService()
+        chapter = service.retrieve(
+            branch_id=branch_pk, chapter_number=chapter_number, defer_body=True
+        )
+        if not chapter:
+            raise NotFound("회차를 찾을 수 없습니다.")
+
+        is_published = chapter.status == ChapterStatus.PUBLISHED
+        if not is_published and (
+            not request.user.is_authenticated or chapter.branch.author != request.user
+        ):
+            raise NotFound("회차를 찾을 수 없습니다.")
+
+        conditional = ConditionalGet(
+            request,
+            "chapter-paragraphs",
+            chapter.pk,
+            chapter.updated_at.timestamp(),
+            last_modified=chapter.updated_at,
+            enabled=is_published,
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        paragraphs = service.get_paragraph_window(chapter, start, count)
+        serializer = ChapterParagraphWindowSerializer(
+            {"total": len(chapter.paragraph_offsets), "paragraphs": paragraphs}
+        )
+        return conditional.finalize(Response(serializer.data))
+
+    @extend_schema(
+        summary="회차 위키 키워드 하이라이트",
+        description=(
+            "회차 본문에서 해당 회차까지 등장한 위키 항목의 이름(별칭 포함)이 나오는 위치를 "
+            "문단 번호와 문단 텍스트 내 오프셋으로 반환합니다."
+        ),
+        tags=["Chapters"],
+        responses={200: ChapterWikiHighlightSerializer},
+    )
+    @action(detail=True, methods=["get"], url_path="wiki-highlights")
+    def wiki_highlights(
+        self, request: Request, branch_pk: int | None = None, pk: int | None = None
+    ) -> Response:
+        """
+        회차 본문의 위키 키워드 위치를 반환한다.
+
+        Parameters:
+            branch_pk (int | None): 회차가 속한 브랜치의 ID.
+            pk (int | None): 회차 번호.
+
+        Returns:
+            Response: `spans`(`paragraph`, `start`, `end`, `wikiId`)와 등장한 `wikis`(`id`, `name`).
+
+        Raises:
+            NotFound: 회차가 없거나 발행되지 않았고 요청자가 작가가 아닐 때.
+            ValidationError: 회차 번호가 정수가 아닐 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        try:
+            chapter_number = int(pk)
+        except (ValueError, TypeError):
+            raise ValidationError("잘못된 회차 번호입니다.")
+
+        chapter = ChapterService().retrieve(
+            branch_id=branch_pk, chapter_number=chapter_number, defer_body=True
+        )
+        if not chapter:
+            raise NotFound("회차를 찾을 수 없습니다.")
+
+        is_published = chapter.status == ChapterStatus.PUBLISHED
+        if not is_published and (
+            not request.user.is_authenticated or chapter.branch.author != request.user
+        ):
+            raise NotFound("회차를 찾을 수 없습니다.")
+
+        # Wiki edits bump the branch version, so it is part of the validator.
+        conditional = ConditionalGet(
+            request,
+            "chapter-wiki-highlights",
+            chapter.pk,
+            chapter.branch.version,
+            chapter.updated_at.timestamp(),
+            last_modified=max(chapter.updated_at, chapter.branch.updated_at),
+            enabled=is_published,
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        serializer = ChapterWikiHighlightSerializer(WikiHighlighter.highlight(chapter))
+        return conditional.finalize(Response(serializer.data))
+
+    @extend_schema(
+        summary="회차 목차 조회",
+        description="발행된 회차의 번호/ID/제목만 담은 목차를 조회합니다.",
+        tags=["Chapters"],
+        responses={200: ChapterTocSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="toc")
+    def toc(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        브랜치의 발행된 회차 목차를 내비게이션 인덱스(캐시)에서 반환한다.
+
+        Parameters:
+            branch_pk (int | None): 조회할 브랜치의 ID.
+
+        Returns:
+            Response: `id`, `chapter_number`, `title`로 구성된 목차 목록.
+
+        Raises:
+            NotFound: branch_pk가 없을 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        index = ChapterNavigationService.get_index(int(branch_pk))
+        return Response(ChapterTocSerializer(index, many=True).data)
+
     @extend_schema(
         summary="초안 자동 저장",
-        description="회차 초안을 Redis에 임시 저장합니다.",
+        description=(
+            "회차 초안을 Redis에 임시 저장합니다. 전체 본문(content) 대신 마지막으로 받은 "
+            "version을 baseVersion으로 하여 편집 연산(ops)만 보낼 수 있으며, 버전이 맞지 않으면 "
+            "409와 현재 version을 반환하므로 전체 본문으로 다시 저장해야 합니다."
+        ),
         tags=["Chapters"],
         request={
             "application/json": {
@@ -232,11 +733,31 @@ class ChapterViewSet(viewsets.ViewSet):
                     "content": {"type": "string"},
                     "title": {"type": "string"},
                     "chapter_id": {"type": "integer", "nullable": True},
+                    "base_version": {"type": "integer"},
+                    "ops": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "start": {"type": "integer"},
+                                "end": {"type": "integer"},
+                                "text": {"type": "string"},
+                            },
+                        },
+                    },
                 },
-                "required": ["content"],
             }
         },
-        responses={200: {"type": "object", "properties": {"success": {"type": "boolean"}}}},
+        responses={
+            200: {
+                "type": "object",
+                "properties": {"success": {"type": "boolean"}, "version": {"type": "integer"}},
+            },
+            409: {
+                "type": "object",
+                "properties": {"success": {"type": "boolean"}, "version": {"type": "integer"}},
+            },
+        },
     )
     @action(detail=False, methods=["post"], url_path="draft")
     def draft(self, request: Request, branch_pk: int | None = None) -> Response:
@@ -248,7 +769,8 @@ class ChapterViewSet(viewsets.ViewSet):
             branch_pk (int | None): 드래프트를 저장할 대상 브랜치의 ID.
         
         Returns:
-            response (dict): {"success": True} — 드래프트가 성공적으로 저장되었음을 나타낸다.
+            response (dict): {"success": True, "version": n} — 저장된 드래프트의 버전. 편집 연산의 기준 버전이
+                맞지 않으면 409와 함께 {"success": False, "version": 현재 버전}을 반환한다.
         
         Raises:
             NotFound: branch_pk가 누락되었거나 해당 브랜치가 존재하지 않을 때 발생한다.
@@ -267,12 +789,6 @@ class ChapterViewSet(viewsets.ViewSet):
         if branch.author != request.user:
             raise PermissionDenied("권한이 없습니다.")
 
-        # Validation
-        content = request.data.get("content")
-        if content is None or not isinstance(content, str) or not content.strip():
-            raise ValidationError("내용은 필수입니다.")
-
-        title = request.data.get("title", "")
         chapter_id = request.data.get("chapter_id")
         if chapter_id is not None:
             try:
@@ -280,14 +796,43 @@ class ChapterViewSet(viewsets.ViewSet):
             except (ValueError, TypeError):
                 raise ValidationError("유효하지 않은 회차 ID입니다.")
 
-        DraftService().save_draft(
+        ops = request.data.get("ops")
+        if ops is not None:
+            # Delta autosave against the client's last acknowledged version
+            base_version = request.data.get("base_version")
+            if not isinstance(ops, list) or not isinstance(base_version, int):
+                raise ValidationError("ops와 base_version이 필요합니다.")
+            try:
+                version, applied = DraftService().apply_patch(
+                    branch_id=int(branch_pk),
+                    chapter_id=chapter_id,
+                    base_version=base_version,
+                    ops=ops,
+                    title=request.data.get("title"),
+                )
+            except ValueError as e:
+                raise ValidationError(str(e))
+            if not applied:
+                return Response(
+                    {"success": False, "version": version}, status=status.HTTP_409_CONFLICT
+                )
+            return Response({"success": True, "version": version}, status=status.HTTP_200_OK)
+
+        # Validation
+        content = request.data.get("content")
+        if content is None or not isinstance(content, str) or not content.strip():
+            raise ValidationError("내용은 필수입니다.")
+
+        title = request.data.get("title", "")
+
+        version = DraftService().save_draft(
             branch_id=int(branch_pk),
             chapter_id=chapter_id,
             title=title,
             content=content,
         )
 
-        return Response({"success": True}, status=status.HTTP_200_OK)
+        return Response({"success": True, "version": version}, status=status.HTTP_200_OK)
 
 
 @extend_schema_view(
@@ -374,7 +919,7 @@ class ChapterDetailViewSet(viewsets.ViewSet):
         if not self._check_author(chapter, request.user):
             raise PermissionDenied("권한이 없습니다.")
 
-        chapter.delete()
+        ChapterService().delete(chapter)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(
@@ -550,12 +1095,15 @@ class WikiEntryViewSet(viewsets.ViewSet):
     Routes:
     - GET /branches/{branch_id}/wikis/ - List wikis
     - POST /branches/{branch_id}/wikis/ - Create wiki
+    - POST /branches/{branch_id}/wikis/{id}/materialize/ - Copy an inherited wiki into the fork
+    - GET /branches/{branch_id}/wikis/search/?q=...&currentChapter=N - Search wikis
+    - GET /branches/{branch_id}/wikis/timeline/ - Snapshot validity table of every wiki
     """
 
     pagination_class = StandardPagination
 
     def get_permissions(self) -> list:
-        if self.action in ["create"]:
+        if self.action in ["create", "materialize"]:
             return [IsAuthenticated()]
         return [AllowAny()]
 
@@ -565,7 +1113,7 @@ class WikiEntryViewSet(viewsets.ViewSet):
         
         쿼리 파라미터:
         - tag: 태그 ID로 필터링(정수).
-        - currentChapter: 컨텍스트가 될 챕터 번호(정수).
+        - currentChapter: 컨텍스트가 될 챕터 번호(정수). 주어지면 그 회차까지 등장한 항목만, 회차 시점의 스냅샷과 함께 반환합니다.
         
         Parameters:
             request (Request): HTTP 요청 객체(쿼리 파라미터 'tag' 및 'currentChapter' 사용).
@@ -593,15 +1141,30 @@ class WikiEntryViewSet(viewsets.ViewSet):
         else:
             current_chapter = None
 
-        wikis = WikiService.list(
-            branch_id=branch_pk, tag_id=tag_id, current_chapter=current_chapter
-        )
+        conditional, lineage = _lineage_conditional(request, "wikis", branch_pk)
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        if current_chapter is None:
+            wikis = WikiService.list(branch_id=branch_pk, tag_id=tag_id, lineage=lineage)
+            serializer_class = WikiEntryListSerializer
+        else:
+            # Reader's context-aware wiki: entries with the snapshot valid at the chapter
+            try:
+                wikis = WikiService.list_at_chapter(
+                    branch_id=branch_pk, chapter=current_chapter, lineage=lineage
+                )
+            except ValueError as e:
+                raise NotFound(str(e))
+            if tag_id is not None:
+                wikis = [w for w in wikis if any(tag.id == tag_id for tag in w.tags.all())]
+            serializer_class = WikiEntryAtChapterSerializer
 
         paginator = StandardPagination()
         page = paginator.paginate_queryset(wikis, request)
-        serializer = WikiEntryListSerializer(page, many=True)
+        serializer = serializer_class(page, many=True)
 
-        return paginator.get_paginated_response(serializer.data)
+        return conditional.finalize(paginator.get_paginated_response(serializer.data))
 
     def create(self, request: Request, branch_pk: int | None = None) -> Response:
         """
@@ -643,6 +1206,124 @@ class WikiEntryViewSet(viewsets.ViewSet):
         response_serializer = WikiEntryDetailSerializer(wiki)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="위키 검색",
+        description=(
+            "브랜치 위키를 이름과 내용으로 검색해 점수 순으로 반환합니다. currentChapter를 주면 "
+            "그 회차까지 등장한 항목과 그 회차 시점의 스냅샷만 검색하며(스포일러 방지), "
+            "snippet에는 일치한 부분이 <mark>로 강조된 HTML 조각이 들어갑니다."
+        ),
+        tags=["Wiki"],
+        parameters=[
+            OpenApiParameter(name="q", type=str, required=True, description="검색어"),
+            OpenApiParameter(name="currentChapter", type=int, description="읽고 있는 회차"),
+            OpenApiParameter(name="limit", type=int, description="최대 결과 수 (기본 20, 최대 50)"),
+        ],
+        responses={200: WikiSearchResultSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        브랜치 위키 검색 결과를 반환한다.
+
+        Raises:
+            NotFound: 브랜치를 찾을 수 없을 때.
+            ValidationError: q가 비어 있거나 currentChapter/limit가 올바른 정수가 아닐 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError("검색어(q)를 입력해주세요.")
+        try:
+            current_chapter = request.query_params.get("currentChapter")
+            current_chapter = int(current_chapter) if current_chapter else None
+            limit = int(request.query_params.get("limit", 20))
+        except (ValueError, TypeError):
+            raise ValidationError("currentChapter와 limit은 숫자여야 합니다.")
+        if not 0 < limit <= WikiSearchService.MAX_RESULTS:
+            raise ValidationError(f"limit은 1~{WikiSearchService.MAX_RESULTS} 사이여야 합니다.")
+
+        conditional, lineage = _lineage_conditional(request, "wiki-search", branch_pk)
+        if lineage is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        results = WikiSearchService.search(
+            int(branch_pk), query, chapter=current_chapter, limit=limit, lineage=lineage
+        )
+        return conditional.finalize(Response(WikiSearchResultSerializer(results, many=True).data))
+
+    @extend_schema(
+        summary="위키 스냅샷 타임라인",
+        description=(
+            "브랜치의 모든 위키 항목에 대해 스냅샷별 유효 회차 구간을 한 번에 반환합니다. "
+            "클라이언트는 회차를 이동할 때마다 요청하지 않고 이 표에서 스냅샷을 고를 수 있습니다. "
+            "currentChapter를 주면 그 회차까지 등장한 항목과 구간만 반환합니다(스포일러 방지)."
+        ),
+        tags=["Wiki"],
+        parameters=[
+            OpenApiParameter(name="currentChapter", type=int, description="읽고 있는 회차"),
+        ],
+        responses={200: WikiTimelineSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="timeline")
+    def timeline(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        브랜치 위키의 스냅샷 유효 구간 표를 반환한다.
+
+        Raises:
+            NotFound: 브랜치를 찾을 수 없을 때.
+            ValidationError: currentChapter가 숫자가 아닐 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        current_chapter = _optional_chapter(request)
+
+        conditional, lineage = _lineage_conditional(request, "wiki-timeline", branch_pk)
+        if lineage is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        rows = WikiService.timeline(int(branch_pk), chapter=current_chapter, lineage=lineage)
+        return conditional.finalize(Response(WikiTimelineSerializer(rows, many=True).data))
+
+    @extend_schema(
+        summary="상위 브랜치 위키 가져오기",
+        description=(
+            "포크 브랜치가 물려받은 위키 항목을 이 브랜치로 복사합니다 (분기 회차까지의 스냅샷 포함). "
+            "이후 목록에서는 복사본이 원본을 대신하며, 이미 이 브랜치의 항목이면 그대로 반환합니다."
+        ),
+        tags=["Wiki"],
+        request=None,
+        responses={200: WikiEntryDetailSerializer},
+    )
+    @action(detail=True, methods=["post"], url_path="materialize")
+    def materialize(
+        self, request: Request, branch_pk: int | None = None, pk: int | None = None
+    ) -> Response:
+        """
+        물려받은 위키 항목을 편집할 수 있도록 브랜치로 복사한다.
+
+        Raises:
+            NotFound: 브랜치나 위키가 없거나 이 브랜치에서 볼 수 없는 위키일 때.
+            PermissionDenied: 브랜치 작가가 아닐 때.
+        """
+        if branch_pk is None or pk is None:
+            raise NotFound("위키를 찾을 수 없습니다.")
+
+        try:
+            wiki = WikiService.materialize(
+                branch_id=int(branch_pk), wiki_id=int(pk), user=request.user
+            )
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        return Response(WikiEntryDetailSerializer(wiki).data)
+
 
 @extend_schema_view(
     retrieve=extend_schema(
@@ -696,13 +1377,19 @@ class WikiEntryDetailViewSet(viewsets.ViewSet):
         chapter = request.query_params.get("chapter")
         chapter = int(chapter) if chapter else None
 
+        conditional = ConditionalGet.for_branch_row(
+            request, "wiki", WikiEntry.objects.filter(pk=pk)
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         try:
             wiki = WikiService.retrieve(wiki_id=pk)
         except ValueError as e:
             raise NotFound(str(e))
 
         serializer = WikiEntryDetailSerializer(wiki, context={"chapter": chapter})
-        return Response(serializer.data)
+        return conditional.finalize(Response(serializer.data))
 
     def partial_update(self, request: Request, pk: int | None = None) -> Response:
         """
@@ -950,6 +1637,7 @@ class WikiSnapshotViewSet(viewsets.ViewSet):
     Routes:
     - GET /wikis/{wiki_id}/snapshots/ - List snapshots
     - POST /wikis/{wiki_id}/snapshots/ - Create snapshot
+    - GET /wikis/{wiki_id}/snapshots/diff/?from=N&to=M - Diff two versions
     """
 
     def get_permissions(self) -> list:
@@ -1017,6 +1705,50 @@ class WikiSnapshotViewSet(viewsets.ViewSet):
         response_serializer = WikiSnapshotSerializer(snapshot)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="스냅샷 비교",
+        description=(
+            "두 스냅샷(valid_from_chapter 기준)의 줄 단위 변경 내역을 반환합니다. "
+            "계산된 결과는 캐시되어 다시 계산하지 않습니다."
+        ),
+        tags=["Wiki"],
+        parameters=[
+            OpenApiParameter(name="from", type=int, required=True, description="이전 버전 회차"),
+            OpenApiParameter(name="to", type=int, required=True, description="이후 버전 회차"),
+        ],
+        responses={200: WikiSnapshotDiffSerializer},
+    )
+    @action(detail=False, methods=["get"], url_path="diff")
+    def diff(self, request: Request, wiki_pk: int | None = None) -> Response:
+        """
+        위키의 두 스냅샷 버전 사이의 변경 내역(``?from=3&to=10``)을 반환한다.
+
+        Raises:
+            NotFound: 위키나 해당 회차의 스냅샷이 없을 때.
+            ValidationError: from/to가 올바른 정수가 아닐 때.
+        """
+        if wiki_pk is None:
+            raise NotFound("위키를 찾을 수 없습니다.")
+
+        try:
+            old_chapter = int(request.query_params["from"])
+            new_chapter = int(request.query_params["to"])
+        except (KeyError, ValueError, TypeError):
+            raise ValidationError("from과 to는 회차 번호여야 합니다.")
+
+        conditional = ConditionalGet.for_branch_row(
+            request, "wiki-diff", WikiEntry.objects.filter(pk=wiki_pk)
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        try:
+            result = WikiSnapshotHistory.diff(int(wiki_pk), old_chapter, new_chapter)
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        return conditional.finalize(Response(WikiSnapshotDiffSerializer(result).data))
+
 
 # =============================================================================
 # Map ViewSets
@@ -1042,12 +1774,16 @@ class MapViewSet(viewsets.ViewSet):
     Routes:
     - GET /branches/{branch_id}/maps/ - List maps
     - POST /branches/{branch_id}/maps/ - Create map
+    - POST /branches/{branch_id}/maps/{id}/materialize/ - Copy an inherited map into the fork
+    - GET /branches/{branch_id}/maps/timeline/ - Snapshot validity table of every map
+    - POST /branches/{branch_id}/maps/fork/ - Copy every map of the parent branch (job)
+    - GET /branches/{branch_id}/maps/fork/{job_id}/ - Progress of that copy
     """
 
     pagination_class = StandardPagination
 
     def get_permissions(self) -> list:
-        if self.action in ["create"]:
+        if self.action in ["create", "materialize", "fork", "fork_status"]:
             return [IsAuthenticated()]
         return [AllowAny()]
 
@@ -1067,13 +1803,17 @@ class MapViewSet(viewsets.ViewSet):
         if branch_pk is None:
             raise NotFound("브랜치를 찾을 수 없습니다.")
 
-        maps = MapService.list(branch_id=branch_pk)
+        conditional, lineage = _lineage_conditional(request, "maps", branch_pk)
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        maps = MapService.list(branch_id=branch_pk, lineage=lineage)
 
         paginator = StandardPagination()
         page = paginator.paginate_queryset(maps, request)
         serializer = MapListSerializer(page, many=True)
 
-        return paginator.get_paginated_response(serializer.data)
+        return conditional.finalize(paginator.get_paginated_response(serializer.data))
 
     def create(self, request: Request, branch_pk: int | None = None) -> Response:
         """
@@ -1112,12 +1852,150 @@ class MapViewSet(viewsets.ViewSet):
         response_serializer = MapDetailSerializer(map_obj)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="지도 스냅샷 타임라인",
+        description=(
+            "브랜치의 모든 지도에 대해 스냅샷별 유효 회차 구간을 한 번에 반환합니다. "
+            "currentChapter를 주면 그 회차까지 시작한 구간만 반환합니다(스포일러 방지)."
+        ),
+        tags=["Maps"],
+        parameters=[
+            OpenApiParameter(name="currentChapter", type=int, description="읽고 있는 회차"),
+        ],
+        responses={200: MapTimelineSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="timeline")
+    def timeline(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        브랜치 지도의 스냅샷 유효 구간 표를 반환한다.
+
+        Raises:
+            NotFound: 브랜치를 찾을 수 없을 때.
+            ValidationError: currentChapter가 숫자가 아닐 때.
+        """
+        if branch_pk is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        current_chapter = _optional_chapter(request)
+
+        conditional, lineage = _lineage_conditional(request, "map-timeline", branch_pk)
+        if lineage is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        rows = MapService.timeline(int(branch_pk), chapter=current_chapter, lineage=lineage)
+        return conditional.finalize(Response(MapTimelineSerializer(rows, many=True).data))
+
+    @extend_schema(
+        summary="상위 브랜치 지도 가져오기",
+        description=(
+            "포크 브랜치가 물려받은 지도를 레이어·오브젝트와 함께 이 브랜치로 복사합니다 "
+            "(분기 회차까지의 스냅샷만). 이미 이 브랜치의 지도이면 그대로 반환합니다."
+        ),
+        tags=["Maps"],
+        request=None,
+        responses={200: MapDetailSerializer},
+    )
+    @action(detail=True, methods=["post"], url_path="materialize")
+    def materialize(
+        self, request: Request, branch_pk: int | None = None, pk: int | None = None
+    ) -> Response:
+        """
+        물려받은 지도를 편집할 수 있도록 브랜치로 복사한다.
+
+        Raises:
+            NotFound: 브랜치나 지도가 없거나 이 브랜치에서 볼 수 없는 지도일 때.
+            PermissionDenied: 브랜치 작가가 아닐 때.
+        """
+        if branch_pk is None or pk is None:
+            raise NotFound("지도를 찾을 수 없습니다.")
+
+        try:
+            map_obj = MapService.materialize(
+                branch_id=int(branch_pk), map_id=int(pk), user=request.user
+            )
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        return Response(MapDetailSerializer(MapService.retrieve(map_obj.id)).data)
+
+    @extend_schema(
+        summary="상위 브랜치 지도 일괄 복사",
+        description=(
+            "상위 브랜치의 모든 지도를 스냅샷·레이어·오브젝트와 함께 이 포크 브랜치로 복사합니다. "
+            "작은 복사는 바로 끝나고, 큰 복사는 백그라운드에서 진행되며 반환된 jobId로 "
+            "진행 상황(copied/total)을 조회합니다."
+        ),
+        tags=["Maps"],
+        request=None,
+        responses={202: MapForkJobSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="fork")
+    def fork(self, request: Request, branch_pk: int | None = None) -> Response:
+        """
+        상위 브랜치 지도 복사 작업을 시작한다.
+
+        Raises:
+            NotFound: 브랜치가 없을 때.
+            PermissionDenied: 브랜치 작가가 아닐 때.
+            ValidationError: 포크 브랜치가 아닐 때.
+            MapForkConflict: 동시에 진행된 복사와 지도 이름이 겹칠 때.
+        """
+        try:
+            branch = Branch.objects.get(pk=branch_pk)
+        except Branch.DoesNotExist:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        if branch.parent_branch_id is None:
+            raise ValidationError("상위 브랜치가 없는 브랜치입니다.")
+
+        try:
+            job = MapService.start_fork(branch.parent_branch_id, branch.id, request.user)
+        except ValueError as e:
+            raise NotFound(str(e))
+        except IntegrityError:
+            raise MapForkConflict()
+        return Response(MapForkJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(
+        summary="상위 브랜치 지도 복사 진행 상황",
+        tags=["Maps"],
+        responses={200: MapForkJobSerializer},
+    )
+    @action(detail=False, methods=["get"], url_path=r"fork/(?P<job_id>[0-9a-f]{32})")
+    def fork_status(
+        self, request: Request, branch_pk: int | None = None, job_id: str | None = None
+    ) -> Response:
+        """
+        지도 복사 작업의 상태(PENDING/RUNNING/DONE/FAILED)와 복사한 오브젝트 수를 반환한다.
+
+        Raises:
+            NotFound: 작업이 없거나 다른 브랜치의 작업일 때.
+            PermissionDenied: 브랜치 작가가 아닐 때.
+        """
+        branch = Branch.objects.filter(pk=branch_pk).only("author_id").first()
+        if branch is None:
+            raise NotFound("브랜치를 찾을 수 없습니다.")
+        if branch.author_id != request.user.id:
+            raise PermissionDenied("권한이 없습니다.")
+
+        job = MapService.get_fork_job(job_id)
+        if job is None or job.get("target_branch_id") != branch.id:
+            raise NotFound("지도 복사 작업을 찾을 수 없습니다.")
+        return Response(MapForkJobSerializer({"job_id": job_id, **job}).data)
+
 
 @extend_schema_view(
     retrieve=extend_schema(
         summary="지도 상세 조회",
-        description="지도 상세 정보를 조회합니다. ?currentChapter=N으로 문맥 인식 조회 가능.",
+        description=(
+            "지도 상세 정보를 조회합니다. ?currentChapter=N으로 문맥 인식 조회 가능. "
+            "?branchId=B를 주면 B에서 보이는 지도만 조회하고, 포크가 물려받은 지도의 "
+            "스냅샷은 분기 회차까지만 반환합니다."
+        ),
         tags=["Maps"],
+        parameters=[
+            OpenApiParameter(name="branchId", type=int, description="지도를 보는 브랜치 ID"),
+        ],
     ),
     partial_update=extend_schema(
         summary="지도 수정",
@@ -1135,13 +2013,14 @@ class MapDetailViewSet(viewsets.ViewSet):
     ViewSet for map operations by ID.
 
     Routes:
-    - GET /maps/{id}/ - Get map detail (with optional ?currentChapter=N)
+    - GET /maps/{id}/ - Get map detail (with optional ?currentChapter=N&branchId=B)
     - PATCH /maps/{id}/ - Update map
     - DELETE /maps/{id}/ - Delete map
+    - GET /maps/{id}/scrub/?fromChapter=N&toChapter=M - State at N and changes up to M
     """
 
     def get_permissions(self) -> list:
-        if self.action in ["retrieve"]:
+        if self.action in ["retrieve", "scrub"]:
             return [AllowAny()]
         return [IsAuthenticated()]
 
@@ -1156,7 +2035,7 @@ class MapDetailViewSet(viewsets.ViewSet):
             Response: 직렬화된 맵 상세 데이터를 포함한 응답. `currentChapter`가 제공되면 그 장을 기준으로 한 스냅샷 정보를 포함할 수 있습니다.
         
         Raises:
-            NotFound: `pk`가 없거나 해당 ID의 맵을 찾을 수 없는 경우 발생합니다.
+            NotFound: `pk`가 없거나 해당 ID의 맵을 찾을 수 없는 경우(`branchId`가 주어지면 그 브랜치에서 볼 수 없는 경우 포함) 발생합니다.
         """
         if pk is None:
             raise NotFound("지도를 찾을 수 없습니다.")
@@ -1164,13 +2043,19 @@ class MapDetailViewSet(viewsets.ViewSet):
         chapter = request.query_params.get("currentChapter")
         chapter = int(chapter) if chapter else None
 
+        conditional, lineage = _map_conditional(request, "map", pk)
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         try:
-            map_obj = MapService.retrieve(map_id=pk)
+            map_obj = MapService.retrieve(map_id=pk, lineage=lineage)
         except ValueError as e:
             raise NotFound(str(e))
 
-        serializer = MapDetailSerializer(map_obj, context={"chapter": chapter})
-        return Response(serializer.data)
+        serializer = MapDetailSerializer(
+            map_obj, context={"chapter": chapter, "cap": MapService.cap_for(map_obj, lineage)}
+        )
+        return conditional.finalize(Response(serializer.data))
 
     def partial_update(self, request: Request, pk: int | None = None) -> Response:
         """
@@ -1237,12 +2122,68 @@ class MapDetailViewSet(viewsets.ViewSet):
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @extend_schema(
+        summary="지도 회차 구간 스크러빙",
+        description=(
+            "fromChapter 시점의 지도 전체 상태와, toChapter까지 시작하는 스냅샷마다 "
+            "바로 앞 상태에서 바뀐 레이어/오브젝트를 한 번에 반환합니다. "
+            "클라이언트는 키프레임에 변경분을 차례로 적용해 회차를 오갈 수 있습니다."
+        ),
+        tags=["Maps"],
+        parameters=[
+            OpenApiParameter(name="fromChapter", type=int, required=True, description="시작 회차"),
+            OpenApiParameter(name="toChapter", type=int, required=True, description="끝 회차"),
+            OpenApiParameter(name="branchId", type=int, description="지도를 보는 브랜치 ID"),
+        ],
+        responses={200: MapScrubSerializer},
+    )
+    @action(detail=True, methods=["get"], url_path="scrub")
+    def scrub(self, request: Request, pk: int | None = None) -> Response:
+        """
+        회차 구간의 지도 키프레임과 변경분 목록을 반환한다.
+
+        Raises:
+            NotFound: 지도를 찾을 수 없을 때.
+            ValidationError: fromChapter/toChapter가 없거나 숫자가 아니거나 순서가 뒤바뀌었을 때.
+        """
+        if pk is None:
+            raise NotFound("지도를 찾을 수 없습니다.")
+        try:
+            from_chapter = int(request.query_params["fromChapter"])
+            to_chapter = int(request.query_params["toChapter"])
+        except (KeyError, ValueError, TypeError):
+            raise ValidationError("fromChapter와 toChapter는 숫자여야 합니다.")
+        if from_chapter > to_chapter:
+            raise ValidationError("fromChapter는 toChapter보다 클 수 없습니다.")
+
+        conditional, lineage = _map_conditional(request, "map_scrub", pk)
+        if not conditional.enabled:
+            raise NotFound("지도를 찾을 수 없습니다.")
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        cap = None
+        if lineage is not None:
+            try:
+                cap = MapService.cap_for(MapService.get_visible(int(pk), lineage), lineage)
+            except ValueError as e:
+                raise NotFound(str(e))
+
+        data = MapSnapshotHistory.scrub(int(pk), from_chapter, to_chapter, cap=cap)
+        return conditional.finalize(Response(MapScrubSerializer(data).data))
+
 
 @extend_schema_view(
     list=extend_schema(
         summary="지도 스냅샷 목록 조회",
-        description="지도의 스냅샷 목록을 조회합니다.",
+        description=(
+            "지도의 스냅샷 목록을 조회합니다. ?branchId=B를 주면 포크가 물려받은 지도의 "
+            "스냅샷은 분기 회차까지만 반환합니다."
+        ),
         tags=["Maps"],
+        parameters=[
+            OpenApiParameter(name="branchId", type=int, description="지도를 보는 브랜치 ID"),
+        ],
     ),
     create=extend_schema(
         summary="지도 스냅샷 생성",
@@ -1257,6 +2198,8 @@ class MapSnapshotViewSet(viewsets.ViewSet):
     Routes:
     - GET /maps/{map_id}/snapshots/ - List snapshots
     - POST /maps/{map_id}/snapshots/ - Create snapshot
+    - GET /maps/{map_id}/snapshots/{id}/viewport/?bbox=x1,y1,x2,y2&zoom=z - Objects on screen
+    - GET /maps/{map_id}/snapshots/{id}/tiles/{z}/{x}/{y}/?v=version - Simplified vector tile
     """
 
     def get_permissions(self) -> list:
@@ -1280,13 +2223,17 @@ class MapSnapshotViewSet(viewsets.ViewSet):
         if map_pk is None:
             raise NotFound("지도를 찾을 수 없습니다.")
 
+        conditional, lineage = _map_conditional(request, "map_snapshots", map_pk)
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         try:
-            map_obj = MapService.retrieve(map_id=map_pk)
+            map_obj = MapService.retrieve(map_id=map_pk, lineage=lineage)
         except ValueError as e:
             raise NotFound(str(e))
 
         serializer = MapSnapshotSerializer(map_obj.snapshots.all(), many=True)
-        return Response(serializer.data)
+        return conditional.finalize(Response(serializer.data))
 
     def create(self, request: Request, map_pk: int | None = None) -> Response:
         """
@@ -1324,6 +2271,128 @@ class MapSnapshotViewSet(viewsets.ViewSet):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
+    @extend_schema(
+        summary="지도 뷰포트 조회",
+        description=(
+            "스냅샷의 표시 레이어와, 경계 상자가 화면 영역(bbox)과 겹치는 오브젝트만 반환합니다. "
+            "zoom을 주면 화면에서 너무 작게 보이는 선/다각형/원은 제외합니다."
+        ),
+        tags=["Maps"],
+        parameters=[
+            OpenApiParameter(
+                name="bbox", type=str, required=True, description="화면 영역 x1,y1,x2,y2"
+            ),
+            OpenApiParameter(name="zoom", type=int, description="지도 확대 수준"),
+        ],
+        responses={200: MapLayerSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="viewport")
+    def viewport(
+        self, request: Request, pk: int | None = None, map_pk: int | None = None
+    ) -> Response:
+        """
+        화면 영역에 보이는 오브젝트만 담은 레이어 목록을 반환한다.
+
+        Raises:
+            NotFound: 스냅샷을 찾을 수 없을 때.
+            ValidationError: bbox가 x1,y1,x2,y2 형식이 아니거나 zoom이 정수가 아닐 때.
+        """
+        if pk is None or map_pk is None:
+            raise NotFound("스냅샷을 찾을 수 없습니다.")
+
+        try:
+            bbox = parse_bbox(request.query_params.get("bbox", ""))
+        except ValueError as e:
+            raise ValidationError(str(e))
+        zoom = request.query_params.get("zoom")
+        if zoom:
+            try:
+                zoom = int(zoom)
+            except (ValueError, TypeError):
+                raise ValidationError("zoom must be a number")
+            if not MapService.MIN_ZOOM <= zoom <= MapService.MAX_ZOOM:
+                raise ValidationError(
+                    f"zoom은 {MapService.MIN_ZOOM}~{MapService.MAX_ZOOM} 사이여야 합니다."
+                )
+        else:
+            zoom = None
+
+        conditional = ConditionalGet.for_branch_row(
+            request,
+            "map_viewport",
+            MapSnapshot.objects.filter(pk=pk, map_id=map_pk),
+            branch_path="map__branch",
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        try:
+            layers = MapService.get_viewport(int(map_pk), int(pk), bbox, zoom=zoom)
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        return conditional.finalize(Response(MapLayerSerializer(layers, many=True).data))
+
+    @extend_schema(
+        summary="지도 타일 조회",
+        description=(
+            "스냅샷의 z/x/y 벡터 타일을 반환합니다. 선과 다각형은 확대 수준에 맞게 단순화되고 "
+            "타일 영역으로 잘리며, 좌표는 타일 격자(extent)에 맞춘 정수의 델타 varint를 "
+            "base64로 인코딩한 값입니다. 스냅샷의 tileVersion을 v로 주면 "
+            "오래 캐시할 수 있는 응답을 받습니다."
+        ),
+        tags=["Maps"],
+        parameters=[
+            OpenApiParameter(name="v", type=str, description="스냅샷의 tileVersion"),
+        ],
+        responses={200: MapTileSerializer},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"tiles/(?P<z>-?\d+)/(?P<x>-?\d+)/(?P<y>-?\d+)",
+    )
+    def tile(
+        self,
+        request: Request,
+        pk: int | None = None,
+        map_pk: int | None = None,
+        z: str = "0",
+        x: str = "0",
+        y: str = "0",
+    ) -> Response:
+        """
+        스냅샷의 z/x/y 타일을 반환한다.
+
+        현재 tileVersion을 v로 준 요청은 내용이 바뀌지 않으므로 1년 동안 캐시하도록 하고,
+        그 밖의 요청은 ETag로 재검증하게 한다.
+
+        Raises:
+            NotFound: 스냅샷을 찾을 수 없을 때.
+            ValidationError: z가 허용 범위를 벗어날 때.
+        """
+        if pk is None or map_pk is None:
+            raise NotFound("스냅샷을 찾을 수 없습니다.")
+        if not MapService.MIN_ZOOM <= int(z) <= MapService.MAX_ZOOM:
+            raise ValidationError(
+                f"zoom은 {MapService.MIN_ZOOM}~{MapService.MAX_ZOOM} 사이여야 합니다."
+            )
+
+        try:
+            tile = MapTileService.get_tile(int(map_pk), int(pk), int(z), int(x), int(y))
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        conditional = ConditionalGet(request, "map_tile", tile["version"])
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
+        response = conditional.finalize(Response(MapTileSerializer(tile).data))
+        if request.query_params.get("v") == tile["version"]:
+            response["Cache-Control"] = f"public, max-age={MapTileService.HTTP_MAX_AGE}, immutable"
+        return response
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="레이어 목록 조회",
@@ -1363,15 +2432,23 @@ class MapLayerViewSet(viewsets.ViewSet):
         Raises:
             NotFound: 지정한 ID의 스냅샷을 찾을 수 없을 때 발생합니다.
         """
+        conditional = ConditionalGet.for_branch_row(
+            request,
+            "map_layers",
+            MapSnapshot.objects.filter(id=snapshot_pk),
+            branch_path="map__branch",
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         try:
-            snapshot = MapSnapshot.objects.prefetch_related("layers__map_objects").get(
-                id=snapshot_pk
-            )
+            snapshot = MapSnapshot.objects.get(id=snapshot_pk)
         except MapSnapshot.DoesNotExist:
             raise NotFound("스냅샷을 찾을 수 없습니다.")
+        MapSnapshotHistory.materialize([snapshot])
 
         serializer = MapLayerSerializer(snapshot.layers.all(), many=True)
-        return Response(serializer.data)
+        return conditional.finalize(Response(serializer.data))
 
     def create(self, request: Request, snapshot_pk: int | None = None) -> Response:
         """
@@ -1428,22 +2505,35 @@ class MapObjectViewSet(viewsets.ViewSet):
     Routes:
     - GET /layers/{layer_id}/objects/ - List objects
     - POST /layers/{layer_id}/objects/ - Create object
+    - POST /layers/{layer_id}/objects/import/ - Create/update objects from GeoJSON
     """
 
     def get_permissions(self) -> list:
-        if self.action in ["create"]:
+        if self.action in ["create", "import_geojson"]:
             return [IsAuthenticated()]
         return [AllowAny()]
 
     def list(self, request: Request, layer_pk: int | None = None) -> Response:
         """List objects for a layer."""
+        conditional = ConditionalGet.for_branch_row(
+            request,
+            "map_objects",
+            MapLayer.objects.filter(id=layer_pk),
+            branch_path="snapshot__map__branch",
+        )
+        if (not_modified := conditional.not_modified()) is not None:
+            return not_modified
+
         try:
-            layer = MapLayer.objects.prefetch_related("map_objects").get(id=layer_pk)
+            layer = MapLayer.objects.select_related("snapshot").get(id=layer_pk)
         except MapLayer.DoesNotExist:
             raise NotFound("레이어를 찾을 수 없습니다.")
+        # Objects a delta snapshot's layer inherits from its keyframe included
+        MapSnapshotHistory.materialize([layer.snapshot])
+        layer = next(item for item in layer.snapshot.layers.all() if item.id == layer.id)
 
         serializer = MapObjectSerializer(layer.map_objects.all(), many=True)
-        return Response(serializer.data)
+        return conditional.finalize(Response(serializer.data))
 
     def create(self, request: Request, layer_pk: int | None = None) -> Response:
         """
@@ -1479,4 +2569,47 @@ class MapObjectViewSet(viewsets.ViewSet):
             raise ValidationError(str(e))
 
         response_serializer = MapObjectSerializer(obj)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="GeoJSON으로 지도 오브젝트 일괄 가져오기",
+        description=(
+            "GeoJSON FeatureCollection 파일의 피처들을 레이어의 오브젝트로 한 번에 만듭니다. "
+            "정수 id가 있는 피처는 그 key의 기존 오브젝트를 수정합니다. "
+            "properties의 label, description, wikiEntryId, styleJson, objectType, radius를 읽으며, "
+            "잘못된 피처가 하나라도 있으면 아무것도 저장하지 않고 피처 번호별 오류를 반환합니다."
+        ),
+        tags=["Maps"],
+        request={"multipart/form-data": MapImportSerializer},
+        responses={200: MapImportResultSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_geojson(self, request: Request, layer_pk: int | None = None) -> Response:
+        """
+        업로드한 GeoJSON 파일로 레이어의 오브젝트를 일괄 생성/수정한다.
+
+        Raises:
+            NotFound: 레이어를 찾을 수 없을 때.
+            PermissionDenied: 브랜치 작가가 아닐 때.
+            ValidationError: 파일이 FeatureCollection이 아니거나 잘못된 피처가 있을 때
+                (``features``에 피처 번호별 오류).
+        """
+        if layer_pk is None or not MapLayer.objects.filter(id=layer_pk).exists():
+            raise NotFound("레이어를 찾을 수 없습니다.")
+
+        serializer = MapImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        if not upload.name.lower().endswith((".geojson", ".json")):
+            raise ValidationError("GeoJSON(.geojson, .json) 파일만 가져올 수 있습니다.")
+
+        try:
+            result = MapImportService.import_features(int(layer_pk), request.user, upload)
+        except PermissionError:
+            raise PermissionDenied("권한이 없습니다.")
+        except FeatureImportError as e:
+            raise ValidationError({"non_field_errors": [str(e)], "features": e.errors})
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        return Response(MapImportResultSerializer(result).data)
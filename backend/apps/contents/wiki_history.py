@@ -0,0 +1,187 @@
+"""
+WikiSnapshotHistory - Delta-encoded wiki snapshot storage and diffs.
+
+A wiki entry keeps one snapshot per chapter version, and consecutive versions
+of a long character page are mostly identical. Snapshots are stored as
+keyframes (full ``content``) with line deltas in between: a new snapshot is
+encoded against the nearest earlier keyframe of its entry, and becomes a
+keyframe itself once that keyframe already has ``KEYFRAME_INTERVAL`` deltas or
+the delta would not be much smaller than the text. Every delta depends on a
+single keyframe, so decoding never walks a chain and inserting a version
+between existing ones leaves them untouched.
+
+Decoded texts and diffs are cached by snapshot id and ``updated_at``, so
+history views are served without decoding or diffing again. Since delta rows
+have no text in the database, their full-text search vectors are also computed
+here from the decoded text (see WikiSearchService).
+"""
+
+import builtins
+from typing import Any
+
+from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, TextField, Value
+
+from apps.contents.models import WikiSnapshot
+from common import line_delta
+
+
+class WikiSnapshotHistory:
+    """Keyframe/delta encoding of wiki snapshots."""
+
+    KEYFRAME_INTERVAL = 8
+    # Store a delta only if it is at most this fraction of the full text
+    MAX_DELTA_RATIO = 0.5
+
+    TEXT_CACHE_KEY = "wiki_snapshot_text:{id}:{stamp}"
+    DIFF_CACHE_KEY = "wiki_snapshot_diff:{old}:{new}"
+    CACHE_TIMEOUT = 60 * 60 * 24
+
+    # Text search configuration of WikiSnapshot.search_vector
+    SEARCH_CONFIG = "simple"
+
+    @classmethod
+    def encode(cls, wiki_entry_id: int, content: str, valid_from_chapter: int) -> dict[str, Any]:
+        """
+        새 스냅샷의 저장 필드(``content``/``base``/``delta``)를 결정합니다.
+
+        Returns:
+            dict: WikiSnapshot 생성 시 넘길 필드. 키프레임이면 ``{"content": content}``.
+        """
+        keyframe = (
+            WikiSnapshot.objects.filter(
+                wiki_entry_id=wiki_entry_id,
+                delta__isnull=True,
+                valid_from_chapter__lt=valid_from_chapter,
+            )
+            .annotate(delta_count=Count("deltas"))
+            .only("id", "content")
+            .order_by("-valid_from_chapter")
+            .first()
+        )
+        if keyframe is None or keyframe.delta_count >= cls.KEYFRAME_INTERVAL:
+            return {"content": content}
+        return cls._encode_against(keyframe, content) or {"content": content}
+
+    @classmethod
+    def _encode_against(cls, keyframe: WikiSnapshot, content: str) -> dict[str, Any] | None:
+        delta = line_delta.encode(keyframe.content, content)
+        if line_delta.size(delta) > len(content) * cls.MAX_DELTA_RATIO:
+            return None
+        return {"content": "", "base": keyframe, "delta": delta}
+
+    @classmethod
+    def _text_key(cls, snapshot: WikiSnapshot) -> str:
+        return cls.TEXT_CACHE_KEY.format(id=snapshot.id, stamp=snapshot.updated_at.timestamp())
+
+    @classmethod
+    def materialize(cls, snapshots: builtins.list[WikiSnapshot]) -> None:
+        """
+        델타 스냅샷의 전체 내용을 한 번에 복원해 ``text``에 채웁니다.
+
+        캐시에 없는 것만 기준 키프레임을 한 번의 쿼리로 읽어 복원하고 캐시에 저장합니다.
+        """
+        pending = {
+            cls._text_key(snapshot): snapshot
+            for snapshot in snapshots
+            if snapshot.delta is not None and "_text" not in snapshot.__dict__
+        }
+        if not pending:
+            return
+
+        for key, text in cache.get_many(builtins.list(pending)).items():
+            pending.pop(key)._text = text
+        if not pending:
+            return
+
+        bases = dict(
+            WikiSnapshot.objects.filter(
+                id__in={snapshot.base_id for snapshot in pending.values()}
+            ).values_list("id", "content")
+        )
+        decoded = {}
+        for key, snapshot in pending.items():
+            snapshot._text = decoded[key] = line_delta.apply(
+                bases[snapshot.base_id], snapshot.delta
+            )
+        cache.set_many(decoded, cls.CACHE_TIMEOUT)
+
+    @classmethod
+    def index_search_vectors(cls, snapshots: builtins.list[WikiSnapshot]) -> None:
+        """스냅샷 전체 내용의 검색 벡터를 저장합니다 (PostgreSQL 전용, 그 외에는 아무 것도 하지 않음)."""
+        if connection.vendor != "postgresql":
+            return
+        cls.materialize(snapshots)
+        for snapshot in snapshots:
+            WikiSnapshot.objects.filter(pk=snapshot.pk).update(
+                search_vector=SearchVector(
+                    Value(snapshot.text, output_field=TextField()), config=cls.SEARCH_CONFIG
+                )
+            )
+
+    @classmethod
+    def diff(cls, wiki_entry_id: int, old_chapter: int, new_chapter: int) -> dict[str, Any]:
+        """
+        두 스냅샷(``valid_from_chapter`` 기준) 사이의 줄 단위 변경 내역을 반환합니다.
+
+        Returns:
+            dict: ``old``/``new`` 스냅샷 정보와 ``hunks`` (common.line_delta.diff 형식)
+
+        Raises:
+            ValueError: 해당 회차의 스냅샷이 없을 때
+        """
+        snapshots = {
+            snapshot.valid_from_chapter: snapshot
+            for snapshot in WikiSnapshot.objects.filter(
+                wiki_entry_id=wiki_entry_id,
+                valid_from_chapter__in=[old_chapter, new_chapter],
+            )
+        }
+        if old_chapter not in snapshots or new_chapter not in snapshots:
+            raise ValueError("존재하지 않는 스냅샷입니다.")
+        old, new = snapshots[old_chapter], snapshots[new_chapter]
+
+        key = cls.DIFF_CACHE_KEY.format(old=cls._text_key(old), new=cls._text_key(new))
+        hunks = cache.get(key)
+        if hunks is None:
+            cls.materialize([old, new])
+            hunks = line_delta.diff(old.text, new.text)
+            cache.set(key, hunks, cls.CACHE_TIMEOUT)
+        return {"old": old, "new": new, "hunks": hunks}
+
+    @classmethod
+    def compact(cls, wiki_entry_id: int) -> int:
+        """
+        위키 항목의 전체 스냅샷을 키프레임/델타로 다시 인코딩합니다 (기존 전체 저장분 압축용).
+
+        Returns:
+            int: 델타로 저장된 스냅샷 수
+        """
+        with transaction.atomic():
+            snapshots = builtins.list(
+                WikiSnapshot.objects.select_for_update()
+                .filter(wiki_entry_id=wiki_entry_id)
+                .order_by("valid_from_chapter")
+            )
+            cls.materialize(snapshots)
+            texts = [snapshot.text for snapshot in snapshots]
+
+            keyframe: WikiSnapshot | None = None
+            delta_count = 0
+            for snapshot, text in zip(snapshots, texts, strict=True):
+                fields = None
+                if keyframe is not None and delta_count < cls.KEYFRAME_INTERVAL:
+                    fields = cls._encode_against(keyframe, text)
+                if fields is None:
+                    fields = {"content": text, "base": None, "delta": None}
+                    keyframe, delta_count = snapshot, 0
+                else:
+                    delta_count += 1
+                for name, value in fields.items():
+                    setattr(snapshot, name, value)
+                snapshot._text = text
+
+            WikiSnapshot.objects.bulk_update(snapshots, ["content", "base", "delta"])
+        return sum(1 for snapshot in snapshots if snapshot.delta is not None)
@@ -0,0 +1,209 @@
+"""
+WikiSearchService - Branch-scoped wiki search bounded by the reader's chapter.
+
+An entry matches when its name contains a query term or when its snapshot
+valid at the reader's chapter (the latest one if no chapter is given) contains
+every term. Entries that appear after the chapter and later snapshots are never
+searched, so results cannot spoil.
+
+On PostgreSQL both sides are index lookups: names through a ``pg_trgm`` GIN
+index (``ILIKE``, ranked by trigram similarity) and snapshot texts through a
+GIN index on ``WikiSnapshot.search_vector`` (prefix ``tsquery``, ranked by
+``ts_rank``). Snapshot texts may be delta-encoded, so vectors are computed from
+the decoded text when a snapshot is written
+(``WikiSnapshotHistory.index_search_vectors``). Other databases fall back to
+matching the decoded texts in Python.
+
+Snippets are cut around the first match from the decoded text of the result
+page only, HTML-escaped, with matches wrapped in ``<mark>``.
+"""
+
+import builtins
+import operator
+import re
+from functools import reduce
+from html import escape
+from typing import Any
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+
+from apps.contents.lineage import BranchLineage
+from apps.contents.models import WikiEntry, WikiSnapshot
+from apps.contents.services import WikiService
+from apps.contents.wiki_history import WikiSnapshotHistory
+
+TERM = re.compile(r"\w+")
+
+# (score, wiki_id)
+Scored = tuple[float, int]
+
+
+class WikiSearchService:
+    """Full-text search over a branch's wiki entries."""
+
+    MAX_TERMS = 8
+    MAX_RESULTS = 50
+    # A name match outranks a content match
+    NAME_WEIGHT = 2.0
+    SNIPPET_RADIUS = 60
+
+    @classmethod
+    def search(
+        cls,
+        branch_id: int,
+        query: str,
+        chapter: int | None = None,
+        limit: int = 20,
+        lineage: BranchLineage | None = None,
+    ) -> builtins.list[dict[str, Any]]:
+        """
+        브랜치 위키에서 검색어와 일치하는 항목을 점수 순으로 반환합니다.
+
+        Parameters:
+            branch_id (int): 브랜치 ID (포크는 물려받은 항목도 검색)
+            query (str): 검색어 (공백으로 구분된 단어, 단어 앞부분 일치)
+            chapter (int | None): 독자가 읽고 있는 회차. 주어지면 그 회차까지 등장한 항목과
+                그 회차 시점의 스냅샷만 검색합니다.
+            limit (int): 최대 결과 수 (MAX_RESULTS 이하)
+            lineage (BranchLineage | None): 이미 조회한 브랜치 계보
+
+        Returns:
+            list[dict]: ``entry``, ``score``, ``snippet``(``<mark>`` 강조가 들어간 HTML 조각)
+
+        Raises:
+            ValueError: 브랜치가 존재하지 않을 때
+        """
+        terms = TERM.findall(query.casefold())[: cls.MAX_TERMS]
+        if not terms:
+            return []
+        if lineage is None:
+            lineage = BranchLineage.resolve(branch_id)
+
+        entries = WikiEntry.objects.filter(WikiService._visible_entries(lineage))
+        snapshots = WikiSnapshot.objects.filter(
+            lineage.filter("wiki_entry__branch_id", "valid_from_chapter")
+        )
+        if chapter is not None:
+            entries = entries.filter(
+                Q(first_appearance__lte=chapter) | Q(first_appearance__isnull=True)
+            )
+            snapshots = snapshots.filter(valid_from_chapter__lte=chapter)
+        snapshots = snapshots.filter(wiki_entry__in=entries.values("id"))
+
+        if connection.vendor == "postgresql":
+            scored, current = cls._rank_postgresql(entries, snapshots, terms)
+        else:
+            scored, current = cls._rank_python(entries, snapshots, terms)
+
+        top = sorted(scored, key=lambda row: (-row[0], row[1]))[: min(limit, cls.MAX_RESULTS)]
+        if not top:
+            return []
+        wikis = WikiEntry.objects.defer(*WikiEntry.HEAVY_FIELDS).in_bulk([w for _, w in top])
+        texts = WikiSnapshot.objects.defer(*WikiSnapshot.HEAVY_FIELDS).in_bulk(
+            [current[w] for _, w in top if w in current]
+        )
+        WikiSnapshotHistory.materialize(builtins.list(texts.values()))
+
+        pattern = re.compile(
+            "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True)),
+            re.IGNORECASE,
+        )
+        return [
+            {
+                "entry": wikis[wiki_id],
+                "score": round(score, 4),
+                "snippet": cls._snippet(
+                    texts[current[wiki_id]].text if wiki_id in current else "", pattern
+                ),
+            }
+            for score, wiki_id in top
+        ]
+
+    @classmethod
+    def _rank_postgresql(
+        cls, entries: QuerySet[WikiEntry], snapshots: QuerySet[WikiSnapshot], terms: list[str]
+    ) -> tuple[builtins.list[Scored], dict[int, int]]:
+        name_hits = dict(
+            entries.filter(reduce(operator.or_, [Q(name__icontains=t) for t in terms]))
+            .annotate(similarity=TrigramSimilarity("name", " ".join(terms)))
+            .values_list("id", "similarity")
+        )
+
+        ts_query = SearchQuery(
+            " & ".join(f"{t}:*" for t in terms),
+            search_type="raw",
+            config=WikiSnapshotHistory.SEARCH_CONFIG,
+        )
+        content_hits = {
+            snapshot_id: (wiki_id, rank)
+            for wiki_id, snapshot_id, rank in snapshots.filter(search_vector=ts_query)
+            .annotate(rank=SearchRank(F("search_vector"), ts_query))
+            .values_list("wiki_entry_id", "id", "rank")
+        }
+
+        # Only the snapshot valid at the chapter counts, not earlier versions
+        candidates = set(name_hits) | {wiki_id for wiki_id, _ in content_hits.values()}
+        current = dict(
+            snapshots.filter(wiki_entry_id__in=candidates)
+            .order_by("wiki_entry_id", "-valid_from_chapter")
+            .distinct("wiki_entry_id")
+            .values_list("wiki_entry_id", "id")
+        )
+
+        scores = {
+            wiki_id: cls.NAME_WEIGHT * max(similarity, 0.1)
+            for wiki_id, similarity in name_hits.items()
+        }
+        for snapshot_id, (wiki_id, rank) in content_hits.items():
+            if current.get(wiki_id) == snapshot_id:
+                scores[wiki_id] = scores.get(wiki_id, 0.0) + rank
+        return [(score, wiki_id) for wiki_id, score in scores.items()], current
+
+    @classmethod
+    def _rank_python(
+        cls, entries: QuerySet[WikiEntry], snapshots: QuerySet[WikiSnapshot], terms: list[str]
+    ) -> tuple[builtins.list[Scored], dict[int, int]]:
+        latest: dict[int, WikiSnapshot] = {}
+        for snapshot in snapshots.defer(*WikiSnapshot.HEAVY_FIELDS).order_by(
+            "wiki_entry_id", "valid_from_chapter"
+        ):
+            latest[snapshot.wiki_entry_id] = snapshot
+        WikiSnapshotHistory.materialize(builtins.list(latest.values()))
+
+        scored = []
+        for wiki_id, name in entries.values_list("id", "name"):
+            name = name.casefold()
+            score = 0.0
+            matched = [t for t in terms if t in name]
+            if matched:
+                score += cls.NAME_WEIGHT * max(sum(map(len, matched)) / len(name), 0.1)
+            if wiki_id in latest:
+                text = latest[wiki_id].text.casefold()
+                if all(t in text for t in terms):
+                    score += min(sum(text.count(t) for t in terms) / 10, 1.0)
+            if score:
+                scored.append((score, wiki_id))
+        return scored, {wiki_id: snapshot.id for wiki_id, snapshot in latest.items()}
+
+    @classmethod
+    def _snippet(cls, text: str, pattern: re.Pattern) -> str:
+        """Escaped excerpt around the first match, matches wrapped in ``<mark>``."""
+        first = pattern.search(text)
+        if first is None:
+            start, end = 0, min(len(text), 2 * cls.SNIPPET_RADIUS)
+        else:
+            start = max(0, first.start() - cls.SNIPPET_RADIUS)
+            end = min(len(text), first.end() + cls.SNIPPET_RADIUS)
+
+        pieces = []
+        position = start
+        for match in pattern.finditer(text, start, end):
+            pieces.append(escape(text[position : match.start()]))
+            pieces.append(f"<mark>{escape(match.group())}</mark>")
+            position = match.end()
+        pieces.append(escape(text[position:end]))
+
+        snippet = " ".join("".join(pieces).split())
+        return f"{'…' if start else ''}{snippet}{'…' if end < len(text) else ''}"
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0005_rename_objects_related_name'),
+        ('interactions', '0006_add_ai_usage_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['chapter', '-created_at', '-id'], name='comments_chapter_5b9abd_idx'),
+        ),
+    ]
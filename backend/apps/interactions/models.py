@@ -114,6 +114,7 @@ class Comment(SoftDeleteModel):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["chapter", "paragraph_index"]),
+            models.Index(fields=["chapter", "-created_at", "-id"]),
         ]
 
     def clean(self) -> None:
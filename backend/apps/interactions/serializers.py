@@ -257,6 +257,44 @@ class LikeToggleResponseSerializer(serializers.Serializer):
     like_count = serializers.IntegerField(read_only=True, allow_null=True)
 
 
+LIKE_TARGET_TYPES = {
+    "comment": "interactions.Comment",
+    "chapter": "contents.Chapter",
+}
+
+MAX_LIKE_STATUS_IDS = 100
+
+
+class LikeStatusQuerySerializer(serializers.Serializer):
+    """Query params for bulk like status lookup (``?type=comment&ids=1,2,3``)."""
+
+    type = serializers.ChoiceField(choices=list(LIKE_TARGET_TYPES.keys()))
+    ids = serializers.CharField()
+
+    def validate_ids(self, value: str) -> list[int]:
+        try:
+            ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError as e:
+            raise serializers.ValidationError("ids는 쉼표로 구분된 숫자여야 합니다.") from e
+        if len(ids) > MAX_LIKE_STATUS_IDS:
+            raise serializers.ValidationError(
+                f"한 번에 최대 {MAX_LIKE_STATUS_IDS}개까지 조회할 수 있습니다."
+            )
+        return ids
+
+    def validate(self, data: dict) -> dict:
+        from django.apps import apps
+
+        data["model"] = apps.get_model(LIKE_TARGET_TYPES[data["type"]])
+        return data
+
+
+class LikeStatusResponseSerializer(serializers.Serializer):
+    """Serializer for bulk like status response."""
+
+    liked_ids = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+
 # =============================================================================
 # Report Serializers
 # =============================================================================
@@ -11,7 +11,8 @@ from datetime import timedelta
 from typing import Any
 
 from django.db import DatabaseError, IntegrityError, transaction
-from django.db.models import Count, Q, QuerySet
+from django.db.models import Count, F, Q, QuerySet, Subquery
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from apps.contents.models import AccessType, Chapter
@@ -27,6 +28,9 @@ from apps.interactions.models import (
 from apps.interactions.services.payment_service import PaymentService
 from apps.users.models import User
 
+# select_related("chapter") 목록 조회에서 제외할 회차 본문 컬럼
+CHAPTER_BODY_LOOKUPS = tuple(f"chapter__{name}" for name in Chapter.HEAVY_FIELDS)
+
 
 class AccessService:
     """Service for checking chapter access permissions."""
@@ -70,6 +74,32 @@ class AccessService:
 
         return False
 
+    def get_accessible_chapter_ids(self, user: User | None, branch: Any) -> list[int] | None:
+        """
+        Resolve access to all chapters of a branch with the can_access_chapter rules.
+
+        Used for bulk reads (e.g. exports) instead of one can_access_chapter call
+        per chapter.
+
+        Args:
+            user: User instance or None
+            branch: Branch whose chapters are checked
+
+        Returns:
+            None if every chapter is accessible (author or active subscription),
+            otherwise the IDs of purchased chapters, which are accessible in
+            addition to FREE chapters.
+        """
+        if user is None:
+            return []
+        if branch.author_id == user.id or self._has_active_subscription(user):
+            return None
+        return sorted(
+            Purchase.objects.filter(user=user, chapter__branch=branch).values_list(
+                "chapter_id", flat=True
+            )
+        )
+
     def _has_active_subscription(self, user: User) -> bool:
         """Check if user has an active, non-expired subscription."""
         return Subscription.objects.filter(
@@ -276,7 +306,12 @@ class PurchaseService:
         Returns:
             QuerySet of Purchase instances
         """
-        return Purchase.objects.filter(user=user).select_related("chapter").order_by("-created_at")
+        return (
+            Purchase.objects.filter(user=user)
+            .select_related("chapter")
+            .defer(*CHAPTER_BODY_LOOKUPS)
+            .order_by("-created_at")
+        )
 
 
 class ReadingService:
@@ -328,6 +363,7 @@ class ReadingService:
         return (
             ReadingLog.objects.filter(user=user)
             .select_related("chapter")
+            .defer(*CHAPTER_BODY_LOOKUPS)
             .order_by("-read_at")[:limit]
         )
 
@@ -352,16 +388,24 @@ class ReadingService:
         from apps.interactions.models import ReadingLog
 
         # Get all chapters in branch ordered by chapter_number
-        chapters = Chapter.objects.filter(branch_id=branch_id).order_by("chapter_number")
+        chapters = (
+            Chapter.objects.filter(branch_id=branch_id)
+            .defer(*Chapter.HEAVY_FIELDS)
+            .order_by("chapter_number")
+        )
 
         if not chapters.exists():
             return {"chapter": None, "progress": 0}
 
         # Get user's reading logs for this branch
-        user_logs = ReadingLog.objects.filter(
-            user=user,
-            chapter__branch_id=branch_id,
-        ).select_related("chapter")
+        user_logs = (
+            ReadingLog.objects.filter(
+                user=user,
+                chapter__branch_id=branch_id,
+            )
+            .select_related("chapter")
+            .defer(*CHAPTER_BODY_LOOKUPS)
+        )
 
         # Check for incomplete reading (미완독 우선)
         incomplete_log = user_logs.filter(is_completed=False).order_by("-read_at").first()
@@ -455,7 +499,12 @@ class BookmarkService:
         """
         from apps.interactions.models import Bookmark
 
-        return Bookmark.objects.filter(user=user).select_related("chapter").order_by("-created_at")
+        return (
+            Bookmark.objects.filter(user=user)
+            .select_related("chapter")
+            .defer(*CHAPTER_BODY_LOOKUPS)
+            .order_by("-created_at")
+        )
 
 
 class CommentService:
@@ -574,7 +623,7 @@ class CommentService:
         comment.save()
 
     @staticmethod
-    def list(chapter_id: int, paragraph_index: int = None) -> list:
+    def list(chapter_id: int, paragraph_index: int = None) -> QuerySet:
         """
         특정 챕터의 삭제되지 않은 댓글 목록을 가져온다.
         
@@ -585,7 +634,8 @@ class CommentService:
             paragraph_index (int, optional): 단락 인덱스로 필터링할 경우 해당 인덱스. 제공하지 않으면 전체 단락의 댓글을 반환한다.
         
         Returns:
-            list: 조회된 댓글 객체의 리스트. 각 객체는 `reply_count` 속성과 `user` 관련 객체를 포함한다.
+            QuerySet: 조회된 댓글 쿼리셋. 각 객체는 `reply_count` 속성과 `user` 관련 객체를 포함한다.
+            페이지네이션(키셋)이 LIMIT을 적용할 수 있도록 평가하지 않은 채 반환한다.
         """
         from apps.interactions.models import Comment
 
@@ -602,7 +652,7 @@ class CommentService:
         if paragraph_index is not None:
             queryset = queryset.filter(paragraph_index=paragraph_index)
 
-        return list(queryset)
+        return queryset
 
     @staticmethod
     def pin(comment_id: int, user: User) -> Any:
@@ -665,6 +715,10 @@ class LikeService:
         """
         Toggle like on a target (comment, chapter, etc.).
 
+        Counters are adjusted in SQL (``F()``) so concurrent toggles cannot lose
+        updates, and ``updated_at`` of the target is left untouched. Chapter likes
+        also roll up into ``Novel.total_like_count``.
+
         Args:
             user instance
             target: Model instance to like (Comment, Chapter, etc.)
@@ -677,33 +731,80 @@ class LikeService:
         from apps.interactions.models import Like
 
         content_type = ContentType.objects.get_for_model(target)
+        like_filter = {"user": user, "content_type": content_type, "object_id": target.id}
 
-        like, created = Like.objects.get_or_create(
-            user=user,
-            content_type=content_type,
-            object_id=target.id,
-        )
-
-        if not created:
-            # Already liked, so unlike
-            like.delete()
-            liked = False
-        else:
-            liked = True
-
-        # Update like_count if target has it
-        if hasattr(target, "like_count"):
-            if liked:
-                target.like_count += 1
+        with transaction.atomic():
+            deleted, _ = Like.objects.filter(**like_filter).delete()
+            if deleted:
+                liked, delta = False, -1
             else:
-                target.like_count = max(0, target.like_count - 1)
-            target.save(update_fields=["like_count", "updated_at"])
+                try:
+                    with transaction.atomic():
+                        Like.objects.create(**like_filter)
+                    liked, delta = True, 1
+                except IntegrityError:
+                    # A concurrent request already created the like
+                    liked, delta = True, 0
+
+            if delta and hasattr(target, "like_count"):
+                LikeService._apply_like_delta(target, delta)
+
+        like_count = None
+        if hasattr(target, "like_count"):
+            like_count = (
+                type(target)
+                .objects.filter(pk=target.pk)
+                .values_list("like_count", flat=True)
+                .first()
+            )
+            target.like_count = like_count
 
         return {
             "liked": liked,
-            "like_count": getattr(target, "like_count", None),
+            "like_count": like_count,
         }
 
+    @staticmethod
+    def _apply_like_delta(target: Any, delta: int) -> None:
+        """Adjust like counters of the target (and its novel, for chapters) in SQL."""
+        from apps.novels.models import Branch, Novel
+
+        type(target).objects.filter(pk=target.pk).update(
+            like_count=Greatest(F("like_count") + delta, 0)
+        )
+        if isinstance(target, Chapter):
+            novel_id = Branch.objects.filter(id=target.branch_id).values("novel_id")[:1]
+            Novel.objects.filter(id=Subquery(novel_id)).update(
+                total_like_count=Greatest(F("total_like_count") + delta, 0)
+            )
+
+    @staticmethod
+    def get_liked_ids(user: User, model: type, ids: list[int]) -> set[int]:
+        """
+        주어진 대상들 중 사용자가 좋아요한 대상의 ID 집합을 한 번의 쿼리로 반환한다.
+
+        Parameters:
+            user (User): 조회할 사용자.
+            model (type): 대상 모델 클래스 (Comment, Chapter 등).
+            ids (list[int]): 한 페이지 분량의 대상 ID 목록.
+
+        Returns:
+            set[int]: 좋아요한 대상의 ID 집합. 비로그인 사용자는 빈 집합.
+        """
+        from django.contrib.contenttypes.models import ContentType
+
+        from apps.interactions.models import Like
+
+        if not user or not user.is_authenticated or not ids:
+            return set()
+
+        content_type = ContentType.objects.get_for_model(model)
+        return set(
+            Like.objects.filter(
+                user=user, content_type=content_type, object_id__in=ids
+            ).values_list("object_id", flat=True)
+        )
+
     @staticmethod
     def get_like_status(user: User, target: Any) -> bool:
         """
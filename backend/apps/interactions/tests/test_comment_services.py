@@ -278,6 +278,61 @@ class TestLikeServiceToggle:
         comment.refresh_from_db()
         assert comment.like_count == 0
 
+    def test_like_uses_sql_increment(self):
+        """다른 요청이 반영한 카운트를 덮어쓰지 않음 (stale 인스턴스)"""
+        user = baker.make("users.User")
+        comment = baker.make("interactions.Comment", like_count=0)
+        # Another request liked it after this instance was loaded
+        type(comment).objects.filter(pk=comment.pk).update(like_count=5)
+
+        result = LikeService.toggle(user=user, target=comment)
+
+        assert result["like_count"] == 6
+
+    def test_like_does_not_touch_updated_at(self):
+        """좋아요는 대상의 updated_at을 바꾸지 않음"""
+        user = baker.make("users.User")
+        comment = baker.make("interactions.Comment")
+        updated_at = comment.updated_at
+
+        LikeService.toggle(user=user, target=comment)
+
+        comment.refresh_from_db()
+        assert comment.updated_at == updated_at
+
+    def test_chapter_like_rolls_up_to_novel(self):
+        """회차 좋아요/취소가 소설 total_like_count에 반영"""
+        user = baker.make("users.User")
+        novel = baker.make("novels.Novel", total_like_count=3)
+        chapter = baker.make("contents.Chapter", branch__novel=novel)
+
+        LikeService.toggle(user=user, target=chapter)
+        novel.refresh_from_db()
+        assert novel.total_like_count == 4
+
+        LikeService.toggle(user=user, target=chapter)
+        novel.refresh_from_db()
+        assert novel.total_like_count == 3
+
+
+class TestLikeServiceGetLikedIds:
+    """LikeService.get_liked_ids() 테스트"""
+
+    def test_returns_liked_subset_in_one_query(self, django_assert_num_queries):
+        """페이지 내 좋아요한 ID만 한 번의 쿼리로 반환"""
+        from apps.interactions.models import Comment
+
+        user = baker.make("users.User")
+        comments = baker.make("interactions.Comment", _quantity=3)
+        LikeService.toggle(user=user, target=comments[0])
+        LikeService.toggle(user=user, target=comments[2])
+        ids = [c.id for c in comments]
+
+        with django_assert_num_queries(1):
+            liked = LikeService.get_liked_ids(user=user, model=Comment, ids=ids)
+
+        assert liked == {comments[0].id, comments[2].id}
+
 
 class TestLikeServiceGetLikeStatus:
     """LikeService.get_like_status() 테스트"""
@@ -43,6 +43,22 @@ class TestCommentListView:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 2
 
+    def test_list_comments_cursor(self):
+        """커서로 다음 페이지 조회"""
+        chapter = baker.make("contents.Chapter")
+        baker.make("interactions.Comment", chapter=chapter, _quantity=3)
+
+        client = APIClient()
+        url = f"/api/v1/chapters/{chapter.id}/comments/?size=2"
+
+        first = client.get(url).data
+        second = client.get(first["next"]).data
+
+        assert first["count"] == 3
+        assert len(first["results"]) == 2
+        assert len(second["results"]) == 1
+        assert second["next"] is None
+
 
 class TestCommentCreateView:
     """POST /api/v1/chapters/{id}/comments 테스트"""
@@ -235,6 +251,34 @@ class TestLikeView:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class TestLikeStatusView:
+    """GET /api/v1/likes/?type=&ids= 테스트"""
+
+    def test_bulk_like_status(self):
+        """좋아요한 ID 목록 일괄 조회"""
+        user = baker.make("users.User")
+        comments = baker.make("interactions.Comment", _quantity=3)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        client.post(f"/api/v1/comments/{comments[1].id}/like/")
+
+        ids = ",".join(str(c.id) for c in comments)
+        response = client.get(f"/api/v1/likes/?type=comment&ids={ids}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["liked_ids"] == [comments[1].id]
+
+    def test_bulk_like_status_rejects_bad_ids(self):
+        """잘못된 ids는 400"""
+        user = baker.make("users.User")
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get("/api/v1/likes/?type=comment&ids=1,a")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 class TestChapterLikeView:
     """POST/DELETE /api/v1/chapters/{id}/like 테스트"""
 
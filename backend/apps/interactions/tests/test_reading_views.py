@@ -57,6 +57,19 @@ class TestReadingHistoryView:
 
         assert len(response.data["results"]) == 1
 
+    def test_reading_history_skips_chapter_body(self, assert_no_heavy_columns):
+        """목록 조회 시 회차 본문 컬럼을 로드하지 않음"""
+        user = baker.make("users.User")
+        baker.make("interactions.ReadingLog", user=user, _quantity=2)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with assert_no_heavy_columns():
+            response = client.get("/api/v1/users/me/reading-history/")
+
+        assert len(response.data["results"]) == 2
+
 
 class TestContinueReadingView:
     """GET /api/v1/branches/{id}/continue-reading 테스트"""
@@ -106,6 +119,21 @@ class TestContinueReadingView:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["chapter"]["id"] == chapter1.id
 
+    def test_continue_reading_skips_chapter_body(self, assert_no_heavy_columns):
+        """이어보기 조회 시 회차 본문 컬럼을 로드하지 않음"""
+        user = baker.make("users.User")
+        branch = baker.make("novels.Branch")
+        chapter = baker.make("contents.Chapter", branch=branch, chapter_number=1)
+        baker.make("interactions.ReadingLog", user=user, chapter=chapter, is_completed=False)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with assert_no_heavy_columns():
+            response = client.get(f"/api/v1/branches/{branch.id}/continue-reading/")
+
+        assert response.data["chapter"]["id"] == chapter.id
+
 
 class TestBookmarkListView:
     """GET /api/v1/users/me/bookmarks 테스트"""
@@ -135,6 +163,19 @@ class TestBookmarkListView:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["note"] == "테스트"
 
+    def test_bookmarks_skip_chapter_body(self, assert_no_heavy_columns):
+        """북마크 목록 조회 시 회차 본문 컬럼을 로드하지 않음"""
+        user = baker.make("users.User")
+        baker.make("interactions.Bookmark", user=user, _quantity=2)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with assert_no_heavy_columns():
+            response = client.get("/api/v1/users/me/bookmarks/")
+
+        assert len(response.data["results"]) == 2
+
 
 class TestChapterBookmarkView:
     """POST/DELETE /api/v1/chapters/{id}/bookmark 테스트"""
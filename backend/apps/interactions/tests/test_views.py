@@ -166,6 +166,18 @@ class TestPurchaseList:
         resp_data = response.json()
         assert len(resp_data["data"]["results"]) == 2
 
+    def test_list_purchases_skips_chapter_body(self, assert_no_heavy_columns):
+        """Purchase list should not load chapter content columns."""
+        user = baker.make(User)
+        baker.make(Purchase, user=user, _quantity=2)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with assert_no_heavy_columns(Chapter):
+            response = client.get("/api/v1/purchases/")
+
+        assert len(response.json()["data"]["results"]) == 2
+
 
 @pytest.mark.django_db
 class TestChapterPurchase:
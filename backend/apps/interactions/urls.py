@@ -13,6 +13,7 @@ from .views import (
     ChapterLikeViewSet,
     ChapterPurchaseViewSet,
     CommentDetailViewSet,
+    LikeStatusViewSet,
     PurchaseViewSet,
     ReportViewSet,
     SubscriptionViewSet,
@@ -57,6 +58,12 @@ urlpatterns = [
         ChapterLikeViewSet.as_view({"post": "create", "delete": "create"}),
         name="chapter-like",
     ),
+    # Bulk like status
+    path(
+        "likes/",
+        LikeStatusViewSet.as_view({"get": "list"}),
+        name="like-status",
+    ),
     # Wallet routes
     path(
         "wallet/charge/",
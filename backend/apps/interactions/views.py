@@ -17,7 +17,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from apps.contents.models import Chapter
-from common.pagination import StandardPagination
+from common.pagination import KeysetPagination, StandardPagination
 
 from .models import Comment, Report
 from .serializers import (
@@ -25,6 +25,8 @@ from .serializers import (
     CommentCreateSerializer,
     CommentSerializer,
     CommentUpdateSerializer,
+    LikeStatusQuerySerializer,
+    LikeStatusResponseSerializer,
     LikeToggleResponseSerializer,
     PurchaseDetailSerializer,
     PurchaseListSerializer,
@@ -214,7 +216,7 @@ class ChapterCommentViewSet(viewsets.ViewSet):
     - POST /chapters/{chapter_pk}/comments/ - Create comment
     """
 
-    pagination_class = StandardPagination
+    pagination_class = KeysetPagination
 
     def get_permissions(self) -> list:
         if self.action == "create":
@@ -231,7 +233,7 @@ class ChapterCommentViewSet(viewsets.ViewSet):
             paragraph_index=paragraph_index,
         )
 
-        paginator = StandardPagination()
+        paginator = KeysetPagination(ordering=("-created_at", "-id"), count_mode="estimate")
         page = paginator.paginate_queryset(comments, request)
         serializer = CommentSerializer(page, many=True)
 
@@ -379,6 +381,35 @@ class ChapterLikeViewSet(viewsets.ViewSet):
         return Response(serializer.data)
 
 
+class LikeStatusViewSet(viewsets.ViewSet):
+    """
+    ViewSet for bulk like status lookups.
+
+    Routes:
+    - GET /likes/?type=comment&ids=1,2,3 - IDs the current user has liked
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="좋아요 상태 일괄 조회",
+        description="한 페이지 분량의 댓글/회차 중 내가 좋아요한 ID 목록을 조회합니다.",
+        tags=["Likes"],
+    )
+    def list(self, request: Request) -> Response:
+        """Return the subset of ``ids`` liked by the current user."""
+        query = LikeStatusQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        liked_ids = LikeService.get_liked_ids(
+            user=request.user,
+            model=query.validated_data["model"],
+            ids=query.validated_data["ids"],
+        )
+        serializer = LikeStatusResponseSerializer({"liked_ids": sorted(liked_ids)})
+        return Response(serializer.data)
+
+
 # =============================================================================
 # Report ViewSets
 # =============================================================================
@@ -579,12 +610,12 @@ class UserWalletViewSet(viewsets.ViewSet):
 
         try:
             wallet = Wallet.objects.get(user=request.user)
-            transactions = CoinTransaction.objects.filter(wallet=wallet).order_by("-created_at")
+            transactions = CoinTransaction.objects.filter(wallet=wallet)
         except Wallet.DoesNotExist:
-            transactions = []
+            transactions = CoinTransaction.objects.none()
 
-        paginator = StandardPagination()
-        page = paginator.paginate_queryset(list(transactions), request)
+        paginator = KeysetPagination(ordering=("-created_at", "-id"), count_mode="estimate")
+        page = paginator.paginate_queryset(transactions, request)
         serializer = CoinTransactionSerializer(page, many=True)
 
         return paginator.get_paginated_response(serializer.data)
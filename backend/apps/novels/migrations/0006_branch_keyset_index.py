@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('novels', '0005_branch_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='branch',
+            index=models.Index(fields=['novel', '-vote_count', '-id'], name='branches_novel_i_1246af_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 from common.models import BaseModel, SoftDeleteModel
 
@@ -132,10 +134,22 @@ class Branch(SoftDeleteModel):
                 name="unique_main_branch_per_novel",
             )
         ]
+        indexes = [
+            models.Index(fields=["novel", "-vote_count", "-id"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.novel.title} - {self.name}"
 
+    @classmethod
+    def bump_version(cls, branch_id: int) -> None:
+        """
+        독자에게 보이는 브랜치 콘텐츠(발행 회차, 위키, 지도)가 바뀌었음을 기록한다.
+
+        version과 updated_at을 갱신하며, 조건부 GET의 ETag/Last-Modified 검증자로 사용된다.
+        """
+        cls.objects.filter(id=branch_id).update(version=F("version") + 1, updated_at=timezone.now())
+
 
 class BranchVote(BaseModel):
     user = models.ForeignKey(
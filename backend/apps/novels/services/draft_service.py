@@ -1,13 +1,61 @@
+import hashlib
+import logging
+import zlib
 from typing import Any
 
+import redis
 from django.core.cache import cache
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 class DraftService:
-    """Service class for real-time draft auto-save using Redis."""
+    """
+    Service class for real-time draft auto-save using Redis.
+
+    Saving a draft of an existing chapter also records ``"{branch_id}:{chapter_id}"``
+    with the draft's content hash in the ``DIRTY_KEY`` hash, so ``sync_drafts_to_db``
+    only visits drafts edited since its last run instead of scanning every key.
+
+    Draft bodies are stored zlib-compressed (``content_z``) together with a version
+    number. Autosave clients may send ``apply_patch`` ops against the version they
+    last saw instead of the full body; a stale version is reported back so the
+    client can fall back to a full save.
+
+    Every write draws its version from one ``incr`` counter (``VERSION_COUNTER_KEY``,
+    atomic on Redis), so a version number belongs to exactly one body. A patch is
+    applied only if it drew ``base_version + 1``, i.e. nothing else was written since
+    its base: of two patches against the same base only one is applied. The counter
+    is the only key kept per draft besides the draft itself.
+    """
 
     TIMEOUT = 24 * 60 * 60  # 24 hours
+    COMPRESS_LEVEL = 6
+
+    DIRTY_KEY = "drafts:dirty"
+    SYNCING_KEY = "drafts:syncing"
+    SYNCED_HASH_KEY = "draft_synced:{branch_id}:{chapter_id}"
+    VERSION_COUNTER_KEY = "{key}:version"
+
+    @staticmethod
+    def _get_client() -> redis.Redis | None:
+        from django_redis import get_redis_connection
+
+        try:
+            return get_redis_connection("default")
+        except NotImplementedError:
+            # Cache backend without a raw Redis client (e.g. LocMemCache in tests).
+            return None
+
+    @staticmethod
+    def content_hash(title: str, content: str) -> str:
+        """제목과 본문으로 초안 내용 해시를 계산한다."""
+        return hashlib.sha1(f"{title}\0{content}".encode()).hexdigest()
+
+    def get_synced_hash_key(self, branch_id: int, chapter_id: int) -> str:
+        """마지막으로 DB에 반영된 초안 내용 해시의 캐시 키를 반환한다."""
+        return self.SYNCED_HASH_KEY.format(branch_id=branch_id, chapter_id=chapter_id)
 
     def _get_key(self, branch_id: int, chapter_id: int | None = None) -> str:
         """
@@ -32,26 +80,189 @@ class DraftService:
         chapter_id: int | None,
         title: str,
         content: str,
-    ) -> None:
+    ) -> int:
         """
         초안(title·content)을 캐시에 저장한다.
-        
-        저장된 항목에는 `title`, `content`, `updated_at` 타임스탬프가 포함되며, 클래스의 `TIMEOUT`(24시간) 동안 유지된다.
-        
+
+        저장된 항목에는 `title`, 압축된 본문(`content_z`), `content_hash`, `version`,
+        `updated_at` 타임스탬프가 포함되며, 클래스의 `TIMEOUT`(24시간) 동안 유지된다.
+
         Parameters:
             branch_id (int): 초안이 속한 브랜치의 식별자.
             chapter_id (int | None): 대상 챕터의 식별자. `None`이면 새 챕터용 임시 초안으로 저장된다.
             title (str): 초안 제목.
             content (str): 초안 내용.
+
+        Returns:
+            int: 저장된 초안의 버전 번호 (저장할 때마다 증가하며, 동시에 저장해도 겹치지 않음).
         """
         key = self._get_key(branch_id, chapter_id)
+        version = self._next_version(key, cache.get(key))
+        self._store(key, branch_id, chapter_id, title, content, version)
+        return version
+
+    def apply_patch(
+        self,
+        branch_id: int,
+        chapter_id: int | None,
+        base_version: int,
+        ops: list[dict[str, Any]],
+        title: str | None = None,
+    ) -> tuple[int, bool]:
+        """
+        마지막으로 저장된 초안 버전에 텍스트 편집 연산을 적용하여 저장한다.
+
+        Parameters:
+            branch_id (int): 초안이 속한 브랜치의 식별자.
+            chapter_id (int | None): 대상 챕터의 식별자.
+            base_version (int): 클라이언트가 편집을 시작한 초안 버전.
+            ops (list[dict]): `{"start", "end", "text"}` 교체 연산 목록. 오프셋은 기준 버전 본문 기준이며
+                겹치지 않고 오름차순이어야 한다.
+            title (str | None): 새 제목. 생략하면 기존 제목을 유지한다.
+
+        Returns:
+            tuple[int, bool]: (현재 버전, 적용 여부). 저장된 초안이 없거나 버전이 다르면
+                적용하지 않고 현재 버전(없으면 0)을 반환하며, 클라이언트는 전체 본문으로 다시 저장해야 한다.
+                같은 기준 버전에 대한 패치가 동시에 오면 먼저 다음 버전을 받은 하나만 적용된다.
+
+        Raises:
+            ValueError: 연산 형식이나 범위가 올바르지 않을 때.
+        """
+        key = self._get_key(branch_id, chapter_id)
+        current = cache.get(key)
+        if current is None or current.get("version") != base_version:
+            return (current or {}).get("version", 0), False
+
+        draft = self.unpack(current)
+        content = self.apply_ops(draft["content"], ops)
+        version = base_version + 1
+        if self._next_version(key, current) != version:
+            # Another save or patch took the next version since we read the draft
+            return version, False
+        self._store(
+            key, branch_id, chapter_id, draft["title"] if title is None else title, content, version
+        )
+        return version, True
+
+    def _next_version(self, key: str, current: dict[str, Any] | None) -> int:
+        """버전 카운터를 원자적으로 올려 새 버전을 받는다 (카운터가 없으면 현재 버전부터)."""
+        counter = self.VERSION_COUNTER_KEY.format(key=key)
+        cache.add(counter, (current or {}).get("version", 0), self.TIMEOUT)
+        cache.touch(counter, self.TIMEOUT)
+        return cache.incr(counter)
+
+    @staticmethod
+    def apply_ops(content: str, ops: list[dict[str, Any]]) -> str:
+        """
+        `{"start", "end", "text"}` 교체 연산을 본문에 적용한다.
+
+        Raises:
+            ValueError: 연산 형식이 잘못되었거나 범위가 겹치거나 본문 길이를 벗어날 때.
+        """
+        parts = []
+        cursor = 0
+        for op in ops:
+            try:
+                start, end, text = int(op["start"]), int(op["end"]), op.get("text", "")
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError("잘못된 편집 연산입니다.") from e
+            if not isinstance(text, str) or not cursor <= start <= end <= len(content):
+                raise ValueError("편집 연산 범위가 올바르지 않습니다.")
+            parts.append(content[cursor:start])
+            parts.append(text)
+            cursor = end
+        parts.append(content[cursor:])
+        return "".join(parts)
+
+    def _store(
+        self,
+        key: str,
+        branch_id: int,
+        chapter_id: int | None,
+        title: str,
+        content: str,
+        version: int,
+    ) -> None:
         data = {
             "title": title,
-            "content": content,
+            "content_z": zlib.compress(content.encode(), self.COMPRESS_LEVEL),
+            "content_hash": self.content_hash(title, content),
+            "version": version,
             "updated_at": timezone.now(),
         }
         cache.set(key, data, self.TIMEOUT)
 
+        if chapter_id:
+            self._mark_dirty(branch_id, chapter_id, data["content_hash"])
+
+    @staticmethod
+    def unpack(data: dict[str, Any]) -> dict[str, Any]:
+        """캐시에 저장된 초안 항목의 본문 압축을 풀어 `content` 키로 반환한다."""
+        if "content_z" not in data:
+            # Drafts saved before bodies were compressed
+            return data
+        unpacked = {k: v for k, v in data.items() if k != "content_z"}
+        unpacked["content"] = zlib.decompress(data["content_z"]).decode()
+        return unpacked
+
+    def _mark_dirty(self, branch_id: int, chapter_id: int, content_hash: str) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.hset(self.DIRTY_KEY, f"{branch_id}:{chapter_id}", content_hash)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to mark draft {branch_id}:{chapter_id} dirty: {e}")
+
+    def claim_dirty(self) -> list[tuple[int, int]]:
+        """
+        마지막 동기화 이후 변경된 초안 목록을 가져온다.
+
+        DIRTY_KEY를 SYNCING_KEY로 RENAME하여 이후 저장분은 다음 동기화로 넘긴다.
+        이전 동기화가 중단되어 SYNCING_KEY가 남아 있으면 그것을 다시 처리한다.
+
+        Returns:
+            list[tuple[int, int]]: (branch_id, chapter_id) 목록.
+
+        Raises:
+            redis.RedisError: Redis 통신 실패 시.
+        """
+        client = self._get_client()
+        if client is None:
+            return []
+
+        if not client.exists(self.SYNCING_KEY):
+            try:
+                client.rename(self.DIRTY_KEY, self.SYNCING_KEY)
+            except redis.ResponseError:
+                # No drafts saved since the last sync
+                return []
+
+        dirty = []
+        for field in client.hkeys(self.SYNCING_KEY):
+            branch_id, _, chapter_id = field.decode().partition(":")
+            dirty.append((int(branch_id), int(chapter_id)))
+        return dirty
+
+    def release_dirty(self, synced_hashes: dict[tuple[int, int], str]) -> None:
+        """
+        동기화를 마친 초안의 내용 해시를 기록하고 SYNCING_KEY를 삭제한다.
+
+        Parameters:
+            synced_hashes (dict): (branch_id, chapter_id) -> DB에 반영된 내용 해시.
+        """
+        if synced_hashes:
+            cache.set_many(
+                {
+                    self.get_synced_hash_key(branch_id, chapter_id): content_hash
+                    for (branch_id, chapter_id), content_hash in synced_hashes.items()
+                },
+                self.TIMEOUT,
+            )
+        client = self._get_client()
+        if client is not None:
+            client.delete(self.SYNCING_KEY)
+
     def get_draft(
         self,
         branch_id: int,
@@ -65,10 +276,11 @@ class DraftService:
             chapter_id (int | None): 챕터 ID; 제공하지 않으면 새 챕터용 임시 초안으로 취급됩니다.
         
         Returns:
-            dict[str, Any] | None: 키 `title`, `content`, `updated_at`를 포함한 초안 사전 또는 존재하지 않으면 `None`.
+            dict[str, Any] | None: 키 `title`, `content`, `version`, `updated_at`를 포함한 초안 사전 또는 존재하지 않으면 `None`.
         """
         key = self._get_key(branch_id, chapter_id)
-        return cache.get(key)
+        data = cache.get(key)
+        return self.unpack(data) if data is not None else None
 
     def delete_draft(
         self,
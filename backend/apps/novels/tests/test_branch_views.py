@@ -93,6 +93,31 @@ class TestBranchList:
         assert len(data["data"]["results"]) == 1
         assert data["data"]["results"][0]["id"] == linked.id
 
+    def test_list_without_page_params_returns_all(self, api_client: APIClient) -> None:
+        """Without cursor/page/size every branch is returned, unpaginated."""
+        novel = baker.make(Novel)
+        baker.make(Branch, novel=novel, visibility=BranchVisibility.PUBLIC, _quantity=25)
+
+        url = reverse("novel-branches-list", kwargs={"novel_pk": novel.id})
+        data = get_json(api_client.get(url))["data"]
+
+        assert len(data["results"]) == 25
+        assert "next" not in data
+
+    def test_list_pages_by_cursor_on_request(self, api_client: APIClient) -> None:
+        """With size the list pages by keyset and the cursor walks every branch."""
+        novel = baker.make(Novel)
+        branches = baker.make(Branch, novel=novel, visibility=BranchVisibility.PUBLIC, _quantity=25)
+
+        url = reverse("novel-branches-list", kwargs={"novel_pk": novel.id})
+        first = get_json(api_client.get(url, {"size": 20}))["data"]
+        second = get_json(api_client.get(first["next"]))["data"]
+
+        assert len(first["results"]) == 20
+        assert second["next"] is None
+        seen = [row["id"] for row in first["results"] + second["results"]]
+        assert sorted(seen) == sorted(branch.id for branch in branches)
+
 
 @pytest.mark.django_db
 class TestGetMainBranch:
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from django.core.cache import cache
 
@@ -64,4 +66,102 @@ class TestDraftService:
 
     def test_get_non_existent_draft(self):
         """Test retrieving a non-existent draft."""
-        assert self.service.get_draft(999) is None
\ No newline at end of file
+        assert self.service.get_draft(999) is None
+    def test_draft_body_is_stored_compressed(self):
+        """The cached entry holds a zlib body much smaller than the text."""
+        content = "반복되는 문단입니다. " * 2000
+
+        self.service.save_draft(1, None, "Title", content)
+
+        raw = cache.get(self.service._get_key(1))
+        assert "content" not in raw
+        assert len(raw["content_z"]) * 10 < len(content.encode())
+        assert self.service.get_draft(1)["content"] == content
+
+    def test_apply_ops(self):
+        """Replace ops are applied left to right against the base text."""
+        ops = [{"start": 0, "end": 5, "text": "Howdy"}, {"start": 11, "end": 11, "text": "!"}]
+
+        assert DraftService.apply_ops("Hello world", ops) == "Howdy world!"
+
+    def test_apply_ops_rejects_overlap(self):
+        """Overlapping or out-of-order ops are invalid."""
+        ops = [{"start": 3, "end": 6, "text": ""}, {"start": 4, "end": 5, "text": ""}]
+
+        with pytest.raises(ValueError):
+            DraftService.apply_ops("Hello world", ops)
+
+    def test_apply_patch_version_mismatch(self):
+        """A patch against an old version is not applied."""
+        self.service.save_draft(1, None, "Title", "v1")
+        self.service.save_draft(1, None, "Title", "v2")
+
+        version, applied = self.service.apply_patch(1, None, 1, [])
+
+        assert (version, applied) == (2, False)
+        assert self.service.get_draft(1)["content"] == "v2"
+
+    def test_concurrent_patches_on_same_base(self, monkeypatch):
+        """Of two patches against the same base version only the first to claim it is applied."""
+        self.service.save_draft(1, None, "Title", "Hello world")
+        apply_ops = DraftService.apply_ops
+        results = []
+
+        def interleaved(content, ops):
+            # A second request reads the same base version while this one is applying its ops
+            if not results:
+                results.append(None)
+                results[0] = self.service.apply_patch(
+                    1, None, 1, [{"start": 0, "end": 5, "text": "Bye"}]
+                )
+            return apply_ops(content, ops)
+
+        monkeypatch.setattr(DraftService, "apply_ops", staticmethod(interleaved))
+        first = self.service.apply_patch(1, None, 1, [{"start": 11, "end": 11, "text": "!"}])
+
+        assert results == [(2, True)]
+        assert first == (2, False)
+        draft = self.service.get_draft(1)
+        assert (draft["version"], draft["content"]) == (2, "Bye world")
+
+    def test_save_skips_versions_taken_by_patches(self):
+        """A full save never reuses a version number a patch already wrote."""
+        self.service.save_draft(1, None, "Title", "v1")
+        assert self.service.apply_patch(1, None, 1, [{"start": 2, "end": 2, "text": "!"}]) == (
+            2,
+            True,
+        )
+
+        assert self.service.save_draft(1, None, "Title", "v3") == 3
+        assert self.service.apply_patch(1, None, 2, []) == (3, False)
+
+    def test_writes_keep_no_per_version_keys(self):
+        """Saves and patches write only the draft and its version counter."""
+        written = set()
+        add, set_ = cache.add, cache.set
+
+        def record(store):
+            def wrapper(key, *args, **kwargs):
+                written.add(key)
+                return store(key, *args, **kwargs)
+
+            return wrapper
+
+        with (
+            patch.object(cache, "add", record(add)),
+            patch.object(cache, "set", record(set_)),
+        ):
+            for i in range(1, 10, 2):
+                self.service.save_draft(1, None, "Title", "body")
+                self.service.apply_patch(1, None, i, [{"start": 0, "end": 0, "text": "!"}])
+
+        assert self.service.get_draft(1)["version"] == 10
+        assert written == {"draft:1:new", "draft:1:new:version"}
+
+    def test_versions_continue_after_delete(self):
+        """A draft saved again after deletion does not reuse the old version numbers."""
+        self.service.save_draft(1, None, "Title", "v1")
+        self.service.save_draft(1, None, "Title", "v2")
+        self.service.delete_draft(1)
+
+        assert self.service.save_draft(1, None, "Title", "again") == 3
@@ -16,7 +16,7 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from common.pagination import StandardPagination
+from common.pagination import KeysetPagination, StandardPagination
 
 from .models import Branch, BranchLinkRequest, LinkRequestStatus, Novel
 from .serializers import (
@@ -138,6 +138,15 @@ class BranchViewSet(viewsets.ViewSet):
     """ViewSet for Branch operations."""
 
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+
+    # Keyset orderings per ``sort`` value; each ends in ``id`` to break ties.
+    SORT_ORDERINGS = {
+        "votes": ("-vote_count", "-id"),
+        "views": ("-view_count", "-id"),
+        "latest": ("-created_at", "-id"),
+    }
+    PAGE_PARAMS = frozenset({"cursor", "page", "size"})
 
     def __init__(self, **kwargs: object) -> None:
         super().__init__(**kwargs)
@@ -145,14 +154,25 @@ class BranchViewSet(viewsets.ViewSet):
         self.link_service = BranchLinkService()
 
     def list(self, request: Request, novel_pk: int | None = None) -> Response:
-        """List branches for a novel."""
+        """
+        List branches for a novel.
+
+        Pages by keyset only when the client asks for it (``cursor``, ``page`` or
+        ``size``); without them every branch is returned, as before pagination.
+        """
         visibility = request.query_params.get("visibility")
         sort = request.query_params.get("sort", "latest")
 
         branches = self.service.list(novel_id=novel_pk, visibility=visibility, sort=sort)
-        serializer = BranchListSerializer(branches, many=True)
+        if not self.PAGE_PARAMS.intersection(request.query_params):
+            return Response({"results": BranchListSerializer(branches, many=True).data})
 
-        return Response({"results": serializer.data})
+        ordering = self.SORT_ORDERINGS.get(sort, self.SORT_ORDERINGS["latest"])
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(branches, request)
+        serializer = BranchListSerializer(page, many=True)
+
+        return paginator.get_paginated_response(serializer.data)
 
     def create(self, request: Request, novel_pk: int | None = None) -> Response:
         """Fork a new branch."""
@@ -0,0 +1,108 @@
+"""
+Aho-Corasick multi-pattern string matching.
+
+Finds every occurrence of a set of patterns in one pass over the text, so the
+cost is linear in the text length (plus the number of matches) regardless of
+how many patterns the automaton holds. Used for wiki keyword highlighting,
+where a branch can have thousands of entry names.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+
+class AhoCorasick:
+    """
+    Automaton over ``(pattern, payload)`` pairs.
+
+    A pattern added more than once keeps its first payload. Empty patterns are
+    ignored.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, Any]]) -> None:
+        # Node 0 is the root. goto[n] maps a character to the next node.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Pattern ending exactly at the node: (length, payload)
+        self._match: list[tuple[int, Any] | None] = [None]
+        # Nearest node on the fail chain that ends a pattern (dictionary link)
+        self._output: list[int] = [0]
+        self._size = 0
+
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._build()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._match.append(None)
+                self._output.append(0)
+            node = child
+        if self._match[node] is None:
+            self._match[node] = (len(pattern), payload)
+            self._size += 1
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._output[child] = fail if self._match[fail] is not None else self._output[fail]
+                queue.append(child)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, Any]]:
+        """Yield ``(start, end, payload)`` for every (possibly overlapping) match."""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            hit = node if self._match[node] is not None else self._output[node]
+            while hit:
+                length, payload = self._match[hit]
+                yield index + 1 - length, index + 1, payload
+                hit = self._output[hit]
+
+    def find_longest(
+        self, text: str, accept: Callable[[int, int, Any], bool] | None = None
+    ) -> list[tuple[int, int, Any]]:
+        """
+        Leftmost-longest, non-overlapping matches in text order.
+
+        Where matches overlap, the one starting first wins, and among those the
+        longest (e.g. "Kim Dokja" over "Kim"). Matches rejected by ``accept`` are
+        dropped before overlaps are resolved.
+        """
+        longest: dict[int, tuple[int, Any]] = {}
+        for start, end, payload in self.iter_matches(text):
+            if accept is not None and not accept(start, end, payload):
+                continue
+            if start not in longest or end > longest[start][0]:
+                longest[start] = (end, payload)
+
+        matches = []
+        position = 0
+        for start in sorted(longest):
+            if start >= position:
+                end, payload = longest[start]
+                matches.append((start, end, payload))
+                position = end
+        return matches
@@ -0,0 +1,93 @@
+"""
+Conditional GET support (weak ETag / Last-Modified).
+
+Branch-scoped read endpoints derive their validators from ``Branch.version``
+(bumped on every reader-visible content change) and the row's ``updated_at``.
+Validators are computed from a single narrow ``values_list`` query so that a
+``304 Not Modified`` is answered before the expensive querysets and serializers
+run. ETags are weak: counters such as view/like counts may drift within a
+validator's lifetime.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+
+class ConditionalGet:
+    """Validators for one conditional GET request."""
+
+    def __init__(
+        self,
+        request: Request,
+        *parts: Any,
+        last_modified: datetime | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.request = request
+        self.enabled = enabled
+        self.last_modified = last_modified
+        self.etag = None
+        if enabled:
+            raw = ":".join(str(part) for part in (*parts, request.get_full_path()))
+            self.etag = f'W/"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    @classmethod
+    def for_branch_row(
+        cls,
+        request: Request,
+        scope: str,
+        queryset: QuerySet,
+        branch_path: str = "branch",
+    ) -> "ConditionalGet":
+        """
+        행 하나와 소속 브랜치의 버전/수정 시각을 한 번의 쿼리로 읽어 검증자를 만든다.
+
+        Parameters:
+            request (Request): 현재 요청.
+            scope (str): ETag 네임스페이스 (예: "wiki", "map").
+            queryset (QuerySet): 대상 행 하나로 필터된 쿼리셋.
+            branch_path (str): 행에서 Branch까지의 조회 경로. Branch 자체면 빈 문자열.
+
+        Returns:
+            ConditionalGet: 행이 없으면 비활성 상태(304 판단·헤더 설정을 하지 않음)로 반환한다.
+        """
+        prefix = f"{branch_path}__" if branch_path else ""
+        row = queryset.values_list(
+            "pk", "updated_at", f"{prefix}version", f"{prefix}updated_at"
+        ).first()
+        if row is None:
+            return cls(request, enabled=False)
+
+        pk, updated_at, version, branch_updated_at = row
+        return cls(
+            request,
+            scope,
+            pk,
+            version,
+            updated_at.timestamp(),
+            last_modified=max(updated_at, branch_updated_at),
+        )
+
+    def not_modified(self) -> HttpResponseBase | None:
+        """Return a 304 response if the client's validators still match, else None."""
+        if not self.enabled:
+            return None
+        last_modified = int(self.last_modified.timestamp()) if self.last_modified else None
+        return get_conditional_response(self.request, etag=self.etag, last_modified=last_modified)
+
+    def finalize(self, response: HttpResponseBase) -> HttpResponseBase:
+        """Attach validators to a 200 response so clients can revalidate next time."""
+        if not self.enabled or response.status_code != 200:
+            return response
+        response["ETag"] = self.etag
+        if self.last_modified:
+            response["Last-Modified"] = http_date(self.last_modified.timestamp())
+        patch_cache_control(response, no_cache=True)
+        return response
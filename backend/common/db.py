@@ -0,0 +1,66 @@
+"""
+Database helpers shared across apps.
+"""
+
+from collections.abc import Mapping
+
+from django.db import connections
+from django.db.models import Case, F, Model, Value, When
+
+
+def bulk_increment(
+    model: type[Model],
+    field: str,
+    deltas: Mapping[int, int],
+    batch_size: int = 1000,
+    using: str = "default",
+) -> int:
+    """
+    Add per-row deltas to a counter column in as few statements as possible.
+
+    On PostgreSQL each batch is a single
+    ``UPDATE t SET col = col + v.delta FROM (VALUES (id, delta), ...) v WHERE t.id = v.id``.
+    Other backends fall back to one ``UPDATE ... CASE WHEN`` per batch.
+
+    Parameters:
+        model: Model whose table is updated (rows are matched on the primary key).
+        field: Name of the integer counter field.
+        deltas: Mapping of primary key -> amount to add (zero entries are skipped).
+        batch_size: Rows per statement.
+
+    Returns:
+        int: Number of rows updated.
+    """
+    items = [(pk, delta) for pk, delta in deltas.items() if delta]
+    updated = 0
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        if connections[using].vendor == "postgresql":
+            updated += _increment_from_values(model, field, batch, using)
+        else:
+            whens = [When(pk=pk, then=Value(delta)) for pk, delta in batch]
+            updated += (
+                model._default_manager.using(using)
+                .filter(pk__in=[pk for pk, _ in batch])
+                .update(**{field: F(field) + Case(*whens, default=Value(0))})
+            )
+    return updated
+
+
+def _increment_from_values(
+    model: type[Model], field: str, batch: list[tuple[int, int]], using: str
+) -> int:
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column = quote(model._meta.get_field(field).column)
+    pk = quote(model._meta.pk.column)
+    values = ", ".join(["(%s::bigint, %s::bigint)"] * len(batch))
+    sql = (
+        f"UPDATE {table} AS t SET {column} = t.{column} + v.delta "
+        f"FROM (VALUES {values}) AS v(id, delta) WHERE t.{pk} = v.id"
+    )
+    params = [value for row in batch for value in row]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
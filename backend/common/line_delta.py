@@ -0,0 +1,74 @@
+"""
+Line-based text deltas.
+
+A delta turns a base text into a target text as a list of ``[start, end, text]``
+replacements over the base's lines (``splitlines(keepends=True)``), in order:
+base lines ``start:end`` are replaced by ``text``. Unchanged lines are not
+stored, so a small edit to a long document costs roughly the size of the edit.
+Deltas are plain lists, so they can be stored in a JSON column as-is.
+"""
+
+import json
+from difflib import SequenceMatcher
+from typing import Any
+
+Delta = list[list[Any]]
+
+
+def _lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+def encode(base: str, target: str) -> Delta:
+    """Delta that turns ``base`` into ``target``."""
+    target_lines = _lines(target)
+    matcher = SequenceMatcher(None, _lines(base), target_lines, autojunk=False)
+    return [
+        [i1, i2, "".join(target_lines[j1:j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply(base: str, delta: Delta) -> str:
+    """Rebuild the target text from ``base`` and a delta made by ``encode``."""
+    lines = _lines(base)
+    out = []
+    position = 0
+    for start, end, text in delta:
+        out.extend(lines[position:start])
+        out.append(text)
+        position = end
+    out.extend(lines[position:])
+    return "".join(out)
+
+
+def size(delta: Delta) -> int:
+    """Approximate storage size of a delta (its compact JSON length)."""
+    return len(json.dumps(delta, ensure_ascii=False, separators=(",", ":")))
+
+
+def diff(old: str, new: str) -> list[dict[str, Any]]:
+    """
+    Changed line ranges between two texts, for display.
+
+    Each hunk has the ``tag`` ("replace", "delete" or "insert"), 0-based line
+    ranges ``old_start``/``old_end`` and ``new_start``/``new_end``, and the
+    ``removed``/``added`` lines without line endings.
+    """
+    old_lines = _lines(old)
+    new_lines = _lines(new)
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [
+        {
+            "tag": tag,
+            "old_start": i1,
+            "old_end": i2,
+            "new_start": j1,
+            "new_end": j2,
+            "removed": [line.rstrip("\r\n") for line in old_lines[i1:i2]],
+            "added": [line.rstrip("\r\n") for line in new_lines[j1:j2]],
+        }
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
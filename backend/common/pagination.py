@@ -1,7 +1,193 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from datetime import date, time
+from typing import Any
+
+from django.db import connections
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over an indexed, unique sort key.
+
+    Pages are fetched with ``WHERE (k1, k2, ...) > (cursor values) LIMIT n``
+    instead of ``OFFSET``, so a deep page costs the same as the first one.
+    ``ordering`` must end in a unique, non-null column (usually ``id``) so the
+    position is unambiguous, e.g. ``("chapter_number",)`` within a branch,
+    ``("-created_at", "-id")`` or ``("-vote_count", "-id")``.
+
+    The response keeps the ``count/next/previous/results`` shape of
+    ``StandardPagination``. ``count`` is ``None`` unless ``count_mode`` is
+    ``"exact"`` or ``"estimate"`` (planner row estimate on PostgreSQL).
+
+    Requests that pass ``page`` without ``cursor`` are served by
+    ``StandardPagination`` so existing page-number clients keep working.
+    """
+
+    page_size = 20
+    page_size_query_param = "size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering: tuple[str, ...] = ("-created_at", "-id")
+    count_mode: str | None = None
+    # Below this planner estimate an exact COUNT(*) is cheap and more accurate.
+    estimate_exact_threshold = 1000
+
+    def __init__(
+        self, ordering: tuple[str, ...] | None = None, count_mode: str | None = None
+    ) -> None:
+        if ordering is not None:
+            self.ordering = ordering
+        if count_mode is not None:
+            self.count_mode = count_mode
+        self.legacy: StandardPagination | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Model]:
+        self.request = request
+        if self.cursor_query_param not in request.query_params and "page" in request.query_params:
+            self.legacy = StandardPagination()
+            return self.legacy.paginate_queryset(queryset.order_by(*self.ordering), request, view)
+
+        self.size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        qs = queryset
+        if position is not None:
+            qs = qs.filter(self._after(position, reverse))
+        if reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        rows = list(qs.order_by(*ordering)[: self.size + 1])
+
+        has_more = len(rows) > self.size
+        rows = rows[: self.size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        self.count = self._get_count(queryset)
+        return rows
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    # --- Cursor encoding ---
+
+    def decode_cursor(self, request: Request) -> tuple[list | None, bool]:
+        """Return (position values, reverse) from the opaque cursor query param."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = payload["p"], bool(payload.get("r"))
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound("잘못된 커서입니다.")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound("잘못된 커서입니다.")
+        return position, reverse
+
+    def encode_cursor(self, obj: Model, reverse: bool) -> str:
+        position = [getattr(obj, field.lstrip("-")) for field in self.ordering]
+        # Full-precision isoformat: DjangoJSONEncoder truncates microseconds, which
+        # would make the equality branch of the keyset filter miss tied rows.
+        payload = json.dumps({"p": position, "r": int(reverse)}, default=_encode_value)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _link(self, obj: Model, reverse: bool) -> str:
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    # --- Query building ---
+
+    @staticmethod
+    def _invert(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _after(self, position: list, reverse: bool) -> Q:
+        """
+        Row-value comparison expanded into ORs, e.g. for ``(-created_at, -id)``:
+        ``created_at < v1 OR (created_at = v1 AND id < v2)``.
+        """
+        condition = Q()
+        equal: dict[str, Any] = {}
+        for field, value in zip(self.ordering, position, strict=True):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def _get_count(self, queryset: QuerySet) -> int | None:
+        if self.count_mode == "exact":
+            return queryset.count()
+        if self.count_mode == "estimate":
+            return estimate_count(queryset, self.estimate_exact_threshold)
+        return None
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, date | time):
+        return value.isoformat()
+    return str(value)
+
+
+def estimate_count(queryset: QuerySet, exact_threshold: int = 1000) -> int:
+    """
+    Cheap row count: the planner's estimate on PostgreSQL, falling back to an
+    exact ``COUNT(*)`` on other backends or when the estimate is small.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    # psycopg decodes the JSON plan itself, so Django may hand back the bare object.
+    if isinstance(plan, list):
+        plan = plan[0]
+    estimate = int(plan["Plan"]["Plan Rows"])
+    if estimate < exact_threshold:
+        return queryset.count()
+    return estimate
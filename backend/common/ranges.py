@@ -0,0 +1,85 @@
+"""
+Byte-range file responses.
+
+Django's FileResponse always sends the whole file. Large downloads (branch
+exports) are served through ``ranged_file_response`` so clients can resume an
+interrupted download with a single ``Range: bytes=start-end`` header.
+Multi-range requests are answered with the full file, which RFC 9110 allows.
+"""
+
+import re
+from collections.abc import Iterator
+from typing import IO
+
+from django.http import FileResponse, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def ranged_file_response(
+    request: HttpRequest,
+    file: IO[bytes],
+    size: int,
+    filename: str,
+    content_type: str = "application/octet-stream",
+) -> HttpResponse:
+    """
+    Serve ``file`` as an attachment, honouring a single byte range.
+
+    Parameters:
+        request: Incoming request (its ``Range`` header is inspected).
+        file: Open binary file positioned at 0; it is closed by the response.
+        size: File size in bytes.
+        filename: Download file name for Content-Disposition.
+        content_type: MIME type of the file.
+
+    Returns:
+        200 with the whole file, 206 with the requested range, or 416 if the
+        range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(request.META.get("HTTP_RANGE", "").strip())
+    if match is None or match.groups() == ("", ""):
+        response = FileResponse(
+            file, as_attachment=True, filename=filename, content_type=content_type
+        )
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start >= size or start > end:
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    file.seek(start)
+    response = StreamingHttpResponse(
+        _read_range(file, end - start + 1), status=206, content_type=content_type
+    )
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    return response
+
+
+def _read_range(file: IO[bytes], length: int) -> Iterator[bytes]:
+    try:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
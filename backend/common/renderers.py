@@ -15,6 +15,7 @@ Standard Response Format:
 }
 """
 
+import json
 from typing import Any
 
 from django.utils import timezone
@@ -57,3 +58,16 @@ class StandardJSONRenderer(CamelCaseJSONRenderer):
             }
 
         return super().render(data, accepted_media_type, renderer_context)
+
+    @staticmethod
+    def wrap_rendered(data: bytes) -> bytes:
+        """
+        Wrap an already-rendered (camelCase) JSON body in the success envelope.
+
+        Used by views that serve pre-rendered payloads from cache, so the body
+        is spliced in as bytes instead of being decoded and re-encoded.
+        """
+        timestamp = json.dumps(timezone.now().isoformat()).encode()
+        return (
+            b'{"success":true,"message":null,"data":' + data + b',"timestamp":' + timestamp + b"}"
+        )
@@ -0,0 +1,42 @@
+"""
+Tests for AhoCorasick - multi-pattern matching in one pass.
+"""
+
+from common.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick:
+    def test_finds_overlapping_matches(self):
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+
+        matches = sorted(automaton.iter_matches("ushers"))
+
+        assert matches == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+
+    def test_leftmost_longest(self):
+        automaton = AhoCorasick([("김", "short"), ("김독자", "long"), ("독자", "reader")])
+
+        assert automaton.find_longest("김독자가 독자였다") == [
+            (0, 3, "long"),
+            (5, 7, "reader"),
+        ]
+
+    def test_accept_filter_applies_before_overlap(self):
+        """A rejected longer match leaves room for a shorter accepted one."""
+        automaton = AhoCorasick([("Kim", "short"), ("Kim Dokja", "long")])
+
+        matches = automaton.find_longest("Kim Dokja", accept=lambda s, e, p: p != "long")
+
+        assert matches == [(0, 3, "short")]
+
+    def test_duplicate_and_empty_patterns(self):
+        automaton = AhoCorasick([("a", 1), ("a", 2), ("", 3)])
+
+        assert len(automaton) == 1
+        assert list(automaton.iter_matches("aa")) == [(0, 1, 1), (1, 2, 1)]
+
+    def test_empty_automaton(self):
+        automaton = AhoCorasick([])
+
+        assert len(automaton) == 0
+        assert automaton.find_longest("anything") == []
@@ -0,0 +1,32 @@
+"""
+Tests for common.db.bulk_increment.
+"""
+
+import pytest
+from model_bakery import baker
+
+from apps.novels.models import Branch
+from common.db import bulk_increment
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBulkIncrement:
+    """bulk_increment adds per-row deltas in batched statements."""
+
+    def test_adds_deltas_in_batches(self, django_assert_num_queries):
+        branches = baker.make(Branch, view_count=1, _quantity=3)
+        deltas = {branch.id: i + 1 for i, branch in enumerate(branches)}
+
+        with django_assert_num_queries(2):
+            updated = bulk_increment(Branch, "view_count", deltas, batch_size=2)
+
+        assert updated == 3
+        counts = dict(Branch.objects.values_list("id", "view_count"))
+        assert counts == {branch.id: i + 2 for i, branch in enumerate(branches)}
+
+    def test_skips_zero_deltas(self, django_assert_num_queries):
+        branch = baker.make(Branch, view_count=1)
+
+        with django_assert_num_queries(0):
+            assert bulk_increment(Branch, "view_count", {branch.id: 0}) == 0
@@ -0,0 +1,56 @@
+"""Tests for common.line_delta."""
+
+import pytest
+
+from common import line_delta
+
+BASE = "# 철수\n\n나이: 17\n소속: 1반\n성격: 조용함\n"
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        BASE,
+        "# 철수\n\n나이: 18\n소속: 1반\n성격: 조용함\n",
+        "# 철수\n\n나이: 17\n소속: 1반\n성격: 조용함\n특기: 검술\n",
+        "나이: 17\n",
+        "",
+        "no trailing newline",
+    ],
+)
+def test_roundtrip(target):
+    assert line_delta.apply(BASE, line_delta.encode(BASE, target)) == target
+
+
+def test_small_edit_stores_only_changed_lines():
+    target = BASE.replace("17", "18")
+
+    delta = line_delta.encode(BASE, target)
+
+    assert delta == [[2, 3, "나이: 18\n"]]
+    assert line_delta.size(delta) < len(target)
+
+
+def test_diff_hunks():
+    hunks = line_delta.diff(BASE, BASE.replace("17", "18") + "특기: 검술\n")
+
+    assert hunks == [
+        {
+            "tag": "replace",
+            "old_start": 2,
+            "old_end": 3,
+            "new_start": 2,
+            "new_end": 3,
+            "removed": ["나이: 17"],
+            "added": ["나이: 18"],
+        },
+        {
+            "tag": "insert",
+            "old_start": 5,
+            "old_end": 5,
+            "new_start": 5,
+            "new_end": 6,
+            "removed": [],
+            "added": ["특기: 검술"],
+        },
+    ]
@@ -0,0 +1,111 @@
+"""
+Tests for KeysetPagination - cursor pagination over (sort key, id).
+"""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.interactions.models import Comment
+from common.pagination import KeysetPagination
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+def make_request(**params) -> Request:
+    return Request(factory.get("/comments/", params))
+
+
+def cursor_of(link: str) -> str:
+    return parse_qs(urlparse(link).query)["cursor"][0]
+
+
+@pytest.fixture
+def comments() -> list[Comment]:
+    """Five comments sharing one created_at, so ordering falls back to id."""
+    chapter = baker.make("contents.Chapter")
+    rows = baker.make(Comment, chapter=chapter, _quantity=5)
+    Comment.objects.update(created_at=timezone.now())
+    return sorted(rows, key=lambda c: c.id, reverse=True)
+
+
+class TestKeysetPagination:
+    """KeysetPagination walks pages by cursor instead of OFFSET."""
+
+    def test_walks_all_rows_across_ties(self, comments):
+        """Rows with equal created_at are neither skipped nor repeated."""
+        seen = []
+        params = {"size": 2}
+        while True:
+            paginator = KeysetPagination(ordering=("-created_at", "-id"))
+            page = paginator.paginate_queryset(Comment.objects.all(), make_request(**params))
+            seen += [c.id for c in page]
+            link = paginator.get_next_link()
+            if link is None:
+                break
+            params = {"size": 2, "cursor": cursor_of(link)}
+
+        assert seen == [c.id for c in comments]
+
+    def test_previous_link_returns_prior_page(self, comments):
+        """Following previous from page 2 yields page 1 in forward order."""
+        first = KeysetPagination(ordering=("-created_at", "-id"))
+        first.paginate_queryset(Comment.objects.all(), make_request(size=2))
+        second = KeysetPagination(ordering=("-created_at", "-id"))
+        second.paginate_queryset(
+            Comment.objects.all(), make_request(size=2, cursor=cursor_of(first.get_next_link()))
+        )
+
+        back = KeysetPagination(ordering=("-created_at", "-id"))
+        page = back.paginate_queryset(
+            Comment.objects.all(),
+            make_request(size=2, cursor=cursor_of(second.get_previous_link())),
+        )
+
+        assert [c.id for c in page] == [c.id for c in comments[:2]]
+        assert back.get_previous_link() is None
+        assert back.get_next_link() is not None
+
+    def test_deep_page_uses_single_query(self, comments, django_assert_num_queries):
+        """Without a count mode a page is one LIMIT query, with no COUNT(*)."""
+        paginator = KeysetPagination(ordering=("-created_at", "-id"))
+        paginator.paginate_queryset(Comment.objects.all(), make_request(size=1))
+        request = make_request(size=1, cursor=cursor_of(paginator.get_next_link()))
+
+        with django_assert_num_queries(1) as ctx:
+            KeysetPagination(ordering=("-created_at", "-id")).paginate_queryset(
+                Comment.objects.all(), request
+            )
+
+        sql = ctx.captured_queries[0]["sql"].upper()
+        assert "OFFSET" not in sql
+        assert "COUNT(" not in sql
+
+    def test_estimate_count_falls_back_to_exact(self, comments):
+        """Non-PostgreSQL backends (and small tables) report the exact count."""
+        paginator = KeysetPagination(ordering=("-created_at", "-id"), count_mode="estimate")
+        paginator.paginate_queryset(Comment.objects.all(), make_request(size=2))
+
+        assert paginator.get_paginated_response([]).data["count"] == 5
+
+    def test_invalid_cursor(self, comments):
+        """A tampered cursor is rejected with 404."""
+        paginator = KeysetPagination(ordering=("-created_at", "-id"))
+
+        with pytest.raises(NotFound):
+            paginator.paginate_queryset(Comment.objects.all(), make_request(cursor="not-a-cursor"))
+
+    def test_page_param_uses_page_number_pagination(self, comments):
+        """Legacy ?page= requests keep the page-number behaviour."""
+        paginator = KeysetPagination(ordering=("-created_at", "-id"))
+        page = paginator.paginate_queryset(Comment.objects.all(), make_request(page=2, size=2))
+
+        assert [c.id for c in page] == [c.id for c in comments[2:4]]
+        assert paginator.get_paginated_response([]).data["count"] == 5
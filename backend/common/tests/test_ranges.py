@@ -0,0 +1,56 @@
+"""
+Tests for ranged_file_response - single byte-range downloads.
+"""
+
+import io
+
+from django.test import RequestFactory
+
+from common.ranges import ranged_file_response
+
+factory = RequestFactory()
+DATA = bytes(range(100))
+
+
+def download(range_header: str | None = None):
+    headers = {"HTTP_RANGE": range_header} if range_header else {}
+    request = factory.get("/download/", **headers)
+    return ranged_file_response(request, io.BytesIO(DATA), len(DATA), "a.bin")
+
+
+def body(response) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+class TestRangedFileResponse:
+    def test_without_range_sends_whole_file(self):
+        response = download()
+
+        assert response.status_code == 200
+        assert response["Accept-Ranges"] == "bytes"
+        assert 'filename="a.bin"' in response["Content-Disposition"]
+        assert body(response) == DATA
+
+    def test_closed_range(self):
+        response = download("bytes=10-19")
+
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 10-19/100"
+        assert response["Content-Length"] == "10"
+        assert body(response) == DATA[10:20]
+
+    def test_suffix_range_and_clamped_end(self):
+        assert body(download("bytes=-5")) == DATA[-5:]
+        assert download("bytes=90-500")["Content-Range"] == "bytes 90-99/100"
+
+    def test_unsatisfiable_range(self):
+        response = download("bytes=100-")
+
+        assert response.status_code == 416
+        assert response["Content-Range"] == "bytes */100"
+
+    def test_multiple_ranges_fall_back_to_whole_file(self):
+        response = download("bytes=0-1,5-6")
+
+        assert response.status_code == 200
+        assert body(response) == DATA
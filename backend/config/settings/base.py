@@ -194,12 +194,23 @@ CELERY_TIMEZONE = "Asia/Seoul"
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
 CELERY_BEAT_SCHEDULE = {
+    "publish_scheduled_chapters": {
+        "task": "apps.contents.tasks.publish_scheduled_chapters",
+        "schedule": timedelta(minutes=1),
+    },
     "sync_drafts_to_db": {
         "task": "apps.contents.tasks.sync_drafts_to_db",
         "schedule": timedelta(minutes=1),
     },
+    "flush_view_counts": {
+        "task": "apps.contents.tasks.flush_view_counts",
+        "schedule": timedelta(minutes=1),
+    },
 }
 
+# Worker processes that render markdown during bulk chapter import (1 = inline)
+CHAPTER_IMPORT_WORKERS = env.int("CHAPTER_IMPORT_WORKERS", default=4)
+
 # Cache Configuration (Redis) - aligned with Celery broker for consistency
 CACHES = {
     "default": {
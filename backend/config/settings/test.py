@@ -13,9 +13,18 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 
+# Local-memory cache so cached read paths work without a Redis server
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+CHAPTER_IMPORT_WORKERS = 1
+
 # N+1 Detection (optional - dev dependency)
 try:
     import nplusone  # noqa: F401
@@ -0,0 +1,52 @@
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Iterator[None]:
+    """Isolate cached read paths (navigation index, wiki automata etc.) between tests."""
+    from apps.contents.highlighter import WikiHighlighter
+
+    cache.clear()
+    WikiHighlighter.invalidate()
+    yield
+    cache.clear()
+    WikiHighlighter.invalidate()
+
+
+@pytest.fixture
+def assert_no_heavy_columns() -> Callable[..., AbstractContextManager[CaptureQueriesContext]]:
+    """
+    Fail if a query inside the block selects a model's ``HEAVY_FIELDS`` columns.
+
+    Usage::
+
+        with assert_no_heavy_columns(Chapter):
+            client.get(list_url)
+    """
+    from apps.contents.models import Chapter, WikiEntry
+
+    @contextmanager
+    def _check(*models: type[Model]) -> Iterator[CaptureQueriesContext]:
+        columns = [
+            f'"{model._meta.db_table}"."{model._meta.get_field(name).column}"'
+            for model in models or (Chapter, WikiEntry)
+            for name in model.HEAVY_FIELDS
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            yield ctx
+        offending = [
+            (column, query["sql"])
+            for query in ctx.captured_queries
+            for column in columns
+            if column in query["sql"]
+        ]
+        assert not offending, f"List query selected heavy columns: {offending}"
+
+    return _check